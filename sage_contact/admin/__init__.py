@@ -1,3 +1,7 @@
+from .analytics import SupportRequestDailyRollupAdmin
+from .contact import ContactAdmin, ContactLabelAdmin, CustomFieldAdmin, LabelAdmin
+from .queue import SupportQueueItemAdmin
+from .spam import QuarantinedSupportRequestAdmin
 from .support import (
     FullSupportRequestAdmin,
     SupportRequestBaseParentAdmin,
@@ -0,0 +1,172 @@
+import logging
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.helpers import ActionForm
+from django.core.exceptions import ValidationError
+from django.template.response import TemplateResponse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+
+from sage_contact.models import ContactLabel, Label
+from sage_contact.settings.app import app_settings
+from sage_contact.utils.export import csv_response
+
+logger = logging.getLogger(__name__)
+
+
+def get_batch_size():
+    return app_settings.bulk_batch_size
+
+
+def _progress(modeladmin, action):
+    opts = modeladmin.model._meta
+
+    def report(done):
+        logger.info("%s on %s: %d rows processed", action, opts.label, done)
+
+    return report
+
+
+@admin.action(
+    permissions=["delete"],
+    description=_("Delete selected %(verbose_name_plural)s in bulk"),
+)
+def bulk_delete_selected(modeladmin, request, queryset):
+    """
+    Delete the selection with ``queryset.bulk_delete()`` after a confirmation.
+
+    Unlike Django's ``delete_selected``, the confirmation page only shows the
+    number of rows, and the deletion runs in batches of a few statements
+    without loading the objects or sending per-object signals. Admin log
+    entries are therefore not written for each object.
+    """
+    opts = modeladmin.model._meta
+    if request.POST.get("post"):
+        deleted = queryset.bulk_delete(
+            batch_size=get_batch_size(),
+            progress=_progress(modeladmin, "bulk_delete_selected"),
+        )
+        modeladmin.message_user(
+            request,
+            _("Deleted %(count)d %(items)s.")
+            % {
+                "count": deleted,
+                "items": (
+                    opts.verbose_name if deleted == 1 else opts.verbose_name_plural
+                ),
+            },
+            messages.SUCCESS,
+        )
+        return None
+
+    select_across = request.POST.get("select_across") == "1"
+    context = {
+        **modeladmin.admin_site.each_context(request),
+        "title": _("Are you sure?"),
+        "opts": opts,
+        "count": queryset.count(),
+        "select_across": select_across,
+        "selected": (
+            [] if select_across else request.POST.getlist(helpers.ACTION_CHECKBOX_NAME)
+        ),
+        "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+        "action": request.POST.get("action"),
+        "media": modeladmin.media,
+    }
+    request.current_app = modeladmin.admin_site.name
+    return TemplateResponse(
+        request, "admin/sage_contact/bulk_delete_confirmation.html", context
+    )
+
+
+@admin.action(
+    permissions=["view"],
+    description=_("Export selected %(verbose_name_plural)s as CSV"),
+)
+def export_csv(modeladmin, request, queryset):
+    """Stream the selection as a CSV file, reading it in chunks from the replica."""
+    opts = modeladmin.model._meta
+    filename = f"{opts.model_name}-{timezone.now():%Y%m%d%H%M%S}.csv"
+    return csv_response(queryset.on_replica(), filename, chunk_size=get_batch_size())
+
+
+class LabelActionForm(ActionForm):
+    """Action form adding the label picked for the label actions."""
+
+    label = forms.ModelChoiceField(
+        queryset=Label.objects.none(),
+        required=False,
+        label=_("Label"),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Built per form: the managers are scoped to the tenant current when
+        # the queryset is created, which at import time is the default one.
+        self.fields["label"].queryset = Label.objects.order_by_name()
+
+
+def _label_action(modeladmin, request, queryset, method, message):
+    # Only a label of the current tenant is accepted; any other value, e.g. a
+    # tampered ID, is rejected before it reaches the bulk statements.
+    field = forms.ModelChoiceField(queryset=Label.objects.db_manager(queryset.db))
+    try:
+        label = field.clean(request.POST.get("label"))
+    except ValidationError as e:
+        modeladmin.message_user(
+            request,
+            (
+                _("Select a label to apply the action.")
+                if e.code == "required"
+                else _("The selected label does not exist.")
+            ),
+            messages.WARNING,
+        )
+        return None
+    count = getattr(ContactLabel.objects.db_manager(queryset.db), method)(
+        queryset,
+        [label.pk],
+        batch_size=get_batch_size(),
+        progress=_progress(modeladmin, method),
+    )
+    modeladmin.message_user(request, message(count), messages.SUCCESS)
+    return None
+
+
+@admin.action(
+    permissions=["change"], description=_("Add the label to selected contacts")
+)
+def assign_label(modeladmin, request, queryset):
+    return _label_action(
+        modeladmin,
+        request,
+        queryset,
+        "bulk_assign",
+        lambda count: ngettext(
+            "Label added to %(count)d contact.",
+            "Label added to %(count)d contacts.",
+            count,
+        )
+        % {"count": count},
+    )
+
+
+@admin.action(
+    permissions=["change"], description=_("Remove the label from selected contacts")
+)
+def unassign_label(modeladmin, request, queryset):
+    return _label_action(
+        modeladmin,
+        request,
+        queryset,
+        "bulk_unassign",
+        lambda count: ngettext(
+            "Label removed from %(count)d contact.",
+            "Label removed from %(count)d contacts.",
+            count,
+        )
+        % {"count": count},
+    )
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from sage_contact.models import SupportRequestDailyRollup
+from sage_contact.repository.queryset.analytics import ROLLUP_BUCKETS
+
+
+@admin.register(SupportRequestDailyRollup)
+class SupportRequestDailyRollupAdmin(admin.ModelAdmin):
+    """
+    Read-only dashboard of support request volume.
+
+    Every figure is read from the rollup table, never from the support request
+    tables. The ``days`` and ``bucket`` query parameters select the period and
+    the time bucket.
+    """
+
+    change_list_template = "admin/sage_contact/supportrequestdailyrollup/dashboard.html"
+    dashboard_days = (7, 30, 90, 365)
+    default_days = 30
+    breakdowns = (
+        ("request_type", _("Request Type")),
+        ("contact_reason", _("Reason for Contact")),
+        ("preferred_contact_method", _("Preferred Contact Method")),
+        ("country", _("Country")),
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+        try:
+            days = int(request.GET.get("days", self.default_days))
+        except ValueError:
+            days = self.default_days
+        days = max(1, min(days, 3660))
+        bucket = request.GET.get("bucket", "day")
+        if bucket not in ROLLUP_BUCKETS:
+            bucket = "day"
+
+        end = timezone.localdate()
+        rollups = SupportRequestDailyRollup.objects.between(
+            end - timedelta(days=days - 1), end
+        )
+        series = list(rollups.counts(bucket=bucket))
+        breakdowns = []
+        for name, label in self.breakdowns:
+            rows = sorted(
+                rollups.counts(by=[name], bucket=None),
+                key=lambda row: row["count"],
+                reverse=True,
+            )
+            breakdowns.append(
+                {
+                    "name": name,
+                    "label": label,
+                    "rows": [
+                        {"value": row[name] or "-", "count": row["count"]}
+                        for row in rows
+                    ],
+                }
+            )
+        total = sum(row["count"] for row in series)
+        peak = max((row["count"] for row in series), default=0)
+        for row in series:
+            row["percent"] = round(100 * row["count"] / peak) if peak else 0
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": _("Support request statistics"),
+            "days": days,
+            "dashboard_days": self.dashboard_days,
+            "bucket": bucket,
+            "buckets": list(ROLLUP_BUCKETS),
+            "series": series,
+            "breakdowns": breakdowns,
+            "total": total,
+            **(extra_context or {}),
+        }
+        request.current_app = self.admin_site.name
+        return TemplateResponse(request, self.change_list_template, context)
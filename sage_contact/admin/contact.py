@@ -0,0 +1,144 @@
+from django.contrib import admin
+from django.forms.models import BaseInlineFormSet
+from django.utils.translation import gettext_lazy as _
+
+from sage_contact.admin.actions import (
+    LabelActionForm,
+    assign_label,
+    bulk_delete_selected,
+    export_csv,
+    unassign_label,
+)
+from sage_contact.admin.filters import HasEmailFilter, HasPhoneNumberFilter, LabelFilter
+from sage_contact.admin.mixins import ReplicaChangelistMixin
+from sage_contact.admin.paginator import EstimatedCountPaginator
+from sage_contact.admin.widgets import PreloadedAutocompleteSelect
+from sage_contact.models import Contact, ContactLabel, CustomField, Label
+
+
+class LargeTableAdminMixin(ReplicaChangelistMixin):
+    """
+    Changelist defaults for tables with millions of rows.
+
+    Counts are estimated or bounded by :class:`EstimatedCountPaginator` and the
+    unfiltered total is never counted. Rows are ordered by the primary key
+    index, which also keeps autocomplete pagination stable. Changelist pages
+    are read from the replica when one is configured.
+    """
+
+    paginator = EstimatedCountPaginator
+    ordering = ["-pk"]
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class ContactLabelInlineFormSet(BaseInlineFormSet):
+    """Hand the labels loaded with the inline rows to their label widgets."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        labels = {
+            str(form.instance.label_id): form.instance.label
+            for form in self.initial_forms
+            if form.instance.label_id is not None
+        }
+        for form in self.forms:
+            widget = form.fields["label"].widget
+            widget = getattr(widget, "widget", widget)
+            if isinstance(widget, PreloadedAutocompleteSelect):
+                widget.preloaded = labels
+
+
+class ContactLabelInline(admin.TabularInline):
+    model = ContactLabel
+    formset = ContactLabelInlineFormSet
+    autocomplete_fields = ["label"]
+    extra = 1
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("contact", "label")
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == "label":
+            kwargs["widget"] = PreloadedAutocompleteSelect(
+                db_field, self.admin_site, using=kwargs.get("using")
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class CustomFieldInline(admin.TabularInline):
+    model = CustomField
+    extra = 1
+
+
+@admin.register(Label)
+class LabelAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ["name", "contact_count"]
+    search_fields = ["^name"]
+    search_help_text = _("Search by the start of the name")
+    ordering = ["name"]
+
+
+@admin.register(Contact)
+class ContactAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ["first_name", "last_name", "email", "phone_number", "company"]
+    list_filter = [HasEmailFilter, HasPhoneNumberFilter, LabelFilter]
+    search_fields = ["^last_name", "^first_name"]
+    search_help_text = _(
+        "Search by the start of the last name or first name, or by email address"
+    )
+    inlines = [ContactLabelInline, CustomFieldInline]
+    action_form = LabelActionForm
+    actions = [assign_label, unassign_label, bulk_delete_selected, export_csv]
+    save_on_top = True
+    fieldsets = (
+        (
+            _("Name"),
+            {
+                "fields": (
+                    ("prefix", "first_name", "middle_name", "last_name", "suffix"),
+                    "nickname",
+                )
+            },
+        ),
+        (
+            _("Contact Information"),
+            {
+                "fields": (
+                    "email",
+                    "phone_number",
+                    "physical_address",
+                    "im_handle",
+                    "website",
+                )
+            },
+        ),
+        (_("Work"), {"fields": ("company", "job_title", "department")}),
+        (
+            _("Other"),
+            {"fields": ("birthday", "anniversary", "notes", "photo")},
+        ),
+    )
+
+    def get_search_results(self, request, queryset, search_term):
+        # Email addresses are matched exactly on the indexed email key.
+        if "@" in search_term:
+            return queryset.by_email(search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+@admin.register(CustomField)
+class CustomFieldAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ["field_name", "field_value", "contact"]
+    list_select_related = ["contact"]
+    search_fields = ["^field_name"]
+    search_help_text = _("Search by the start of the field name")
+    autocomplete_fields = ["contact"]
+
+
+@admin.register(ContactLabel)
+class ContactLabelAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ["contact", "label"]
+    list_select_related = ["contact", "label"]
+    list_filter = [("label", admin.RelatedFieldListFilter)]
+    autocomplete_fields = ["contact", "label"]
@@ -0,0 +1,35 @@
+from sage_contact.routers import replica_scope
+from sage_contact.utils.network import parse_network
+
+
+class ReplicaChangelistMixin:
+    """
+    Read changelist pages from the read replica, when one is configured.
+
+    Only ``GET`` requests are routed; action posts and clients inside their
+    read-your-writes window read from the primary. The response is rendered
+    inside the routing scope so the template's lazy queries follow it too.
+    """
+
+    def changelist_view(self, request, extra_context=None):
+        with replica_scope(request):
+            response = super().changelist_view(request, extra_context)
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        return response
+
+
+class NetworkSearchMixin:
+    """
+    Search support requests by IP address or CIDR network, e.g. ``203.0.113.0/24``.
+
+    Such a search term is one range query on the IP key index; other terms
+    use the regular ``search_fields``.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        try:
+            network = parse_network(search_term)
+        except ValueError:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.in_network(network), False
@@ -0,0 +1,78 @@
+from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+
+from sage_contact.admin.filters import OverdueFilter
+from sage_contact.admin.mixins import ReplicaChangelistMixin
+from sage_contact.models import SupportQueueItem
+
+
+@admin.action(permissions=["change"], description=_("Claim selected requests"))
+def claim_selected(modeladmin, request, queryset):
+    """Claim the open items of the selection for the current user."""
+    claimed = queryset.claim(request.user.get_username(), limit=queryset.count())
+    modeladmin.message_user(
+        request,
+        ngettext(
+            "Claimed %(count)d request.", "Claimed %(count)d requests.", len(claimed)
+        )
+        % {"count": len(claimed)},
+    )
+
+
+@admin.action(permissions=["change"], description=_("Mark selected requests as done"))
+def complete_selected(modeladmin, request, queryset):
+    completed = queryset.complete()
+    modeladmin.message_user(
+        request,
+        ngettext(
+            "Completed %(count)d request.", "Completed %(count)d requests.", completed
+        )
+        % {"count": completed},
+    )
+
+
+@admin.action(
+    permissions=["change"], description=_("Give selected requests back to their queue")
+)
+def release_claims(modeladmin, request, queryset):
+    released = queryset.release()
+    modeladmin.message_user(
+        request,
+        ngettext(
+            "Released %(count)d request.", "Released %(count)d requests.", released
+        )
+        % {"count": released},
+    )
+
+
+@admin.register(SupportQueueItem)
+class SupportQueueItemAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
+    """
+    Work queues of the support requests, in claim order.
+
+    Queue state only changes through the actions, which use the same claim
+    API as workers, so agents and workers never take the same request.
+    """
+
+    list_display = (
+        "support_request",
+        "queue",
+        "priority",
+        "state",
+        "due_at",
+        "claimed_by",
+        "claimed_until",
+    )
+    list_filter = ("state", "queue", OverdueFilter)
+    list_select_related = ("support_request",)
+    search_fields = ("claimed_by",)
+    ordering = ("-priority", "due_at", "pk")
+    actions = [claim_selected, complete_selected, release_claims]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        # Needed by the actions; the change form itself is read-only.
+        return obj is None and super().has_change_permission(request, obj)
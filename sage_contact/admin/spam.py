@@ -0,0 +1,45 @@
+from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+
+from sage_contact.models import QuarantinedSupportRequest
+
+
+@admin.action(
+    permissions=["delete"],
+    description=_("Release selected submissions as support requests"),
+)
+def release_selected(modeladmin, request, queryset):
+    """Submit the selection through its forms, skipping the spam filter."""
+    released = queryset.release()
+    modeladmin.message_user(
+        request,
+        ngettext(
+            "Released %(count)d submission.",
+            "Released %(count)d submissions.",
+            released,
+        )
+        % {"count": released},
+    )
+
+
+@admin.register(QuarantinedSupportRequest)
+class QuarantinedSupportRequestAdmin(admin.ModelAdmin):
+    """
+    Review of the submissions held back by the spam filter.
+
+    Submissions are read-only; they are either released, which creates the
+    support request, or deleted.
+    """
+
+    list_display = ("subject", "email", "score", "reasons", "ip_address", "created_at")
+    list_filter = ("form_class",)
+    search_fields = ("subject", "email")
+    date_hierarchy = "created_at"
+    actions = [release_selected]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
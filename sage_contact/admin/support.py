@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from polymorphic.admin import PolymorphicParentModelAdmin, PolymorphicChildModelAdmin
 
+from sage_contact.admin.actions import bulk_delete_selected, export_csv
+from sage_contact.admin.mixins import NetworkSearchMixin, ReplicaChangelistMixin
 from sage_contact.models import (
     FullSupportRequest,
     SupportRequestBase,
@@ -9,7 +11,9 @@ from sage_contact.models import (
     SupportRequestWithPhone,
 )
 
-class SupportRequestBaseChildAdmin(PolymorphicParentModelAdmin, admin.ModelAdmin):
+class SupportRequestBaseChildAdmin(
+    NetworkSearchMixin, ReplicaChangelistMixin, PolymorphicParentModelAdmin, admin.ModelAdmin
+):
     base_model = SupportRequestBase
     child_models = (
         FullSupportRequest,
@@ -18,9 +22,10 @@ class SupportRequestBaseChildAdmin(PolymorphicParentModelAdmin, admin.ModelAdmin
         FullSupportRequest
     )
     search_fields = ["subject", "full_name", "email"]
-    search_help_text = _("Search by subject, full name, or email")
+    search_help_text = _("Search by subject, full name, email, or IP address or network")
     list_display = ["subject","get_request_type","full_name", "email", "created_at", "modified_at"]
     list_filter = ["created_at", "modified_at"]
+    actions = [bulk_delete_selected, export_csv]
     save_on_top = True
     readonly_fields = ["created_at", "modified_at"]
     fieldsets = (
@@ -57,7 +62,7 @@ class SupportRequestBaseParentAdmin(PolymorphicChildModelAdmin, SupportRequestBa
         "polymorphic_ctype",
     ]
     search_fields = ["subject", "full_name", "email"]
-    search_help_text = _("Search by subject, full name, or email")
+    search_help_text = _("Search by subject, full name, email, or IP address or network")
     save_on_top = True
     readonly_fields = ["created_at", "modified_at"]
 
@@ -146,6 +151,7 @@ class FullSupportRequestAdmin(PolymorphicChildModelAdmin, SupportRequestBaseChil
         "get_request_type",
     ]
     autocomplete_fields = ("user",)
+    list_select_related = ("user",)
     fieldsets = (
         (
             _("Contact Information"),
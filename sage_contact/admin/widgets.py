@@ -0,0 +1,37 @@
+from django.contrib.admin.widgets import AutocompleteSelect
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """
+    Autocomplete widget that renders its selected option from a preloaded object.
+
+    ``AutocompleteSelect`` queries the selected object of every form it
+    renders. Inline formsets already load the related objects with
+    ``select_related()``, so the formset stores them in ``preloaded``
+    (``{str(pk): obj}``) and the widget renders without a query.
+    """
+
+    preloaded = None
+
+    def optgroups(self, name, value, attr=None):
+        selected = [
+            str(v) for v in value if str(v) not in self.choices.field.empty_values
+        ]
+        if self.preloaded is None or any(v not in self.preloaded for v in selected):
+            return super().optgroups(name, value, attr)
+        default = (None, [], 0)
+        if not self.is_required and not self.allow_multiple_selected:
+            default[1].append(self.create_option(name, "", "", False, 0))
+        for option_value in selected:
+            default[1].append(
+                self.create_option(
+                    name,
+                    option_value,
+                    self.choices.field.label_from_instance(
+                        self.preloaded[option_value]
+                    ),
+                    set(selected),
+                    len(default[1]),
+                )
+            )
+        return [default]
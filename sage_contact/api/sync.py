@@ -0,0 +1,45 @@
+from django.contrib.auth.mixins import PermissionRequiredMixin
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+
+from sage_contact.utils.sync import (
+    SyncTokenError,
+    SyncTokenExpired,
+    iter_sync_lines,
+    sync_enabled,
+)
+
+
+class ContactSyncView(PermissionRequiredMixin, View):
+    """
+    Stream the contact, custom field and label changes after a sync token.
+
+    ``GET ?since=<token>&limit=<n>`` answers with newline-delimited JSON: one
+    ``{"seq", "kind", "op", "id", "contact_id", "data"}`` object per change
+    (``op`` is ``"upsert"`` or ``"delete"``), then ``{"token", "more"}``. A
+    client repeats the request with the returned token while ``more`` is
+    true, and omits ``since`` on its first sync. An expired token is answered
+    with ``410 Gone``; the client must then sync from scratch. Without
+    ``SAGE_CONTACT_SYNC`` the view answers ``404 Not Found``.
+    """
+
+    permission_required = "sage_contact.view_contact"
+    raise_exception = True
+    http_method_names = ["get", "head", "options"]
+
+    def get(self, request, *args, **kwargs):
+        if not sync_enabled():
+            return JsonResponse({"error": "Sync is disabled."}, status=404)
+        try:
+            limit = int(request.GET.get("limit") or 0)
+        except ValueError:
+            return JsonResponse({"error": "limit must be an integer."}, status=400)
+        try:
+            lines = iter_sync_lines(request.GET.get("since") or None, limit)
+        except SyncTokenExpired as exc:
+            return JsonResponse({"error": str(exc)}, status=410)
+        except SyncTokenError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        response = StreamingHttpResponse(lines, content_type="application/x-ndjson")
+        response["Cache-Control"] = "no-store"
+        return response
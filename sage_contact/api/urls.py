@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .sync import ContactSyncView
+
+app_name = "sage_contact_api"
+
+urlpatterns = [
+    path("contacts/sync/", ContactSyncView.as_view(), name="contact_sync"),
+]
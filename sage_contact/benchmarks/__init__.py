@@ -0,0 +1 @@
+from .runner import BENCHMARK_CASES, BenchmarkRunner, case, compare_reports
@@ -0,0 +1,484 @@
+"""
+Benchmark cases for the sage_contact hot paths.
+
+Each case is registered with :func:`sage_contact.benchmarks.runner.case` and
+grouped so that a subset can be selected from the command line.
+"""
+
+import itertools
+import os
+import time
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core import mail
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+
+from sage_contact.forms import (
+    FullSupportRequestForm,
+    SupportRequestForm,
+    SupportRequestWithLocationForm,
+    SupportRequestWithPhoneForm,
+)
+from sage_contact.forms.mixins import GeoLocationMixin
+from sage_contact.models import (
+    Contact,
+    ContactChange,
+    FullSupportRequest,
+    SupportQueueItem,
+    SupportRequestBase,
+    SupportRequestWithLocation,
+    SupportRequestWithPhone,
+)
+
+from sage_contact.utils.directory import ContactDirectory
+from sage_contact.utils.geoip import enrich_locations
+from sage_contact.utils.mail import flush
+from sage_contact.utils.queue import enqueue_missing
+from sage_contact.utils.spam import SpamScorer, timing_token, train_spam_model
+
+from .data import ensure_contacts, support_request_data
+from .runner import BenchmarkRunner, case
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+SUPPORT_FORMS = (
+    SupportRequestForm,
+    SupportRequestWithPhoneForm,
+    SupportRequestWithLocationForm,
+    FullSupportRequestForm,
+)
+
+SUPPORT_MODELS = (
+    SupportRequestBase,
+    SupportRequestWithPhone,
+    SupportRequestWithLocation,
+    FullSupportRequest,
+)
+
+_sequence = itertools.count()
+
+
+def model_fields(model, index):
+    """Return the create() keyword arguments of ``model`` for fixture ``index``."""
+    data = support_request_data(index)
+    fields = {name: data[name] for name in ("subject", "full_name", "email", "message")}
+    if issubclass(model, SupportRequestWithPhone):
+        fields["phone_number"] = data["phone_number"]
+    if issubclass(model, SupportRequestWithLocation):
+        fields["country"] = data["country"]
+        fields["ip_address"] = "203.0.113.%d" % (index % 255)
+    if issubclass(model, FullSupportRequest):
+        fields["contact_reason"] = data["contact_reason"]
+        fields["preferred_contact_method"] = data["preferred_contact_method"]
+    return fields
+
+
+@case("forms")
+def form_validation(runner: BenchmarkRunner) -> None:
+    data = support_request_data()
+    for form_class in SUPPORT_FORMS:
+        runner.measure(
+            "forms",
+            f"{form_class.__name__}.is_valid",
+            lambda form_class=form_class: form_class(data).is_valid(),
+            number=200,
+        )
+
+
+@case("forms")
+def spam_scoring(runner: BenchmarkRunner) -> None:
+    data = support_request_data()
+    scorer = SpamScorer(
+        blocked_domains=["spam.example", "casino.test"],
+        model=train_spam_model(
+            ["cheap casino bonus win money now"] * 50,
+            [support_request_data(index)["message"] for index in range(50)],
+        ),
+    )
+    clean = {**data, "sage_contact_ts": timing_token(now=time.time() - 60)}
+    spam = {
+        **data,
+        "sage_contact_ts": timing_token(),
+        "message": "Win money now https://a.test https://b.test https://c.test",
+    }
+    for label, submitted in (("clean", clean), ("spam", spam)):
+        runner.measure(
+            "forms",
+            f"SpamScorer.score[{label}]",
+            lambda submitted=submitted: scorer.score(submitted, submitted),
+            number=2000,
+        )
+
+
+@case("inserts")
+def polymorphic_inserts(runner: BenchmarkRunner) -> None:
+    batch_size = 100
+    with override_settings(SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM=False):
+        for model in SUPPORT_MODELS:
+            manager = model.objects.db_manager(runner.using)
+            runner.measure(
+                "inserts",
+                f"{model.__name__}.create",
+                lambda model=model, manager=manager: manager.create(
+                    **model_fields(model, next(_sequence))
+                ),
+                number=100,
+            )
+
+            if model is SupportRequestBase:
+                ctype = ContentType.objects.db_manager(runner.using).get_for_model(
+                    model, for_concrete_model=False
+                )
+
+                def bulk(model=model, manager=manager):
+                    manager.bulk_create(
+                        [
+                            model(
+                                polymorphic_ctype=ctype,
+                                **model_fields(model, next(_sequence)),
+                            )
+                            for _ in range(batch_size)
+                        ]
+                    )
+
+                name = f"{model.__name__}.bulk_create"
+            else:
+                # Django cannot bulk_create multi-table inherited models, so
+                # child levels are measured as batched saves in one transaction.
+                def bulk(model=model, manager=manager):
+                    with transaction.atomic(using=runner.using):
+                        for _ in range(batch_size):
+                            manager.create(**model_fields(model, next(_sequence)))
+
+                name = f"{model.__name__}.batched_create"
+            result = runner.measure(
+                "inserts", name, bulk, number=5, batch_size=batch_size
+            )
+            result["rows_per_sec"] = batch_size / result["median_s"]
+
+
+@case("managers")
+def contact_manager(runner: BenchmarkRunner) -> None:
+    manager = Contact.objects.db_manager(runner.using)
+    for rows in runner.row_counts:
+        runner.log(f"seeding contacts up to {rows} rows")
+        ensure_contacts(rows, using=runner.using)
+        runner.measure(
+            "managers",
+            "ContactManager.search_by_name[:50]",
+            lambda: list(manager.search_by_name("smi")[:50]),
+            number=20,
+            rows=rows,
+        )
+        runner.measure(
+            "managers",
+            "ContactManager.search_by_name.count",
+            lambda: manager.search_by_name("smi").count(),
+            number=5,
+            rows=rows,
+        )
+        runner.measure(
+            "managers",
+            "ContactManager.order_by_name[:50]",
+            lambda: list(manager.order_by_name()[:50]),
+            number=20,
+            rows=rows,
+        )
+        runner.measure(
+            "managers",
+            "ContactManager.order_by_name[-50:]",
+            lambda: list(manager.order_by_name()[rows - 50 : rows]),
+            number=5,
+            rows=rows,
+        )
+
+
+@case("directory")
+def contact_directory(runner: BenchmarkRunner) -> None:
+    manager = Contact.objects.db_manager(runner.using)
+    for rows in runner.row_counts:
+        runner.log(f"seeding contacts up to {rows} rows")
+        ensure_contacts(rows, using=runner.using)
+        directory = ContactDirectory(runner.using)
+        result = runner.measure(
+            "directory", "ContactDirectory.build", directory.build, number=1, rows=rows
+        )
+        # Memory footprint of the built index.
+        result.update(directory.stats())
+        for prefix in ("s", "smi", "james.smith"):
+            runner.measure(
+                "directory",
+                f"ContactDirectory.search[{prefix}]",
+                lambda prefix=prefix: directory.search(prefix),
+                number=200,
+                rows=rows,
+            )
+        runner.measure(
+            "directory",
+            "ContactManager.typeahead[smi]",
+            lambda: manager.typeahead("smi"),
+            number=50,
+            rows=rows,
+        )
+
+
+@case("sync")
+@override_settings(SAGE_CONTACT_SYNC=True)
+def contact_sync(runner: BenchmarkRunner) -> None:
+    manager = Contact.objects.db_manager(runner.using)
+    for rows in runner.row_counts:
+        runner.log(f"seeding contacts up to {rows} rows")
+        ensure_contacts(rows, using=runner.using)
+        runner.measure(
+            "sync",
+            "ContactManager.changes_since[first page]",
+            lambda: manager.changes_since(None, limit=500),
+            number=5,
+            rows=rows,
+        )
+        # A client that is up to date, then one that missed a few edits.
+        token = manager.changes_since(None, limit=1).token
+        while True:
+            page = manager.changes_since(token)
+            token = page.token
+            if not page.more:
+                break
+        runner.measure(
+            "sync",
+            "ContactManager.changes_since[up to date]",
+            lambda: manager.changes_since(token),
+            number=50,
+            rows=rows,
+        )
+        contacts = list(manager.order_by("pk")[:20])
+        for contact in contacts:
+            contact.job_title = f"Title {next(_sequence)}"
+        manager.bulk_update(contacts, ["job_title"])
+        runner.measure(
+            "sync",
+            "ContactManager.changes_since[20 changes]",
+            lambda: manager.changes_since(token),
+            number=50,
+            rows=rows,
+        )
+
+
+@case("admin")
+def admin_changelists(runner: BenchmarkRunner) -> None:
+    rows = 500
+    with override_settings(
+        ROOT_URLCONF="sage_contact.benchmarks.urls",
+        SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM=False,
+    ):
+        for model in SUPPORT_MODELS:
+            manager = model.objects.db_manager(runner.using)
+            with transaction.atomic(using=runner.using):
+                for _ in range(rows // len(SUPPORT_MODELS)):
+                    manager.create(**model_fields(model, next(_sequence)))
+
+        user_model = get_user_model()
+        user, _ = user_model._default_manager.db_manager(runner.using).get_or_create(
+            **{user_model.USERNAME_FIELD: "sage_contact_benchmark"},
+            defaults={"is_staff": True, "is_superuser": True},
+        )
+        factory = RequestFactory()
+        for model, model_admin in admin.site._registry.items():
+            if model._meta.app_label != "sage_contact":
+                continue
+
+            def render(model_admin=model_admin):
+                request = factory.get("/")
+                request.user = user
+                model_admin.changelist_view(request).render()
+
+            runner.measure(
+                "admin",
+                f"{model_admin.__class__.__name__}.changelist",
+                render,
+                number=10,
+            )
+
+
+@case("geoip")
+def geoip_lookup(runner: BenchmarkRunner) -> None:
+    if not getattr(settings, "SAGE_CONTACT_GEOIP_PATH", None):
+        runner.skip("geoip", "GeoLocationMixin.set_country_from_ip", "no GeoIP path")
+        return
+    try:
+        from django.contrib.gis.geoip2 import GeoIP2
+
+        GeoIP2().country("8.8.8.8")
+    except Exception as e:
+        runner.skip("geoip", "GeoLocationMixin.set_country_from_ip", str(e))
+        return
+
+    mixin = GeoLocationMixin()
+    instance = SupportRequestWithLocation(ip_address="8.8.8.8")
+    runner.measure(
+        "geoip",
+        "GeoLocationMixin.set_country_from_ip",
+        lambda: mixin.set_country_from_ip(instance),
+        number=200,
+    )
+
+    rows = min(max(runner.row_counts), 1000)
+    for index in range(rows):
+        fields = model_fields(SupportRequestWithLocation, index)
+        fields["ip_address"] = "8.8.%d.%d" % (index // 250 % 250, index % 250)
+        SupportRequestWithLocation.objects.using(runner.using).create(**fields)
+    runner.measure(
+        "geoip",
+        "enrich_locations[backfill]",
+        lambda: enrich_locations(runner.using, backfill=True),
+        number=1,
+        rows=rows,
+    )
+
+
+@case("network")
+def network_queries(runner: BenchmarkRunner) -> None:
+    manager = SupportRequestWithLocation.objects.db_manager(runner.using)
+    seeded = 0
+    for rows in runner.row_counts:
+        runner.log(f"seeding support requests with location up to {rows} rows")
+        with transaction.atomic(using=runner.using):
+            for index in range(seeded, rows):
+                fields = model_fields(SupportRequestWithLocation, index)
+                fields["ip_address"] = "10.%d.%d.%d" % (
+                    index // 65536 % 256,
+                    index // 256 % 256,
+                    index % 256,
+                )
+                manager.create(**fields)
+        seeded = max(seeded, rows)
+        runner.measure(
+            "network",
+            "SupportRequestManager.in_network[/24].count",
+            lambda: manager.non_polymorphic().in_network("10.0.7.0/24").count(),
+            number=20,
+            rows=rows,
+        )
+        runner.measure(
+            "network",
+            "SupportRequestManager.subnet_counts[/16]",
+            lambda: manager.non_polymorphic().subnet_counts(prefix=16),
+            number=3,
+            rows=rows,
+        )
+
+
+@case("queue")
+def work_queue(runner: BenchmarkRunner) -> None:
+    manager = SupportQueueItem.objects.db_manager(runner.using)
+    ctype = ContentType.objects.db_manager(runner.using).get_for_model(
+        SupportRequestBase, for_concrete_model=False
+    )
+    rows = min(max(runner.row_counts), 10_000)
+    runner.log(f"seeding {rows} queued support requests")
+    SupportRequestBase.objects.db_manager(runner.using).bulk_create(
+        [
+            SupportRequestBase(
+                polymorphic_ctype=ctype,
+                **model_fields(SupportRequestBase, next(_sequence)),
+            )
+            for _ in range(rows)
+        ],
+        batch_size=1000,
+    )
+    enqueue_missing(SupportRequestBase.objects.all(), using=runner.using)
+
+    def claim_and_complete():
+        manager.claim("benchmark", limit=10)
+        manager.claimed().complete()
+
+    runner.measure(
+        "queue",
+        "SupportQueueItemManager.claim[10]+complete",
+        claim_and_complete,
+        number=50,
+        rows=rows,
+    )
+    runner.measure(
+        "queue", "SupportQueueItemManager.stats", manager.stats, number=5, rows=rows
+    )
+
+
+@case("email")
+def confirmation_email(runner: BenchmarkRunner) -> None:
+    from sage_contact.signals.support import send_confirmation_email
+
+    instance = FullSupportRequest(**model_fields(FullSupportRequest, 0))
+    with override_settings(
+        EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM=True,
+        SAGE_CONTACT_SUPPORT_EMAIL_TEMPLATE_PATH="confirmation.html",
+        BASE_DIR=TEMPLATES_DIR,
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "DIRS": [TEMPLATES_DIR],
+            }
+        ],
+    ):
+        mail.outbox = []
+        runner.measure(
+            "email",
+            "send_confirmation_email[locmem]",
+            lambda: send_confirmation_email(
+                sender=FullSupportRequest, instance=instance, created=True
+            ),
+            number=100,
+            setup=lambda: setattr(mail, "outbox", []),
+        )
+        # Request path cost only: the message is sent by the mail loop.
+        with override_settings(SAGE_CONTACT_EMAIL_ASYNC=True):
+            runner.measure(
+                "email",
+                "send_confirmation_email[async]",
+                lambda: send_confirmation_email(
+                    sender=FullSupportRequest, instance=instance, created=True
+                ),
+                number=100,
+                setup=flush,
+            )
+            flush()
+
+
+@case("history")
+def change_history(runner: BenchmarkRunner) -> None:
+    ensure_contacts(200, using=runner.using)
+    manager = Contact.objects.db_manager(runner.using)
+    contact = manager.order_by("pk").first()
+    contacts = list(manager.order_by("pk")[:100])
+    for enabled in (False, True):
+        label = "on" if enabled else "off"
+        with override_settings(SAGE_CONTACT_CHANGE_HISTORY=enabled):
+
+            def save(contact=contact):
+                contact.job_title = f"Title {next(_sequence)}"
+                contact.save()
+
+            runner.measure("history", f"Contact.save[{label}]", save, number=200)
+
+            def bulk_update(contacts=contacts):
+                for obj in contacts:
+                    obj.job_title = f"Title {next(_sequence)}"
+                manager.bulk_update(contacts, ["job_title"])
+
+            runner.measure(
+                "history",
+                f"ContactManager.bulk_update[{label}]",
+                bulk_update,
+                number=10,
+                batch_size=len(contacts),
+            )
+    runner.measure(
+        "history",
+        "ContactChangeManager.reconstruct",
+        lambda: ContactChange.objects.db_manager(runner.using).reconstruct(contact.pk),
+        number=20,
+    )
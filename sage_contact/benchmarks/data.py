@@ -0,0 +1,71 @@
+"""
+Deterministic fixture generation for the benchmark suite.
+"""
+
+import random
+from typing import Dict, Iterator, List
+
+from sage_contact.models import Contact
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Sara", "Ali", "Reza", "Maryam",
+]  # fmt: skip
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+    "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Akbarzadeh", "Karimi",
+]  # fmt: skip
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne"]
+COUNTRIES = ["US", "GB", "DE", "FR", "IR", "CA", "NL", "SE", "JP", "BR"]
+
+SEED = 20240701
+
+
+def support_request_data(index: int = 0) -> Dict[str, str]:
+    """Return valid form data for the widest support request form."""
+    rng = random.Random(SEED + index)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "subject": f"Question number {index}",
+        "full_name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}{index}@example.com",
+        "message": "I would like to know more about your product. " * 4,
+        "phone_number": f"+1202555{index % 10000:04d}",
+        "country": rng.choice(COUNTRIES),
+        "contact_reason": rng.choice(["support", "sales", "feedback"]),
+        "preferred_contact_method": rng.choice(["email", "phone", "text"]),
+    }
+
+
+def iter_contacts(start: int, stop: int) -> Iterator[Contact]:
+    """Yield unsaved contacts ``start`` to ``stop`` with deterministic values."""
+    rng = random.Random(SEED + start)
+    for index in range(start, stop):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield Contact(
+            first_name=first,
+            last_name=f"{last}{index % 997}",
+            email=(
+                f"{first.lower()}.{last.lower()}{index}@example.com"
+                if index % 4
+                else None
+            ),
+            phone_number=f"+1202{index % 10_000_000:07d}" if index % 3 else None,
+            company=rng.choice(COMPANIES),
+        )
+
+
+def ensure_contacts(total: int, using: str = "default", batch_size: int = 5000) -> int:
+    """Top the contact table up to ``total`` rows and return the row count."""
+    existing = Contact.objects.using(using).count()
+    batch: List[Contact] = []
+    for contact in iter_contacts(existing, total):
+        batch.append(contact)
+        if len(batch) >= batch_size:
+            Contact.objects.using(using).bulk_create(batch)
+            batch = []
+    if batch:
+        Contact.objects.using(using).bulk_create(batch)
+    return max(existing, total)
@@ -0,0 +1,506 @@
+"""
+Query-count and latency regression guards.
+
+Every guard runs one public entry point (a manager method, an admin view or
+the support form view) against a small fixture data set, records the number
+of SQL queries and the wall time, and compares both against a budget.
+
+Fixtures are sized so that an N+1 pattern shows up as a query count well
+above the budget. Query budgets are exact upper bounds; latency budgets are
+generous ceilings meant to catch pathological slowdowns, and can be scaled
+with ``latency_factor`` on slow CI machines.
+
+The guards run in the test suite (``sage_contact/tests/test_guards.py``) and
+with the ``sage_contact_check_budgets`` management command.
+"""
+
+import itertools
+import time
+from datetime import date, timedelta
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.cache import SessionStore
+from django.db import connections
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from sage_contact.models import (
+    Contact,
+    ContactLabel,
+    CustomField,
+    FullSupportRequest,
+    Label,
+    SupportRequestBase,
+    SupportQueueItem,
+    SupportRequestDailyRollup,
+    SupportRequestWithLocation,
+    SupportRequestWithPhone,
+)
+
+from .data import iter_contacts, support_request_data
+
+GUARDS: List[Callable[["GuardRunner"], None]] = []
+
+FIXTURE_SIZE = 20
+
+#: Opt-in features enabled while the guards run, so their cost is budgeted.
+OPT_IN_SETTINGS = {"SAGE_CONTACT_QUEUE": True, "SAGE_CONTACT_SYNC": True}
+
+#: ``name -> (max_queries, max_seconds)``. Query counts include the
+#: BEGIN/COMMIT statements of atomic blocks.
+DEFAULT_BUDGETS: Dict[str, tuple] = {
+    "LabelManager.search_by_name": (1, 0.05),
+    "LabelManager.order_by_name": (1, 0.05),
+    "ContactManager.search_by_name": (1, 0.05),
+    "ContactManager.order_by_name": (1, 0.05),
+    "ContactManager.with_email": (1, 0.05),
+    "ContactManager.with_phone_number": (1, 0.05),
+    "CustomFieldManager.search_by_field_name": (1, 0.05),
+    "CustomFieldManager.order_by_field_name": (1, 0.05),
+    "ContactLabelManager.search_by_contact": (1, 0.05),
+    "ContactLabelManager.search_by_label": (1, 0.05),
+    # Served from the label catalog once warm.
+    "LabelManager.catalog": (0, 0.005),
+    # Matches come from the in-memory directory; one query fetches them.
+    "ContactManager.typeahead": (1, 0.01),
+    "SupportRequestBaseParentAdmin.changelist": (4, 0.5),
+    "SupportRequestBaseParentAdmin.changeform": (6, 0.5),
+    "SupportRequestWithPhoneAdmin.changelist": (3, 0.5),
+    "SupportRequestWithPhoneAdmin.changeform": (6, 0.5),
+    "SupportRequestWithLocationAdmin.changelist": (3, 0.5),
+    "SupportRequestWithLocationAdmin.changeform": (6, 0.5),
+    "FullSupportRequestAdmin.changelist": (3, 0.5),
+    "FullSupportRequestAdmin.changeform": (5, 0.5),
+    "SupportRequestDailyRollupAdmin.dashboard": (5, 0.5),
+    "ContactAdmin.changelist": (3, 0.5),
+    "ContactAdmin.changeform": (5, 0.5),
+    "LabelAdmin.changelist": (2, 0.5),
+    "LabelAdmin.changeform": (3, 0.5),
+    "CustomFieldAdmin.changelist": (2, 0.5),
+    "CustomFieldAdmin.changeform": (4, 0.5),
+    "ContactLabelAdmin.changelist": (3, 0.5),
+    "ContactLabelAdmin.changeform": (7, 0.5),
+    # Includes the rollup row increment and the work queue item INSERT.
+    "SupportRequestViewMixin.post": (9, 0.25),
+    # The sync sequence UPDATE, the row UPDATE and the change history INSERT,
+    # in one transaction; unchanged saves write nothing else.
+    "Contact.save": (5, 0.05),
+    "Contact.save[unchanged]": (1, 0.05),
+    # One batch of contacts, whatever its size: the pk batch queries, then in
+    # one transaction the link reads, the sync sequence, the INSERT or DELETE,
+    # the label count UPDATE and the change history (and tombstone) INSERTs.
+    "ContactLabelManager.bulk_assign": (10, 0.05),
+    "ContactLabelManager.bulk_unassign": (10, 0.05),
+    "ContactManager.by_phone": (1, 0.05),
+    "ContactManager.by_phone_suffix": (1, 0.05),
+    # Served from the phone LRU once warm.
+    "ContactManager.get_by_phone": (0, 0.005),
+    # The base rows, then one query per polymorphic child model.
+    "SupportRequestManager.by_phone": (4, 0.05),
+    "SupportRequestManager.by_phone_suffix": (4, 0.05),
+    "ContactManager.by_email": (1, 0.05),
+    "SupportRequestManager.by_email": (4, 0.05),
+    "ContactManager.upcoming_birthdays": (1, 0.05),
+    "ContactManager.upcoming_anniversaries": (1, 0.05),
+    # The sync sequence, then one range scan per synced model (and the
+    # tombstones after a token), merged in Python.
+    "ContactManager.changes_since": (4, 0.05),
+    "ContactManager.changes_since[token]": (5, 0.05),
+    # The base rows, then the two location child models.
+    "SupportRequestManager.in_network": (3, 0.05),
+    # One grouped query for IPv4 and one for IPv6 subnets.
+    "SupportRequestManager.subnet_counts": (2, 0.05),
+    # Lock the candidates, mark them claimed and read them back with their
+    # support requests, in one transaction, however many items are claimed.
+    "SupportQueueItemManager.claim": (5, 0.05),
+    "SupportQueueItemManager.stats": (1, 0.05),
+}
+
+
+def guard(func: Callable[["GuardRunner"], None]) -> Callable:
+    """Register a guard; it receives the :class:`GuardRunner`."""
+    GUARDS.append(func)
+    return func
+
+
+class BudgetExceeded(AssertionError):
+    """Raised when one or more guards exceed their budget."""
+
+
+class GuardRunner:
+    """
+    Run the registered guards and collect their measurements.
+
+    :param using: The database alias to measure.
+    :param budgets: Overrides for :data:`DEFAULT_BUDGETS`.
+    :param latency_factor: Multiplier applied to every latency budget.
+    """
+
+    def __init__(
+        self,
+        using: str = "default",
+        budgets: Optional[Dict[str, tuple]] = None,
+        latency_factor: float = 1.0,
+    ) -> None:
+        self.using = using
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.latency_factor = latency_factor
+        self.results: List[Dict[str, Any]] = []
+
+    def check(self, name: str, func: Callable[[], Any]) -> Dict[str, Any]:
+        """Measure ``func`` once (after a warm-up call) against ``name``'s budget."""
+        max_queries, max_seconds = self.budgets[name]
+        max_seconds *= self.latency_factor
+        func()
+        # Every connection is captured, so reads routed to a replica count too.
+        with ExitStack() as stack:
+            captures = [
+                stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in connections
+            ]
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        queries = [query for capture in captures for query in capture.captured_queries]
+        result = {
+            "name": name,
+            "queries": len(queries),
+            "max_queries": max_queries,
+            "seconds": elapsed,
+            "max_seconds": max_seconds,
+            "passed": len(queries) <= max_queries and elapsed <= max_seconds,
+            "sql": [query["sql"] for query in queries],
+        }
+        self.results.append(result)
+        return result
+
+    def run(self) -> List[Dict[str, Any]]:
+        with override_settings(**OPT_IN_SETTINGS):
+            create_fixtures(self.using)
+            for func in GUARDS:
+                func(self)
+        missing = set(self.budgets) - {result["name"] for result in self.results}
+        if missing:
+            raise BudgetExceeded(
+                f"Budgets without a guard: {', '.join(sorted(missing))}"
+            )
+        return self.results
+
+    def assert_within_budget(self) -> None:
+        """Raise :class:`BudgetExceeded` listing every failed guard."""
+        failures = [result for result in self.results if not result["passed"]]
+        if failures:
+            raise BudgetExceeded(
+                "\n".join(
+                    f"{result['name']}: {result['queries']} queries "
+                    f"(budget {result['max_queries']}), {result['seconds']:.3f}s "
+                    f"(budget {result['max_seconds']:.3f}s)"
+                    for result in failures
+                )
+            )
+
+
+def create_fixtures(using: str) -> None:
+    contacts = list(iter_contacts(0, FIXTURE_SIZE))
+    for index, contact in enumerate(contacts):
+        if contact.phone_number:
+            # Valid numbers, so that they get an E.164 key.
+            contact.phone_number = support_request_data(index)["phone_number"]
+        # Spread over the year, so a one-year window holds every contact.
+        contact.birthday = date(1980, 1, 1) + timedelta(days=index * 18)
+        contact.anniversary = date(2010, 1, 1) + timedelta(days=index * 18)
+    contacts = Contact.objects.db_manager(using).bulk_create(contacts)
+    labels = Label.objects.db_manager(using).bulk_create(
+        Label(name=f"Guard label {index}") for index in range(FIXTURE_SIZE)
+    )
+    ContactLabel.objects.db_manager(using).bulk_create(
+        ContactLabel(contact=contacts[0], label=label) for label in labels
+    )
+    ContactLabel.objects.db_manager(using).bulk_create(
+        ContactLabel(contact=contact, label=labels[0]) for contact in contacts[1:]
+    )
+    CustomField.objects.db_manager(using).bulk_create(
+        CustomField(contact=contact, field_name="Guard field", field_value="value")
+        for contact in contacts
+    )
+
+    user_model = get_user_model()
+    users = [
+        user_model._default_manager.db_manager(using).create(
+            **{user_model.USERNAME_FIELD: f"sage_contact_guard_{index}"}
+        )
+        for index in range(FIXTURE_SIZE)
+    ]
+    with override_settings(SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM=False):
+        for index in range(FIXTURE_SIZE):
+            data = support_request_data(index)
+            base = {
+                key: data[key] for key in ("subject", "full_name", "email", "message")
+            }
+            SupportRequestBase.objects.db_manager(using).create(**base)
+            SupportRequestWithPhone.objects.db_manager(using).create(
+                phone_number=data["phone_number"], **base
+            )
+            SupportRequestWithLocation.objects.db_manager(using).create(
+                phone_number=data["phone_number"],
+                country=data["country"],
+                ip_address="203.0.113.1",
+                **base,
+            )
+            FullSupportRequest.objects.db_manager(using).create(
+                phone_number=data["phone_number"],
+                country=data["country"],
+                ip_address="203.0.113.1",
+                user=users[index],
+                contact_reason=data["contact_reason"],
+                preferred_contact_method=data["preferred_contact_method"],
+                **base,
+            )
+
+
+@guard
+def manager_methods(runner: GuardRunner) -> None:
+    using = runner.using
+    label = Label.objects.db_manager(using).order_by("pk").first()
+    contact = Contact.objects.db_manager(using).order_by("pk").first()
+    calls = {
+        "LabelManager.search_by_name": lambda m: m.search_by_name("guard"),
+        "LabelManager.order_by_name": lambda m: m.order_by_name(),
+        "ContactManager.search_by_name": lambda m: m.search_by_name("a"),
+        "ContactManager.order_by_name": lambda m: m.order_by_name(),
+        "ContactManager.with_email": lambda m: m.with_email(),
+        "ContactManager.with_phone_number": lambda m: m.with_phone_number(),
+        "CustomFieldManager.search_by_field_name": lambda m: m.search_by_field_name(
+            "guard"
+        ),
+        "CustomFieldManager.order_by_field_name": lambda m: m.order_by_field_name(),
+        "ContactLabelManager.search_by_contact": lambda m: m.search_by_contact(
+            contact.pk
+        ),
+        "ContactLabelManager.search_by_label": lambda m: m.search_by_label(label.pk),
+    }
+    managers = {
+        "LabelManager": Label.objects,
+        "ContactManager": Contact.objects,
+        "CustomFieldManager": CustomField.objects,
+        "ContactLabelManager": ContactLabel.objects,
+    }
+    calls["LabelManager.catalog"] = lambda m: m.catalog()
+    calls["ContactManager.typeahead"] = lambda m: m.typeahead("a")
+    for name, call in calls.items():
+        manager = managers[name.split(".")[0]].db_manager(using)
+        # Rendering every row with str() exposes lazy relation lookups.
+        runner.check(
+            name, lambda call=call, manager=manager: [str(obj) for obj in call(manager)]
+        )
+
+
+def _admin_request(factory: RequestFactory, user: Any, path: str = "/") -> Any:
+    request = factory.get(path)
+    request.user = user
+    request.session = SessionStore()
+    request._messages = FallbackStorage(request)
+    return request
+
+
+@guard
+def admin_views(runner: GuardRunner) -> None:
+    user_model = get_user_model()
+    user, _ = user_model._default_manager.db_manager(runner.using).get_or_create(
+        **{user_model.USERNAME_FIELD: "sage_contact_guard_admin"},
+        defaults={"is_staff": True, "is_superuser": True},
+    )
+    factory = RequestFactory()
+    with override_settings(ROOT_URLCONF="sage_contact.benchmarks.urls"):
+        for model, model_admin in admin.site._registry.items():
+            if not issubclass(model, SupportRequestBase):
+                continue
+            name = model_admin.__class__.__name__
+            obj = model.objects.db_manager(runner.using).order_by("-pk").first()
+            runner.check(
+                f"{name}.changelist",
+                lambda model_admin=model_admin: model_admin.changelist_view(
+                    _admin_request(factory, user)
+                ).render(),
+            )
+            runner.check(
+                f"{name}.changeform",
+                lambda model_admin=model_admin, obj=obj: model_admin.changeform_view(
+                    _admin_request(factory, user), object_id=str(obj.pk)
+                ).render(),
+            )
+        # The first contact carries every fixture label and custom field.
+        for model in (Contact, Label, CustomField, ContactLabel):
+            model_admin = admin.site._registry[model]
+            name = model_admin.__class__.__name__
+            obj = model.objects.db_manager(runner.using).order_by("pk").first()
+            runner.check(
+                f"{name}.changelist",
+                lambda model_admin=model_admin: model_admin.changelist_view(
+                    _admin_request(factory, user)
+                ).render(),
+            )
+            runner.check(
+                f"{name}.changeform",
+                lambda model_admin=model_admin, obj=obj: model_admin.changeform_view(
+                    _admin_request(factory, user), object_id=str(obj.pk)
+                ).render(),
+            )
+        model_admin = admin.site._registry[SupportRequestDailyRollup]
+        runner.check(
+            "SupportRequestDailyRollupAdmin.dashboard",
+            lambda: model_admin.changelist_view(
+                _admin_request(factory, user, "/?days=365")
+            ).render(),
+        )
+
+
+@guard
+def support_view_post(runner: GuardRunner) -> None:
+    from .views import BenchmarkSupportView
+
+    factory = RequestFactory()
+    view = BenchmarkSupportView.as_view()
+    data = support_request_data(FIXTURE_SIZE + 1)
+
+    def post():
+        request = factory.post("/", data)
+        request.user = AnonymousUser()
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        response = view(request)
+        if response.status_code != 302:
+            raise BudgetExceeded("SupportRequestViewMixin.post did not redirect.")
+
+    with override_settings(
+        ROOT_URLCONF="sage_contact.benchmarks.urls",
+        SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM=False,
+        SAGE_CONTACT_SPAM_FILTER=True,
+    ):
+        runner.check("SupportRequestViewMixin.post", post)
+
+
+@guard
+def contact_save(runner: GuardRunner) -> None:
+    contact = Contact.objects.db_manager(runner.using).order_by("pk").last()
+    sequence = itertools.count()
+
+    def save_changed():
+        contact.job_title = f"Guard title {next(sequence)}"
+        contact.save()
+
+    runner.check("Contact.save", save_changed)
+    runner.check("Contact.save[unchanged]", contact.save)
+
+
+@guard
+def label_bulk_actions(runner: GuardRunner) -> None:
+    using = runner.using
+    contacts = Contact.objects.db_manager(using).all()
+    manager = ContactLabel.objects.db_manager(using)
+    # Every call moves a fresh label onto, then off, the whole selection.
+    label_ids = list(
+        Label.objects.db_manager(using).order_by("pk").values_list("pk", flat=True)
+    )[1:]
+    assigned = iter(label_ids)
+    unassigned = iter(label_ids)
+    runner.check(
+        "ContactLabelManager.bulk_assign",
+        lambda: manager.bulk_assign(contacts, [next(assigned)]),
+    )
+    runner.check(
+        "ContactLabelManager.bulk_unassign",
+        lambda: manager.bulk_unassign(contacts, [next(unassigned)]),
+    )
+
+
+@guard
+def phone_lookups(runner: GuardRunner) -> None:
+    using = runner.using
+    contacts = Contact.objects.db_manager(using)
+    number = str(contacts.with_phone_number().order_by("pk").first().phone_number)
+    support_number = support_request_data(0)["phone_number"]
+    support_requests = SupportRequestBase.objects.db_manager(using)
+    calls = {
+        "ContactManager.by_phone": lambda: contacts.by_phone(number),
+        "ContactManager.by_phone_suffix": lambda: contacts.by_phone_suffix(number[-7:]),
+        "SupportRequestManager.by_phone": lambda: support_requests.by_phone(
+            support_number
+        ),
+        "SupportRequestManager.by_phone_suffix": lambda: (
+            support_requests.by_phone_suffix(support_number[-7:])
+        ),
+    }
+    for name, call in calls.items():
+        runner.check(name, lambda call=call: [str(obj) for obj in call()])
+    runner.check("ContactManager.get_by_phone", lambda: contacts.get_by_phone(number))
+
+
+@guard
+def email_lookups(runner: GuardRunner) -> None:
+    using = runner.using
+    contacts = Contact.objects.db_manager(using)
+    # Typed in another case, as a visitor would.
+    email = contacts.with_email().order_by("pk").first().email.upper()
+    support_email = support_request_data(0)["email"].upper()
+    support_requests = SupportRequestBase.objects.db_manager(using)
+    runner.check(
+        "ContactManager.by_email",
+        lambda: [str(obj) for obj in contacts.by_email(email)],
+    )
+    runner.check(
+        "SupportRequestManager.by_email",
+        lambda: [str(obj) for obj in support_requests.by_email(support_email)],
+    )
+
+
+@guard
+def upcoming_dates(runner: GuardRunner) -> None:
+    contacts = Contact.objects.db_manager(runner.using)
+    runner.check(
+        "ContactManager.upcoming_birthdays",
+        lambda: [str(obj) for obj in contacts.upcoming_birthdays(days=365)],
+    )
+    runner.check(
+        "ContactManager.upcoming_anniversaries",
+        lambda: [str(obj) for obj in contacts.upcoming_anniversaries(days=365)],
+    )
+
+
+@guard
+def contact_sync(runner: GuardRunner) -> None:
+    contacts = Contact.objects.db_manager(runner.using)
+    # A token from the middle of the history, so the page has rows and
+    # tombstones to read.
+    token = contacts.changes_since(limit=FIXTURE_SIZE).token
+    runner.check("ContactManager.changes_since", contacts.changes_since)
+    runner.check(
+        "ContactManager.changes_since[token]",
+        lambda: contacts.changes_since(token),
+    )
+
+
+@guard
+def network_queries(runner: GuardRunner) -> None:
+    support_requests = SupportRequestBase.objects.db_manager(runner.using)
+    runner.check(
+        "SupportRequestManager.in_network",
+        lambda: [str(obj) for obj in support_requests.in_network("203.0.113.0/24")],
+    )
+    runner.check("SupportRequestManager.subnet_counts", support_requests.subnet_counts)
+
+
+@guard
+def work_queue(runner: GuardRunner) -> None:
+    # The fixture requests were queued when they were saved.
+    items = SupportQueueItem.objects.db_manager(runner.using)
+    runner.check(
+        "SupportQueueItemManager.claim",
+        lambda: [str(item.support_request) for item in items.claim("guard", limit=5)],
+    )
+    runner.check("SupportQueueItemManager.stats", items.stats)
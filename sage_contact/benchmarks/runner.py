@@ -0,0 +1,175 @@
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import django
+from django.db import connections
+
+from sage_contact.utils.version import package_version
+
+BENCHMARK_CASES: Dict[str, List[Callable[["BenchmarkRunner"], None]]] = {}
+
+
+def case(group: str) -> Callable:
+    """
+    Register a benchmark case under ``group``.
+
+    A case is a callable receiving the :class:`BenchmarkRunner`; it prepares its
+    data and calls :meth:`BenchmarkRunner.measure` once per measurement.
+    """
+
+    def decorator(func: Callable[["BenchmarkRunner"], None]) -> Callable:
+        BENCHMARK_CASES.setdefault(group, []).append(func)
+        return func
+
+    return decorator
+
+
+class BenchmarkRunner:
+    """
+    Run registered benchmark cases and collect their results.
+
+    Every measurement calls ``func`` ``number`` times per round and keeps the
+    per-operation time of each of the ``repeat`` rounds, so the reported
+    median is robust against a single noisy round.
+    """
+
+    def __init__(
+        self,
+        using: str = "default",
+        row_counts: Optional[List[int]] = None,
+        repeat: int = 5,
+        groups: Optional[List[str]] = None,
+        stdout: Any = None,
+    ) -> None:
+        self.using = using
+        self.row_counts = sorted(row_counts or [10_000])
+        self.repeat = repeat
+        self.groups = groups or list(BENCHMARK_CASES)
+        self.stdout = stdout
+        self.results: List[Dict[str, Any]] = []
+
+    def log(self, message: str) -> None:
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def measure(
+        self,
+        group: str,
+        name: str,
+        func: Callable[[], Any],
+        number: int = 100,
+        setup: Optional[Callable[[], Any]] = None,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """
+        Time ``func`` and record the result.
+
+        :param group: The benchmark group, e.g. ``"forms"``.
+        :param name: The measurement name within the group.
+        :param func: The operation to time; called ``number`` times per round.
+        :param number: Operations per round.
+        :param setup: Optional callable run before each round, not timed.
+        :param params: Extra parameters stored with the result (e.g. ``rows``).
+        :return: The recorded result.
+        """
+        func()  # warm up caches, lazy imports and connection state
+        rounds = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            rounds.append((time.perf_counter() - start) / number)
+        median = statistics.median(rounds)
+        result = {
+            "group": group,
+            "name": name,
+            "params": params,
+            "number": number,
+            "repeat": self.repeat,
+            "median_s": median,
+            "min_s": min(rounds),
+            "max_s": max(rounds),
+            "ops_per_sec": 1 / median if median else None,
+        }
+        self.results.append(result)
+        self.log(
+            f"{group:<10} {name:<48} {median * 1000:>10.3f} ms/op "
+            f"{result['ops_per_sec'] or 0:>12.1f} op/s {params or ''}"
+        )
+        return result
+
+    def skip(self, group: str, name: str, reason: str, **params: Any) -> None:
+        """Record a measurement that cannot run in this environment."""
+        self.results.append(
+            {"group": group, "name": name, "params": params, "skipped": reason}
+        )
+        self.log(f"{group:<10} {name:<48} skipped: {reason}")
+
+    def run(self) -> Dict[str, Any]:
+        """Run the selected groups and return the JSON-serializable report."""
+        for group in self.groups:
+            for func in BENCHMARK_CASES.get(group, ()):
+                func(self)
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        connection = connections[self.using]
+        return {
+            "meta": {
+                "package_version": package_version(),
+                "django_version": django.get_version(),
+                "python_version": platform.python_version(),
+                "platform": platform.platform(),
+                "database_vendor": connection.vendor,
+                "database_version": ".".join(
+                    str(part) for part in connection.get_database_version()
+                ),
+                "row_counts": self.row_counts,
+                "repeat": self.repeat,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            },
+            "results": self.results,
+        }
+
+
+def compare_reports(
+    baseline: Dict[str, Any], current: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Pair the measurements of two reports and compute the median ratio.
+
+    A ratio above 1 means ``current`` is slower than ``baseline``.
+    """
+
+    def key(result: Dict[str, Any]) -> str:
+        return json.dumps(
+            [result["group"], result["name"], result["params"]], sort_keys=True
+        )
+
+    previous = {
+        key(result): result
+        for result in baseline.get("results", ())
+        if "median_s" in result
+    }
+    rows = []
+    for result in current.get("results", ()):
+        before = previous.get(key(result))
+        if before is None or "median_s" not in result:
+            continue
+        rows.append(
+            {
+                "group": result["group"],
+                "name": result["name"],
+                "params": result["params"],
+                "baseline_s": before["median_s"],
+                "current_s": result["median_s"],
+                "ratio": result["median_s"] / before["median_s"],
+            }
+        )
+    return rows
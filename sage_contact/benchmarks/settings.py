@@ -0,0 +1,101 @@
+"""
+Standalone Django settings for running the benchmark suite.
+
+SQLite is used by default. Set ``SAGE_CONTACT_BENCH_DB=postgres`` and the
+usual ``PGHOST``/``PGPORT``/``PGUSER``/``PGPASSWORD``/``PGDATABASE``
+variables to run against a local PostgreSQL server (add
+``SAGE_CONTACT_BENCH_REPLICA=1`` to route reads through a second connection)::
+
+    DJANGO_SETTINGS_MODULE=sage_contact.benchmarks.settings \\
+        django-admin sage_contact_benchmark --output results.json
+"""
+
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SECRET_KEY = "sage-contact-benchmark"  # nosec - local benchmarks only
+DEBUG = False
+ALLOWED_HOSTS = ["*"]
+USE_TZ = True
+SITE_ID = 1
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.sites",
+    "polymorphic",
+    "phonenumber_field",
+    "django_countries",
+    "sage_contact",
+]
+
+MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+]
+
+ROOT_URLCONF = "sage_contact.benchmarks.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [os.path.join(BASE_DIR, "templates")],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ]
+        },
+    }
+]
+
+if os.environ.get("SAGE_CONTACT_BENCH_DB") == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("PGDATABASE", "sage_contact_bench"),
+            "USER": os.environ.get("PGUSER", "postgres"),
+            "PASSWORD": os.environ.get("PGPASSWORD", ""),
+            "HOST": os.environ.get("PGHOST", "localhost"),
+            "PORT": os.environ.get("PGPORT", "5432"),
+        }
+    }
+    INSTALLED_APPS.insert(0, "django.contrib.postgres")
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get(
+                "SAGE_CONTACT_BENCH_SQLITE", os.path.join(BASE_DIR, "bench.sqlite3")
+            ),
+        }
+    }
+
+# ``SAGE_CONTACT_BENCH_REPLICA=1`` adds a second SQLite connection to the same
+# file as a stand-in read replica, so replica-routed paths run through the
+# router; queries on both connections count against the guard budgets.
+if os.environ.get("SAGE_CONTACT_BENCH_REPLICA"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_ROUTERS = ["sage_contact.routers.ReplicaRouter"]
+    SAGE_CONTACT_READ_DATABASE = "replica"
+
+# The app ships without migrations; tables are created with run_syncdb.
+MIGRATION_MODULES = {"sage_contact": None}
+
+SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM = False
+SAGE_CONTACT_GEOIP_PATH = os.environ.get("SAGE_CONTACT_GEOIP_PATH") or None
+GEOIP_PATH = SAGE_CONTACT_GEOIP_PATH
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+SILENCED_SYSTEM_CHECKS = ["fields.W163", "models.W046"]
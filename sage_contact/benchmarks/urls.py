@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.urls import include, path
+from django.views.generic import TemplateView
+
+from .views import BenchmarkSupportView
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("api/", include("sage_contact.api.urls")),
+    path(
+        "support/",
+        BenchmarkSupportView.as_view(),
+        name="sage_contact_benchmark_support",
+    ),
+    path(
+        "support/done/",
+        TemplateView.as_view(template_name="support.html"),
+        name="sage_contact_benchmark_support_done",
+    ),
+]
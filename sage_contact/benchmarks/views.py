@@ -0,0 +1,10 @@
+from django.views.generic import TemplateView
+
+from sage_contact.forms import FullSupportRequestForm
+from sage_contact.views import SupportRequestViewMixin
+
+
+class BenchmarkSupportView(SupportRequestViewMixin, TemplateView):
+    support_form_class = FullSupportRequestForm
+    support_success_url_name = "sage_contact_benchmark_support_done"
+    template_name = "support.html"
@@ -32,3 +32,14 @@ class Prefix(models.TextChoices):
     MRS = ("Mrs", _("Mrs"))
     MS = ("Ms", _("Ms"))
     DR = ("Dr", _("Dr"))
+
+
+# Work queue part
+class QueueStates(models.TextChoices):
+    """
+    Work Queue States
+    """
+
+    OPEN = ("open", _("Open"))
+    CLAIMED = ("claimed", _("Claimed"))
+    DONE = ("done", _("Done"))
@@ -1,8 +1,12 @@
 # constants.py
 
 SAGE_CONTACT_GEOIP_PATH = None
+SAGE_CONTACT_GEOIP_DEFERRED = False
+SAGE_CONTACT_GEOIP_BATCH_SIZE = 1000
 
 # Email
+SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM = True
+SAGE_CONTACT_SUPPORT_EMAIL_TEMPLATE_PATH = None
 EMAIL_CONFIRMATION_SUBJECT = "We have received your contact request"
 EMAIL_EXTRA_HEADERS_MIME_VERSION = "1.0"
 EMAIL_EXTRA_HEADERS_CONTENT_TYPE = "text/html; charset=UTF-8"
@@ -10,3 +14,83 @@ EMAIL_EXTRA_HEADERS_CONTENT_TRANSFER_ENCODING = "quoted-printable"
 EMAIL_EXTRA_HEADERS_X_PRIORITY = "3"
 EMAIL_EXTRA_HEADERS_X_AUTO_RESPONSE_SUPPRESS = "All"
 EMAIL_EXTRA_HEADERS_X_SPAMD_RESULT = "default: False [-0.90 / 15.00]"
+SAGE_CONTACT_EMAIL_ASYNC = False
+SAGE_CONTACT_EMAIL_POOL_SIZE = 4
+SAGE_CONTACT_EMAIL_POOL_IDLE_TIMEOUT = 30
+
+# Instrumentation
+SAGE_CONTACT_TIMING_HOOKS = ()
+SAGE_CONTACT_TIMING_HISTOGRAM = False
+SAGE_CONTACT_TIMING_FLUSH_INTERVAL = 10
+SAGE_CONTACT_TIMING_CACHE = "default"
+
+# Forms
+SAGE_CONTACT_FORM_RENDER_CACHE = False
+SAGE_CONTACT_FORM_CACHE_ALIAS = None
+SAGE_CONTACT_FORM_CACHE_TIMEOUT = 60 * 60 * 24
+SAGE_CONTACT_FORM_CACHE_VERSION = None
+
+# Retention
+SAGE_CONTACT_ARCHIVE_BATCH_SIZE = 1000
+
+# Bulk operations
+SAGE_CONTACT_BULK_BATCH_SIZE = 1000
+
+# Phone lookups
+SAGE_CONTACT_PHONE_CACHE_SIZE = 1024
+SAGE_CONTACT_PHONE_CACHE_TIMEOUT = 60
+
+# Email lookups
+SAGE_CONTACT_EMAIL_CANONICALIZE = False
+
+# Change history
+SAGE_CONTACT_CHANGE_HISTORY = True
+
+# Database routing
+SAGE_CONTACT_READ_DATABASE = None
+SAGE_CONTACT_PRIMARY_DATABASE = "default"
+SAGE_CONTACT_READ_YOUR_WRITES_SECONDS = 5
+SAGE_CONTACT_CONTACTED_BEFORE_ON_REPLICA = False
+
+# Label catalog
+SAGE_CONTACT_LABEL_CACHE_ALIAS = "default"
+SAGE_CONTACT_LABEL_CACHE_TIMEOUT = 60 * 60
+SAGE_CONTACT_LABEL_LOCAL_TIMEOUT = 5
+
+# Contact directory
+SAGE_CONTACT_DIRECTORY_MERGE_THRESHOLD = 50_000
+
+# Incremental sync, opt-in: every synced write locks one sequence row
+SAGE_CONTACT_SYNC = False
+SAGE_CONTACT_SYNC_PAGE_SIZE = 1000
+
+# Tenancy
+SAGE_CONTACT_TENANT_RESOLVER = None
+
+# Spam filter, opt-in: set SAGE_CONTACT_SPAM_FILTER = True to score submissions
+SAGE_CONTACT_SPAM_FILTER = False
+SAGE_CONTACT_SPAM_HONEYPOT_FIELD = "homepage"
+SAGE_CONTACT_SPAM_TIMING_FIELD = "sage_contact_ts"
+SAGE_CONTACT_SPAM_TIMING_REQUIRED = False
+SAGE_CONTACT_SPAM_MIN_SUBMIT_SECONDS = 3
+SAGE_CONTACT_SPAM_MAX_TOKEN_AGE = 60 * 60 * 24
+SAGE_CONTACT_SPAM_MAX_LINKS = 2
+SAGE_CONTACT_SPAM_BLOCKED_DOMAINS = ()
+SAGE_CONTACT_SPAM_MODEL_PATH = None
+SAGE_CONTACT_SPAM_QUARANTINE_SCORE = 5
+SAGE_CONTACT_SPAM_DROP_SCORE = 10
+
+# Abuse control
+SAGE_CONTACT_RATE_LIMIT = None
+
+# Work queues, opt-in: set SAGE_CONTACT_QUEUE = True to queue new requests
+SAGE_CONTACT_QUEUE = False
+SAGE_CONTACT_QUEUE_DEFAULT = "general"
+SAGE_CONTACT_QUEUE_ROUTES = {
+    "support": {"priority": 30, "sla": 60 * 60 * 4},
+    "sales": {"priority": 20, "sla": 60 * 60 * 8},
+    "general": {"priority": 20, "sla": 60 * 60 * 24},
+    "feedback": {"priority": 10, "sla": 60 * 60 * 72},
+}
+SAGE_CONTACT_QUEUE_ROUTER = None
+SAGE_CONTACT_QUEUE_CLAIM_TIMEOUT = 60 * 30
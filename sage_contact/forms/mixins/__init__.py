@@ -1 +1,8 @@
 from .geo_ip import GeoLocationMixin
+from .instrumentation import StageTimingMixin
+from .performance import (
+    SharedChoicesFields,
+    SharedChoicesMixin,
+    UnboundRenderCacheMixin,
+)
+from .spam import SpamFilterMixin
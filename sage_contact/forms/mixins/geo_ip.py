@@ -1,7 +1,10 @@
 import logging
 
-from django.conf import settings
-from django.contrib.gis.geoip2 import GeoIP2
+from django.utils import timezone
+
+from sage_contact.utils.geoip import (geoip_configured, geoip_deferred,
+                                      lookup_country)
+from sage_contact.utils.timing import stage
 
 logger = logging.getLogger(__name__)
 
@@ -13,18 +16,22 @@ class GeoLocationMixin:
             instance.ip_address = ip_address
 
     def set_country_from_ip(self, instance):
-        geoip_path = getattr(settings, 'SAGE_CONTACT_GEOIP_PATH', None)
-        if geoip_path is None:
+        if not geoip_configured():
             logger.info('SAGE_CONTACT_GEOIP_PATH is not set. Skipping country setting.')
             return
+        if geoip_deferred():
+            # Left pending for sage_contact.utils.geoip.enrich_locations().
+            return
 
         ip_address = instance.ip_address
         if ip_address:
             try:
-                g = GeoIP2()
-                country = g.country(ip_address)["country_code"]
+                with stage("geoip.lookup"):
+                    country = lookup_country(ip_address)
                 instance.country = country
+                instance.geoip_checked_at = timezone.now()
             except Exception as e:
+                # The row stays pending, so the deferred job retries it.
                 logger.warning(
                     f"Failed to get country information from GeoIP2 service: {e}"
                 )
@@ -0,0 +1,23 @@
+from sage_contact.utils.timing import stage
+
+
+class StageTimingMixin:
+    """
+    Time the validation phases of a form through ``sage_contact.utils.timing``.
+
+    ``form.clean_fields`` covers field parsing (e.g. phone numbers),
+    ``form.clean`` the form-wide clean and ``form.post_clean`` the model
+    validators (e.g. the ``full_name`` regex) run on the instance.
+    """
+
+    def _clean_fields(self):
+        with stage("form.clean_fields", form=self.__class__.__name__):
+            return super()._clean_fields()
+
+    def _clean_form(self):
+        with stage("form.clean", form=self.__class__.__name__):
+            return super()._clean_form()
+
+    def _post_clean(self):
+        with stage("form.post_clean", form=self.__class__.__name__):
+            return super()._post_clean()
@@ -0,0 +1,169 @@
+import copy
+import hashlib
+
+import django
+from django.core.cache import caches
+from django.utils import translation
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from sage_contact.settings.app import app_settings
+from sage_contact.utils.version import package_version
+
+
+class SharedChoicesFields(dict):
+    """
+    ``base_fields`` mapping whose deep copies share the fields' choices.
+
+    Every form instance deep-copies ``base_fields``. Choices are never mutated
+    after the form class is built, so the copies reuse them instead of copying
+    every option (the country list alone has ~250 entries). Widgets, attrs,
+    validators and error messages are still copied per instance.
+    """
+
+    def __init__(self, fields):
+        super().__init__(fields)
+        self.shared_memo = {}
+        for field in fields.values():
+            choices = getattr(field, "_choices", None)
+            if choices is not None:
+                self.shared_memo[id(choices)] = choices
+
+    def __deepcopy__(self, memo):
+        memo.update(self.shared_memo)
+        return {name: copy.deepcopy(field, memo) for name, field in self.items()}
+
+
+class SharedChoicesMixin:
+    """
+    Build the per-instance fields from a precomputed :class:`SharedChoicesFields`.
+
+    The wrapper is computed once per form class, on its first instantiation.
+    """
+
+    def __init__(self, *args, **kwargs):
+        cls = type(self)
+        if not isinstance(cls.__dict__.get("base_fields"), SharedChoicesFields):
+            cls.base_fields = SharedChoicesFields(cls.base_fields)
+        super().__init__(*args, **kwargs)
+
+
+class UnboundRenderCacheMixin:
+    """
+    Serve the HTML of unbound, pristine forms from a cache.
+
+    Enabled globally with ``SAGE_CONTACT_FORM_RENDER_CACHE = True`` or per
+    instance by setting ``use_render_cache`` (``SupportRequestViewMixin`` does
+    so for anonymous visitors). The HTML is keyed by form class, active
+    language and the options that affect the markup, so it is only reused for
+    forms built without data, initial values or an existing instance. Forms
+    whose fields are altered per request must not enable it.
+
+    Rendered fragments are kept in a per-process dict and, when
+    ``SAGE_CONTACT_FORM_CACHE_ALIAS`` names a cache, shared across processes.
+    Shared entries are versioned with ``SAGE_CONTACT_FORM_CACHE_VERSION``
+    (e.g. the release or commit being deployed) or, when unset, a digest of
+    the package version and the form definition, so a deploy that changes
+    the markup never serves stale fragments. The fragment never contains the
+    CSRF token; the ``{% support_form %}`` template tag adds it per request.
+    """
+
+    _unbound_render_cache = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.use_render_cache = app_settings.form_render_cache
+        self._render_cacheable = (
+            len(args) <= 2
+            and not self.is_bound
+            and not kwargs.get("initial")
+            and kwargs.get("instance") is None
+        )
+
+    @classmethod
+    def get_render_cache_version(cls):
+        """Return the version of the shared cache entries of this form class."""
+        configured = app_settings.form_cache_version
+        if configured:
+            return str(configured)
+        version = cls.__dict__.get("_render_cache_version")
+        if version is None:
+            digest = hashlib.sha256()
+            digest.update(f"{package_version()}:{django.get_version()}".encode())
+            # Lazy translations are resolved to their untranslated source so
+            # the digest is identical in every process.
+            with translation.override(None):
+                for name, field in cls.base_fields.items():
+                    digest.update(
+                        repr(
+                            (
+                                name,
+                                type(field).__qualname__,
+                                type(field.widget).__qualname__,
+                                sorted(
+                                    (key, str(value))
+                                    for key, value in field.widget.attrs.items()
+                                ),
+                                str(field.label),
+                                str(field.help_text),
+                                field.required,
+                            )
+                        ).encode()
+                    )
+            digest.update(str(cls.template_name).encode())
+            version = digest.hexdigest()[:12]
+            cls._render_cache_version = version
+        return version
+
+    def get_unbound_render_key(self):
+        """Return the key identifying the markup of this unbound form."""
+        return (
+            self.__class__.__module__,
+            self.__class__.__qualname__,
+            get_language(),
+            self.prefix,
+            self.auto_id,
+            self.label_suffix,
+            self.use_required_attribute,
+            self.template_name,
+            self.renderer.__class__.__qualname__,
+        )
+
+    def render(self, template_name=None, context=None, renderer=None):
+        if (
+            template_name is not None
+            or context is not None
+            or renderer is not None
+            or not self._render_cacheable
+            or not self.use_render_cache
+        ):
+            return super().render(template_name, context, renderer)
+        key = self.get_unbound_render_key()
+        html = self._unbound_render_cache.get(key)
+        if html is not None:
+            return html
+
+        alias = app_settings.form_cache_alias
+        if alias:
+            cache = caches[alias]
+            version = self.get_render_cache_version()
+            cache_key = (
+                "sage_contact:form:" + hashlib.sha256(repr(key).encode()).hexdigest()
+            )
+            html = cache.get(cache_key, version=version)
+            if html is None:
+                html = str(super().render())
+                cache.set(
+                    cache_key,
+                    html,
+                    app_settings.form_cache_timeout,
+                    version=version,
+                )
+            html = mark_safe(html)  # nosec - markup rendered by the form itself
+        else:
+            html = super().render()
+        self._unbound_render_cache[key] = html
+        return html
+
+    __str__ = render
+    __html__ = render
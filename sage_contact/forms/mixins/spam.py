@@ -0,0 +1,49 @@
+import logging
+
+from sage_contact.utils.spam import (
+    ACCEPT,
+    SpamVerdict,
+    get_spam_scorer,
+    spam_filter_enabled,
+)
+from sage_contact.utils.timing import stage
+
+logger = logging.getLogger(__name__)
+
+
+class SpamFilterMixin:
+    """
+    Score a validated submission with ``sage_contact.utils.spam`` before saving.
+
+    Views call :meth:`get_spam_verdict` after ``is_valid()`` and only call
+    ``save()`` for accepted submissions; :meth:`quarantine` stores the others
+    without creating a support request.
+    """
+
+    def get_spam_verdict(self) -> SpamVerdict:
+        """Return the spam verdict of the validated submission, computed once."""
+        verdict = getattr(self, "_spam_verdict", None)
+        if verdict is None:
+            if not spam_filter_enabled():
+                verdict = SpamVerdict(ACCEPT, 0, ())
+            else:
+                with stage("spam.score", form=self.__class__.__name__):
+                    verdict = get_spam_scorer().score(self.cleaned_data, self.data)
+            self._spam_verdict = verdict
+        return verdict
+
+    def quarantine(self, verdict: SpamVerdict):
+        """Store the submission for review instead of saving it."""
+        from sage_contact.models import QuarantinedSupportRequest
+
+        request = getattr(self, "request", None)
+        with stage("db.quarantine", form=self.__class__.__name__):
+            return QuarantinedSupportRequest.objects.create(
+                form_class=f"{self.__class__.__module__}.{self.__class__.__qualname__}",
+                subject=self.cleaned_data.get("subject") or "",
+                email=self.cleaned_data.get("email") or "",
+                data={name: self.data.get(name) for name in self.fields},
+                ip_address=request.META.get("REMOTE_ADDR") if request else None,
+                score=min(verdict.score, 32767),
+                reasons=",".join(verdict.reasons),
+            )
@@ -7,12 +7,28 @@ from sage_contact.models import (FullSupportRequest, SupportRequestBase,
                                  SupportRequestWithLocation,
                                  SupportRequestWithPhone)
 
-from .mixins import GeoLocationMixin
+from sage_contact.utils.timing import stage
+
+from .mixins import (GeoLocationMixin, SharedChoicesMixin, SpamFilterMixin,
+                     StageTimingMixin, UnboundRenderCacheMixin)
 
 logger = logging.getLogger(__name__)
 
 
-class SupportRequestForm(forms.ModelForm):
+class SupportRequestForm(
+    UnboundRenderCacheMixin,
+    SharedChoicesMixin,
+    StageTimingMixin,
+    SpamFilterMixin,
+    forms.ModelForm,
+):
+    # SupportRequestViewMixin only passes the request to forms that accept it.
+    accepts_request = True
+
+    def __init__(self, *args, **kwargs):
+        self.request = kwargs.pop("request", None)
+        super().__init__(*args, **kwargs)
+
     class Meta:
         model = SupportRequestBase
         fields = ["subject", "full_name", "email", "message"]
@@ -120,15 +136,12 @@ class SupportRequestWithPhoneForm(GeoLocationMixin, SupportRequestForm):
             self.set_ip_address(instance)
             self.set_country_from_ip(instance)
         if commit:
-            instance.save()
+            with stage("db.insert", model=instance.__class__.__name__):
+                instance.save()
         return instance
 
 
 class SupportRequestWithLocationForm(SupportRequestWithPhoneForm):
-    def __init__(self, *args, **kwargs):
-        self.request = kwargs.pop("request", None)
-        super().__init__(*args, **kwargs)
-
     class Meta(SupportRequestWithPhoneForm.Meta):
         model = SupportRequestWithLocation
         fields = SupportRequestWithPhoneForm.Meta.fields
@@ -231,7 +244,8 @@ class FullSupportRequestForm(SupportRequestWithLocationForm):
             self.set_ip_address(instance)
             self.set_country_from_ip(instance)
         if commit:
-            instance.save()
+            with stage("db.insert", model=instance.__class__.__name__):
+                instance.save()
         return instance
 
     def set_user(self, instance):
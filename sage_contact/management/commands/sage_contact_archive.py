@@ -0,0 +1,98 @@
+import gzip
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from sage_contact.models import SupportRequestBase
+from sage_contact.settings.app import app_settings
+from sage_contact.utils.retention import archive_support_requests, purge_archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move old support requests out of the live tables in batches, to a gzip "
+        "JSONL file and/or the archive table."
+    )
+
+    def add_arguments(self, parser):
+        cutoff = parser.add_mutually_exclusive_group(required=True)
+        cutoff.add_argument(
+            "--days", type=int, help="Archive requests older than this many days."
+        )
+        cutoff.add_argument(
+            "--before", help="Archive requests created before this date (YYYY-MM-DD)."
+        )
+        parser.add_argument(
+            "--output", help="Append the archived requests to this .jsonl.gz file."
+        )
+        parser.add_argument(
+            "--no-table",
+            action="store_true",
+            help="Do not copy the requests to the archive table.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=app_settings.archive_batch_size
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between batches.",
+        )
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--purge-archive",
+            action="store_true",
+            help="Delete archive table rows older than the cutoff instead.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the requests that would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] is not None:
+            cutoff = timezone.now() - timedelta(days=options["days"])
+        else:
+            try:
+                day = datetime.strptime(options["before"], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("--before must be a date in YYYY-MM-DD format.")
+            cutoff = timezone.make_aware(datetime.combine(day, time.min))
+        using = options["database"]
+
+        if options["purge_archive"]:
+            deleted = purge_archive(cutoff, using=using)
+            self.stdout.write(self.style.SUCCESS(f"Purged {deleted} archive rows."))
+            return
+
+        if options["dry_run"]:
+            count = (
+                SupportRequestBase.objects.using(using)
+                .non_polymorphic()
+                .created_before(cutoff)
+                .count()
+            )
+            self.stdout.write(f"{count} support requests would be archived.")
+            return
+
+        if options["no_table"] and not options["output"]:
+            raise CommandError("--no-table requires --output.")
+
+        stream = gzip.open(options["output"], "at") if options["output"] else None
+        try:
+            total = archive_support_requests(
+                cutoff,
+                batch_size=options["batch_size"],
+                stream=stream,
+                to_table=not options["no_table"],
+                using=using,
+                pause=options["pause"],
+                progress=lambda done: self.stdout.write(f"archived {done}"),
+            )
+        finally:
+            if stream is not None:
+                stream.close()
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} support requests."))
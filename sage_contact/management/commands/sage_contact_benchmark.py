@@ -0,0 +1,95 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+
+from sage_contact.benchmarks import BENCHMARK_CASES, BenchmarkRunner, compare_reports
+
+
+def int_list(value):
+    return [int(item.replace("_", "")) for item in value.split(",") if item]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the sage_contact hot paths on a throwaway test database and "
+        "write the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output", help="Write the JSON report to this file instead of stdout."
+        )
+        parser.add_argument(
+            "--compare", help="A previous JSON report to compare the results against."
+        )
+        parser.add_argument(
+            "--rows",
+            type=int_list,
+            default=[10_000],
+            help="Comma-separated contact table sizes, e.g. 10000,100000,1000000.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Timed rounds per measurement."
+        )
+        parser.add_argument(
+            "--groups",
+            help="Comma-separated benchmark groups to run. "
+            "Defaults to all registered groups.",
+        )
+        parser.add_argument(
+            "--database", default="default", help="The database alias to benchmark."
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Reuse the test database between runs, keeping seeded rows.",
+        )
+
+    def handle(self, *args, **options):
+        import sage_contact.benchmarks.cases  # noqa: F401 - registers the cases
+
+        groups = options["groups"].split(",") if options["groups"] else None
+        unknown = set(groups or ()) - set(BENCHMARK_CASES)
+        if unknown:
+            raise CommandError(
+                f"Unknown benchmark groups: {', '.join(sorted(unknown))}. "
+                f"Available: {', '.join(BENCHMARK_CASES)}."
+            )
+
+        old_config = setup_databases(
+            verbosity=options["verbosity"],
+            interactive=False,
+            keepdb=options["keepdb"],
+            aliases={options["database"]},
+        )
+        try:
+            runner = BenchmarkRunner(
+                using=options["database"],
+                row_counts=options["rows"],
+                repeat=options["repeat"],
+                groups=groups,
+                stdout=self.stderr,
+            )
+            report = runner.run()
+        finally:
+            teardown_databases(
+                old_config, verbosity=options["verbosity"], keepdb=options["keepdb"]
+            )
+
+        if options["compare"]:
+            with open(options["compare"]) as fp:
+                report["comparison"] = compare_reports(json.load(fp), report)
+            for row in report["comparison"]:
+                self.stderr.write(
+                    f"{row['group']:<10} {row['name']:<48} x{row['ratio']:.2f} "
+                    f"{row['params'] or ''}"
+                )
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as fp:
+                fp.write(output)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(output)
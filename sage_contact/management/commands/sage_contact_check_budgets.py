@@ -0,0 +1,82 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+
+from sage_contact.benchmarks.guards import BudgetExceeded, GuardRunner
+
+
+class Command(BaseCommand):
+    help = (
+        "Check the SQL query count and latency of the sage_contact managers, "
+        "admin views and support view against their budgets. Exits with an "
+        "error when a budget is exceeded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database", default="default", help="The database alias to measure."
+        )
+        parser.add_argument(
+            "--budgets",
+            help='JSON file overriding budgets: {"name": [max_queries, max_seconds]}.',
+        )
+        parser.add_argument(
+            "--latency-factor",
+            type=float,
+            default=1.0,
+            help="Multiply every latency budget, e.g. 3 on slow CI runners.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the measurements as JSON."
+        )
+        parser.add_argument(
+            "--show-sql",
+            action="store_true",
+            help="Print the captured SQL of guards that exceed their budget.",
+        )
+
+    def handle(self, *args, **options):
+        budgets = None
+        if options["budgets"]:
+            with open(options["budgets"]) as fp:
+                budgets = {name: tuple(value) for name, value in json.load(fp).items()}
+
+        old_config = setup_databases(
+            verbosity=0, interactive=False, aliases={options["database"]}
+        )
+        try:
+            runner = GuardRunner(
+                using=options["database"],
+                budgets=budgets,
+                latency_factor=options["latency_factor"],
+            )
+            try:
+                results = runner.run()
+            except BudgetExceeded as e:
+                raise CommandError(str(e))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            for result in results:
+                status = (
+                    self.style.SUCCESS("ok  ")
+                    if result["passed"]
+                    else self.style.ERROR("FAIL")
+                )
+                self.stdout.write(
+                    f"{status} {result['name']:<46} "
+                    f"{result['queries']:>3}/{result['max_queries']:<3} queries "
+                    f"{result['seconds'] * 1000:>8.1f}/{result['max_seconds'] * 1000:.0f} ms"
+                )
+                if options["show_sql"] and not result["passed"]:
+                    for sql in result["sql"]:
+                        self.stdout.write(f"        {sql}")
+
+        try:
+            runner.assert_within_budget()
+        except BudgetExceeded as e:
+            raise CommandError(f"Performance budgets exceeded:\n{e}")
@@ -0,0 +1,53 @@
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from sage_contact.settings.app import app_settings
+from sage_contact.utils.geoip import enrich_locations, geoip_configured
+
+
+class Command(BaseCommand):
+    help = (
+        "Look up the country of the support requests whose GeoIP lookup is "
+        "pending, in batches. With --backfill, look every request up again, e.g. "
+        "after updating the GeoIP database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Look up every request with an IP address, not only pending ones.",
+        )
+        parser.add_argument(
+            "--since", help="Only requests created from this day on (YYYY-MM-DD)."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=app_settings.geoip_batch_size
+        )
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        if not geoip_configured():
+            raise CommandError("SAGE_CONTACT_GEOIP_PATH is not set.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        since = None
+        if options["since"]:
+            try:
+                day = datetime.strptime(options["since"], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("--since must be a date in YYYY-MM-DD format.")
+            since = datetime.combine(day, time.min)
+            if settings.USE_TZ:
+                since = timezone.make_aware(since)
+
+        checked = enrich_locations(
+            using=options["database"],
+            batch_size=options["batch_size"],
+            backfill=options["backfill"],
+            since=since,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Looked up {checked} support requests."))
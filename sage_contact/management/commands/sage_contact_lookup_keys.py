@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+
+from sage_contact.models import (
+    Contact,
+    SupportRequestBase,
+    SupportRequestWithLocation,
+    SupportRequestWithPhone,
+)
+from sage_contact.utils.email import refresh_email_keys
+from sage_contact.utils.labels import refresh_label_counts
+from sage_contact.utils.network import refresh_ip_keys
+from sage_contact.utils.phone import refresh_phone_keys
+from sage_contact.utils.reminders import refresh_date_keys
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill the normalized email, phone, date and IP address lookup keys of "
+        "contacts and support requests and the label contact counts, e.g. after "
+        "an upgrade or after changing SAGE_CONTACT_EMAIL_CANONICALIZE or "
+        "PHONENUMBER_DEFAULT_REGION."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            choices=["email", "phone", "dates", "ip", "labels"],
+            help="Refresh one kind of key.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        jobs = []
+        if options["only"] in (None, "email"):
+            jobs += [
+                ("email", refresh_email_keys, Contact),
+                ("email", refresh_email_keys, SupportRequestBase),
+            ]
+        if options["only"] in (None, "phone"):
+            jobs += [
+                ("phone", refresh_phone_keys, Contact),
+                ("phone", refresh_phone_keys, SupportRequestWithPhone),
+            ]
+        if options["only"] in (None, "dates"):
+            jobs += [("date", refresh_date_keys, Contact)]
+        if options["only"] in (None, "ip"):
+            jobs += [("IP address", refresh_ip_keys, SupportRequestWithLocation)]
+        if options["only"] in (None, "labels"):
+            updated = refresh_label_counts(using=options["database"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Recounted the contacts of {updated} labels.")
+            )
+        for kind, refresh, model in jobs:
+            updated = refresh(
+                model, using=options["database"], batch_size=options["batch_size"]
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Updated {updated} {model._meta.verbose_name_plural} {kind} keys."
+                )
+            )
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sage_contact.models import SupportRequestBase
+from sage_contact.utils.matching import match_support_requests
+
+
+class Command(BaseCommand):
+    help = (
+        "Attach unmatched support requests to contacts by email or phone number, "
+        "creating contacts for new senders, in batches. Run it periodically "
+        "(e.g. from cron) or with --loop as a background worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-create",
+            action="store_true",
+            help="Only attach requests to existing contacts.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--loop",
+            type=float,
+            metavar="SECONDS",
+            help="Keep running, sleeping this many seconds between passes.",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        while True:
+            matched = match_support_requests(
+                create=not options["no_create"],
+                batch_size=options["batch_size"],
+                using=using,
+                progress=lambda total: self.stdout.write(f"  {total} matched"),
+            )
+            remaining = (
+                SupportRequestBase.objects.db_manager(using)
+                .non_polymorphic()
+                .unmatched()
+                .count()
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Matched {matched} support requests, {remaining} unmatched."
+                )
+            )
+            if options["loop"] is None:
+                return
+            time.sleep(options["loop"])
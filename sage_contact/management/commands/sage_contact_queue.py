@@ -0,0 +1,58 @@
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from sage_contact.models import SupportQueueItem, SupportRequestBase
+from sage_contact.utils.queue import enqueue_missing
+
+
+class Command(BaseCommand):
+    help = (
+        "Reopen the support requests whose claim expired and show the open, "
+        "claimed and overdue requests per work queue. With --backfill, first "
+        "queue the requests stored without a queue item."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Queue the support requests that have no queue item.",
+        )
+        parser.add_argument(
+            "--since",
+            help="Only backfill requests created from this day on (YYYY-MM-DD).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        using = options["database"]
+        if options["backfill"]:
+            queryset = SupportRequestBase.objects.all()
+            if options["since"]:
+                try:
+                    day = datetime.strptime(options["since"], "%Y-%m-%d").date()
+                except ValueError:
+                    raise CommandError("--since must be a date in YYYY-MM-DD format.")
+                since = datetime.combine(day, time.min)
+                if settings.USE_TZ:
+                    since = timezone.make_aware(since)
+                queryset = queryset.filter(created_at__gte=since)
+            queued = enqueue_missing(
+                queryset, using=using, batch_size=options["batch_size"]
+            )
+            self.stdout.write(self.style.SUCCESS(f"Queued {queued} support requests."))
+
+        manager = SupportQueueItem.objects.db_manager(using)
+        requeued = manager.requeue_expired()
+        self.stdout.write(self.style.SUCCESS(f"Reopened {requeued} expired claims."))
+        for row in manager.stats():
+            self.stdout.write(
+                f"{row['queue']}: {row['open']} open, {row['claimed']} claimed, "
+                f"{row['overdue']} overdue, next due {row['next_due'] or '-'}"
+            )
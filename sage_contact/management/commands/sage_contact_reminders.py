@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from sage_contact.models import Contact
+from sage_contact.utils.reminders import REMINDER_FIELDS, iter_reminders, send_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        "Send the sage_contact.utils.reminders.reminders_due signal, in batches, "
+        "for contacts whose birthday or anniversary is due. Schedule it once a "
+        "day; with --days N it covers today and the next N days."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            choices=sorted(REMINDER_FIELDS),
+            action="append",
+            help="Reminder kind; repeat for several. Defaults to all kinds.",
+        )
+        parser.add_argument("--days", type=int, default=0)
+        parser.add_argument("--date", help="First day of the window (YYYY-MM-DD).")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the due reminders instead of sending them.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days must not be negative.")
+        if options["date"]:
+            try:
+                start = datetime.strptime(options["date"], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("--date must be a date in YYYY-MM-DD format.")
+        else:
+            start = timezone.localdate()
+        contacts = Contact.objects.db_manager(options["database"]).all_tenants()
+
+        for kind in options["kind"] or sorted(REMINDER_FIELDS):
+            if options["dry_run"]:
+                for batch in iter_reminders(
+                    contacts, kind, start, options["days"], options["batch_size"]
+                ):
+                    for contact, due in batch:
+                        self.stdout.write(f"{due} {kind} {contact} (#{contact.pk})")
+                continue
+            sent = send_reminders(
+                contacts, kind, start, options["days"], options["batch_size"]
+            )
+            self.stdout.write(self.style.SUCCESS(f"Sent {sent} {kind} reminders."))
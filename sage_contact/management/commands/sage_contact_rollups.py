@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from sage_contact.utils.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the daily support request rollups from the live tables, for a "
+        "date range or for all days."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="First day to rebuild (YYYY-MM-DD).")
+        parser.add_argument("--end", help="Last day to rebuild (YYYY-MM-DD).")
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Rebuild the last N days, today included. Overrides --start.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        start = self.parse_day(options["start"], "--start")
+        end = self.parse_day(options["end"], "--end")
+        if options["days"] is not None:
+            if options["days"] < 1:
+                raise CommandError("--days must be at least 1.")
+            start = timezone.localdate() - timedelta(days=options["days"] - 1)
+        if start and end and start > end:
+            raise CommandError("--start must not be after --end.")
+
+        written = rebuild_rollups(
+            start, end, using=options["database"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {written} rollup rows "
+                f"({start or 'first day'} to {end or 'last day'})."
+            )
+        )
+
+    @staticmethod
+    def parse_day(value, option):
+        if value is None:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise CommandError(f"{option} must be a date in YYYY-MM-DD format.")
@@ -0,0 +1,56 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sage_contact.utils.timing import get_histogram
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the per-stage latency histogram of the support request submit path. "
+        "Requires SAGE_CONTACT_TIMING_HISTOGRAM = True and a cache backend shared "
+        "by the web workers (SAGE_CONTACT_TIMING_CACHE)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--json", action="store_true", help="Print the statistics as JSON."
+        )
+        parser.add_argument(
+            "--reset", action="store_true", help="Clear the collected statistics."
+        )
+
+    def handle(self, *args, **options):
+        histogram = get_histogram()
+        if histogram is None:
+            raise CommandError("SAGE_CONTACT_TIMING_HISTOGRAM is not enabled.")
+
+        if options["reset"]:
+            histogram.reset()
+            self.stdout.write(self.style.SUCCESS("Timing statistics cleared."))
+            return
+
+        stats = histogram.shared_snapshot()
+        if options["json"]:
+            self.stdout.write(json.dumps(stats, indent=2, default=str))
+            return
+        if not stats:
+            self.stdout.write("No timing samples recorded yet.")
+            return
+
+        def ms(value):
+            if value is None:
+                return "-"
+            if value == float("inf"):
+                return "inf"
+            return f"{value * 1000:.2f}"
+
+        header = f"{'stage':<24}{'count':>10}{'mean ms':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name in sorted(stats):
+            row = stats[name]
+            self.stdout.write(
+                f"{name:<24}{row['count']:>10}{ms(row['mean']):>12}"
+                f"{ms(row['p50']):>10}{ms(row['p95']):>10}{ms(row['p99']):>10}"
+            )
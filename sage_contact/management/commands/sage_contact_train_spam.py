@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from sage_contact.models import QuarantinedSupportRequest, SupportRequestBase
+from sage_contact.utils.spam import train_spam_model
+
+
+class Command(BaseCommand):
+    help = (
+        "Train the spam filter's naive Bayes model on quarantined submissions "
+        "(spam) and stored support requests (legitimate), and write it to the "
+        "file SAGE_CONTACT_SPAM_MODEL_PATH points to. Release false positives "
+        "from the quarantine before training."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path of the model file to write.")
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10_000,
+            help="Most recent rows of each kind to train on.",
+        )
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        if options["limit"] < 1:
+            raise CommandError("--limit must be at least 1.")
+        using, limit = options["database"], options["limit"]
+        spam = [
+            f"{data.get('subject') or ''}\n{data.get('message') or ''}"
+            for data in QuarantinedSupportRequest.objects.using(using)
+            .order_by("-pk")
+            .values_list("data", flat=True)[:limit]
+            .iterator()
+        ]
+        ham = [
+            f"{subject}\n{message}"
+            for subject, message in SupportRequestBase.objects.using(using)
+            .non_polymorphic()
+            .order_by("-pk")
+            .values_list("subject", "message")[:limit]
+            .iterator()
+        ]
+        if not spam or not ham:
+            raise CommandError(
+                "Training needs both quarantined submissions and support requests."
+            )
+        model = train_spam_model(spam, ham)
+        model.save(options["output"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Trained on {len(spam)} spam and {len(ham)} legitimate texts "
+                f"({len(model.counts)} words)."
+            )
+        )
@@ -1,7 +1,13 @@
+from .analytics import SupportRequestDailyRollup
+from .archive import SupportRequestArchive
 from .contact import Contact, ContactLabel, CustomField, Label
+from .history import ContactChange
+from .queue import SupportQueueItem
+from .spam import QuarantinedSupportRequest
 from .support import (
     FullSupportRequest,
     SupportRequestBase,
     SupportRequestWithLocation,
     SupportRequestWithPhone,
 )
+from .sync import SyncSequence, SyncTombstone
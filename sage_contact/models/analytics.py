@@ -0,0 +1,82 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from sage_contact.repository.manager.analytics import SupportRequestRollupManager
+
+
+class SupportRequestDailyRollup(models.Model):
+    """
+    Model holding the number of support requests submitted per day and dimension.
+
+    Rows are incremented as requests are created and can be rebuilt from the
+    live tables with the ``sage_contact_rollups`` command. Dimensions that a
+    request type does not have are stored as an empty string.
+    """
+
+    day = models.DateField(
+        verbose_name=_("Day"),
+        help_text=_("Day the support requests were submitted"),
+        db_comment="Day the support requests were submitted",
+    )
+    request_type = models.CharField(
+        verbose_name=_("Request Type"),
+        max_length=100,
+        help_text=_("Model label of the support requests"),
+        db_comment="Model label of the support requests",
+    )
+    contact_reason = models.CharField(
+        verbose_name=_("Reason for Contact"),
+        max_length=200,
+        blank=True,
+        default="",
+        help_text=_("Reason for contact, empty when not collected"),
+        db_comment="Reason for contact, empty when not collected",
+    )
+    preferred_contact_method = models.CharField(
+        verbose_name=_("Preferred Contact Method"),
+        max_length=50,
+        blank=True,
+        default="",
+        help_text=_("Preferred contact method, empty when not collected"),
+        db_comment="Preferred contact method, empty when not collected",
+    )
+    country = models.CharField(
+        verbose_name=_("Country"),
+        max_length=2,
+        blank=True,
+        default="",
+        help_text=_("Country code, empty when not collected"),
+        db_comment="Country code, empty when not collected",
+    )
+    count = models.PositiveIntegerField(
+        verbose_name=_("Count"),
+        default=0,
+        help_text=_("Number of support requests"),
+        db_comment="Number of support requests",
+    )
+
+    objects = SupportRequestRollupManager()
+
+    class Meta:
+        verbose_name = _("Support Request Statistics")
+        verbose_name_plural = _("Support Request Statistics")
+        default_manager_name = "objects"
+        db_table = "sage_support_daily_rollup"
+        db_table_comment = (
+            "Daily support request counts per type, reason, contact method and country."
+        )
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "day",
+                    "request_type",
+                    "contact_reason",
+                    "preferred_contact_method",
+                    "country",
+                ],
+                name="sage_support_rollup_unique_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.request_type}: {self.count}"
@@ -0,0 +1,57 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class SupportRequestArchive(models.Model):
+    """
+    Model storing support requests moved out of the live polymorphic tables.
+
+    Each row holds one support request flattened across its inheritance chain,
+    so archived requests can be inspected or restored without keeping the
+    four live tables growing.
+    """
+
+    original_id = models.BigIntegerField(
+        verbose_name=_("Original ID"),
+        help_text=_("Primary key of the support request before archival"),
+        db_comment="Primary key of the support request before archival",
+    )
+    request_type = models.CharField(
+        verbose_name=_("Request Type"),
+        max_length=100,
+        help_text=_("Model label of the archived support request"),
+        db_comment="Model label of the archived support request",
+    )
+    created_at = models.DateTimeField(
+        verbose_name=_("Created at"),
+        help_text=_("Creation time of the original support request"),
+        db_comment="Creation time of the original support request",
+    )
+    archived_at = models.DateTimeField(
+        verbose_name=_("Archived at"),
+        auto_now_add=True,
+        help_text=_("Time the support request was archived"),
+        db_comment="Time the support request was archived",
+    )
+    payload = models.JSONField(
+        verbose_name=_("Payload"),
+        encoder=DjangoJSONEncoder,
+        help_text=_("All field values of the archived support request"),
+        db_comment="All field values of the archived support request",
+    )
+
+    class Meta:
+        verbose_name = _("Archived Support Request")
+        verbose_name_plural = _("Archived Support Requests")
+        db_table = "sage_support_archive"
+        db_table_comment = (
+            "Support requests moved out of the live tables by the retention job."
+        )
+        indexes = [
+            models.Index(fields=["created_at"], name="sage_archive_created_idx"),
+            models.Index(fields=["original_id"], name="sage_archive_original_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.request_type} #{self.original_id}"
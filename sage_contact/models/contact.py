@@ -1,9 +1,15 @@
 from django.conf import settings
 from django.core.validators import EmailValidator, MaxLengthValidator
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 from sage_contact.constants.choices import Prefix
+from sage_contact.models.history import ChangeHistoryMixin
+from sage_contact.models.indexes import PatternOpsIndex
+from sage_contact.models.sync import SyncMixin
+from sage_contact.models.tenancy import TenantMixin
 from sage_contact.repository.manager.contact import (
     LabelManager,
     ContactLabelManager,
@@ -12,7 +18,7 @@ from sage_contact.repository.manager.contact import (
 )
 
 
-class Label(models.Model):
+class Label(TenantMixin):
     """
     Model representing a label used to organize contacts into groups.
     """
@@ -20,10 +26,16 @@ class Label(models.Model):
     name = models.CharField(
         verbose_name=_("Name"),
         max_length=255,
-        unique=True,
         null=False,
-        help_text=_("Unique name for the label"),
-        db_comment="Unique name for the label",
+        help_text=_("Name for the label, unique per tenant"),
+        db_comment="Name for the label, unique per tenant",
+    )
+    contact_count = models.PositiveIntegerField(
+        verbose_name=_("Contacts"),
+        default=0,
+        editable=False,
+        help_text=_("Number of contacts with the label, maintained automatically"),
+        db_comment="Number of contacts carrying the label, maintained incrementally",
     )
 
     objects = LabelManager()
@@ -34,12 +46,17 @@ class Label(models.Model):
         default_manager_name = "objects"
         db_table = "sage_label"
         db_table_comment = "Labels help in organizing contacts into groups."
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant_id", "name"], name="sage_label_tenant_name_uniq"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name}"
 
 
-class Contact(models.Model):
+class Contact(TenantMixin, SyncMixin, ChangeHistoryMixin):
     """
     Model representing a contact with various personal and professional details.
     """
@@ -105,6 +122,15 @@ class Contact(models.Model):
         help_text=_("Contact's email address"),
         db_comment="Contact's email address",
     )
+    email_key = models.CharField(
+        verbose_name=_("Email Lookup Key"),
+        max_length=254,
+        blank=True,
+        default="",
+        editable=False,
+        help_text=_("Normalized email address, maintained automatically"),
+        db_comment="Contact's email address lowercased and canonicalized, for lookups",
+    )
     phone_number = PhoneNumberField(
         _("Phone Number"),
         null=True,
@@ -112,6 +138,24 @@ class Contact(models.Model):
         help_text=_("Contact's phone number"),
         db_comment="Contact's phone number",
     )
+    phone_e164 = models.CharField(
+        verbose_name=_("Phone Number (E.164)"),
+        max_length=16,
+        blank=True,
+        default="",
+        editable=False,
+        help_text=_("Phone number normalized to E.164, maintained automatically"),
+        db_comment="Contact's phone number normalized to E.164, empty when invalid",
+    )
+    phone_suffix = models.CharField(
+        verbose_name=_("Phone Number Suffix Key"),
+        max_length=32,
+        blank=True,
+        default="",
+        editable=False,
+        help_text=_("Phone number digits reversed, for trailing-digit lookups"),
+        db_comment="Contact's phone number digits reversed, for suffix lookups",
+    )
     physical_address = models.TextField(
         verbose_name=_("Physical Address"),
         null=True,
@@ -166,6 +210,14 @@ class Contact(models.Model):
         help_text=_("Contact's birthday"),
         db_comment="Contact's birthday",
     )
+    birthday_key = models.PositiveSmallIntegerField(
+        verbose_name=_("Birthday Day Key"),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Month and day of the birthday as MMDD, maintained automatically"),
+        db_comment="Month * 100 + day of the birthday, for upcoming-date queries",
+    )
     anniversary = models.DateField(
         verbose_name=_("Anniversary"),
         null=True,
@@ -173,6 +225,16 @@ class Contact(models.Model):
         help_text=_("Contact's anniversary date"),
         db_comment="Contact's anniversary date",
     )
+    anniversary_key = models.PositiveSmallIntegerField(
+        verbose_name=_("Anniversary Day Key"),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_(
+            "Month and day of the anniversary as MMDD, maintained automatically"
+        ),
+        db_comment="Month * 100 + day of the anniversary, for upcoming-date queries",
+    )
     notes = models.TextField(
         verbose_name=_("Notes"),
         null=True,
@@ -197,9 +259,41 @@ class Contact(models.Model):
         default_manager_name = "objects"
         db_table = "sage_contact"
         db_table_comment = "Table to store contact details similar to Google Contacts."
+        indexes = [
+            PatternOpsIndex(
+                F("tenant_id"),
+                Upper("last_name"),
+                Upper("first_name"),
+                name="sage_contact_name_idx",
+            ),
+            models.Index(
+                fields=["tenant_id", "email_key"], name="sage_contact_tenant_email_idx"
+            ),
+            models.Index(
+                fields=["tenant_id", "phone_e164"], name="sage_contact_tenant_e164_idx"
+            ),
+            models.Index(
+                fields=["tenant_id", "phone_suffix"],
+                name="sage_contact_tenant_suffix_idx",
+            ),
+            models.Index(
+                fields=["tenant_id", "birthday_key"],
+                name="sage_contact_tenant_bday_idx",
+            ),
+            models.Index(
+                fields=["tenant_id", "anniversary_key"],
+                name="sage_contact_tenant_anniv_idx",
+            ),
+            models.Index(
+                fields=["tenant_id", "sync_seq", "id"], name="sage_contact_sync_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.first_name} {self.last_name}"
 
 
-class CustomField(models.Model):
+class CustomField(TenantMixin, SyncMixin, ChangeHistoryMixin):
     """
     Model representing a custom field for a contact to store additional user-defined information.
     """
@@ -228,6 +322,11 @@ class CustomField(models.Model):
         verbose_name_plural = _("Custom Fields")
         default_manager_name = "objects"
         db_table = "sage_customfield"
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "sync_seq", "id"], name="sage_customfield_sync_idx"
+            ),
+        ]
         db_table_comment = (
             "Custom fields allow additional user-defined information for each contact."
         )
@@ -236,7 +335,7 @@ class CustomField(models.Model):
         return f"{self.field_name}: {self.field_value}"
 
 
-class ContactLabel(models.Model):
+class ContactLabel(TenantMixin, SyncMixin, ChangeHistoryMixin):
     """
     Model representing the many-to-many relationship between contacts and labels.
     """
@@ -262,6 +361,12 @@ class ContactLabel(models.Model):
         verbose_name_plural = _("Contact Labels")
         default_manager_name = "objects"
         db_table = "sage_contactlabel"
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "sync_seq", "id"],
+                name="sage_contactlabel_sync_idx",
+            ),
+        ]
         db_table_comment = (
             "Table to manage the many-to-many relationship between contacts and labels."
         )
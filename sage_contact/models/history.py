@@ -0,0 +1,113 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from sage_contact.models.tenancy import TenantMixin
+from sage_contact.repository.manager.history import ContactChangeManager
+from sage_contact.utils.history import remember_state
+
+
+class ChangeHistoryMixin(models.Model):
+    """
+    Keep the values a row was loaded with, so edits can be logged as diffs.
+
+    The values come straight from the query result; no extra query is made.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        remember_state(
+            instance,
+            {
+                name: value
+                for name, value in zip(field_names, values)
+                if value is not models.DEFERRED
+            },
+        )
+        return instance
+
+
+class ContactChange(TenantMixin):
+    """
+    Append-only log of field-level changes to contacts, custom fields and labels.
+
+    Each row stores only what changed: the new values of the edited fields
+    for a contact, the field name and value for a custom field, or the label
+    for a label link. The log has no foreign keys, so it outlives the rows it
+    describes, and a contact can be rebuilt as of any point in time with
+    ``ContactChange.objects.reconstruct()``. Entries belong to the tenant of
+    the row they describe.
+    """
+
+    class Kind(models.IntegerChoices):
+        CONTACT = 1, _("Contact")
+        CUSTOM_FIELD = 2, _("Custom Field")
+        LABEL = 3, _("Label")
+
+    class Action(models.IntegerChoices):
+        CREATE = 1, _("Create")
+        UPDATE = 2, _("Update")
+        DELETE = 3, _("Delete")
+
+    contact_id = models.BigIntegerField(
+        verbose_name=_("Contact ID"),
+        help_text=_("Primary key of the contact the change belongs to"),
+        db_comment="Primary key of the contact the change belongs to",
+    )
+    kind = models.PositiveSmallIntegerField(
+        verbose_name=_("Kind"),
+        choices=Kind.choices,
+        help_text=_("The kind of changed row"),
+        db_comment="1 contact, 2 custom field, 3 contact label",
+    )
+    object_id = models.BigIntegerField(
+        verbose_name=_("Object ID"),
+        help_text=_("Primary key of the changed row"),
+        db_comment="Primary key of the changed row",
+    )
+    action = models.PositiveSmallIntegerField(
+        verbose_name=_("Action"),
+        choices=Action.choices,
+        help_text=_("Whether the row was created, updated or deleted"),
+        db_comment="1 create, 2 update, 3 delete",
+    )
+    changes = models.JSONField(
+        verbose_name=_("Changes"),
+        encoder=DjangoJSONEncoder,
+        default=dict,
+        blank=True,
+        help_text=_("New values of the changed fields"),
+        db_comment="New values of the changed fields, empty for deletions",
+    )
+    changed_at = models.DateTimeField(
+        verbose_name=_("Changed at"),
+        default=timezone.now,
+        help_text=_("Time of the change"),
+        db_comment="Time of the change",
+    )
+
+    objects = ContactChangeManager()
+
+    class Meta:
+        verbose_name = _("Contact Change")
+        verbose_name_plural = _("Contact Changes")
+        default_manager_name = "objects"
+        db_table = "sage_contact_change"
+        db_table_comment = "Append-only field-level change log of contacts."
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "contact_id", "changed_at"],
+                name="sage_change_contact_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.get_action_display()} {self.get_kind_display()} "
+            f"#{self.object_id} of contact #{self.contact_id}"
+        )
@@ -0,0 +1,34 @@
+from django.contrib.postgres.indexes import OpClass
+from django.db import models
+from django.db.models import F
+
+
+class PatternOpsIndex(models.Index):
+    """
+    Expression index whose text expressions use a pattern operator class.
+
+    Prefix lookups such as ``istartswith`` compile to ``UPPER(col) LIKE 'X%'``
+    on PostgreSQL, which a B-tree index only serves under the C collation
+    unless it uses ``text_pattern_ops``. On PostgreSQL every expression but a
+    plain field reference gets that operator class; this needs
+    ``django.contrib.postgres`` in ``INSTALLED_APPS``. Other backends create a
+    plain expression index.
+    """
+
+    opclass = "text_pattern_ops"
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        index = self.clone()
+        index.expressions = tuple(
+            (
+                expression
+                if isinstance(expression, F)
+                else OpClass(expression, name=self.opclass)
+            )
+            for expression in self.expressions
+        )
+        return super(PatternOpsIndex, index).create_sql(
+            model, schema_editor, using=using, **kwargs
+        )
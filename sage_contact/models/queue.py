@@ -0,0 +1,166 @@
+from datetime import timedelta
+from typing import Optional
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from sage_contact.constants.choices import QueueStates
+from sage_contact.repository.manager.queue import SupportQueueItemManager
+from sage_contact.utils.queue import claim_timeout
+
+
+class SupportQueueItem(models.Model):
+    """
+    Place of a support request in a work queue.
+
+    Queue state lives in this narrow table rather than on the support
+    request tables, so claims lock and update one small row and leave the
+    polymorphic request rows alone.
+    """
+
+    support_request = models.OneToOneField(
+        "sage_contact.SupportRequestBase",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="queue_item",
+        verbose_name=_("Support Request"),
+        help_text=_("The queued support request"),
+        db_comment="The queued support request",
+    )
+    queue = models.CharField(
+        verbose_name=_("Queue"),
+        max_length=50,
+        help_text=_("Queue the request was routed to"),
+        db_comment="Queue the request was routed to",
+    )
+    priority = models.SmallIntegerField(
+        verbose_name=_("Priority"),
+        default=0,
+        help_text=_("Higher priorities are claimed first"),
+        db_comment="Higher priorities are claimed first",
+    )
+    state = models.CharField(
+        verbose_name=_("State"),
+        max_length=10,
+        choices=QueueStates.choices,
+        default=QueueStates.OPEN,
+        help_text=_("Whether the request waits, is being handled or is done"),
+        db_comment="open, claimed or done",
+    )
+    due_at = models.DateTimeField(
+        verbose_name=_("Due at"),
+        help_text=_("SLA deadline of the request"),
+        db_comment="SLA deadline of the request",
+    )
+    claimed_by = models.CharField(
+        verbose_name=_("Claimed by"),
+        max_length=150,
+        blank=True,
+        help_text=_("Agent or worker handling the request"),
+        db_comment="Agent or worker handling the request",
+    )
+    claimed_at = models.DateTimeField(
+        verbose_name=_("Claimed at"),
+        null=True,
+        blank=True,
+        help_text=_("Time of the current claim"),
+        db_comment="Time of the current claim",
+    )
+    claimed_until = models.DateTimeField(
+        verbose_name=_("Claimed until"),
+        null=True,
+        blank=True,
+        help_text=_("End of the claim's lease; the request is reopened after it"),
+        db_comment="End of the claim lease, the request is reopened after it",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name=_("Attempts"),
+        default=0,
+        help_text=_("Number of times the request was claimed"),
+        db_comment="Number of times the request was claimed",
+    )
+    done_at = models.DateTimeField(
+        verbose_name=_("Done at"),
+        null=True,
+        blank=True,
+        help_text=_("Time the request was handled"),
+        db_comment="Time the request was handled",
+    )
+
+    objects = SupportQueueItemManager()
+
+    class Meta:
+        verbose_name = _("Support Queue Item")
+        verbose_name_plural = _("Support Queue Items")
+        default_manager_name = "objects"
+        db_table = "sage_support_queue_item"
+        db_table_comment = "Work queue state of support requests."
+        indexes = [
+            # Claims: open items of a queue in claim order.
+            models.Index(
+                fields=["state", "queue", "-priority", "due_at"],
+                name="sage_queue_claim_idx",
+            ),
+            models.Index(fields=["state", "due_at"], name="sage_queue_due_idx"),
+            models.Index(
+                fields=["state", "claimed_until"], name="sage_queue_lease_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.queue} #{self.support_request_id} ({self.state})"
+
+    @property
+    def is_overdue(self) -> bool:
+        return self.state != QueueStates.DONE and self.due_at < timezone.now()
+
+    def _update_claim(self, **values) -> bool:
+        # Only the current claim may change the item: a claim that expired
+        # and was taken over by another worker matches no row.
+        updated = (
+            type(self)
+            ._base_manager.using(self._state.db)
+            .filter(
+                pk=self.pk,
+                state=QueueStates.CLAIMED,
+                claimed_by=self.claimed_by,
+                claimed_at=self.claimed_at,
+            )
+            .update(**values)
+        )
+        if updated:
+            for name, value in values.items():
+                setattr(self, name, value)
+        return bool(updated)
+
+    def complete(self) -> bool:
+        """
+        Mark the claimed request as done.
+
+        :return: Whether the claim was still held.
+        """
+        return self._update_claim(
+            state=QueueStates.DONE, done_at=timezone.now(), claimed_until=None
+        )
+
+    def release(self) -> bool:
+        """
+        Give the claimed request back to its queue.
+
+        :return: Whether the claim was still held.
+        """
+        return self._update_claim(
+            state=QueueStates.OPEN, claimed_by="", claimed_at=None, claimed_until=None
+        )
+
+    def renew(self, lease: Optional[timedelta] = None) -> bool:
+        """
+        Extend the claim's lease from now.
+
+        :param lease: The new lease, ``SAGE_CONTACT_QUEUE_CLAIM_TIMEOUT`` by default.
+        :return: Whether the claim was still held.
+        """
+        return self._update_claim(
+            claimed_until=timezone.now() + (lease or claim_timeout())
+        )
@@ -0,0 +1,79 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from sage_contact.repository.manager.spam import QuarantinedSupportRequestManager
+
+
+class QuarantinedSupportRequest(models.Model):
+    """
+    Support form submission held back by the spam filter.
+
+    The submitted values are kept as posted, in one flat row: no support
+    request is created, geolocated or confirmed by email until the
+    submission is released.
+    """
+
+    form_class = models.CharField(
+        verbose_name=_("Form"),
+        max_length=200,
+        help_text=_("Dotted path of the form the submission was posted to"),
+        db_comment="Dotted path of the form the submission was posted to",
+    )
+    subject = models.CharField(
+        verbose_name=_("Subject"),
+        max_length=100,
+        help_text=_("Subject of the submission"),
+        db_comment="Subject of the submission",
+    )
+    email = models.EmailField(
+        verbose_name=_("Email"),
+        help_text=_("Email address of the sender"),
+        db_comment="Email address of the sender",
+    )
+    data = models.JSONField(
+        verbose_name=_("Data"),
+        encoder=DjangoJSONEncoder,
+        help_text=_("Values of the form fields as submitted"),
+        db_comment="Values of the form fields as submitted",
+    )
+    ip_address = models.GenericIPAddressField(
+        verbose_name=_("IP Address"),
+        blank=True,
+        null=True,
+        help_text=_("IP address the submission came from"),
+        db_comment="IP address the submission came from",
+    )
+    score = models.PositiveSmallIntegerField(
+        verbose_name=_("Spam Score"),
+        help_text=_("Score given by the spam filter"),
+        db_comment="Score given by the spam filter",
+    )
+    reasons = models.CharField(
+        verbose_name=_("Reasons"),
+        max_length=200,
+        blank=True,
+        help_text=_("Checks that added to the score"),
+        db_comment="Comma-separated checks that added to the score",
+    )
+    created_at = models.DateTimeField(
+        verbose_name=_("Created at"),
+        default=timezone.now,
+        db_index=True,
+        help_text=_("Time of the submission"),
+        db_comment="Time of the submission",
+    )
+
+    objects = QuarantinedSupportRequestManager()
+
+    class Meta:
+        verbose_name = _("Quarantined Support Request")
+        verbose_name_plural = _("Quarantined Support Requests")
+        default_manager_name = "objects"
+        db_table = "sage_support_quarantine"
+        db_table_comment = "Support form submissions held back by the spam filter."
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.subject} ({self.email})"
@@ -5,10 +5,11 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django_countries.fields import CountryField
 from phonenumber_field.modelfields import PhoneNumberField
-from polymorphic.models import PolymorphicManager, PolymorphicModel
+from polymorphic.models import PolymorphicModel
 from sage_tools.mixins.models.base import TimeStampMixin
 
 from sage_contact.constants.choices import ContactMethods, ContactReasons
+from sage_contact.repository.manager.support import SupportRequestManager
 
 
 class SupportRequestBase(TimeStampMixin, PolymorphicModel):
@@ -57,6 +58,17 @@ class SupportRequestBase(TimeStampMixin, PolymorphicModel):
         ],
     )
 
+    email_key = models.CharField(
+        verbose_name=_("Email Lookup Key"),
+        max_length=254,
+        blank=True,
+        default="",
+        editable=False,
+        db_index=True,
+        help_text=_("Normalized email address, maintained automatically"),
+        db_comment="The email address lowercased and canonicalized, for lookups",
+    )
+
     message = models.TextField(
         _("Message"),
         help_text=_("The detailed message or inquiry you wish to submit."),
@@ -64,7 +76,20 @@ class SupportRequestBase(TimeStampMixin, PolymorphicModel):
         validators=[MinLengthValidator(1, message=_("The message cannot be empty."))],
     )
 
-    objects = PolymorphicManager()
+    contact = models.ForeignKey(
+        "sage_contact.Contact",
+        verbose_name=_("Contact"),
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=False,
+        related_name="support_requests",
+        help_text=_("The contact who sent the request, matched by email or phone"),
+        db_comment="The contact matched to the request, NULL until matched",
+    )
+
+    objects = SupportRequestManager()
 
     class Meta:
         verbose_name = _("Basic Contact")
@@ -72,6 +97,12 @@ class SupportRequestBase(TimeStampMixin, PolymorphicModel):
         default_manager_name = "objects"
         db_table = "sage_support_base"
         db_table_comment = "Table to store basic contact information including subject, full name, email, and message."
+        indexes = [
+            models.Index(fields=["created_at"], name="sage_support_created_idx"),
+            models.Index(
+                fields=["contact", "-created_at"], name="sage_support_contact_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.full_name}"
@@ -86,6 +117,26 @@ class SupportRequestWithPhone(SupportRequestBase):
         help_text=_("Your phone number in international format, e.g., +12025550109."),
         db_comment="The international phone number of the person contacting.",
     )
+    phone_e164 = models.CharField(
+        verbose_name=_("Phone Number (E.164)"),
+        max_length=16,
+        blank=True,
+        default="",
+        editable=False,
+        db_index=True,
+        help_text=_("Phone number normalized to E.164, maintained automatically"),
+        db_comment="The phone number normalized to E.164, empty when invalid",
+    )
+    phone_suffix = models.CharField(
+        verbose_name=_("Phone Number Suffix Key"),
+        max_length=32,
+        blank=True,
+        default="",
+        editable=False,
+        db_index=True,
+        help_text=_("Phone number digits reversed, for trailing-digit lookups"),
+        db_comment="The phone number digits reversed, for suffix lookups",
+    )
 
     class Meta:
         verbose_name = _("Contact With Phone")
@@ -115,11 +166,44 @@ class SupportRequestWithLocation(SupportRequestWithPhone):
         db_comment="The IP address from which the contact form was submitted.",
     )
 
+    ip_key = models.CharField(
+        _("IP Address Key"),
+        max_length=32,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Indexed form of the IP address for network range queries."),
+        db_comment="IP address as 32 hex digits, IPv4 in its IPv4-mapped IPv6 form; ordered like the address.",
+    )
+
+    geoip_checked_at = models.DateTimeField(
+        _("GeoIP Checked at"),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_(
+            "When the country was last looked up from the IP address; empty while the lookup is pending."
+        ),
+        db_comment="Time of the last GeoIP lookup, NULL while the lookup is pending.",
+    )
+
     class Meta:
         verbose_name = _("Contact With Location")
         verbose_name_plural = _("Contacts With Location")
         db_table = "sage_support_with_location"
         db_table_comment = "Table to store contact information including location details along with phone and basic contact details."
+        indexes = [
+            # A CIDR network is one range of keys.
+            models.Index(fields=["ip_key"], name="sage_location_ip_key_idx"),
+            # Only rows still waiting for their GeoIP lookup are indexed.
+            models.Index(
+                fields=["supportrequestwithphone_ptr"],
+                condition=models.Q(
+                    geoip_checked_at__isnull=True, ip_address__isnull=False
+                ),
+                name="sage_location_geoip_idx",
+            ),
+        ]
 
 
 class FullSupportRequest(SupportRequestWithLocation):
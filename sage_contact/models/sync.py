@@ -0,0 +1,137 @@
+from django.db import models, router, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from sage_contact.repository.manager.sync import SyncTombstoneManager
+from sage_contact.utils.history import diff
+from sage_contact.utils.sync import allocate_sync_seq, sync_enabled
+
+
+class SyncMixin(models.Model):
+    """
+    Stamp every write with a value of the sync sequence.
+
+    Saves that change nothing keep their sequence value and cost no extra
+    query; other saves take the value in the same transaction as the write.
+    """
+
+    sync_seq = models.BigIntegerField(
+        verbose_name=_("Sync Sequence"),
+        default=0,
+        editable=False,
+        help_text=_("Position of the last change in the sync sequence"),
+        db_comment="Sync sequence value of the last write, 0 if never synced",
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if (
+            not sync_enabled()
+            or update_fields is not None
+            and not update_fields
+            or not self._state.adding
+            and not diff(self, update_fields)
+        ):
+            return super().save(*args, **kwargs)
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            self.sync_seq = allocate_sync_seq(using)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "sync_seq"}
+            super().save(*args, **kwargs)
+
+
+class SyncSequence(models.Model):
+    """
+    Single-row counter handing out the sync sequence values.
+
+    Its row is locked by every writing transaction until it commits, which
+    makes sequence values visible in order.
+    """
+
+    value = models.BigIntegerField(
+        verbose_name=_("Value"),
+        default=0,
+        help_text=_("Last sequence value handed out"),
+        db_comment="Last sequence value handed out",
+    )
+    horizon = models.BigIntegerField(
+        verbose_name=_("Horizon"),
+        default=0,
+        help_text=_("Sequence value up to which tombstones were purged"),
+        db_comment="Sequence value up to which tombstones were purged",
+    )
+
+    class Meta:
+        verbose_name = _("Sync Sequence")
+        verbose_name_plural = _("Sync Sequences")
+        db_table = "sage_sync_sequence"
+        db_table_comment = "Counter of the contact sync sequence."
+
+    def __str__(self):
+        return f"{self.value}"
+
+
+class SyncTombstone(models.Model):
+    """
+    Marker of a deleted contact, custom field or contact label for sync clients.
+
+    A contact's tombstone stands for its custom fields and labels as well.
+    Tombstones are purged after a retention period with
+    ``SyncTombstone.objects.purge()``.
+    """
+
+    kind = models.PositiveSmallIntegerField(
+        verbose_name=_("Kind"),
+        help_text=_("The kind of deleted row"),
+        db_comment="1 contact, 2 custom field, 3 contact label",
+    )
+    object_id = models.BigIntegerField(
+        verbose_name=_("Object ID"),
+        help_text=_("Primary key of the deleted row"),
+        db_comment="Primary key of the deleted row",
+    )
+    contact_id = models.BigIntegerField(
+        verbose_name=_("Contact ID"),
+        help_text=_("Primary key of the contact the row belonged to"),
+        db_comment="Primary key of the contact the row belonged to",
+    )
+    tenant_id = models.PositiveBigIntegerField(
+        verbose_name=_("Tenant"),
+        default=0,
+        help_text=_("Tenant the deleted row belonged to"),
+        db_comment="Tenant the deleted row belonged to",
+    )
+    sync_seq = models.BigIntegerField(
+        verbose_name=_("Sync Sequence"),
+        help_text=_("Position of the deletion in the sync sequence"),
+        db_comment="Sync sequence value of the deletion",
+    )
+    deleted_at = models.DateTimeField(
+        verbose_name=_("Deleted at"),
+        default=timezone.now,
+        help_text=_("Time of the deletion"),
+        db_comment="Time of the deletion",
+    )
+
+    objects = SyncTombstoneManager()
+
+    class Meta:
+        verbose_name = _("Sync Tombstone")
+        verbose_name_plural = _("Sync Tombstones")
+        default_manager_name = "objects"
+        db_table = "sage_sync_tombstone"
+        db_table_comment = "Deleted contact rows, kept for incremental sync."
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "sync_seq", "kind", "object_id"],
+                name="sage_tombstone_sync_idx",
+            ),
+            models.Index(fields=["deleted_at"], name="sage_tombstone_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.object_id} deleted at {self.sync_seq}"
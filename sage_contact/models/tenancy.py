@@ -0,0 +1,23 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from sage_contact.tenancy import current_tenant
+
+
+class TenantMixin(models.Model):
+    """
+    Assign rows to a tenant; new rows take the tenant of the current context.
+
+    The column is not indexed on its own: the models' indexes lead with it.
+    """
+
+    tenant_id = models.PositiveBigIntegerField(
+        verbose_name=_("Tenant"),
+        default=current_tenant,
+        editable=False,
+        help_text=_("Tenant owning the row, 0 for the default tenant"),
+        db_comment="Tenant owning the row, 0 for the default tenant",
+    )
+
+    class Meta:
+        abstract = True
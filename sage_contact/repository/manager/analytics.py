@@ -0,0 +1,68 @@
+from typing import Iterable, Optional
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, QuerySet
+
+from sage_contact.repository.queryset.analytics import SupportRequestRollupQuerySet
+
+
+class SupportRequestRollupManager(models.Manager):
+    """
+    Custom Manager for the SupportRequestDailyRollup model.
+    """
+
+    def get_queryset(self) -> SupportRequestRollupQuerySet:
+        """
+        Override the default queryset with the custom SupportRequestRollupQuerySet.
+
+        :return: An instance of SupportRequestRollupQuerySet.
+        """
+        return SupportRequestRollupQuerySet(self.model, using=self._db)
+
+    def on_replica(self) -> SupportRequestRollupQuerySet:
+        """
+        Proxy method to mark the queryset as safe to read from the replica.
+
+        :return: A QuerySet carrying the ``replica`` routing hint.
+        """
+        return self.get_queryset().on_replica()
+
+    def between(self, start=None, end=None) -> SupportRequestRollupQuerySet:
+        """
+        Proxy method to filter rollup rows by day.
+
+        :param start: The first day to include, or ``None``.
+        :param end: The last day to include, or ``None``.
+        :return: A QuerySet of rollup rows within the range.
+        """
+        return self.get_queryset().between(start, end)
+
+    def counts(self, by: Iterable[str] = (), bucket: Optional[str] = "day") -> QuerySet:
+        """
+        Proxy method to sum submission counts per time bucket and dimension.
+
+        :param by: Dimensions to group by.
+        :param bucket: ``"day"``, ``"week"``, ``"month"`` or ``None``.
+        :return: A values QuerySet with the bucket, dimensions and ``count``.
+        """
+        return self.get_queryset().counts(by=by, bucket=bucket)
+
+    def increment(self, amount: int = 1, **key) -> None:
+        """
+        Add ``amount`` to the rollup row identified by ``key``, creating it if needed.
+
+        The row is updated with an ``F()`` expression, so concurrent submissions
+        never lose increments.
+
+        :param amount: The number to add; negative to subtract.
+        :param key: ``day`` and every rollup dimension.
+        """
+        queryset = self.get_queryset().filter(**key)
+        if queryset.update(count=F("count") + amount):
+            return
+        try:
+            with transaction.atomic(using=self.db):
+                self.create(count=amount, **key)
+        except IntegrityError:
+            # Another process created the row between our update and insert.
+            queryset.update(count=F("count") + amount)
@@ -1,11 +1,20 @@
+from datetime import date
+from typing import Callable, Iterable, List, Optional, Tuple
+
 from django.db import models
 from django.db.models import QuerySet
+
 from sage_contact.repository.queryset.contact import (
     ContactLabelQuerySet,
     ContactQuerySet,
     CustomFieldQuerySet,
     LabelQuerySet,
 )
+from sage_contact.tenancy import current_tenant
+from sage_contact.utils.directory import get_contact_directory
+from sage_contact.utils.labels import LabelEntry, get_label_catalog
+from sage_contact.utils.phone import get_contact_phone_cache, to_e164
+from sage_contact.utils.sync import SyncPage, changes_since
 
 
 class LabelManager(models.Manager):
@@ -15,12 +24,29 @@ class LabelManager(models.Manager):
 
     def get_queryset(self) -> LabelQuerySet:
         """
-        Override the default queryset with the custom LabelQuerySet.
+        Override the default queryset with the custom LabelQuerySet, scoped to
+        the current tenant.
 
         :return: An instance of LabelQuerySet.
         """
+        return self.all_tenants().for_tenant(current_tenant())
+
+    def all_tenants(self) -> LabelQuerySet:
+        """
+        Return a LabelQuerySet over the rows of every tenant.
+
+        :return: An unscoped instance of LabelQuerySet.
+        """
         return LabelQuerySet(self.model, using=self._db)
 
+    def on_replica(self) -> QuerySet:
+        """
+        Proxy method to mark the queryset as safe to read from the replica.
+
+        :return: A QuerySet carrying the ``replica`` routing hint.
+        """
+        return self.get_queryset().on_replica()
+
     def search_by_name(self, name: str) -> QuerySet:
         """
         Proxy method to search labels by name.
@@ -38,6 +64,35 @@ class LabelManager(models.Manager):
         """
         return self.get_queryset().order_by_name()
 
+    def catalog(self) -> Tuple[LabelEntry, ...]:
+        """
+        Return every label with its contact count, ordered by name, from cache.
+
+        Served from the process-local or shared label catalog; a warm catalog
+        costs no database query.
+
+        :return: A tuple of ``LabelEntry(pk, name, contact_count)``.
+        """
+        return get_label_catalog().entries(self._db or "default", current_tenant())
+
+    def catalog_search(self, name: str) -> Tuple[LabelEntry, ...]:
+        """
+        Search the cached label catalog by name, ignoring case.
+
+        :param name: The name to search for.
+        :return: A tuple of matching ``LabelEntry`` rows, ordered by name.
+        """
+        return get_label_catalog().search(name, self._db or "default", current_tenant())
+
+    def catalog_get(self, pk) -> Optional[LabelEntry]:
+        """
+        Return one label of the cached label catalog.
+
+        :param pk: The ID of the label.
+        :return: The ``LabelEntry``, or ``None`` if there is no such label.
+        """
+        return get_label_catalog().get(pk, self._db or "default", current_tenant())
+
 
 class ContactManager(models.Manager):
     """
@@ -46,12 +101,29 @@ class ContactManager(models.Manager):
 
     def get_queryset(self) -> ContactQuerySet:
         """
-        Override the default queryset with the custom ContactQuerySet.
+        Override the default queryset with the custom ContactQuerySet, scoped to
+        the current tenant.
 
         :return: An instance of ContactQuerySet.
         """
+        return self.all_tenants().for_tenant(current_tenant())
+
+    def all_tenants(self) -> ContactQuerySet:
+        """
+        Return a ContactQuerySet over the rows of every tenant.
+
+        :return: An unscoped instance of ContactQuerySet.
+        """
         return ContactQuerySet(self.model, using=self._db)
 
+    def on_replica(self) -> QuerySet:
+        """
+        Proxy method to mark the queryset as safe to read from the replica.
+
+        :return: A QuerySet carrying the ``replica`` routing hint.
+        """
+        return self.get_queryset().on_replica()
+
     def search_by_name(self, name: str) -> QuerySet:
         """
         Proxy method to search contacts by name.
@@ -69,6 +141,47 @@ class ContactManager(models.Manager):
         """
         return self.get_queryset().order_by_name()
 
+    def typeahead(self, prefix: str, limit: int = 10) -> List:
+        """
+        Return the contacts whose name, last name, email or company starts with
+        ``prefix``, best match first.
+
+        Matches come from the in-memory contact directory, built on the first
+        call in each process; only the matching contacts are fetched, with one
+        query.
+
+        :param prefix: The text typed so far.
+        :param limit: The maximum number of contacts returned.
+        :return: A list of Contact instances.
+        """
+        ids = get_contact_directory(self._db or "default", current_tenant()).search(
+            prefix, limit
+        )
+        if not ids:
+            return []
+        contacts = self.get_queryset().in_bulk(ids)
+        return [contacts[pk] for pk in ids if pk in contacts]
+
+    def changes_since(
+        self, token: Optional[str] = None, limit: Optional[int] = None
+    ) -> SyncPage:
+        """
+        Return the contact, custom field and label changes of the current tenant
+        after a sync token.
+
+        Only rows written since ``token`` and tombstones of rows deleted since
+        are read, through the ``(sync_seq, id)`` indexes. Call again with the
+        returned token while ``more`` is true.
+
+        :param token: The token of the previous page, or ``None`` for a first
+            sync, which returns every row.
+        :param limit: The maximum number of changes, bounded by
+            ``SAGE_CONTACT_SYNC_PAGE_SIZE``.
+        :raises SyncTokenExpired: If the client must sync from scratch.
+        :return: A ``SyncPage(changes, token, more)``.
+        """
+        return changes_since(token, limit, using=self._db, tenant=current_tenant())
+
     def with_email(self) -> QuerySet:
         """
         Proxy method to filter contacts that have an email address.
@@ -77,6 +190,14 @@ class ContactManager(models.Manager):
         """
         return self.get_queryset().with_email()
 
+    def without_email(self) -> QuerySet:
+        """
+        Proxy method to filter contacts that have no email address.
+
+        :return: A QuerySet of contacts without an email address.
+        """
+        return self.get_queryset().without_email()
+
     def with_phone_number(self) -> QuerySet:
         """
         Proxy method to filter contacts that have a phone number.
@@ -85,6 +206,127 @@ class ContactManager(models.Manager):
         """
         return self.get_queryset().with_phone_number()
 
+    def without_phone_number(self) -> QuerySet:
+        """
+        Proxy method to filter contacts that have no phone number.
+
+        :return: A QuerySet of contacts without a phone number.
+        """
+        return self.get_queryset().without_phone_number()
+
+    def by_email(self, email: str) -> QuerySet:
+        """
+        Proxy method to filter contacts by email address, ignoring case.
+
+        :param email: The email address as typed.
+        :return: A QuerySet of contacts with that address.
+        """
+        return self.get_queryset().by_email(email)
+
+    def matching_support_requests(self, support_requests: QuerySet) -> QuerySet:
+        """
+        Proxy method to filter contacts that share an email with support requests.
+
+        :param support_requests: A QuerySet of support requests.
+        :return: A QuerySet of matching contacts.
+        """
+        return self.get_queryset().matching_support_requests(support_requests)
+
+    def with_support_history(self) -> QuerySet:
+        """
+        Proxy method to prefetch the support requests of contacts.
+
+        :return: A QuerySet whose contacts carry ``support_requests``.
+        """
+        return self.get_queryset().with_support_history()
+
+    def by_phone(self, number, region: Optional[str] = None) -> QuerySet:
+        """
+        Proxy method to filter contacts by phone number.
+
+        :param number: A phone number in any format.
+        :param region: Region used to parse national numbers.
+        :return: A QuerySet of contacts with that number.
+        """
+        return self.get_queryset().by_phone(number, region=region)
+
+    def by_phone_suffix(self, digits: str) -> QuerySet:
+        """
+        Proxy method to filter contacts whose phone number ends with ``digits``.
+
+        :param digits: At least ``MIN_SUFFIX_DIGITS`` trailing digits.
+        :return: A QuerySet of matching contacts.
+        """
+        return self.get_queryset().by_phone_suffix(digits)
+
+    def get_by_phone(self, number, region: Optional[str] = None):
+        """
+        Return the contact behind a phone number, or ``None``.
+
+        Results, including misses, are kept in a per-process LRU for
+        ``SAGE_CONTACT_PHONE_CACHE_TIMEOUT`` seconds, so repeat callers skip the
+        database. When several contacts share the number, the oldest is returned.
+
+        :param number: A phone number in any format, e.g. an inbound caller ID.
+        :param region: Region used to parse national numbers.
+        :return: A Contact instance or ``None``.
+        """
+        e164 = to_e164(number, region)
+        if not e164:
+            return None
+        cache = get_contact_phone_cache()
+        key = f"{self.db}:{current_tenant()}:{e164}"
+        contact = cache.get(key)
+        if contact is cache._missing:
+            contact = self.get_queryset().filter(phone_e164=e164).order_by("pk").first()
+            cache.set(key, contact)
+        return contact
+
+    def upcoming_birthdays(
+        self, days: int = 7, today: Optional[date] = None
+    ) -> QuerySet:
+        """
+        Proxy method to filter contacts with a birthday in the next ``days`` days.
+
+        :param days: The window length after ``today``; ``0`` means today only.
+        :param today: The first day of the window, defaults to the local date.
+        :return: A QuerySet of contacts, soonest first.
+        """
+        return self.get_queryset().upcoming_birthdays(days=days, today=today)
+
+    def upcoming_anniversaries(
+        self, days: int = 7, today: Optional[date] = None
+    ) -> QuerySet:
+        """
+        Proxy method to filter contacts with an anniversary in the next ``days`` days.
+
+        :param days: The window length after ``today``; ``0`` means today only.
+        :param today: The first day of the window, defaults to the local date.
+        :return: A QuerySet of contacts, soonest first.
+        """
+        return self.get_queryset().upcoming_anniversaries(days=days, today=today)
+
+    def with_label(self, label_id: int) -> QuerySet:
+        """
+        Proxy method to filter contacts that carry a label.
+
+        :param label_id: The ID of the label.
+        :return: A QuerySet of labelled contacts.
+        """
+        return self.get_queryset().with_label(label_id)
+
+    def bulk_delete(
+        self, batch_size: int = 1000, progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Proxy method to delete all contacts and their dependent rows in batches.
+
+        :param batch_size: The number of contacts deleted per transaction.
+        :param progress: Called with the running total after every batch.
+        :return: The number of deleted contacts.
+        """
+        return self.get_queryset().bulk_delete(batch_size=batch_size, progress=progress)
+
 
 class CustomFieldManager(models.Manager):
     """
@@ -93,12 +335,29 @@ class CustomFieldManager(models.Manager):
 
     def get_queryset(self) -> CustomFieldQuerySet:
         """
-        Override the default queryset with the custom CustomFieldQuerySet.
+        Override the default queryset with the custom CustomFieldQuerySet, scoped to
+        the current tenant.
 
         :return: An instance of CustomFieldQuerySet.
         """
+        return self.all_tenants().for_tenant(current_tenant())
+
+    def all_tenants(self) -> CustomFieldQuerySet:
+        """
+        Return a CustomFieldQuerySet over the rows of every tenant.
+
+        :return: An unscoped instance of CustomFieldQuerySet.
+        """
         return CustomFieldQuerySet(self.model, using=self._db)
 
+    def on_replica(self) -> QuerySet:
+        """
+        Proxy method to mark the queryset as safe to read from the replica.
+
+        :return: A QuerySet carrying the ``replica`` routing hint.
+        """
+        return self.get_queryset().on_replica()
+
     def search_by_field_name(self, field_name: str) -> QuerySet:
         """
         Proxy method to search custom fields by field name.
@@ -124,12 +383,29 @@ class ContactLabelManager(models.Manager):
 
     def get_queryset(self) -> ContactLabelQuerySet:
         """
-        Override the default queryset with the custom ContactLabelQuerySet.
+        Override the default queryset with the custom ContactLabelQuerySet, scoped to
+        the current tenant.
 
         :return: An instance of ContactLabelQuerySet.
         """
+        return self.all_tenants().for_tenant(current_tenant())
+
+    def all_tenants(self) -> ContactLabelQuerySet:
+        """
+        Return a ContactLabelQuerySet over the rows of every tenant.
+
+        :return: An unscoped instance of ContactLabelQuerySet.
+        """
         return ContactLabelQuerySet(self.model, using=self._db)
 
+    def on_replica(self) -> QuerySet:
+        """
+        Proxy method to mark the queryset as safe to read from the replica.
+
+        :return: A QuerySet carrying the ``replica`` routing hint.
+        """
+        return self.get_queryset().on_replica()
+
     def search_by_contact(self, contact_id: int) -> QuerySet:
         """
         Proxy method to search contact labels by contact ID.
@@ -147,3 +423,43 @@ class ContactLabelManager(models.Manager):
         :return: A QuerySet of matching contact labels.
         """
         return self.get_queryset().search_by_label(label_id)
+
+    def bulk_assign(
+        self,
+        contacts: QuerySet,
+        label_ids: Iterable[int],
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Proxy method to attach labels to many contacts.
+
+        :param contacts: A QuerySet of contacts.
+        :param label_ids: IDs of the labels to attach.
+        :param batch_size: The number of contacts handled per transaction.
+        :param progress: Called with the number of contacts handled so far.
+        :return: The number of contacts handled.
+        """
+        return self.get_queryset().bulk_assign(
+            contacts, label_ids, batch_size=batch_size, progress=progress
+        )
+
+    def bulk_unassign(
+        self,
+        contacts: QuerySet,
+        label_ids: Iterable[int],
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Proxy method to detach labels from many contacts.
+
+        :param contacts: A QuerySet of contacts.
+        :param label_ids: IDs of the labels to detach.
+        :param batch_size: The number of contacts handled per transaction.
+        :param progress: Called with the number of contacts handled so far.
+        :return: The number of removed links.
+        """
+        return self.get_queryset().bulk_unassign(
+            contacts, label_ids, batch_size=batch_size, progress=progress
+        )
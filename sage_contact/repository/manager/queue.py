@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import models
+
+from sage_contact.repository.queryset.queue import SupportQueueItemQuerySet
+
+
+class SupportQueueItemManager(models.Manager):
+    """
+    Custom Manager for the SupportQueueItem model.
+    """
+
+    def get_queryset(self) -> SupportQueueItemQuerySet:
+        """
+        Override the default queryset with the custom SupportQueueItemQuerySet.
+
+        :return: An instance of SupportQueueItemQuerySet.
+        """
+        return SupportQueueItemQuerySet(self.model, using=self._db)
+
+    def open(self) -> SupportQueueItemQuerySet:
+        """
+        Proxy method to filter the items waiting to be claimed.
+
+        :return: A QuerySet of open items.
+        """
+        return self.get_queryset().open()
+
+    def claimed(self) -> SupportQueueItemQuerySet:
+        """
+        Proxy method to filter the items being handled.
+
+        :return: A QuerySet of claimed items.
+        """
+        return self.get_queryset().claimed()
+
+    def in_queues(self, queues: Optional[Iterable[str]]) -> SupportQueueItemQuerySet:
+        """
+        Proxy method to filter the items of some queues.
+
+        :param queues: Queue names; ``None`` for every queue.
+        :return: A QuerySet of queue items.
+        """
+        return self.get_queryset().in_queues(queues)
+
+    def overdue(self, now: Optional[datetime] = None) -> SupportQueueItemQuerySet:
+        """
+        Proxy method to filter the open and claimed items past their deadline.
+
+        :param now: The reference time, now by default.
+        :return: A QuerySet of overdue items.
+        """
+        return self.get_queryset().overdue(now)
+
+    def claim(
+        self,
+        worker: str,
+        queues: Optional[Iterable[str]] = None,
+        limit: int = 1,
+        lease: Optional[timedelta] = None,
+    ) -> List[Any]:
+        """
+        Proxy method to claim the next open items for ``worker``.
+
+        :param worker: Name of the agent or worker, stored in ``claimed_by``.
+        :param queues: Queue names to claim from; ``None`` for every queue.
+        :param limit: The maximum number of items to claim.
+        :param lease: How long the claim holds,
+            ``SAGE_CONTACT_QUEUE_CLAIM_TIMEOUT`` by default.
+        :return: The claimed items in claim order.
+        """
+        return self.get_queryset().claim(worker, queues, limit, lease)
+
+    def requeue_expired(self, now: Optional[datetime] = None) -> int:
+        """
+        Proxy method to reopen the claimed items whose lease ran out.
+
+        :param now: The reference time, now by default.
+        :return: The number of reopened items.
+        """
+        return self.get_queryset().requeue_expired(now)
+
+    def stats(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Proxy method to count the open, claimed and overdue items per queue.
+
+        :param now: The reference time, now by default.
+        :return: One dict per queue.
+        """
+        return self.get_queryset().stats(now)
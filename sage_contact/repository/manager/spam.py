@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.db import models
+
+from sage_contact.repository.queryset.spam import QuarantinedSupportRequestQuerySet
+
+
+class QuarantinedSupportRequestManager(models.Manager):
+    """
+    Custom Manager for the QuarantinedSupportRequest model.
+    """
+
+    def get_queryset(self) -> QuarantinedSupportRequestQuerySet:
+        """
+        Override the default queryset with the custom QuarantinedSupportRequestQuerySet.
+
+        :return: An instance of QuarantinedSupportRequestQuerySet.
+        """
+        return QuarantinedSupportRequestQuerySet(self.model, using=self._db)
+
+    def older_than(self, age: timedelta) -> QuarantinedSupportRequestQuerySet:
+        """
+        Proxy method to filter the submissions quarantined more than ``age`` ago.
+
+        :param age: The minimum time spent in quarantine.
+        :return: A QuerySet of quarantined submissions.
+        """
+        return self.get_queryset().older_than(age)
+
+    def release(self) -> int:
+        """
+        Proxy method to submit every quarantined submission through its form.
+
+        :return: The number of released submissions.
+        """
+        return self.get_queryset().release()
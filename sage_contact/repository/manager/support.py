@@ -0,0 +1,126 @@
+from typing import Callable, List, Optional
+
+from polymorphic.managers import PolymorphicManager
+
+from sage_contact.repository.queryset.support import SupportRequestQuerySet
+
+
+class SupportRequestManager(PolymorphicManager):
+    """
+    Custom polymorphic Manager for the SupportRequestBase model.
+    """
+
+    queryset_class = SupportRequestQuerySet
+
+    def on_replica(self) -> SupportRequestQuerySet:
+        """
+        Proxy method to mark the queryset as safe to read from the replica.
+
+        :return: A QuerySet carrying the ``replica`` routing hint.
+        """
+        return self.get_queryset().on_replica()
+
+    def created_since(self, since) -> SupportRequestQuerySet:
+        """
+        Proxy method to filter support requests created at or after ``since``.
+
+        :param since: A timezone-aware datetime.
+        :return: A QuerySet of support requests newer than ``since``.
+        """
+        return self.get_queryset().created_since(since)
+
+    def in_network(self, network) -> SupportRequestQuerySet:
+        """
+        Proxy method to filter support requests sent from an IP network.
+
+        :param network: A network in CIDR notation, or a single address.
+        :return: A QuerySet of support requests sent from the network.
+        """
+        return self.get_queryset().in_network(network)
+
+    def subnet_counts(
+        self, prefix: int = 24, v6_prefix: int = 64, since=None
+    ) -> List[dict]:
+        """
+        Proxy method to count support requests per subnet, busiest first.
+
+        :param prefix: Prefix length of IPv4 subnets.
+        :param v6_prefix: Prefix length of IPv6 subnets.
+        :param since: Only count requests created from this time on.
+        :return: ``{"subnet", "count", "first", "last"}`` dicts.
+        """
+        return self.get_queryset().subnet_counts(prefix, v6_prefix, since)
+
+    def created_before(self, cutoff) -> SupportRequestQuerySet:
+        """
+        Proxy method to filter support requests created before ``cutoff``.
+
+        :param cutoff: A timezone-aware datetime.
+        :return: A QuerySet of support requests older than ``cutoff``.
+        """
+        return self.get_queryset().created_before(cutoff)
+
+    def unmatched(self) -> SupportRequestQuerySet:
+        """
+        Proxy method to filter support requests not attached to a contact yet.
+
+        :return: A QuerySet of unmatched support requests.
+        """
+        return self.get_queryset().unmatched()
+
+    def support_history(self, contact_id: int) -> SupportRequestQuerySet:
+        """
+        Proxy method to fetch the support requests of a contact in one query.
+
+        :param contact_id: The ID of the contact.
+        :return: A non-polymorphic QuerySet of support requests, newest first.
+        """
+        return self.get_queryset().support_history(contact_id)
+
+    def by_email(self, email: str) -> SupportRequestQuerySet:
+        """
+        Proxy method to filter support requests by email address, ignoring case.
+
+        :param email: The email address as typed.
+        :return: A QuerySet of support requests sent from that address.
+        """
+        return self.get_queryset().by_email(email)
+
+    def with_matched_contact(self) -> SupportRequestQuerySet:
+        """
+        Proxy method to annotate support requests with ``matched_contact_id``.
+
+        :return: The annotated QuerySet.
+        """
+        return self.get_queryset().with_matched_contact()
+
+    def by_phone(self, number, region: Optional[str] = None) -> SupportRequestQuerySet:
+        """
+        Proxy method to filter support requests by phone number.
+
+        :param number: A phone number in any format.
+        :param region: Region used to parse national numbers.
+        :return: A QuerySet of support requests with that number.
+        """
+        return self.get_queryset().by_phone(number, region=region)
+
+    def by_phone_suffix(self, digits: str) -> SupportRequestQuerySet:
+        """
+        Proxy method to filter support requests whose phone number ends with ``digits``.
+
+        :param digits: At least ``MIN_SUFFIX_DIGITS`` trailing digits.
+        :return: A QuerySet of matching support requests.
+        """
+        return self.get_queryset().by_phone_suffix(digits)
+
+    def bulk_delete(
+        self, batch_size: int = 1000, progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Proxy method to delete all support requests across every table.
+
+        :param batch_size: The number of requests deleted per transaction.
+        :param progress: Called with the running total after every batch.
+        :return: The number of deleted support requests.
+        """
+        return self.get_queryset().bulk_delete(batch_size=batch_size, progress=progress)
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.db import models
+
+from sage_contact.repository.queryset.sync import SyncTombstoneQuerySet
+from sage_contact.utils.sync import purge_tombstones
+
+
+class SyncTombstoneManager(models.Manager):
+    """
+    Custom Manager for the SyncTombstone model.
+    """
+
+    def get_queryset(self) -> SyncTombstoneQuerySet:
+        """
+        Override the default queryset with the custom SyncTombstoneQuerySet.
+
+        :return: An instance of SyncTombstoneQuerySet.
+        """
+        return SyncTombstoneQuerySet(self.model, using=self._db)
+
+    def for_contact(self, contact_id: int) -> SyncTombstoneQuerySet:
+        """
+        Proxy method to filter the tombstones of one contact and of its rows.
+
+        :param contact_id: The ID of the contact.
+        :return: A QuerySet of tombstones.
+        """
+        return self.get_queryset().for_contact(contact_id)
+
+    def purge(self, older_than: timedelta) -> int:
+        """
+        Delete tombstones older than ``older_than``.
+
+        Clients whose sync token predates the purged tombstones must sync
+        from scratch.
+
+        :param older_than: The retention period of tombstones.
+        :return: The number of deleted tombstones.
+        """
+        return purge_tombstones(older_than, using=self._db)
@@ -0,0 +1,78 @@
+from typing import Iterable, Optional
+
+from django.db.models import F, QuerySet, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from sage_contact.repository.queryset.routing import ReplicaQuerySetMixin
+
+ROLLUP_DIMENSIONS = (
+    "request_type",
+    "contact_reason",
+    "preferred_contact_method",
+    "country",
+)
+ROLLUP_BUCKETS = {
+    "day": None,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+
+
+class SupportRequestRollupQuerySet(ReplicaQuerySetMixin, QuerySet):
+    """
+    Custom QuerySet for the SupportRequestDailyRollup model.
+    """
+
+    def between(self, start=None, end=None) -> "SupportRequestRollupQuerySet":
+        """
+        Filter rollup rows by day, both bounds inclusive.
+
+        :param start: The first day to include, or ``None``.
+        :param end: The last day to include, or ``None``.
+        :return: A QuerySet of rollup rows within the range.
+        """
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(day__gte=start)
+        if end is not None:
+            queryset = queryset.filter(day__lte=end)
+        return queryset
+
+    def for_type(self, model) -> "SupportRequestRollupQuerySet":
+        """
+        Filter rollup rows by support request model.
+
+        :param model: A support request model class.
+        :return: A QuerySet of rollup rows of that model.
+        """
+        return self.filter(request_type=model._meta.label)
+
+    def counts(self, by: Iterable[str] = (), bucket: Optional[str] = "day") -> QuerySet:
+        """
+        Sum the submission counts per time bucket and dimension.
+
+        :param by: Dimensions to group by, a subset of ``ROLLUP_DIMENSIONS``.
+        :param bucket: ``"day"``, ``"week"``, ``"month"`` or ``None`` for totals.
+        :return: A values QuerySet with ``bucket`` (unless ``None``), the
+            requested dimensions and ``count``, read from the replica when
+            one is configured.
+        """
+        by = tuple(by)
+        unknown = set(by) - set(ROLLUP_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown rollup dimensions: {', '.join(sorted(unknown))}")
+        if bucket is not None and bucket not in ROLLUP_BUCKETS:
+            raise ValueError(f"Unknown rollup bucket: {bucket}")
+
+        queryset = self.on_replica()
+        fields = list(by)
+        if bucket is not None:
+            trunc = ROLLUP_BUCKETS[bucket]
+            queryset = queryset.annotate(bucket=trunc("day") if trunc else F("day"))
+            fields.insert(0, "bucket")
+        return (
+            queryset.order_by()
+            .values(*fields)
+            .annotate(count=Sum("count"))
+            .order_by(*fields)
+        )
@@ -0,0 +1,77 @@
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from django.db import models
+from django.db.models import QuerySet
+
+
+def iter_pk_batches(queryset: QuerySet, batch_size: int = 1000) -> Iterator[List]:
+    """
+    Yield the primary keys of ``queryset`` in ascending batches.
+
+    Batches are fetched with keyset pagination (``pk > last``), so the whole
+    selection is never loaded at once and rows deleted between batches do not
+    shift the following ones.
+
+    :param queryset: The selection to walk.
+    :param batch_size: The number of primary keys per batch.
+    """
+    if hasattr(queryset, "non_polymorphic"):
+        queryset = queryset.non_polymorphic()
+    queryset = queryset.order_by("pk").values_list("pk", flat=True)
+    last = None
+    while True:
+        batch = queryset if last is None else queryset.filter(pk__gt=last)
+        pks = list(batch[:batch_size])
+        if not pks:
+            return
+        yield pks
+        last = pks[-1]
+
+
+def run_in_batches(
+    queryset: QuerySet,
+    func: Callable[[List], int],
+    batch_size: int = 1000,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Call ``func`` with every batch of primary keys of ``queryset``.
+
+    :param func: Receives a list of primary keys and returns the number of
+        rows it handled.
+    :param progress: Called with the running total after every batch.
+    :return: The total returned by ``func``.
+    """
+    total = 0
+    for pks in iter_pk_batches(queryset, batch_size):
+        total += func(pks)
+        if progress is not None:
+            progress(total)
+    return total
+
+
+def clear_relations(model: type, pks: Iterable, using: str, raw: bool = False) -> None:
+    """
+    Apply ``on_delete`` of the relations pointing at ``model`` rows ``pks``.
+
+    Multi-table inheritance parent links are skipped. Cascading relations are
+    deleted, ``SET_NULL`` ones are cleared; other behaviours are left to the
+    database constraints.
+
+    :param raw: Delete cascaded rows that nothing else points at with a plain
+        DELETE, without loading them or sending delete signals.
+    """
+    for relation in model._meta.related_objects:
+        field = relation.field
+        if getattr(field, "remote_field", None) and field.remote_field.parent_link:
+            continue
+        related = relation.related_model._base_manager.using(using).filter(
+            **{f"{field.name}__in": pks}
+        )
+        if relation.on_delete is models.CASCADE:
+            if raw and not relation.related_model._meta.related_objects:
+                related._raw_delete(using)
+            else:
+                related.delete()
+        elif relation.on_delete is models.SET_NULL:
+            related.update(**{field.name: None})
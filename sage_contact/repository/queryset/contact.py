@@ -1,8 +1,88 @@
-from django.db import models
+from collections import Counter
+from datetime import date
+from typing import Callable, Iterable, List, Optional
+
+from django.db import models, transaction
 from django.db.models import QuerySet
+from django.utils import timezone
+
+from sage_contact.repository.queryset.bulk import (
+    clear_relations,
+    iter_pk_batches,
+    run_in_batches,
+)
+from sage_contact.repository.queryset.history import ChangeHistoryQuerySetMixin
+from sage_contact.repository.queryset.routing import ReplicaQuerySetMixin
+from sage_contact.repository.queryset.sync import SyncQuerySetMixin
+from sage_contact.repository.queryset.tenancy import TenantQuerySetMixin
+from sage_contact.settings.app import app_settings
+from sage_contact.utils.directory import (
+    directory_changed,
+    directory_removed,
+    directory_saved,
+    directory_tracks,
+    suspend_directory,
+)
+from sage_contact.utils.email import normalize_email, set_email_key
+from sage_contact.utils.history import (
+    DERIVED_CONTACT_FIELDS,
+    entry,
+    history_enabled,
+    record,
+    record_bulk_update,
+    suspend_history,
+    to_json,
+)
+from sage_contact.utils.labels import adjust_tenant_label_counts
+from sage_contact.utils.reminders import day_key, set_date_keys, upcoming_filter
+from sage_contact.utils.phone import (
+    get_contact_phone_cache,
+    phone_suffix_filter,
+    set_phone_keys,
+    to_e164,
+)
+from sage_contact.utils.sync import allocate_sync_seq, record_tombstones, sync_enabled
+
+# The lookup keys a bulk_update() must refresh: (changed field, setter, keys).
+LOOKUP_KEYS = (
+    ("email", set_email_key, ("email_key",)),
+    ("birthday", set_date_keys, ("birthday_key",)),
+    ("anniversary", set_date_keys, ("anniversary_key",)),
+    ("phone_number", set_phone_keys, ("phone_e164", "phone_suffix")),
+)
+
+
+def fill_lookup_keys(objs: List, fields: List[str]) -> List[str]:
+    """
+    Refresh the lookup keys derived from ``fields`` on ``objs`` in one pass.
+
+    :return: ``fields`` followed by the keys to write with them.
+    """
+    fields = list(fields)
+    setters = []
+    for field, setter, keys in LOOKUP_KEYS:
+        if field in fields:
+            if setter not in setters:
+                setters.append(setter)
+            fields += [key for key in keys if key not in fields]
+    if setters:
+        for obj in objs:
+            for setter in setters:
+                setter(obj)
+    return fields
 
 
-class LabelQuerySet(QuerySet):
+def refresh_lookup_keys(batch: QuerySet, fields: List[str]) -> None:
+    """
+    Recompute the lookup keys of the ``batch`` rows after ``fields`` were set
+    by expressions, with one SELECT and one UPDATE.
+    """
+    objs = list(batch.only(*(field for field, _, _ in LOOKUP_KEYS)))
+    keys = fill_lookup_keys(objs, fields)[len(fields) :]
+    batch.model._base_manager.using(batch.db).bulk_update(objs, keys)
+
+
+class LabelQuerySet(ReplicaQuerySetMixin, TenantQuerySetMixin, QuerySet):
     """
     Custom QuerySet for the Label model.
     """
@@ -14,7 +94,7 @@ class LabelQuerySet(QuerySet):
         :param name: The name to search for.
         :return: A QuerySet of matching labels.
         """
-        return self.filter(name__icontains=name)
+        return self.on_replica().filter(name__icontains=name)
 
     def order_by_name(self) -> QuerySet:
         """
@@ -22,10 +102,16 @@ class LabelQuerySet(QuerySet):
 
         :return: A QuerySet of labels ordered by name.
         """
-        return self.order_by("name")
+        return self.on_replica().order_by("name")
 
 
-class ContactQuerySet(QuerySet):
+class ContactQuerySet(
+    ReplicaQuerySetMixin,
+    TenantQuerySetMixin,
+    ChangeHistoryQuerySetMixin,
+    SyncQuerySetMixin,
+    QuerySet,
+):
     """
     Custom QuerySet for the Contact model.
     """
@@ -37,7 +123,7 @@ class ContactQuerySet(QuerySet):
         :param name: The name to search for.
         :return: A QuerySet of matching contacts.
         """
-        return self.filter(
+        return self.on_replica().filter(
             models.Q(first_name__icontains=name) | models.Q(last_name__icontains=name)
         )
 
@@ -47,7 +133,7 @@ class ContactQuerySet(QuerySet):
 
         :return: A QuerySet of contacts ordered by last name, then first name.
         """
-        return self.order_by("last_name", "first_name")
+        return self.on_replica().order_by("last_name", "first_name")
 
     def with_email(self) -> QuerySet:
         """
@@ -55,7 +141,15 @@ class ContactQuerySet(QuerySet):
 
         :return: A QuerySet of contacts with an email address.
         """
-        return self.exclude(email="")
+        return self.filter(email__isnull=False).exclude(email="")
+
+    def without_email(self) -> QuerySet:
+        """
+        Filter contacts that have no email address.
+
+        :return: A QuerySet of contacts without an email address.
+        """
+        return self.filter(models.Q(email__isnull=True) | models.Q(email=""))
 
     def with_phone_number(self) -> QuerySet:
         """
@@ -63,10 +157,262 @@ class ContactQuerySet(QuerySet):
 
         :return: A QuerySet of contacts with a phone number.
         """
-        return self.exclude(phone_number="")
+        return self.filter(phone_number__isnull=False).exclude(phone_number="")
+
+    def without_phone_number(self) -> QuerySet:
+        """
+        Filter contacts that have no phone number.
+
+        :return: A QuerySet of contacts without a phone number.
+        """
+        return self.filter(
+            models.Q(phone_number__isnull=True) | models.Q(phone_number="")
+        )
+
+    def by_email(self, email: str) -> QuerySet:
+        """
+        Filter contacts by email address, ignoring case, through the indexed key.
+
+        :param email: The email address as typed.
+        :return: A QuerySet of contacts with that address.
+        """
+        key = normalize_email(email)
+        if not key:
+            return self.none()
+        return self.filter(email_key=key)
+
+    def matching_support_requests(self, support_requests: QuerySet) -> QuerySet:
+        """
+        Filter contacts that share an email key with ``support_requests``.
+
+        Runs as one semi-join on the indexed ``email_key`` columns.
+
+        :param support_requests: A QuerySet of support requests.
+        :return: A QuerySet of matching contacts.
+        """
+        return self.filter(
+            email_key__in=support_requests.non_polymorphic()
+            .exclude(email_key="")
+            .values("email_key")
+        )
+
+    def with_support_history(self) -> QuerySet:
+        """
+        Prefetch the support requests of the contacts, newest first.
+
+        All contacts' requests are loaded in a single extra query with their
+        child tables joined in (see ``SupportRequestQuerySet.support_history``).
+
+        :return: A QuerySet whose contacts carry ``support_requests``.
+        """
+        from sage_contact.models import SupportRequestBase
+        from sage_contact.repository.queryset.support import SUPPORT_CHILD_PATH
+
+        return self.prefetch_related(
+            models.Prefetch(
+                "support_requests",
+                queryset=SupportRequestBase.objects.non_polymorphic()
+                .select_related(SUPPORT_CHILD_PATH)
+                .order_by("-created_at"),
+            )
+        )
+
+    def by_phone(self, number, region: Optional[str] = None) -> QuerySet:
+        """
+        Filter contacts by phone number through the indexed E.164 key.
+
+        :param number: A phone number in any format, e.g. an inbound caller ID.
+        :param region: Region used to parse national numbers, defaults to
+            ``PHONENUMBER_DEFAULT_REGION``.
+        :return: A QuerySet of contacts with that number, empty if it is invalid.
+        """
+        e164 = to_e164(number, region)
+        if not e164:
+            return self.none()
+        return self.filter(phone_e164=e164)
+
+    def by_phone_suffix(self, digits: str) -> QuerySet:
+        """
+        Filter contacts whose phone number ends with ``digits``.
+
+        Served by a range scan on the indexed reversed-digits key.
+
+        :param digits: At least ``MIN_SUFFIX_DIGITS`` trailing digits.
+        :return: A QuerySet of matching contacts.
+        """
+        return self.filter(**phone_suffix_filter("phone_suffix", digits))
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Fill the lookup keys and log the creations, as ``save()`` signals would.
+        """
+        objs = list(objs)
+        for obj in objs:
+            set_email_key(obj)
+            set_phone_keys(obj)
+            set_date_keys(obj)
+        created = super().bulk_create(objs, *args, **kwargs)
+        directory_saved(created, self.db)
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """
+        Keep the lookup keys in step when ``email`` or ``phone_number`` change.
+
+        Changed values are logged in the change history with one INSERT.
+        """
+        objs = list(objs)
+        logged = list(fields)
+        fields = fill_lookup_keys(objs, logged)
+        with transaction.atomic(using=self.db, savepoint=False):
+            # The CASE updates of bulk_update() are logged and indexed here,
+            # not by update().
+            with suspend_history(), suspend_directory():
+                rows = super().bulk_update(objs, fields, *args, **kwargs)
+            if history_enabled():
+                record_bulk_update(objs, logged, self.db)
+            if directory_tracks(fields, self.db):
+                directory_saved(objs, self.db)
+        if "phone_number" in fields:
+            get_contact_phone_cache().clear()
+        return rows
+
+    def update(self, **kwargs):
+        """
+        Update the selected contacts and log the new values.
 
+        The lookup keys of a changed ``email``, ``phone_number``, ``birthday``
+        or ``anniversary`` are written by the same UPDATE.
 
-class CustomFieldQuerySet(QuerySet):
+        Without history, a loaded directory or a key source set by an
+        expression this is a single UPDATE. Otherwise the selection is updated
+        in primary key batches of ``SAGE_CONTACT_BULK_BATCH_SIZE``, each
+        logged with one INSERT, so the keys of a large selection are never
+        loaded at once. All batches share one transaction and one sync
+        sequence value. Values given as expressions are read back after each
+        batch.
+        """
+        if self.query.is_sliced:
+            raise TypeError("Cannot update a query once a slice has been taken.")
+        self._for_write = True
+        sources = [field for field, _, _ in LOOKUP_KEYS if field in kwargs]
+        computed = [
+            field for field in sources if hasattr(kwargs[field], "resolve_expression")
+        ]
+        if sources and not computed:
+            # Plain values: derive the keys once, on an unsaved instance.
+            probe = self.model(**{field: kwargs[field] for field in sources})
+            keys = fill_lookup_keys([probe], sources)[len(sources) :]
+            kwargs.update((key, getattr(probe, key)) for key in keys)
+        if "phone_number" in kwargs:
+            # Cached lookups of the old and new numbers are stale.
+            get_contact_phone_cache().clear()
+        indexed = directory_tracks(kwargs, self.db)
+        if not history_enabled() and not indexed and not computed:
+            return super().update(**kwargs)
+        opts = self.model._meta
+        attnames = [
+            opts.get_field(name).attname
+            for name in kwargs
+            if opts.get_field(name).attname not in DERIVED_CONTACT_FIELDS
+        ]
+        logged = bool(attnames) and history_enabled()
+        rows = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            if sync_enabled() and "sync_seq" not in kwargs:
+                kwargs["sync_seq"] = allocate_sync_seq(self.db)
+            base = self.model._base_manager.using(self.db)
+            for pks in iter_pk_batches(self, app_settings.bulk_batch_size):
+                batch = base.filter(pk__in=pks)
+                rows += batch.update(**kwargs)
+                if computed:
+                    refresh_lookup_keys(batch, sources)
+                if indexed:
+                    directory_changed(pks, self.db)
+                if logged:
+                    record_update(batch, kwargs, attnames, self.db)
+        return rows
+
+    def upcoming_birthdays(
+        self, days: int = 7, today: Optional[date] = None
+    ) -> QuerySet:
+        """
+        Filter contacts whose birthday falls within the next ``days`` days.
+
+        Served by a range scan on the indexed ``birthday_key``; windows that
+        cross the new year and February 29 birthdays are handled.
+
+        :param days: The window length after ``today``; ``0`` means today only.
+        :param today: The first day of the window, defaults to the local date.
+        :return: A QuerySet of contacts, soonest first.
+        """
+        return self._upcoming("birthday_key", days, today)
+
+    def upcoming_anniversaries(
+        self, days: int = 7, today: Optional[date] = None
+    ) -> QuerySet:
+        """
+        Filter contacts whose anniversary falls within the next ``days`` days.
+
+        :param days: The window length after ``today``; ``0`` means today only.
+        :param today: The first day of the window, defaults to the local date.
+        :return: A QuerySet of contacts, soonest first.
+        """
+        return self._upcoming("anniversary_key", days, today)
+
+    def _upcoming(self, field: str, days: int, today: Optional[date]) -> QuerySet:
+        today = today or timezone.localdate()
+        first = day_key(today)
+        return self.filter(upcoming_filter(field, today, days)).order_by(
+            models.Case(
+                models.When(**{f"{field}__gte": first, "then": 0}),
+                default=1,
+                output_field=models.IntegerField(),
+            ),
+            field,
+            "pk",
+        )
+
+    def with_label(self, label_id: int) -> QuerySet:
+        """
+        Filter contacts that carry the label ``label_id``.
+
+        The contact/label pair is unique, so the join never duplicates rows.
+
+        :param label_id: The ID of the label.
+        :return: A QuerySet of labelled contacts.
+        """
+        return self.filter(contactlabel__label_id=label_id)
+
+    def bulk_delete(
+        self, batch_size: int = 1000, progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Delete the selected contacts and their dependent rows in batches.
+
+        Every batch issues one DELETE per related table and one for the
+        contacts, without loading the objects or sending delete signals, and
+        logs the deletions in the change history with one INSERT.
+
+        :param batch_size: The number of contacts deleted per transaction.
+        :param progress: Called with the running total after every batch.
+        :return: The number of deleted contacts.
+        """
+        return run_in_batches(
+            self,
+            lambda pks: delete_contacts(pks, self.db),
+            batch_size=batch_size,
+            progress=progress,
+        )
+
+
+class CustomFieldQuerySet(
+    ReplicaQuerySetMixin,
+    TenantQuerySetMixin,
+    ChangeHistoryQuerySetMixin,
+    SyncQuerySetMixin,
+    QuerySet,
+):
     """
     Custom QuerySet for the CustomField model.
     """
@@ -78,7 +424,7 @@ class CustomFieldQuerySet(QuerySet):
         :param field_name: The field name to search for.
         :return: A QuerySet of matching custom fields.
         """
-        return self.filter(field_name__icontains=field_name)
+        return self.on_replica().filter(field_name__icontains=field_name)
 
     def order_by_field_name(self) -> QuerySet:
         """
@@ -86,10 +432,16 @@ class CustomFieldQuerySet(QuerySet):
 
         :return: A QuerySet of custom fields ordered by field name.
         """
-        return self.order_by("field_name")
+        return self.on_replica().order_by("field_name")
 
 
-class ContactLabelQuerySet(QuerySet):
+class ContactLabelQuerySet(
+    ReplicaQuerySetMixin,
+    TenantQuerySetMixin,
+    ChangeHistoryQuerySetMixin,
+    SyncQuerySetMixin,
+    QuerySet,
+):
     """
     Custom QuerySet for the ContactLabel model.
     """
@@ -98,16 +450,280 @@ class ContactLabelQuerySet(QuerySet):
         """
         Search contact labels by contact ID.
 
+        The contact and label are joined in, so rendering the results does
+        not issue a query per row.
+
         :param contact_id: The ID of the contact.
         :return: A QuerySet of matching contact labels.
         """
-        return self.filter(contact_id=contact_id)
+        return (
+            self.on_replica()
+            .filter(contact_id=contact_id)
+            .select_related("contact", "label")
+        )
 
     def search_by_label(self, label_id: int) -> QuerySet:
         """
         Search contact labels by label ID.
 
+        The contact and label are joined in, so rendering the results does
+        not issue a query per row.
+
         :param label_id: The ID of the label.
         :return: A QuerySet of matching contact labels.
         """
-        return self.filter(label_id=label_id)
+        return (
+            self.on_replica()
+            .filter(label_id=label_id)
+            .select_related("contact", "label")
+        )
+
+    def bulk_create(self, objs, *args, ignore_conflicts=False, **kwargs):
+        """
+        Count the new links in ``Label.contact_count``.
+
+        With ``ignore_conflicts`` the database does not report which links
+        were inserted; use :meth:`bulk_assign`, which counts them.
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(
+                objs, *args, ignore_conflicts=ignore_conflicts, **kwargs
+            )
+            if not ignore_conflicts:
+                adjust_tenant_label_counts(
+                    Counter((obj.tenant_id, obj.label_id) for obj in objs), self.db
+                )
+        return objs
+
+    def bulk_assign(
+        self,
+        contacts: QuerySet,
+        label_ids: Iterable[int],
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Attach every label in ``label_ids`` to every contact in ``contacts``.
+
+        Links are inserted with ``bulk_create(ignore_conflicts=True)``, so
+        existing links are skipped by the database instead of being checked
+        one by one. The links of a batch are read before and after the
+        insert, so only the new ones are counted in ``Label.contact_count``
+        and logged in the change history.
+
+        :param contacts: A QuerySet of contacts.
+        :param label_ids: IDs of the labels to attach.
+        :param batch_size: The number of contacts handled per transaction.
+        :param progress: Called with the number of contacts handled so far.
+        :return: The number of contacts handled.
+        """
+        from sage_contact.models import ContactChange
+
+        label_ids = list(label_ids)
+
+        def assign(contact_ids: List[int]) -> int:
+            links = self.filter(contact_id__in=contact_ids, label_id__in=label_ids)
+            with transaction.atomic(using=self.db, savepoint=False):
+                existing = set(links.values_list("pk", flat=True))
+                self.bulk_create(
+                    [
+                        self.model(contact_id=contact_id, label_id=label_id)
+                        for contact_id in contact_ids
+                        for label_id in label_ids
+                    ],
+                    ignore_conflicts=True,
+                )
+                # Conflicting inserts return no primary keys, so the new links
+                # are read back.
+                added = [
+                    link
+                    for link in links.values_list(
+                        "pk", "contact_id", "label_id", "tenant_id"
+                    )
+                    if link[0] not in existing
+                ]
+                adjust_tenant_label_counts(
+                    Counter((tenant_id, label_id) for *_, label_id, tenant_id in added),
+                    self.db,
+                )
+                if history_enabled():
+                    record(
+                        [
+                            entry(
+                                self.model,
+                                contact_id,
+                                pk,
+                                ContactChange.Action.CREATE,
+                                {"contact_id": contact_id, "label_id": label_id},
+                                tenant_id,
+                            )
+                            for pk, contact_id, label_id, tenant_id in added
+                        ],
+                        self.db,
+                    )
+            return len(contact_ids)
+
+        if not label_ids:
+            return 0
+        return run_in_batches(contacts, assign, batch_size, progress)
+
+    def bulk_unassign(
+        self,
+        contacts: QuerySet,
+        label_ids: Iterable[int],
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Detach every label in ``label_ids`` from every contact in ``contacts``.
+
+        :param contacts: A QuerySet of contacts.
+        :param label_ids: IDs of the labels to detach.
+        :param batch_size: The number of contacts handled per transaction.
+        :param progress: Called with the number of contacts handled so far.
+        :return: The number of removed links.
+        """
+        from sage_contact.models import ContactChange
+
+        label_ids = list(label_ids)
+        if not label_ids:
+            return 0
+        removed = 0
+        handled = 0
+        for contact_ids in iter_pk_batches(contacts, batch_size):
+            links = self.filter(contact_id__in=contact_ids, label_id__in=label_ids)
+            with transaction.atomic(using=self.db, savepoint=False):
+                rows = list(
+                    links.values_list("pk", "contact_id", "label_id", "tenant_id")
+                )
+                removed += links._raw_delete(self.db)
+                adjust_tenant_label_counts(
+                    {
+                        key: -count
+                        for key, count in Counter(
+                            (tenant_id, label_id) for *_, label_id, tenant_id in rows
+                        ).items()
+                    },
+                    self.db,
+                )
+                if history_enabled():
+                    record(
+                        [
+                            entry(
+                                self.model,
+                                contact_id,
+                                pk,
+                                ContactChange.Action.DELETE,
+                                tenant_id=tenant_id,
+                            )
+                            for pk, contact_id, _, tenant_id in rows
+                        ],
+                        self.db,
+                    )
+                record_tombstones(
+                    [
+                        (self.model, pk, contact_id, tenant_id)
+                        for pk, contact_id, _, tenant_id in rows
+                    ],
+                    self.db,
+                )
+            handled += len(contact_ids)
+            if progress is not None:
+                progress(handled)
+        return removed
+
+
+def delete_contacts(pks: Iterable[int], using: Optional[str] = None) -> int:
+    """
+    Delete contacts by primary key with one statement per table.
+
+    Relations pointing at the contact table are handled according to their
+    ``on_delete``: cascading ones are deleted, ``SET_NULL`` ones are cleared.
+
+    :param pks: Primary keys of ``Contact`` rows.
+    :param using: The database alias.
+    :return: The number of deleted contacts.
+    """
+    from sage_contact.models import Contact, ContactChange, ContactLabel
+
+    pks = list(pks)
+    if not pks:
+        return 0
+    using = using or "default"
+    with transaction.atomic(using=using):
+        tenants = []
+        if history_enabled() or sync_enabled():
+            tenants = list(
+                Contact._base_manager.using(using)
+                .filter(pk__in=pks)
+                .values_list("pk", "tenant_id")
+            )
+        if history_enabled():
+            record(
+                [
+                    entry(Contact, pk, pk, ContactChange.Action.DELETE, None, tenant_id)
+                    for pk, tenant_id in tenants
+                ],
+                using,
+            )
+        adjust_tenant_label_counts(
+            {
+                (tenant_id, label_id): -count
+                for tenant_id, label_id, count in ContactLabel._base_manager.using(
+                    using
+                )
+                .filter(contact_id__in=pks)
+                .order_by()
+                .values_list("tenant_id", "label_id")
+                .annotate(count=models.Count("pk"))
+            },
+            using,
+        )
+        # Custom fields and label links go with a plain DELETE: their removal
+        # is implied by the contact's deletion entry in the change history.
+        # The contacts' tombstones stand for their custom fields and labels.
+        if sync_enabled():
+            record_tombstones(
+                [(Contact, pk, pk, tenant_id) for pk, tenant_id in tenants], using
+            )
+        clear_relations(Contact, pks, using, raw=True)
+        directory_removed(pks, using)
+        return Contact._base_manager.using(using).filter(pk__in=pks)._raw_delete(using)
+
+
+def record_update(
+    batch: QuerySet, values: dict, attnames: List[str], using: str
+) -> None:
+    """
+    Log the new ``attnames`` values of the contacts in ``batch`` in one INSERT.
+
+    The tenants of the contacts, and values given as expressions, which are
+    only known to the database, are read back from ``batch`` with one query.
+    """
+    from sage_contact.models import Contact, ContactChange
+
+    if any(hasattr(value, "resolve_expression") for value in values.values()):
+        changes = {}
+        for row in batch.values("pk", "tenant_id", *attnames):
+            pk, tenant_id = row.pop("pk"), row.pop("tenant_id")
+            changes[pk] = tenant_id, {
+                name: to_json(value) for name, value in row.items()
+            }
+    else:
+        opts = Contact._meta
+        new = {
+            opts.get_field(name).attname: to_json(value)
+            for name, value in values.items()
+        }
+        data = {name: new[name] for name in attnames}
+        changes = {
+            pk: (tenant_id, data)
+            for pk, tenant_id in batch.values_list("pk", "tenant_id")
+        }
+    record(
+        [
+            entry(Contact, pk, pk, ContactChange.Action.UPDATE, data, tenant_id)
+            for pk, (tenant_id, data) in changes.items()
+        ],
+        using,
+    )
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from sage_contact.repository.queryset.tenancy import TenantQuerySetMixin
+from sage_contact.utils.history import history_enabled, record_bulk_create
+
+
+class ChangeHistoryQuerySetMixin:
+    """
+    Log the rows inserted by ``bulk_create`` in the change history.
+
+    The log entries are written with one INSERT in the same transaction.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        if not history_enabled():
+            return super().bulk_create(objs, *args, **kwargs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            record_bulk_create(objs, self.db)
+        return objs
+
+
+class ContactChangeQuerySet(TenantQuerySetMixin, QuerySet):
+    """
+    Custom QuerySet for the ContactChange model.
+    """
+
+    def for_contact(self, contact_id: int) -> QuerySet:
+        """
+        Filter the changes of one contact, oldest first.
+
+        Served by the ``(tenant_id, contact_id, changed_at)`` index.
+
+        :param contact_id: The ID of the contact.
+        :return: A QuerySet of changes in the order they happened.
+        """
+        return self.filter(contact_id=contact_id).order_by("changed_at", "pk")
+
+    def until(self, at: datetime) -> QuerySet:
+        """
+        Filter changes made at or before ``at``.
+
+        :param at: The point in time.
+        :return: A QuerySet of changes.
+        """
+        return self.filter(changed_at__lte=at)
@@ -0,0 +1,181 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Min, Q, QuerySet
+from django.utils import timezone
+
+from sage_contact.constants.choices import QueueStates
+
+
+class SupportQueueItemQuerySet(QuerySet):
+    """
+    Custom QuerySet for the SupportQueueItem model.
+    """
+
+    def open(self) -> QuerySet:
+        """
+        Filter the items waiting to be claimed.
+
+        :return: A QuerySet of open items.
+        """
+        return self.filter(state=QueueStates.OPEN)
+
+    def claimed(self) -> QuerySet:
+        """
+        Filter the items being handled.
+
+        :return: A QuerySet of claimed items.
+        """
+        return self.filter(state=QueueStates.CLAIMED)
+
+    def in_queues(self, queues: Optional[Iterable[str]]) -> QuerySet:
+        """
+        Filter the items of some queues.
+
+        :param queues: Queue names; ``None`` for every queue.
+        :return: A QuerySet of queue items.
+        """
+        if queues is None:
+            return self
+        if isinstance(queues, str):
+            queues = [queues]
+        return self.filter(queue__in=list(queues))
+
+    def overdue(self, now: Optional[datetime] = None) -> QuerySet:
+        """
+        Filter the open and claimed items past their SLA deadline.
+
+        :param now: The reference time, now by default.
+        :return: A QuerySet of overdue items.
+        """
+        return self.filter(
+            state__in=[QueueStates.OPEN, QueueStates.CLAIMED],
+            due_at__lt=now or timezone.now(),
+        )
+
+    def expired_claims(self, now: Optional[datetime] = None) -> QuerySet:
+        """
+        Filter the claimed items whose lease ran out.
+
+        :param now: The reference time, now by default.
+        :return: A QuerySet of claimed items.
+        """
+        return self.claimed().filter(claimed_until__lt=now or timezone.now())
+
+    def claim_order(self) -> QuerySet:
+        """
+        Order the items highest priority, then earliest deadline, first.
+
+        :return: An ordered QuerySet of queue items.
+        """
+        return self.order_by("-priority", "due_at", "pk")
+
+    def claim(
+        self,
+        worker: str,
+        queues: Optional[Iterable[str]] = None,
+        limit: int = 1,
+        lease: Optional[timedelta] = None,
+    ) -> List[Any]:
+        """
+        Claim the next open items of this selection for ``worker``.
+
+        The candidates are locked with ``SELECT ... FOR UPDATE SKIP LOCKED``
+        where the database supports it, so concurrent claims skip each
+        other's rows instead of queueing on their locks, then marked as
+        claimed in the same transaction. Only the items this call won are
+        returned, also on databases without row locks.
+
+        :param worker: Name of the agent or worker, stored in ``claimed_by``.
+        :param queues: Queue names to claim from; ``None`` for every queue.
+        :param limit: The maximum number of items to claim.
+        :param lease: How long the claim holds,
+            ``SAGE_CONTACT_QUEUE_CLAIM_TIMEOUT`` by default.
+        :return: The claimed items in claim order, with their support request
+            (as ``SupportRequestBase``) selected.
+        """
+        from sage_contact.utils.queue import claim_timeout
+
+        using = self._db or router.db_for_write(self.model)
+        now = timezone.now()
+        candidates = self.using(using).in_queues(queues).open().claim_order()
+        if connections[using].features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        else:
+            candidates = candidates.select_for_update()
+        manager = self.model._base_manager.using(using)
+        with transaction.atomic(using=using):
+            pks = list(candidates.values_list("pk", flat=True)[:limit])
+            if not pks:
+                return []
+            manager.filter(pk__in=pks, state=QueueStates.OPEN).update(
+                state=QueueStates.CLAIMED,
+                claimed_by=worker,
+                claimed_at=now,
+                claimed_until=now + (lease or claim_timeout()),
+                attempts=F("attempts") + 1,
+            )
+            return list(
+                manager.filter(
+                    pk__in=pks,
+                    state=QueueStates.CLAIMED,
+                    claimed_by=worker,
+                    claimed_at=now,
+                )
+                .select_related("support_request")
+                .order_by("-priority", "due_at", "pk")
+            )
+
+    def complete(self) -> int:
+        """
+        Mark the claimed items as done.
+
+        :return: The number of completed items.
+        """
+        return self.claimed().update(
+            state=QueueStates.DONE, done_at=timezone.now(), claimed_until=None
+        )
+
+    def release(self) -> int:
+        """
+        Give the claimed items back to their queues.
+
+        :return: The number of released items.
+        """
+        return self.claimed().update(
+            state=QueueStates.OPEN, claimed_by="", claimed_at=None, claimed_until=None
+        )
+
+    def requeue_expired(self, now: Optional[datetime] = None) -> int:
+        """
+        Reopen the claimed items whose lease ran out, e.g. of crashed workers.
+
+        :param now: The reference time, now by default.
+        :return: The number of reopened items.
+        """
+        return self.expired_claims(now).update(
+            state=QueueStates.OPEN, claimed_by="", claimed_at=None, claimed_until=None
+        )
+
+    def stats(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Count the open, claimed and overdue items per queue, in one query.
+
+        :param now: The reference time, now by default.
+        :return: ``{"queue", "open", "claimed", "overdue", "next_due"}`` dicts
+            by queue name; ``next_due`` is the earliest open deadline.
+        """
+        now = now or timezone.now()
+        return list(
+            self.filter(state__in=[QueueStates.OPEN, QueueStates.CLAIMED])
+            .order_by()
+            .values("queue")
+            .annotate(
+                open=Count("pk", filter=Q(state=QueueStates.OPEN)),
+                claimed=Count("pk", filter=Q(state=QueueStates.CLAIMED)),
+                overdue=Count("pk", filter=Q(due_at__lt=now)),
+                next_due=Min("due_at", filter=Q(state=QueueStates.OPEN)),
+            )
+            .order_by("queue")
+        )
@@ -0,0 +1,24 @@
+from django.db.models import QuerySet
+
+
+class ReplicaQuerySetMixin:
+    """
+    Let read-only querysets opt in to the read replica.
+
+    The hint is read by ``sage_contact.routers.ReplicaRouter``; without the
+    router, or without ``SAGE_CONTACT_READ_DATABASE``, it has no effect.
+    """
+
+    def on_replica(self) -> QuerySet:
+        """
+        Mark the queryset as safe to read from the replica.
+
+        Results may lag behind the primary by the replication delay, so only
+        searches, listings, exports and reports should use it.
+
+        :return: A copy of the queryset carrying the ``replica`` hint.
+        """
+        clone = self._chain()
+        # Clones share the hints dict, so it is replaced rather than updated.
+        clone._hints = {**self._hints, "replica": True}
+        return clone
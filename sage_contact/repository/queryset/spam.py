@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+class QuarantinedSupportRequestQuerySet(QuerySet):
+    """
+    Custom QuerySet for the QuarantinedSupportRequest model.
+    """
+
+    def older_than(self, age: timedelta) -> QuerySet:
+        """
+        Filter the submissions quarantined more than ``age`` ago.
+
+        :param age: The minimum time spent in quarantine.
+        :return: A QuerySet of quarantined submissions.
+        """
+        return self.filter(created_at__lt=timezone.now() - age)
+
+    def release(self) -> int:
+        """
+        Submit the quarantined submissions through their form and delete them.
+
+        Released submissions skip the spam filter and go through the form's
+        validation and ``save()``, so they are stored and confirmed like any
+        other request. Submissions that no longer validate stay quarantined.
+
+        Each submission is saved and removed from quarantine in one
+        transaction, so a failure partway through never releases one twice.
+
+        :return: The number of released submissions.
+        """
+        released = 0
+        for item in self:
+            form = import_string(item.form_class)(item.data)
+            if form.is_valid():
+                with transaction.atomic(using=self.db):
+                    instance = form.save(commit=False)
+                    if item.ip_address and hasattr(instance, "ip_address"):
+                        instance.ip_address = item.ip_address
+                    instance.save()
+                    item.delete(using=self.db)
+                released += 1
+        return released
@@ -0,0 +1,255 @@
+from typing import Callable, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from polymorphic.query import PolymorphicQuerySet
+
+from sage_contact.repository.queryset.bulk import clear_relations, run_in_batches
+from sage_contact.repository.queryset.routing import ReplicaQuerySetMixin
+from sage_contact.utils.email import normalize_email, set_email_key
+from sage_contact.utils.network import network_key_range, subnet_counts
+from sage_contact.utils.phone import phone_suffix_filter, to_e164
+
+#: ``select_related`` path through every child table of ``SupportRequestBase``.
+SUPPORT_CHILD_PATH = (
+    "supportrequestwithphone__supportrequestwithlocation__fullsupportrequest"
+)
+
+
+class SupportRequestQuerySet(ReplicaQuerySetMixin, PolymorphicQuerySet):
+    """
+    Custom QuerySet for the SupportRequestBase model and its children.
+    """
+
+    def created_before(self, cutoff) -> "SupportRequestQuerySet":
+        """
+        Filter support requests created before ``cutoff``.
+
+        :param cutoff: A timezone-aware datetime.
+        :return: A QuerySet of support requests older than ``cutoff``.
+        """
+        return self.filter(created_at__lt=cutoff)
+
+    def created_since(self, since) -> "SupportRequestQuerySet":
+        """
+        Filter support requests created at or after ``since``.
+
+        :param since: A timezone-aware datetime.
+        :return: A QuerySet of support requests newer than ``since``.
+        """
+        return self.filter(created_at__gte=since)
+
+    def by_email(self, email: str) -> "SupportRequestQuerySet":
+        """
+        Filter support requests by email address, ignoring case.
+
+        :param email: The email address as typed.
+        :return: A QuerySet of support requests sent from that address.
+        """
+        key = normalize_email(email)
+        if not key:
+            return self.none()
+        return self.filter(email_key=key)
+
+    def with_matched_contact(self) -> "SupportRequestQuerySet":
+        """
+        Annotate each support request with ``matched_contact_id``.
+
+        The ID is that of the oldest ``Contact`` sharing the request's email
+        key, or ``None``. It is computed in the same query by a correlated
+        subquery on the indexed ``Contact.email_key`` column.
+
+        :return: The annotated QuerySet.
+        """
+        from sage_contact.models import Contact
+
+        return self.annotate(
+            matched_contact_id=Subquery(
+                Contact.objects.filter(email_key=OuterRef("email_key"))
+                .exclude(email_key="")
+                .order_by("pk")
+                .values("pk")[:1]
+            )
+        )
+
+    def unmatched(self) -> "SupportRequestQuerySet":
+        """
+        Filter support requests not attached to a contact yet.
+
+        :return: A QuerySet of unmatched support requests.
+        """
+        return self.filter(contact__isnull=True)
+
+    def support_history(self, contact_id: int) -> "SupportRequestQuerySet":
+        """
+        Return the support requests of a contact, newest first, in one query.
+
+        The child tables are joined with ``select_related`` instead of being
+        fetched per type, so every row is available as a base instance whose
+        child fields are reached through the cached parent links, e.g.
+        ``request.supportrequestwithphone.phone_number``.
+
+        :param contact_id: The ID of the contact.
+        :return: A non-polymorphic QuerySet of support requests.
+        """
+        return (
+            self.non_polymorphic()
+            .filter(contact_id=contact_id)
+            .select_related(SUPPORT_CHILD_PATH)
+            .order_by("-created_at")
+        )
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Fill the email key, which the ``pre_save`` signal would have set."""
+        objs = list(objs)
+        for obj in objs:
+            set_email_key(obj)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def by_phone(
+        self, number, region: Optional[str] = None
+    ) -> "SupportRequestQuerySet":
+        """
+        Filter support requests by phone number through the indexed E.164 key.
+
+        On models without a phone number (``SupportRequestBase``) the lookup
+        goes through the ``SupportRequestWithPhone`` child table.
+
+        :param number: A phone number in any format.
+        :param region: Region used to parse national numbers.
+        :return: A QuerySet of support requests with that number.
+        """
+        e164 = to_e164(number, region)
+        if not e164:
+            return self.none()
+        return self.filter(**{self._phone_lookup("phone_e164"): e164})
+
+    def by_phone_suffix(self, digits: str) -> "SupportRequestQuerySet":
+        """
+        Filter support requests whose phone number ends with ``digits``.
+
+        :param digits: At least ``MIN_SUFFIX_DIGITS`` trailing digits.
+        :return: A QuerySet of matching support requests.
+        """
+        return self.filter(
+            **phone_suffix_filter(self._phone_lookup("phone_suffix"), digits)
+        )
+
+    def _phone_lookup(self, field: str) -> str:
+        from sage_contact.models import SupportRequestWithPhone
+
+        if issubclass(self.model, SupportRequestWithPhone):
+            return field
+        return f"supportrequestwithphone__{field}"
+
+    def in_network(self, network) -> "SupportRequestQuerySet":
+        """
+        Filter support requests sent from an IP network, e.g. ``"203.0.113.0/24"``.
+
+        The network is one range of the indexed IP key. On models without an
+        IP address the lookup goes through the ``SupportRequestWithLocation``
+        child table.
+
+        :param network: A network in CIDR notation, or a single address.
+        :return: A QuerySet of support requests sent from the network.
+        :raises ValueError: If ``network`` is not a network or address.
+        """
+        first, last = network_key_range(network)
+        key = self._location_lookup("ip_key")
+        return self.filter(**{f"{key}__gte": first, f"{key}__lte": last})
+
+    def subnet_counts(
+        self, prefix: int = 24, v6_prefix: int = 64, since=None
+    ) -> List[dict]:
+        """
+        Count support requests per subnet of their IP address, busiest first.
+
+        :param prefix: Prefix length of IPv4 subnets.
+        :param v6_prefix: Prefix length of IPv6 subnets.
+        :param since: Only count requests created from this time on.
+        :return: ``{"subnet", "count", "first", "last"}`` dicts.
+        """
+        queryset = self if since is None else self.created_since(since)
+        return subnet_counts(
+            queryset, prefix, v6_prefix, key=self._location_lookup("ip_key")
+        )
+
+    def _location_lookup(self, field: str) -> str:
+        from sage_contact.models import (
+            SupportRequestWithLocation,
+            SupportRequestWithPhone,
+        )
+
+        if issubclass(self.model, SupportRequestWithLocation):
+            return field
+        if issubclass(self.model, SupportRequestWithPhone):
+            return f"supportrequestwithlocation__{field}"
+        return f"supportrequestwithphone__supportrequestwithlocation__{field}"
+
+    def bulk_delete(
+        self, batch_size: int = 1000, progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Delete the selected support requests from every polymorphic table.
+
+        Rows are deleted in batches of ``batch_size`` primary keys with one
+        DELETE statement per table, deepest child table first, instead of
+        collecting and deleting each object. No ``pre_delete``/``post_delete``
+        signals are sent for the support requests themselves.
+
+        :param batch_size: The number of requests deleted per transaction.
+        :param progress: Called with the running total after every batch.
+        :return: The number of deleted support requests.
+        """
+        return run_in_batches(
+            self,
+            lambda pks: delete_support_requests(pks, self.db),
+            batch_size=batch_size,
+            progress=progress,
+        )
+
+
+def _concrete_support_models(base: type) -> List[type]:
+    """Return ``base`` and all its concrete subclasses, deepest first."""
+    found = []
+    pending = [base]
+    while pending:
+        model = pending.pop()
+        if not model._meta.abstract and not model._meta.proxy:
+            found.append(model)
+        pending.extend(model.__subclasses__())
+    return sorted(
+        found, key=lambda model: len(model._meta.get_parent_list()), reverse=True
+    )
+
+
+def delete_support_requests(pks: Iterable[int], using: Optional[str] = None) -> int:
+    """
+    Delete support requests by primary key with one statement per table.
+
+    Relations pointing at a support request table (other than the
+    multi-table inheritance links) are handled according to their
+    ``on_delete``: cascading ones are deleted, ``SET_NULL`` ones are cleared.
+
+    :param pks: Primary keys of ``SupportRequestBase`` rows.
+    :param using: The database alias.
+    :return: The number of deleted support requests.
+    """
+    from sage_contact.models import SupportRequestBase
+
+    pks = list(pks)
+    if not pks:
+        return 0
+    using = using or "default"
+    support_models = _concrete_support_models(SupportRequestBase)
+    with transaction.atomic(using=using):
+        for model in support_models:
+            clear_relations(model, pks, using)
+        deleted = 0
+        for model in support_models:
+            count = (
+                model._base_manager.using(using).filter(pk__in=pks)._raw_delete(using)
+            )
+            if model is SupportRequestBase:
+                deleted = count
+    return deleted
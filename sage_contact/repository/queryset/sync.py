@@ -0,0 +1,55 @@
+from django.db import transaction
+from django.db.models import QuerySet
+
+from sage_contact.utils.sync import allocate_sync_seq, stamp, sync_enabled
+
+
+class SyncQuerySetMixin:
+    """
+    Stamp rows written by ``bulk_create``, ``bulk_update`` and ``update`` with
+    one new sync sequence value per call.
+
+    The value is taken in the same transaction as the write.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        if not sync_enabled():
+            return super().bulk_create(objs, *args, **kwargs)
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            stamp(objs, self.db)
+            return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if not sync_enabled():
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        objs = list(objs)
+        fields = list(fields)
+        if "sync_seq" not in fields:
+            fields.append("sync_seq")
+        with transaction.atomic(using=self.db, savepoint=False):
+            stamp(objs, self.db)
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        # bulk_update() passes the values it stamped.
+        if not sync_enabled() or "sync_seq" in kwargs:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            kwargs["sync_seq"] = allocate_sync_seq(self.db)
+            return super().update(**kwargs)
+
+
+class SyncTombstoneQuerySet(QuerySet):
+    """
+    Custom QuerySet for the SyncTombstone model.
+    """
+
+    def for_contact(self, contact_id: int) -> QuerySet:
+        """
+        Filter the tombstones of one contact and of its rows.
+
+        :param contact_id: The ID of the contact.
+        :return: A QuerySet of tombstones.
+        """
+        return self.filter(contact_id=contact_id)
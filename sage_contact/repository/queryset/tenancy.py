@@ -0,0 +1,21 @@
+from django.db.models import QuerySet
+
+
+class TenantQuerySetMixin:
+    """
+    Restrict a queryset to one tenant.
+
+    The managers apply :meth:`for_tenant` with the current tenant, so every
+    queryset method they proxy is tenant-aware.
+    """
+
+    def for_tenant(self, tenant_id: int) -> QuerySet:
+        """
+        Filter the rows of one tenant.
+
+        Served by the tenant-leading indexes of the model.
+
+        :param tenant_id: The ID of the tenant.
+        :return: A QuerySet of the tenant's rows.
+        """
+        return self.filter(tenant_id=tenant_id)
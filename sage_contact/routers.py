@@ -0,0 +1,170 @@
+"""
+Routing of sage_contact read-only paths to a read replica.
+
+Add the router and, optionally, the middleware to the project settings::
+
+    DATABASE_ROUTERS = ["sage_contact.routers.ReplicaRouter"]
+    MIDDLEWARE = [..., "sage_contact.routers.ReadYourWritesMiddleware"]
+    SAGE_CONTACT_READ_DATABASE = "replica"
+
+Only queries that opt in are sent to ``SAGE_CONTACT_READ_DATABASE``:
+querysets marked with ``on_replica()`` (searches, exports, analytics and,
+with ``SAGE_CONTACT_CONTACTED_BEFORE_ON_REPLICA``, the ``contacted_before``
+lookup) and the reads of a :func:`read_from_replica` block (the admin
+changelists). Everything else, and every write, uses the primary.
+
+A client that has just written (e.g. submitted the support form) reads from
+the primary for ``SAGE_CONTACT_READ_YOUR_WRITES_SECONDS``, so it never sees a
+replica that has not caught up with its own submission yet. The window is
+carried by a short-lived cookie set on the response of the writing request.
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sage_contact.settings.app import app_settings
+
+#: Cookie marking a client whose reads stay on the primary.
+PRIMARY_COOKIE_NAME = "sage_contact_primary"
+
+_prefer_replica = ContextVar("sage_contact_prefer_replica", default=False)
+_pinned_until = ContextVar("sage_contact_pinned_until", default=0.0)
+_request_writes = ContextVar("sage_contact_request_writes", default=None)
+
+
+def read_alias() -> Optional[str]:
+    """Return the database alias of the replica, or ``None`` if unset."""
+    return app_settings.read_database
+
+
+def primary_alias() -> str:
+    """Return the database alias that receives writes."""
+    return app_settings.primary_database
+
+
+def read_your_writes_seconds() -> float:
+    return app_settings.read_your_writes_seconds
+
+
+def primary_pinned() -> bool:
+    """Return whether reads of the current context must use the primary."""
+    return time.monotonic() < _pinned_until.get()
+
+
+@contextmanager
+def read_from_primary():
+    """Send every read in the block to the primary, even replica-hinted ones."""
+    token = _pinned_until.set(float("inf"))
+    try:
+        yield
+    finally:
+        _pinned_until.reset(token)
+
+
+@contextmanager
+def read_from_replica():
+    """Send every sage_contact read in the block to the replica, if configured."""
+    token = _prefer_replica.set(True)
+    try:
+        yield
+    finally:
+        _prefer_replica.reset(token)
+
+
+def wants_primary(request: Any) -> bool:
+    """Return whether ``request`` comes from a client inside its write window."""
+    return PRIMARY_COOKIE_NAME in getattr(request, "COOKIES", {})
+
+
+def pin_response(response: Any) -> Any:
+    """Keep the client of ``response`` on the primary for the write window."""
+    seconds = read_your_writes_seconds()
+    if seconds and read_alias():
+        response.set_cookie(
+            PRIMARY_COOKIE_NAME, "1", max_age=seconds, httponly=True, samesite="Lax"
+        )
+    return response
+
+
+@contextmanager
+def request_scope(request: Any):
+    """
+    Route the reads of one request and track whether it wrote.
+
+    Reads go to the primary if the client is inside its write window, and
+    for the rest of the request once it has written anything.
+    """
+    state = {"wrote": False}
+    writes = _request_writes.set(state)
+    pinned = _pinned_until.set(float("inf") if wants_primary(request) else 0.0)
+    try:
+        yield state
+    finally:
+        _pinned_until.reset(pinned)
+        _request_writes.reset(writes)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Keep a client on the primary for the write window after it wrote.
+
+    Writes are detected by :class:`ReplicaRouter` for sage_contact models.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_scope(request) as state:
+            response = self.get_response(request)
+        if state["wrote"]:
+            pin_response(response)
+        return response
+
+
+class ReplicaRouter:
+    """
+    Route opted-in sage_contact reads to ``SAGE_CONTACT_READ_DATABASE``.
+
+    Writes always go to ``SAGE_CONTACT_PRIMARY_DATABASE``, including writes
+    of objects that were read from the replica. No migrations run on the
+    replica; it receives the schema from the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = read_alias()
+        if not alias or model._meta.app_label != "sage_contact" or primary_pinned():
+            return None
+        if hints.get("replica") or _prefer_replica.get():
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label != "sage_contact":
+            return None
+        state = _request_writes.get()
+        if state is not None:
+            # Read the rest of this request from the primary too.
+            state["wrote"] = True
+            _pinned_until.set(float("inf"))
+        return primary_alias() if read_alias() else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {primary_alias(), read_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if read_alias() and db == read_alias():
+            return False
+        return None
+
+
+def replica_scope(request: Any):
+    """Return the context the admin changelist of ``request`` is read in."""
+    if request.method in ("GET", "HEAD") and not wants_primary(request):
+        return read_from_replica()
+    return nullcontext()
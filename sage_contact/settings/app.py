@@ -0,0 +1,231 @@
+"""
+The settings of sage_contact, read once into a typed object.
+
+Every field is the project setting named in its metadata, or the default of
+the same name in :mod:`sage_contact.constants.settings`::
+
+    from sage_contact.settings.app import app_settings
+
+    if app_settings.geoip_deferred:
+        ...
+
+The object is built and validated on first use, e.g. by the system checks
+at startup, and rebuilt after a ``setting_changed`` signal for one of its
+settings (``override_settings`` in tests). Reading a field is an attribute
+lookup on a frozen dataclass instead of a ``getattr`` on the lazy Django
+settings.
+"""
+
+import copy
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Sequence
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from sage_contact.constants import settings as defaults
+from sage_contact.settings.exc import DjangoSageContactConfigurationError
+
+
+def setting(name: str, minimum: Optional[float] = None) -> Any:
+    """
+    Declare a field read from setting ``name``.
+
+    :param minimum: The smallest value allowed for a number.
+    """
+    default = getattr(defaults, name)
+    metadata = {"setting": name, "minimum": minimum}
+    if isinstance(default, (dict, list, set)):
+        return field(default_factory=lambda: copy.deepcopy(default), metadata=metadata)
+    return field(default=default, metadata=metadata)
+
+
+@dataclass(frozen=True)
+class AppSettings:
+    """Typed, validated snapshot of the sage_contact settings."""
+
+    # GeoIP
+    geoip_path: Optional[str] = setting("SAGE_CONTACT_GEOIP_PATH")
+    geoip_deferred: bool = setting("SAGE_CONTACT_GEOIP_DEFERRED")
+    geoip_batch_size: int = setting("SAGE_CONTACT_GEOIP_BATCH_SIZE", minimum=1)
+
+    # Email
+    send_confirmation_email: bool = setting(
+        "SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM"
+    )
+    support_email_template_path: Optional[str] = setting(
+        "SAGE_CONTACT_SUPPORT_EMAIL_TEMPLATE_PATH"
+    )
+    email_confirmation_subject: str = setting("EMAIL_CONFIRMATION_SUBJECT")
+    email_extra_headers_mime_version: str = setting("EMAIL_EXTRA_HEADERS_MIME_VERSION")
+    email_extra_headers_content_type: str = setting("EMAIL_EXTRA_HEADERS_CONTENT_TYPE")
+    email_extra_headers_content_transfer_encoding: str = setting(
+        "EMAIL_EXTRA_HEADERS_CONTENT_TRANSFER_ENCODING"
+    )
+    email_extra_headers_x_priority: str = setting("EMAIL_EXTRA_HEADERS_X_PRIORITY")
+    email_extra_headers_x_auto_response_suppress: str = setting(
+        "EMAIL_EXTRA_HEADERS_X_AUTO_RESPONSE_SUPPRESS"
+    )
+    email_extra_headers_x_spamd_result: str = setting(
+        "EMAIL_EXTRA_HEADERS_X_SPAMD_RESULT"
+    )
+    email_async: bool = setting("SAGE_CONTACT_EMAIL_ASYNC")
+    email_pool_size: int = setting("SAGE_CONTACT_EMAIL_POOL_SIZE", minimum=1)
+    email_pool_idle_timeout: float = setting(
+        "SAGE_CONTACT_EMAIL_POOL_IDLE_TIMEOUT", minimum=0
+    )
+
+    # Instrumentation
+    timing_hooks: Sequence[Any] = setting("SAGE_CONTACT_TIMING_HOOKS")
+    timing_histogram: bool = setting("SAGE_CONTACT_TIMING_HISTOGRAM")
+    timing_flush_interval: float = setting(
+        "SAGE_CONTACT_TIMING_FLUSH_INTERVAL", minimum=0
+    )
+    timing_cache: str = setting("SAGE_CONTACT_TIMING_CACHE")
+
+    # Forms
+    form_render_cache: bool = setting("SAGE_CONTACT_FORM_RENDER_CACHE")
+    form_cache_alias: Optional[str] = setting("SAGE_CONTACT_FORM_CACHE_ALIAS")
+    form_cache_timeout: Optional[float] = setting("SAGE_CONTACT_FORM_CACHE_TIMEOUT")
+    form_cache_version: Optional[Any] = setting("SAGE_CONTACT_FORM_CACHE_VERSION")
+
+    # Batch sizes
+    archive_batch_size: int = setting("SAGE_CONTACT_ARCHIVE_BATCH_SIZE", minimum=1)
+    bulk_batch_size: int = setting("SAGE_CONTACT_BULK_BATCH_SIZE", minimum=1)
+
+    # Lookups
+    phone_cache_size: int = setting("SAGE_CONTACT_PHONE_CACHE_SIZE", minimum=0)
+    phone_cache_timeout: float = setting("SAGE_CONTACT_PHONE_CACHE_TIMEOUT", minimum=0)
+    email_canonicalize: bool = setting("SAGE_CONTACT_EMAIL_CANONICALIZE")
+
+    # Change history
+    change_history: bool = setting("SAGE_CONTACT_CHANGE_HISTORY")
+
+    # Database routing
+    read_database: Optional[str] = setting("SAGE_CONTACT_READ_DATABASE")
+    primary_database: str = setting("SAGE_CONTACT_PRIMARY_DATABASE")
+    read_your_writes_seconds: float = setting(
+        "SAGE_CONTACT_READ_YOUR_WRITES_SECONDS", minimum=0
+    )
+    contacted_before_on_replica: bool = setting(
+        "SAGE_CONTACT_CONTACTED_BEFORE_ON_REPLICA"
+    )
+
+    # Label catalog
+    label_cache_alias: str = setting("SAGE_CONTACT_LABEL_CACHE_ALIAS")
+    label_cache_timeout: float = setting("SAGE_CONTACT_LABEL_CACHE_TIMEOUT", minimum=0)
+    label_local_timeout: float = setting("SAGE_CONTACT_LABEL_LOCAL_TIMEOUT", minimum=0)
+
+    # Contact directory
+    directory_merge_threshold: int = setting(
+        "SAGE_CONTACT_DIRECTORY_MERGE_THRESHOLD", minimum=1
+    )
+
+    # Incremental sync
+    sync: bool = setting("SAGE_CONTACT_SYNC")
+    sync_page_size: int = setting("SAGE_CONTACT_SYNC_PAGE_SIZE", minimum=1)
+
+    # Tenancy
+    tenant_resolver: Optional[Any] = setting("SAGE_CONTACT_TENANT_RESOLVER")
+
+    # Spam filter
+    spam_filter: bool = setting("SAGE_CONTACT_SPAM_FILTER")
+    spam_honeypot_field: Optional[str] = setting("SAGE_CONTACT_SPAM_HONEYPOT_FIELD")
+    spam_timing_field: Optional[str] = setting("SAGE_CONTACT_SPAM_TIMING_FIELD")
+    spam_timing_required: bool = setting("SAGE_CONTACT_SPAM_TIMING_REQUIRED")
+    spam_min_submit_seconds: float = setting(
+        "SAGE_CONTACT_SPAM_MIN_SUBMIT_SECONDS", minimum=0
+    )
+    spam_max_token_age: float = setting("SAGE_CONTACT_SPAM_MAX_TOKEN_AGE", minimum=0)
+    spam_max_links: int = setting("SAGE_CONTACT_SPAM_MAX_LINKS", minimum=0)
+    spam_blocked_domains: Sequence[str] = setting("SAGE_CONTACT_SPAM_BLOCKED_DOMAINS")
+    spam_model_path: Optional[str] = setting("SAGE_CONTACT_SPAM_MODEL_PATH")
+    spam_quarantine_score: int = setting("SAGE_CONTACT_SPAM_QUARANTINE_SCORE")
+    spam_drop_score: int = setting("SAGE_CONTACT_SPAM_DROP_SCORE")
+
+    # Abuse control
+    rate_limit: Optional[Dict[str, Any]] = setting("SAGE_CONTACT_RATE_LIMIT")
+
+    # Work queues
+    queue: bool = setting("SAGE_CONTACT_QUEUE")
+    queue_default: str = setting("SAGE_CONTACT_QUEUE_DEFAULT")
+    queue_routes: Dict[str, Dict[str, Any]] = setting("SAGE_CONTACT_QUEUE_ROUTES")
+    queue_router: Optional[Any] = setting("SAGE_CONTACT_QUEUE_ROUTER")
+    queue_claim_timeout: float = setting("SAGE_CONTACT_QUEUE_CLAIM_TIMEOUT", minimum=1)
+
+    def __post_init__(self) -> None:
+        for item in fields(self):
+            value = getattr(self, item.name)
+            minimum = item.metadata["minimum"]
+            if minimum is None or value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise DjangoSageContactConfigurationError(
+                    detail=f"{item.metadata['setting']} must be a number.",
+                    code="E010",
+                    section_code="sage_contact",
+                )
+            if value < minimum:
+                raise DjangoSageContactConfigurationError(
+                    detail=f"{item.metadata['setting']} must be at least {minimum}.",
+                    code="E011",
+                    section_code="sage_contact",
+                )
+        if self.spam_drop_score < self.spam_quarantine_score:
+            raise DjangoSageContactConfigurationError(
+                detail=(
+                    "SAGE_CONTACT_SPAM_DROP_SCORE must not be lower than "
+                    "SAGE_CONTACT_SPAM_QUARANTINE_SCORE."
+                ),
+                code="E012",
+                section_code="sage_contact",
+            )
+        if self.rate_limit is not None and "limit" not in self.rate_limit:
+            raise DjangoSageContactConfigurationError(
+                detail="SAGE_CONTACT_RATE_LIMIT must have a 'limit'.",
+                code="E013",
+                section_code="sage_contact",
+            )
+
+    @classmethod
+    def from_settings(cls) -> "AppSettings":
+        """Read every field from the Django settings, or its default."""
+        values = {}
+        for item in fields(cls):
+            name = item.metadata["setting"]
+            if hasattr(settings, name):
+                values[item.name] = getattr(settings, name)
+        return cls(**values)
+
+
+SETTING_NAMES = frozenset(item.metadata["setting"] for item in fields(AppSettings))
+
+_app_settings: Optional[AppSettings] = None
+
+
+def get_app_settings() -> AppSettings:
+    """Return the settings, reading them once."""
+    global _app_settings
+    if _app_settings is None:
+        _app_settings = AppSettings.from_settings()
+    return _app_settings
+
+
+@receiver(setting_changed)
+def reset_app_settings(setting: str, **kwargs: Any) -> None:
+    global _app_settings
+    if setting in SETTING_NAMES:
+        _app_settings = None
+
+
+class _AppSettingsProxy:
+    """Attribute access to the current :class:`AppSettings`."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_app_settings(), name)
+
+
+app_settings: Any = _AppSettingsProxy()
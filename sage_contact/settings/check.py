@@ -1,9 +1,12 @@
+from django.apps import apps
 from django.conf import settings
 from django.core.checks import Error, register
+from django.db import connections
 from django.template.utils import get_app_template_dirs
 from typing import List, Dict, Any
 import os
 
+from .app import get_app_settings
 from .exc import DjangoSageContactError, DjangoSageContactConfigurationError
 
 
@@ -37,10 +40,12 @@ def check_django_sage_contact_config(app_configs: Dict[str, Any], **kwargs: Any)
     errors: List[Error] = []
 
     def get_settings() -> Dict[str, Any]:
+        # Reading the app settings validates them.
+        app_settings = get_app_settings()
         return {
-            "SAGE_CONTACT_GEOIP_PATH": getattr(settings, 'SAGE_CONTACT_GEOIP_PATH', None),
-            "SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM": getattr(settings, 'SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM', True),
-            "SAGE_CONTACT_SUPPORT_EMAIL_TEMPLATE_PATH": getattr(settings, 'SAGE_CONTACT_SUPPORT_EMAIL_TEMPLATE_PATH', None),
+            "SAGE_CONTACT_GEOIP_PATH": app_settings.geoip_path,
+            "SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM": app_settings.send_confirmation_email,
+            "SAGE_CONTACT_SUPPORT_EMAIL_TEMPLATE_PATH": app_settings.support_email_template_path,
             "EMAIL_HOST": getattr(settings, 'EMAIL_HOST', None),
             "EMAIL_PORT": getattr(settings, 'EMAIL_PORT', None),
             "EMAIL_HOST_USER": getattr(settings, 'EMAIL_HOST_USER', None),
@@ -124,4 +129,37 @@ def check_django_sage_contact_config(app_configs: Dict[str, Any], **kwargs: Any)
             )
         )
 
-    return errors
\ No newline at end of file
+    return errors
+
+
+@register()
+def check_django_sage_contact_postgres(app_configs: Dict[str, Any], **kwargs: Any) -> List[Error]:
+    """
+    Check that django.contrib.postgres is installed when a PostgreSQL database is configured.
+
+    The name index of the contacts uses the text_pattern_ops operator class on PostgreSQL,
+    which Django only renders with django.contrib.postgres installed.
+
+    Parameters
+    ----------
+    app_configs : dict
+        The application configurations.
+    **kwargs
+        Additional keyword arguments.
+
+    Returns
+    -------
+    list of Error
+        A list with one Error when the app is missing, empty otherwise.
+    """
+    uses_postgres = any(connection.vendor == 'postgresql' for connection in connections.all())
+    if uses_postgres and not apps.is_installed('django.contrib.postgres'):
+        return [
+            Error(
+                'django.contrib.postgres is not installed but a PostgreSQL database is configured',
+                hint="Add 'django.contrib.postgres' to INSTALLED_APPS so the contact name index "
+                     "is created with its pattern operator class.",
+                id='sage_contact.E006',
+            )
+        ]
+    return []
\ No newline at end of file
@@ -1,2 +1,20 @@
 from .support import (assign_user_field, send_confirmation_email,
                       update_contacted_before_status)
+from .analytics import update_support_request_rollup
+from .directory import index_saved_contact, unindex_deleted_contact
+from .history import record_contact_change, record_contact_deletion
+from .labels import (
+    count_deleted_label_link,
+    count_saved_label_link,
+    invalidate_labels,
+    remember_previous_label,
+)
+from .lookup import (
+    invalidate_contact_phone_cache,
+    update_date_keys,
+    update_email_key,
+    update_ip_key,
+    update_phone_keys,
+)
+from .queue import enqueue_support_request
+from .sync import record_sync_tombstone
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from sage_contact.models import SupportRequestBase
+from sage_contact.utils.analytics import record_support_request
+
+
+@receiver(post_save)
+def update_support_request_rollup(sender, instance, created, raw=False, **kwargs):
+    # Count every new support request, whatever its concrete type, in the
+    # daily rollup. Fixture loading (raw saves) is left to the rebuild command.
+    if not created or raw or not isinstance(instance, SupportRequestBase):
+        return
+    record_support_request(instance, using=kwargs.get("using"))
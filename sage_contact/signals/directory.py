@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from sage_contact.models import Contact
+from sage_contact.utils.directory import (
+    DIRECTORY_FIELDS,
+    directory_removed,
+    directory_saved,
+)
+
+
+@receiver(post_save, sender=Contact)
+def index_saved_contact(sender, instance, raw=False, update_fields=None, **kwargs):
+    if update_fields is not None and not DIRECTORY_FIELDS.intersection(update_fields):
+        return
+    directory_saved([instance], kwargs.get("using"))
+
+
+@receiver(post_delete, sender=Contact)
+def unindex_deleted_contact(sender, instance, **kwargs):
+    directory_removed([instance.pk], kwargs.get("using"))
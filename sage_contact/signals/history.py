@@ -0,0 +1,35 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from sage_contact.models import Contact, ContactLabel, CustomField
+from sage_contact.utils.history import history_enabled, record_delete, record_save
+
+
+@receiver(post_save, sender=Contact)
+@receiver(post_save, sender=CustomField)
+@receiver(post_save, sender=ContactLabel)
+def record_contact_change(sender, instance, created, raw=False, **kwargs):
+    # Append the changed fields of contacts, custom fields and label links to
+    # the change history; saves that change nothing are not logged.
+    if raw or not history_enabled():
+        return
+    record_save(
+        instance, created, using=kwargs.get("using"), fields=kwargs.get("update_fields")
+    )
+
+
+@receiver(post_delete, sender=Contact)
+@receiver(post_delete, sender=CustomField)
+@receiver(post_delete, sender=ContactLabel)
+def record_contact_deletion(sender, instance, origin=None, **kwargs):
+    # Rows removed by the cascade of a contact deletion are implied by the
+    # contact's own deletion entry and are not logged one by one.
+    if not history_enabled():
+        return
+    if sender is not Contact and (
+        isinstance(origin, Contact)
+        or (isinstance(origin, QuerySet) and origin.model is Contact)
+    ):
+        return
+    record_delete(instance, using=kwargs.get("using"))
@@ -0,0 +1,47 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from sage_contact.models import ContactLabel, Label
+from sage_contact.utils.labels import adjust_label_counts, invalidate_label_catalog
+
+
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+def invalidate_labels(sender, instance, **kwargs):
+    invalidate_label_catalog(kwargs.get("using"), instance.tenant_id)
+
+
+@receiver(pre_save, sender=ContactLabel)
+def remember_previous_label(sender, instance, raw=False, **kwargs):
+    # The label a link pointed at when it was loaded, to move its count when
+    # the link is edited to another label.
+    state = getattr(instance, "_history_state", None) or {}
+    instance._previous_label_id = state.get("label_id")
+
+
+@receiver(post_save, sender=ContactLabel)
+def count_saved_label_link(sender, instance, created, raw=False, **kwargs):
+    # Fixture loading (raw saves) is left to refresh_label_counts().
+    if raw:
+        return
+    previous = getattr(instance, "_previous_label_id", None)
+    if created:
+        deltas = {instance.label_id: 1}
+    elif previous is not None and previous != instance.label_id:
+        deltas = {previous: -1, instance.label_id: 1}
+    else:
+        return
+    adjust_label_counts(deltas, kwargs.get("using"), instance.tenant_id)
+
+
+@receiver(post_delete, sender=ContactLabel)
+def count_deleted_label_link(sender, instance, origin=None, **kwargs):
+    # Links removed with their label leave no count to adjust.
+    if isinstance(origin, Label) or (
+        isinstance(origin, QuerySet) and origin.model is Label
+    ):
+        return
+    adjust_label_counts(
+        {instance.label_id: -1}, kwargs.get("using"), instance.tenant_id
+    )
@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from sage_contact.models import (
+    Contact,
+    SupportRequestBase,
+    SupportRequestWithLocation,
+    SupportRequestWithPhone,
+)
+from sage_contact.utils.email import set_email_key
+from sage_contact.utils.network import set_ip_key
+from sage_contact.utils.phone import get_contact_phone_cache, set_phone_keys
+from sage_contact.utils.reminders import set_date_keys
+
+
+@receiver(pre_save)
+def update_email_key(sender, instance, raw=False, **kwargs):
+    # Keep the indexed email key in step with email on contacts and on every
+    # support request type.
+    if raw or not isinstance(instance, (Contact, SupportRequestBase)):
+        return
+    set_email_key(instance)
+
+
+@receiver(pre_save)
+def update_phone_keys(sender, instance, raw=False, **kwargs):
+    # Keep the indexed E.164 and suffix keys in step with phone_number on
+    # contacts and on every support request type that has a phone number.
+    if raw or not isinstance(instance, (Contact, SupportRequestWithPhone)):
+        return
+    set_phone_keys(instance)
+
+
+@receiver(pre_save)
+def update_ip_key(sender, instance, raw=False, **kwargs):
+    # Keep the indexed IP key in step with ip_address on every support request
+    # type that stores one.
+    if raw or not isinstance(instance, SupportRequestWithLocation):
+        return
+    set_ip_key(instance)
+
+
+@receiver(pre_save, sender=Contact)
+def update_date_keys(sender, instance, raw=False, **kwargs):
+    # Keep the indexed birthday and anniversary day keys in step.
+    if raw:
+        return
+    set_date_keys(instance)
+
+
+@receiver(post_save, sender=Contact)
+@receiver(post_delete, sender=Contact)
+def invalidate_contact_phone_cache(sender, instance, **kwargs):
+    cache = get_contact_phone_cache()
+    cache.discard_value(instance.pk)
+    if instance.phone_e164:
+        cache.discard(
+            f"{instance._state.db}:{instance.tenant_id}:{instance.phone_e164}"
+        )
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from sage_contact.models import (
+    FullSupportRequest,
+    SupportRequestBase,
+    SupportRequestWithLocation,
+    SupportRequestWithPhone,
+)
+from sage_contact.utils.queue import enqueue, queue_enabled
+
+
+@receiver(post_save, sender=SupportRequestBase)
+@receiver(post_save, sender=SupportRequestWithPhone)
+@receiver(post_save, sender=SupportRequestWithLocation)
+@receiver(post_save, sender=FullSupportRequest)
+def enqueue_support_request(sender, instance, created, raw=False, **kwargs):
+    # Route every new support request to a work queue. Fixture loading (raw
+    # saves) is left to ``sage_contact_queue --backfill``.
+    if created and not raw and queue_enabled():
+        enqueue(instance, using=kwargs.get("using"))
@@ -1,34 +1,31 @@
-import os
-from email.utils import make_msgid
+from functools import partial
 
-from django.conf import settings
-from django.contrib.sites.models import Site
-from django.core.mail import EmailMessage
+from django.db import transaction
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
-from django.template.loader import render_to_string
-from django.db.models.signals import pre_save, post_save
-from sage_contact.constants.settings import (
-    EMAIL_EXTRA_HEADERS_CONTENT_TRANSFER_ENCODING,
-    EMAIL_EXTRA_HEADERS_CONTENT_TYPE,
-    EMAIL_EXTRA_HEADERS_MIME_VERSION,
-    EMAIL_EXTRA_HEADERS_X_AUTO_RESPONSE_SUPPRESS,
-    EMAIL_EXTRA_HEADERS_X_PRIORITY,
-    EMAIL_EXTRA_HEADERS_X_SPAMD_RESULT,
-    EMAIL_CONFIRMATION_SUBJECT,
-)
 from sage_contact.models import (
     FullSupportRequest,
 )
+from sage_contact.settings.app import app_settings
+from sage_contact.utils.email import normalize_email
+from sage_contact.utils.mail import build_confirmation_email, email_async, send_in_background
+from sage_contact.utils.timing import stage
 
 
 
 @receiver(pre_save, sender=FullSupportRequest)
 def update_contacted_before_status(sender, instance, **kwargs):
-    # Check if the email has been used before in any FullSupportRequest record
-    instance.contacted_before = FullSupportRequest.objects.filter(
-        email=instance.email
-    ).exists()
+    # Check if the email has been used before in any FullSupportRequest record,
+    # ignoring case, through the indexed email key. The lookup may be served by
+    # the read replica, at the cost of missing submissions it has not
+    # replicated yet.
+    queryset = FullSupportRequest.objects.all()
+    if app_settings.contacted_before_on_replica:
+        queryset = queryset.on_replica()
+    with stage("db.contacted_before"):
+        instance.contacted_before = queryset.filter(
+            email_key=normalize_email(instance.email)
+        ).exists()
 
 
 @receiver(pre_save, sender=FullSupportRequest)
@@ -43,55 +40,18 @@ def send_confirmation_email(sender, instance, created, **kwargs):
     if not created:
         return
 
-    # Check if the SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM is True
-    if not getattr(settings, "SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM", True):
+    email = build_confirmation_email(instance)
+    if email is None:
         return
 
-    # Check if the SAGE_CONTACT_SUPPORT_EMAIL_TEMPLATE_PATH is set and exists
-    template_path = getattr(settings, "SAGE_CONTACT_SUPPORT_EMAIL_TEMPLATE_PATH", None)
-    if not template_path or not os.path.exists(
-        os.path.join(settings.BASE_DIR, template_path)
-    ):
+    # With SAGE_CONTACT_EMAIL_ASYNC, send from the mail event loop once the
+    # request is committed, without waiting for the SMTP server.
+    if email_async():
+        transaction.on_commit(
+            partial(send_in_background, [email]), using=kwargs.get("using")
+        )
         return
 
-    # Get the current site domain
-    current_site = Site.objects.get_current()
-    domain = current_site.domain
-
-    # Create the email subject and body using an HTML template
-    subject = EMAIL_CONFIRMATION_SUBJECT
-    body = render_to_string(
-        template_path,
-        {
-            "full_name": instance.full_name,
-            "subject": instance.subject,
-            "message": instance.message,
-            "contact_reason": instance.get_contact_reason_display(),
-            "preferred_contact_method": instance.get_preferred_contact_method_display(),
-        },
-    )
-
-    # Create the email message
-    email = EmailMessage(
-        subject=subject,
-        body=body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[instance.email],
-    )
-
-    # Specify that the body is HTML
-    email.content_subtype = "html"
-
-    # Add standard headers
-    email.extra_headers = {
-        "MIME-Version": EMAIL_EXTRA_HEADERS_MIME_VERSION,
-        "Content-Type": EMAIL_EXTRA_HEADERS_CONTENT_TYPE,
-        "Content-Transfer-Encoding": EMAIL_EXTRA_HEADERS_CONTENT_TRANSFER_ENCODING,
-        "X-Priority": EMAIL_EXTRA_HEADERS_X_PRIORITY,
-        "Message-ID": make_msgid(domain=domain),
-        "X-Auto-Response-Suppress": EMAIL_EXTRA_HEADERS_X_AUTO_RESPONSE_SUPPRESS,
-        "X-Spamd-Result": EMAIL_EXTRA_HEADERS_X_SPAMD_RESULT,
-    }
-
     # Send the email
-    email.send(fail_silently=False)
+    with stage("email.send"):
+        email.send(fail_silently=False)
@@ -0,0 +1,23 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from sage_contact.models import Contact, ContactLabel, CustomField
+from sage_contact.utils.sync import record_tombstones
+
+
+@receiver(post_delete, sender=Contact)
+@receiver(post_delete, sender=CustomField)
+@receiver(post_delete, sender=ContactLabel)
+def record_sync_tombstone(sender, instance, origin=None, **kwargs):
+    # Sync clients drop the custom fields and labels of a deleted contact
+    # with the contact, so its cascade leaves no tombstones of its own.
+    if sender is not Contact and (
+        isinstance(origin, Contact)
+        or (isinstance(origin, QuerySet) and origin.model is Contact)
+    ):
+        return
+    contact_id = instance.pk if sender is Contact else instance.contact_id
+    record_tombstones(
+        [(sender, instance.pk, contact_id, instance.tenant_id)], kwargs.get("using")
+    )
@@ -0,0 +1,34 @@
+from django import template
+from django.template.backends.utils import csrf_input
+from django.utils.html import format_html
+
+from sage_contact.utils.spam import get_spam_scorer, spam_filter_enabled
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def support_form(context, form):
+    """
+    Render ``form`` preceded by the CSRF input of the current request and the
+    spam filter's honeypot and timing inputs.
+
+    The form markup may be served from the shared fragment cache; the tokens
+    are injected here so the cached fragment stays identical for every
+    visitor::
+
+        {% load sage_contact_tags %}
+        <form method="post">{% support_form contact_form %}</form>
+    """
+    request = context.get("request")
+    if request is not None:
+        token_input = csrf_input(request)
+    elif context.get("csrf_token"):
+        token_input = format_html(
+            '<input type="hidden" name="csrfmiddlewaretoken" value="{}">',
+            context["csrf_token"],
+        )
+    else:
+        token_input = ""
+    spam_inputs = get_spam_scorer().inputs() if spam_filter_enabled() else ""
+    return format_html("{}{}{}", token_input, spam_inputs, form)
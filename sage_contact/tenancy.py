@@ -0,0 +1,72 @@
+"""
+Tenant scoping of contacts, labels, custom fields, contact labels and their
+change history.
+
+Every row of these models carries a ``tenant_id``: an opaque integer chosen
+by the project (a team, an organization or an owning user). ``0`` is the
+default tenant; a deployment that never sets a tenant keeps every row there
+and behaves as a single address book.
+
+The models' managers only see the rows of the current tenant, which is set
+for a block of code with :func:`tenant_scope` or per request by
+:class:`TenantMiddleware`::
+
+    MIDDLEWARE = [..., "sage_contact.tenancy.TenantMiddleware"]
+    SAGE_CONTACT_TENANT_RESOLVER = "myproject.tenants.tenant_of_request"
+
+The resolver is called with the request and returns a tenant ID or
+``None`` for the default tenant. New rows take the current tenant, and the
+indexes of these tables lead with ``tenant_id``, so per-tenant queries stay
+as fast as the address book of one tenant. ``Model.objects.all_tenants()``
+and ``Model._base_manager`` reach every tenant, e.g. for maintenance jobs.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from django.utils.module_loading import import_string
+
+from sage_contact.settings.app import app_settings
+
+#: Tenant of rows created outside any tenant scope.
+DEFAULT_TENANT = 0
+
+_current_tenant = ContextVar("sage_contact_tenant", default=DEFAULT_TENANT)
+
+
+def current_tenant() -> int:
+    """Return the tenant of the current context."""
+    return _current_tenant.get()
+
+
+@contextmanager
+def tenant_scope(tenant_id: Optional[int]):
+    """Make ``tenant_id`` (``None`` for the default) current in the block."""
+    token = _current_tenant.set(DEFAULT_TENANT if tenant_id is None else int(tenant_id))
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+def resolve_tenant(request: Any) -> Optional[int]:
+    """Return the tenant of ``request`` from ``SAGE_CONTACT_TENANT_RESOLVER``."""
+    resolver = app_settings.tenant_resolver
+    if not resolver:
+        return None
+    if isinstance(resolver, str):
+        resolver = import_string(resolver)
+    return resolver(request)
+
+
+class TenantMiddleware:
+    """Run every request in the scope of the tenant it resolves to."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.sage_contact_tenant = resolve_tenant(request)
+        with tenant_scope(request.sage_contact_tenant):
+            return self.get_response(request)
@@ -0,0 +1,33 @@
+"""
+Set up Django and the test databases for the sage_contact tests.
+
+Tests are ``django.test`` test cases run by pytest::
+
+    pytest sage_contact/tests
+"""
+
+import os
+
+import django
+import pytest
+
+
+def pytest_configure(config):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sage_contact.tests.settings")
+    django.setup()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def django_test_databases():
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    yield
+    teardown_databases(old_config, verbosity=0)
+    teardown_test_environment()
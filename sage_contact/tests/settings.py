@@ -0,0 +1,84 @@
+"""
+Django settings for the sage_contact test suite.
+
+Two SQLite databases: ``default`` and ``replica``, a test mirror of it that
+stands in for a read replica, so the replica-routed paths run through
+:class:`sage_contact.routers.ReplicaRouter`.
+"""
+
+import os
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SECRET_KEY = "sage-contact-tests"  # nosec - tests only
+DEBUG = False
+ALLOWED_HOSTS = ["*"]
+USE_TZ = True
+SITE_ID = 1
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.sites",
+    "polymorphic",
+    "phonenumber_field",
+    "django_countries",
+    "sage_contact",
+]
+
+MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "sage_contact.routers.ReadYourWritesMiddleware",
+]
+
+ROOT_URLCONF = "sage_contact.benchmarks.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [os.path.join(os.path.dirname(BASE_DIR), "benchmarks", "templates")],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ]
+        },
+    }
+]
+
+# The test database is a file, not SQLite's shared in-memory database, so the
+# replica connection reads the committed state like a real replica instead of
+# failing on the primary's table locks.
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "tests.sqlite3"),
+        "TEST": {
+            "NAME": os.path.join(tempfile.gettempdir(), "sage_contact_tests.sqlite3")
+        },
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "tests.sqlite3"),
+        "TEST": {"MIRROR": "default"},
+    },
+}
+DATABASE_ROUTERS = ["sage_contact.routers.ReplicaRouter"]
+SAGE_CONTACT_READ_DATABASE = "replica"
+
+# The app ships without migrations; tables are created with run_syncdb.
+MIGRATION_MODULES = {"sage_contact": None}
+
+SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM = False
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+SILENCED_SYSTEM_CHECKS = ["fields.W163", "models.W046"]
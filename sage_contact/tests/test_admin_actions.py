@@ -0,0 +1,71 @@
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.contrib.messages import WARNING, get_messages
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.cache import SessionStore
+from django.test import RequestFactory, TestCase
+
+from sage_contact.admin.actions import LabelActionForm, assign_label, unassign_label
+from sage_contact.models import Contact, ContactLabel, Label
+from sage_contact.routers import read_from_primary
+from sage_contact.tenancy import tenant_scope
+
+
+class LabelActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        cls.label = Label.objects.create(name="VIP")
+        Contact.objects.create(first_name="Ann", last_name="Lee")
+        Contact.objects.create(first_name="Bob", last_name="Ray")
+        with tenant_scope(7):
+            cls.other_label = Label.objects.create(name="Other tenant")
+
+    def setUp(self):
+        self.model_admin = admin.site._registry[Contact]
+
+    def run_action(self, action, label):
+        request = RequestFactory().post("/", {"label": label})
+        request.user = self.user
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        response = action(self.model_admin, request, Contact.objects.all())
+        return response, list(get_messages(request))
+
+    def test_assign_and_unassign(self):
+        _, messages = self.run_action(assign_label, str(self.label.pk))
+        self.assertEqual(messages[0].message, "Label added to 2 contacts.")
+        self.assertEqual(ContactLabel.objects.filter(label=self.label).count(), 2)
+        self.label.refresh_from_db()
+        self.assertEqual(self.label.contact_count, 2)
+
+        _, messages = self.run_action(unassign_label, str(self.label.pk))
+        self.assertEqual(messages[0].message, "Label removed from 2 contacts.")
+        self.assertFalse(ContactLabel.objects.exists())
+
+    @read_from_primary()
+    def test_action_form_lists_the_labels_of_the_current_tenant(self):
+        self.assertEqual(list(LabelActionForm().fields["label"].queryset), [self.label])
+        with tenant_scope(7):
+            self.assertEqual(
+                list(LabelActionForm().fields["label"].queryset), [self.other_label]
+            )
+
+    def test_missing_label(self):
+        response, messages = self.run_action(assign_label, "")
+        self.assertIsNone(response)
+        self.assertEqual(messages[0].level, WARNING)
+        self.assertEqual(messages[0].message, "Select a label to apply the action.")
+
+    def test_invalid_labels_are_rejected(self):
+        for value in ("not-a-number", "999999", str(self.other_label.pk)):
+            with self.subTest(value=value):
+                response, messages = self.run_action(assign_label, value)
+                self.assertIsNone(response)
+                self.assertEqual(messages[0].level, WARNING)
+                self.assertEqual(
+                    messages[0].message, "The selected label does not exist."
+                )
+        self.assertFalse(ContactLabel.objects.all_tenants().exists())
+        self.other_label.refresh_from_db()
+        self.assertEqual(self.other_label.contact_count, 0)
@@ -0,0 +1,107 @@
+from datetime import date
+
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from sage_contact.models import Contact, ContactChange
+
+
+class ContactQuerySetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Contact.objects.bulk_create(
+            Contact(first_name="Ann", last_name=f"Lee {index}") for index in range(5)
+        )
+
+    def changes(self):
+        return ContactChange.objects.filter(action=ContactChange.Action.UPDATE)
+
+    def test_bulk_update_fills_lookup_keys(self):
+        contacts = list(Contact.objects.order_by("pk"))
+        for contact in contacts:
+            contact.email = "Ann.Lee@Example.com"
+            contact.phone_number = "+12025550143"
+            contact.birthday = date(1980, 3, 14)
+        rows = Contact.objects.bulk_update(
+            iter(contacts), ["email", "phone_number", "birthday"]
+        )
+        self.assertEqual(rows, 5)
+        self.assertEqual(
+            set(
+                Contact.objects.values_list(
+                    "email_key", "phone_e164", "birthday_key", "anniversary_key"
+                )
+            ),
+            {("ann.lee@example.com", "+12025550143", 314, None)},
+        )
+        self.assertEqual(Contact.objects.by_phone("+12025550143").count(), 5)
+        self.assertEqual(self.changes().count(), 5)
+
+    @override_settings(SAGE_CONTACT_BULK_BATCH_SIZE=2, SAGE_CONTACT_SYNC=True)
+    def test_update_runs_in_batches(self):
+        with CaptureQueriesContext(connection) as queries:
+            rows = Contact.objects.update(job_title="Engineer")
+        self.assertEqual(rows, 5)
+        updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "sage_contact" ')
+        ]
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(
+            list(self.changes().values_list("changes", flat=True)),
+            [{"job_title": "Engineer"}] * 5,
+        )
+        self.assertEqual(
+            len(set(Contact.objects.values_list("sync_seq", flat=True))), 1
+        )
+
+    @override_settings(SAGE_CONTACT_BULK_BATCH_SIZE=2)
+    def test_update_reads_expressions_back(self):
+        rows = Contact.objects.filter(last_name__in=["Lee 1", "Lee 3"]).update(
+            last_name=Concat(F("last_name"), Value("!"))
+        )
+        self.assertEqual(rows, 2)
+        self.assertEqual(
+            sorted(
+                change["last_name"]
+                for change in self.changes().values_list("changes", flat=True)
+            ),
+            ["Lee 1!", "Lee 3!"],
+        )
+
+    def test_update_refreshes_email_key(self):
+        contact = Contact.objects.order_by("pk").first()
+        Contact.objects.filter(pk=contact.pk).update(email="Old@Example.com")
+        Contact.objects.filter(pk=contact.pk).update(email="New@Example.com")
+        self.assertEqual(list(Contact.objects.by_email("new@example.com")), [contact])
+        self.assertFalse(Contact.objects.by_email("old@example.com").exists())
+
+    @override_settings(SAGE_CONTACT_CHANGE_HISTORY=False)
+    def test_update_refreshes_keys_of_expressions(self):
+        Contact.objects.update(email=Concat(F("last_name"), Value("@Example.com")))
+        self.assertEqual(
+            list(Contact.objects.by_email("lee 3@example.com")),
+            list(Contact.objects.filter(last_name="Lee 3")),
+        )
+
+    def test_update_refreshes_phone_keys(self):
+        contact = Contact.objects.order_by("pk").first()
+        Contact.objects.filter(pk=contact.pk).update(phone_number="+12025550143")
+        self.assertEqual(Contact.objects.get_by_phone("+1 202 555 0143"), contact)
+        # A cached miss of the new number must not outlive the update either.
+        self.assertIsNone(Contact.objects.get_by_phone("+12025550199"))
+        Contact.objects.filter(pk=contact.pk).update(phone_number="+12025550199")
+        self.assertEqual(Contact.objects.get_by_phone("+12025550199"), contact)
+        self.assertIsNone(Contact.objects.get_by_phone("+12025550143"))
+        self.assertEqual(
+            list(Contact.objects.by_phone_suffix("0199").values_list("pk", flat=True)),
+            [contact.pk],
+        )
+
+    def test_update_of_slice_is_refused(self):
+        with self.assertRaises(TypeError):
+            Contact.objects.order_by("pk")[:2].update(job_title="Engineer")
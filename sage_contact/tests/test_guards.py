@@ -0,0 +1,27 @@
+"""
+The query-count and latency guards of :mod:`sage_contact.benchmarks.guards`.
+
+Set ``SAGE_CONTACT_GUARD_LATENCY_FACTOR`` (e.g. ``3``) to scale the latency
+budgets on slow machines; query budgets are always exact.
+"""
+
+import os
+
+from django.test import TransactionTestCase
+
+from sage_contact.benchmarks.guards import GuardRunner
+
+
+class GuardTests(TransactionTestCase):
+    # The fixtures are committed, as under sage_contact_check_budgets, so the
+    # replica connection sees them and on_commit callbacks run.
+    databases = {"default", "replica"}
+
+    def test_within_budget(self):
+        runner = GuardRunner(
+            latency_factor=float(
+                os.environ.get("SAGE_CONTACT_GUARD_LATENCY_FACTOR", "1")
+            )
+        )
+        runner.run()
+        runner.assert_within_budget()
@@ -0,0 +1,114 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from sage_contact.models import (
+    Contact,
+    ContactChange,
+    ContactLabel,
+    CustomField,
+    Label,
+)
+
+
+class ReconstructTests(TestCase):
+    def test_reconstruct_at_points_in_time(self):
+        before = timezone.now()
+        contact = Contact.objects.create(first_name="Ann", last_name="Lee")
+        field = CustomField.objects.create(
+            contact=contact, field_name="Team", field_value="Sales"
+        )
+        vip = Label.objects.create(name="VIP")
+        link = ContactLabel.objects.create(contact=contact, label=vip)
+        created = timezone.now()
+
+        contact.job_title = "Engineer"
+        contact.save()
+        field.field_value = "Support"
+        field.save()
+        edited = timezone.now()
+
+        Contact.objects.filter(pk=contact.pk).update(
+            job_title="Manager", email="Ann@Example.com"
+        )
+        link.delete()
+        updated = timezone.now()
+
+        pk = contact.pk
+        contact.delete()
+
+        self.assertIsNone(ContactChange.objects.reconstruct(pk, before))
+        for at, job_title, email, team, labels in [
+            (created, None, None, "Sales", [vip.pk]),
+            (edited, "Engineer", None, "Support", [vip.pk]),
+            (updated, "Manager", "Ann@Example.com", "Support", []),
+        ]:
+            with self.subTest(at=at):
+                state = ContactChange.objects.reconstruct(pk, at)
+                self.assertEqual(
+                    (state.first_name, state.job_title, state.email),
+                    ("Ann", job_title, email),
+                )
+                self.assertEqual(
+                    state.history_custom_fields, {field.pk: ("Team", team)}
+                )
+                self.assertEqual(state.history_label_ids, labels)
+        self.assertIsNone(ContactChange.objects.reconstruct(pk))
+
+
+class BulkHistoryTests(TestCase):
+    def inserts(self, queries):
+        return [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "sage_contact_change"')
+        ]
+
+    def test_bulk_create_and_bulk_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            contacts = Contact.objects.bulk_create(
+                Contact(first_name="Ann", last_name=f"Lee {index}")
+                for index in range(5)
+            )
+        self.assertEqual(len(self.inserts(queries)), 1)
+        for contact in contacts:
+            contact.job_title = "Engineer"
+        with CaptureQueriesContext(connection) as queries:
+            Contact.objects.bulk_update(contacts, ["job_title"])
+        self.assertEqual(len(self.inserts(queries)), 1)
+        self.assertEqual(
+            sorted(ContactChange.objects.values_list("action", flat=True)),
+            [ContactChange.Action.CREATE] * 5 + [ContactChange.Action.UPDATE] * 5,
+        )
+
+    @override_settings(SAGE_CONTACT_BULK_BATCH_SIZE=2)
+    def test_one_insert_per_batch(self):
+        Contact.objects.bulk_create(
+            Contact(first_name="Ann", last_name=f"Lee {index}") for index in range(5)
+        )
+        labels = [Label.objects.create(name=name).pk for name in ("VIP", "Team")]
+        cases = [
+            ("update", lambda: Contact.objects.update(job_title="Engineer"), 3),
+            (
+                "bulk_assign",
+                lambda: ContactLabel.objects.bulk_assign(
+                    Contact.objects.all(), labels, batch_size=2
+                ),
+                3,
+            ),
+            (
+                "bulk_unassign",
+                lambda: ContactLabel.objects.bulk_unassign(
+                    Contact.objects.all(), labels, batch_size=2
+                ),
+                3,
+            ),
+        ]
+        for name, func, batches in cases:
+            with self.subTest(name), CaptureQueriesContext(connection) as queries:
+                func()
+            self.assertEqual(len(self.inserts(queries)), batches)
+        self.assertEqual(
+            ContactChange.objects.filter(kind=ContactChange.Kind.LABEL).count(), 20
+        )
@@ -0,0 +1,41 @@
+from unittest import mock
+
+from django.contrib.postgres.indexes import OpClass
+from django.db import connection
+from django.db.models import OrderBy
+from django.db.models.functions import Collate
+from django.db.models.indexes import IndexExpression
+from django.test import SimpleTestCase
+
+from sage_contact.models import Contact
+
+
+class PatternOpsIndexTests(SimpleTestCase):
+    databases = {"default"}
+
+    def create_sql(self):
+        index = next(
+            index
+            for index in Contact._meta.indexes
+            if index.name == "sage_contact_name_idx"
+        )
+        with connection.schema_editor(collect_sql=True) as editor:
+            return str(index.create_sql(Contact, editor))
+
+    def test_plain_expressions_on_other_backends(self):
+        sql = self.create_sql()
+        self.assertIn('"tenant_id", (UPPER("last_name")), (UPPER("first_name"))', sql)
+        self.assertNotIn("pattern_ops", sql)
+
+    def test_pattern_ops_on_postgresql(self):
+        # Registered by django.contrib.postgres when it is installed.
+        wrappers = IndexExpression.wrapper_classes
+        IndexExpression.register_wrappers(OrderBy, OpClass, Collate)
+        self.addCleanup(IndexExpression.register_wrappers, *wrappers)
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            sql = self.create_sql()
+        self.assertIn(
+            '"tenant_id", (UPPER("last_name")) text_pattern_ops, '
+            '(UPPER("first_name")) text_pattern_ops',
+            sql,
+        )
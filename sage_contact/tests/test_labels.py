@@ -0,0 +1,106 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from sage_contact.models import Contact, ContactLabel, Label
+from sage_contact.tenancy import tenant_scope
+from sage_contact.utils.labels import (
+    LabelCatalog,
+    get_label_catalog,
+    refresh_label_counts,
+)
+
+
+class LabelCountTests(TestCase):
+    def setUp(self):
+        self.vip = Label.objects.create(name="VIP")
+        self.team = Label.objects.create(name="Team")
+        self.ann, self.bob = (
+            Contact.objects.create(first_name=name, last_name="Lee")
+            for name in ("Ann", "Bob")
+        )
+
+    def counts(self):
+        return dict(Label.objects.values_list("name", "contact_count"))
+
+    def test_create_move_and_delete_links(self):
+        link = ContactLabel.objects.create(contact=self.ann, label=self.vip)
+        ContactLabel.objects.create(contact=self.bob, label=self.vip)
+        self.assertEqual(self.counts(), {"VIP": 2, "Team": 0})
+
+        link.label = self.team
+        link.save()
+        self.assertEqual(self.counts(), {"VIP": 1, "Team": 1})
+        link.save()
+        self.assertEqual(self.counts(), {"VIP": 1, "Team": 1})
+
+        link.delete()
+        self.assertEqual(self.counts(), {"VIP": 1, "Team": 0})
+
+    def test_contact_deletion_cascades(self):
+        for contact in (self.ann, self.bob):
+            for label in (self.vip, self.team):
+                ContactLabel.objects.create(contact=contact, label=label)
+        self.ann.delete()
+        self.assertEqual(self.counts(), {"VIP": 1, "Team": 1})
+        Contact.objects.all().bulk_delete()
+        self.assertEqual(self.counts(), {"VIP": 0, "Team": 0})
+
+    def test_label_deletion_leaves_other_counts(self):
+        ContactLabel.objects.create(contact=self.ann, label=self.vip)
+        ContactLabel.objects.create(contact=self.ann, label=self.team)
+        self.vip.delete()
+        self.assertEqual(self.counts(), {"Team": 1})
+
+    def test_counts_are_per_tenant(self):
+        with tenant_scope(5):
+            label = Label.objects.create(name="VIP")
+            ContactLabel.objects.create(
+                contact=Contact.objects.create(first_name="Eve", last_name="Kim"),
+                label=label,
+            )
+            self.assertEqual(self.counts(), {"VIP": 1})
+        self.assertEqual(self.counts(), {"VIP": 0, "Team": 0})
+
+    def test_refresh_label_counts(self):
+        ContactLabel.objects.create(contact=self.ann, label=self.vip)
+        Label.objects.update(contact_count=7)
+        self.assertEqual(refresh_label_counts(), 2)
+        self.assertEqual(self.counts(), {"VIP": 1, "Team": 0})
+
+
+class LabelCatalogTests(TestCase):
+    def setUp(self):
+        # Label primary keys are reused after the test's rollback, so no
+        # cached catalog may outlive it.
+        for clear in (cache.clear, get_label_catalog().clear):
+            clear()
+            self.addCleanup(clear)
+        self.vip = Label.objects.create(name="VIP")
+
+    def names(self, entries):
+        return [(entry.name, entry.contact_count) for entry in entries]
+
+    def test_changes_invalidate_the_catalog(self):
+        self.assertEqual(self.names(Label.objects.catalog()), [("VIP", 0)])
+        contact = Contact.objects.create(first_name="Ann", last_name="Lee")
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            ContactLabel.objects.create(contact=contact, label=self.vip)
+            Label.objects.create(name="Team")
+        self.assertTrue(callbacks)
+        self.assertEqual(self.names(Label.objects.catalog()), [("Team", 0), ("VIP", 1)])
+
+    def test_bump(self):
+        catalog = LabelCatalog(local_timeout=3600)
+        other = LabelCatalog(local_timeout=0)
+        self.assertEqual(self.names(catalog.entries()), [("VIP", 0)])
+        self.assertEqual(self.names(other.entries()), [("VIP", 0)])
+        # Changed without signals: both copies are stale until a bump.
+        Label.objects.update(name="Customers")
+        self.assertEqual(self.names(catalog.entries()), [("VIP", 0)])
+        self.assertEqual(self.names(other.entries()), [("VIP", 0)])
+        catalog.bump()
+        self.assertEqual(self.names(catalog.entries()), [("Customers", 0)])
+        # Other processes check the shared version once their copy expires.
+        self.assertEqual(self.names(other.entries()), [("Customers", 0)])
+        with tenant_scope(5):
+            self.assertEqual(catalog.entries(tenant=5), ())
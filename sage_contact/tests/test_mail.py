@@ -0,0 +1,103 @@
+import asyncio
+import os
+import socket
+import threading
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory, TransactionTestCase, override_settings
+
+from sage_contact.benchmarks.data import support_request_data
+from sage_contact.benchmarks.views import BenchmarkSupportView
+from sage_contact.utils.mail import flush
+
+pytest.importorskip("aiosmtplib")
+controller = pytest.importorskip("aiosmtpd.controller")
+
+TEMPLATES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "benchmarks",
+    "templates",
+)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Handler:
+    """Accept every message once ``release`` is set."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+        self.received = []
+
+    async def handle_DATA(self, server, session, envelope):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.release.wait, 5)
+        self.received.append(envelope.rcpt_tos)
+        return "250 OK"
+
+
+class AsyncConfirmationTests(TransactionTestCase):
+    def setUp(self):
+        self.handler = Handler()
+        self.port = free_port()
+        self.server = controller.Controller(
+            self.handler, hostname="127.0.0.1", port=self.port
+        )
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        # Let a blocked send finish before the server stops.
+        self.addCleanup(flush, 5)
+        self.addCleanup(self.handler.release.set)
+        settings = override_settings(
+            EMAIL_BACKEND="sage_contact.utils.mail.AsyncSMTPEmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.port,
+            EMAIL_TIMEOUT=5,
+            BASE_DIR=TEMPLATES_DIR,
+            SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM=True,
+            SAGE_CONTACT_SUPPORT_EMAIL_TEMPLATE_PATH="confirmation.html",
+            SAGE_CONTACT_EMAIL_ASYNC=True,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def post(self):
+        self.data = support_request_data(1)
+        request = RequestFactory().post("/", self.data)
+        request.user = AnonymousUser()
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        return BenchmarkSupportView.as_view()(request)
+
+    def test_confirmation_is_delivered(self):
+        response = self.post()
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(flush(5))
+        self.assertEqual(self.handler.received, [[self.data["email"]]])
+
+    def test_view_returns_before_the_send_finishes(self):
+        self.handler.release.clear()
+        response = self.post()
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(flush(0.1))
+        self.assertEqual(self.handler.received, [])
+        self.handler.release.set()
+        self.assertTrue(flush(5))
+        self.assertEqual(self.handler.received, [[self.data["email"]]])
+
+    def test_failed_send_is_logged(self):
+        with override_settings(EMAIL_PORT=free_port()):
+            with self.assertLogs("sage_contact.utils.mail", "ERROR") as logs:
+                response = self.post()
+                self.assertTrue(flush(5))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("Sending email in the background failed.", logs.output[0])
+        self.assertEqual(self.handler.received, [])
@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from sage_contact.admin.paginator import EstimatedCountPaginator
+from sage_contact.models import Contact
+from sage_contact.tenancy import tenant_scope
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(3):
+            Contact.objects.create(first_name="Ann", last_name=f"Lee {index}")
+
+    def test_tenant_filter_only(self):
+        with tenant_scope(4):
+            scoped = Contact.objects.all()
+        self.assertTrue(EstimatedCountPaginator.is_tenant_filter_only(scoped))
+        for queryset in (
+            scoped.filter(first_name="Ann"),
+            scoped.exclude(tenant_id=5),
+            Contact.objects.all_tenants(),
+            Contact.objects.all_tenants().filter(pk=1),
+        ):
+            with self.subTest(queryset=str(queryset.query)):
+                self.assertFalse(
+                    EstimatedCountPaginator.is_tenant_filter_only(queryset)
+                )
+
+    @mock.patch.object(EstimatedCountPaginator, "estimated_table_count")
+    @mock.patch.object(EstimatedCountPaginator, "estimated_filter_count")
+    def test_estimates(self, filter_count, table_count):
+        filter_count.return_value = 20_000
+        table_count.return_value = 30_000
+        scoped = Contact.objects.order_by("-pk")
+        self.assertEqual(EstimatedCountPaginator(scoped, 50).count, 20_000)
+        unscoped = Contact.objects.all_tenants().order_by("-pk")
+        self.assertEqual(EstimatedCountPaginator(unscoped, 50).count, 30_000)
+        filtered = scoped.filter(first_name="Ann")
+        self.assertEqual(EstimatedCountPaginator(filtered, 50).count, 3)
+        self.assertEqual(filter_count.call_count, 1)
+        self.assertEqual(table_count.call_count, 1)
+
+    def test_small_estimates_are_counted(self):
+        paginator = EstimatedCountPaginator(Contact.objects.order_by("-pk"), 50)
+        self.assertEqual(paginator.count, 3)
+        paginator = EstimatedCountPaginator(Contact.objects.order_by("-pk"), 50)
+        paginator.count_limit = 2
+        self.assertEqual(paginator.count, 2)
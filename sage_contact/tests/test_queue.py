@@ -0,0 +1,148 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from sage_contact.benchmarks.data import support_request_data
+from sage_contact.constants.choices import QueueStates
+from sage_contact.models import (
+    FullSupportRequest,
+    SupportQueueItem,
+    SupportRequestBase,
+)
+from sage_contact.repository.queryset.queue import SupportQueueItemQuerySet
+from sage_contact.utils.queue import Route
+
+
+def route_to_vip(instance):
+    if instance.email.startswith("vip"):
+        return Route("vip", 99, timedelta(minutes=5))
+    return None
+
+
+def support_request(index, **kwargs):
+    return FullSupportRequest.objects.create(
+        **{**support_request_data(index), **kwargs}
+    )
+
+
+class EnqueueTests(TestCase):
+    def test_queue_is_off_by_default(self):
+        support_request(0)
+        self.assertFalse(SupportQueueItem.objects.exists())
+
+    @override_settings(SAGE_CONTACT_QUEUE=True)
+    def test_routing_by_reason(self):
+        sales = support_request(0, contact_reason="sales")
+        support = support_request(1, contact_reason="support")
+        base = SupportRequestBase.objects.create(
+            subject="Hello", full_name="Ann Lee", email="ann@example.com", message="Hi"
+        )
+        items = {
+            item.support_request_id: item for item in SupportQueueItem.objects.all()
+        }
+        self.assertEqual(
+            {pk: (item.queue, item.priority) for pk, item in items.items()},
+            {
+                sales.pk: ("sales", 20),
+                support.pk: ("support", 30),
+                base.pk: ("general", 20),
+            },
+        )
+        self.assertEqual(items[sales.pk].due_at, sales.created_at + timedelta(hours=8))
+        self.assertEqual(items[sales.pk].state, QueueStates.OPEN)
+
+    @override_settings(
+        SAGE_CONTACT_QUEUE=True,
+        SAGE_CONTACT_QUEUE_ROUTER="sage_contact.tests.test_queue.route_to_vip",
+    )
+    def test_custom_router(self):
+        vip = support_request(0, email="vip@example.com")
+        support_request(1)
+        item = SupportQueueItem.objects.get()
+        self.assertEqual(
+            (item.support_request_id, item.queue, item.priority),
+            (vip.pk, "vip", 99),
+        )
+
+    @override_settings(SAGE_CONTACT_QUEUE=True)
+    def test_updates_are_not_queued_again(self):
+        request = support_request(0)
+        request.subject = "Updated"
+        request.save()
+        self.assertEqual(SupportQueueItem.objects.count(), 1)
+
+
+@override_settings(SAGE_CONTACT_QUEUE=True)
+class ClaimTests(TestCase):
+    def setUp(self):
+        reasons = ["feedback", "sales", "support", "support", "sales"]
+        self.requests = [
+            support_request(index, contact_reason=reason)
+            for index, reason in enumerate(reasons)
+        ]
+
+    def claimed(self, items):
+        return [item.support_request_id for item in items]
+
+    def test_claim_order(self):
+        first = SupportQueueItem.objects.claim("a", limit=3)
+        self.assertEqual(
+            [item.queue for item in first], ["support", "support", "sales"]
+        )
+        self.assertEqual({item.claimed_by for item in first}, {"a"})
+        self.assertEqual({item.attempts for item in first}, {1})
+        self.assertIsInstance(first[0].support_request, SupportRequestBase)
+        second = SupportQueueItem.objects.claim("b", limit=3)
+        self.assertEqual([item.queue for item in second], ["sales", "feedback"])
+        self.assertFalse(set(self.claimed(first)) & set(self.claimed(second)))
+        self.assertEqual(SupportQueueItem.objects.claim("c"), [])
+
+    def test_claim_by_queue(self):
+        items = SupportQueueItem.objects.claim("a", queues="sales", limit=5)
+        self.assertEqual(
+            self.claimed(items), [self.requests[1].pk, self.requests[4].pk]
+        )
+
+    def test_competing_claims(self):
+        won = self.claimed(SupportQueueItem.objects.claim("a", limit=2))
+        # Worker "b" read its candidates before "a" committed: they include
+        # the items "a" won, which it must not get.
+        with mock.patch.object(SupportQueueItemQuerySet, "open", lambda self: self):
+            items = SupportQueueItem.objects.claim("b", limit=3)
+        self.assertEqual(self.claimed(items), [self.requests[1].pk])
+        self.assertEqual(
+            set(
+                SupportQueueItem.objects.filter(claimed_by="a").values_list(
+                    "pk", flat=True
+                )
+            ),
+            set(won),
+        )
+
+    def test_requeue_expired(self):
+        expired = SupportQueueItem.objects.claim("a", lease=timedelta(seconds=-1))
+        held = SupportQueueItem.objects.claim("b")
+        self.assertEqual(SupportQueueItem.objects.requeue_expired(), 1)
+        item = SupportQueueItem.objects.get(pk=expired[0].pk)
+        self.assertEqual(
+            (item.state, item.claimed_by, item.claimed_until),
+            (QueueStates.OPEN, "", None),
+        )
+        self.assertEqual(
+            SupportQueueItem.objects.get(pk=held[0].pk).state, QueueStates.CLAIMED
+        )
+        reclaimed = SupportQueueItem.objects.claim("c")
+        self.assertEqual(self.claimed(reclaimed), self.claimed(expired))
+        self.assertEqual(reclaimed[0].attempts, 2)
+
+    def test_complete_and_release(self):
+        SupportQueueItem.objects.claim("a", limit=2)
+        self.assertEqual(SupportQueueItem.objects.filter(queue="sales").release(), 0)
+        self.assertEqual(SupportQueueItem.objects.filter(queue="support").complete(), 2)
+        self.assertEqual(
+            SupportQueueItem.objects.filter(state=QueueStates.DONE).count(), 2
+        )
+        self.assertEqual(SupportQueueItem.objects.claim("b")[0].queue, "sales")
+        self.assertEqual(SupportQueueItem.objects.all().release(), 1)
+        self.assertEqual(SupportQueueItem.objects.open().count(), 3)
@@ -0,0 +1,55 @@
+import io
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+from django.utils import timezone
+
+from sage_contact.models import SupportRequestArchive, SupportRequestBase
+from sage_contact.utils.retention import archive_support_requests
+
+
+class ArchiveSupportRequestsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(5):
+            SupportRequestBase.objects.create(
+                subject=f"Question {index}",
+                full_name="Ann Lee",
+                email=f"ann{index}@example.com",
+                message="Hello",
+            )
+        cls.cutoff = timezone.now() + timedelta(seconds=1)
+
+    def test_batches_are_archived_and_deleted(self):
+        stream = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            total = archive_support_requests(self.cutoff, batch_size=2, stream=stream)
+        self.assertEqual(total, 5)
+        self.assertFalse(SupportRequestBase.objects.exists())
+        self.assertEqual(SupportRequestArchive.objects.count(), 5)
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(
+            sorted(line["id"] for line in lines),
+            sorted(SupportRequestArchive.objects.values_list("original_id", flat=True)),
+        )
+
+    def test_failed_batch_is_not_written(self):
+        stream = io.StringIO()
+        with mock.patch(
+            "sage_contact.utils.retention.delete_support_requests",
+            side_effect=DatabaseError("deadlock"),
+        ), self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(DatabaseError):
+                archive_support_requests(self.cutoff, batch_size=2, stream=stream)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(stream.getvalue(), "")
+        self.assertEqual(SupportRequestBase.objects.count(), 5)
+        self.assertFalse(SupportRequestArchive.objects.exists())
+
+        # The retry archives every request once.
+        with self.captureOnCommitCallbacks(execute=True):
+            archive_support_requests(self.cutoff, batch_size=2, stream=stream)
+        self.assertEqual(len(stream.getvalue().splitlines()), 5)
@@ -0,0 +1,108 @@
+from django.contrib.auth.models import User
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+
+from sage_contact.models import Contact, FullSupportRequest, SupportRequestBase
+from sage_contact.routers import (
+    PRIMARY_COOKIE_NAME,
+    ReadYourWritesMiddleware,
+    ReplicaRouter,
+    read_from_primary,
+    read_from_replica,
+    request_scope,
+)
+
+
+class ReplicaRouterTests(TestCase):
+    databases = {"default", "replica"}
+
+    def test_reads_use_the_primary_by_default(self):
+        self.assertEqual(Contact.objects.all().db, "default")
+        self.assertEqual(SupportRequestBase.objects.all().db, "default")
+
+    def test_on_replica_reads_use_the_replica(self):
+        self.assertEqual(Contact.objects.on_replica().db, "replica")
+        self.assertEqual(Contact.objects.search_by_name("a").db, "replica")
+        self.assertEqual(SupportRequestBase.objects.on_replica().db, "replica")
+
+    def test_read_from_replica_block(self):
+        with read_from_replica():
+            self.assertEqual(Contact.objects.all().db, "replica")
+            self.assertEqual(FullSupportRequest.objects.all().db, "replica")
+            # Only sage_contact models are routed.
+            self.assertEqual(User.objects.all().db, "default")
+        self.assertEqual(Contact.objects.all().db, "default")
+
+    def test_read_from_primary_overrides_the_replica(self):
+        with read_from_replica(), read_from_primary():
+            self.assertEqual(Contact.objects.all().db, "default")
+            self.assertEqual(Contact.objects.on_replica().db, "default")
+
+    def test_writes_always_use_the_primary(self):
+        self.assertEqual(router.db_for_write(Contact), "default")
+        with read_from_replica():
+            self.assertEqual(router.db_for_write(Contact), "default")
+            contact = Contact.objects.create(first_name="Ann", last_name="Lee")
+        self.assertEqual(contact._state.db, "default")
+        contact._state.db = "replica"
+        self.assertEqual(router.db_for_write(Contact, instance=contact), "default")
+
+    def test_reads_after_a_write_use_the_primary(self):
+        with request_scope(RequestFactory().get("/")) as state:
+            self.assertEqual(Contact.objects.on_replica().db, "replica")
+            Contact.objects.create(first_name="Bob", last_name="Ray")
+            self.assertTrue(state["wrote"])
+            self.assertEqual(Contact.objects.on_replica().db, "default")
+            with read_from_replica():
+                self.assertEqual(Contact.objects.all().db, "default")
+        self.assertEqual(Contact.objects.on_replica().db, "replica")
+
+    def test_primary_cookie_keeps_reads_on_the_primary(self):
+        request = RequestFactory().get("/")
+        request.COOKIES[PRIMARY_COOKIE_NAME] = "1"
+        with request_scope(request):
+            self.assertEqual(Contact.objects.on_replica().db, "default")
+            with read_from_replica():
+                self.assertEqual(Contact.objects.all().db, "default")
+
+    def test_middleware_sets_the_primary_cookie_after_a_write(self):
+        def write(request):
+            Contact.objects.create(first_name="Cy", last_name="Orr")
+            return HttpResponse()
+
+        def read(request):
+            Contact.objects.on_replica().exists()
+            return HttpResponse()
+
+        factory = RequestFactory()
+        response = ReadYourWritesMiddleware(write)(factory.post("/"))
+        self.assertIn(PRIMARY_COOKIE_NAME, response.cookies)
+        response = ReadYourWritesMiddleware(read)(factory.get("/"))
+        self.assertNotIn(PRIMARY_COOKIE_NAME, response.cookies)
+
+    @override_settings(SAGE_CONTACT_READ_DATABASE=None)
+    def test_without_a_replica_nothing_is_routed(self):
+        self.assertEqual(Contact.objects.on_replica().db, "default")
+        self.assertIsNone(ReplicaRouter().db_for_write(Contact))
+
+    def test_no_migrations_on_the_replica(self):
+        self.assertIs(ReplicaRouter().allow_migrate("replica", "sage_contact"), False)
+        self.assertIs(ReplicaRouter().allow_migrate("replica", "auth"), False)
+        self.assertIsNone(ReplicaRouter().allow_migrate("default", "sage_contact"))
+        self.assertFalse(router.allow_migrate("replica", "sage_contact"))
+        self.assertTrue(router.allow_migrate("default", "sage_contact"))
+
+
+class ReplicaReadTests(TransactionTestCase):
+    """Reads through the replica connection see the committed rows."""
+
+    databases = {"default", "replica"}
+
+    def test_on_replica_reads_the_mirror(self):
+        contact = Contact.objects.create(first_name="Ann", last_name="Lee")
+        replica = Contact.objects.on_replica().get(pk=contact.pk)
+        self.assertEqual(replica._state.db, "replica")
+        replica.first_name = "Anna"
+        replica.save()
+        self.assertEqual(Contact.objects.get(pk=contact.pk).first_name, "Anna")
@@ -0,0 +1,233 @@
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from sage_contact.benchmarks.data import support_request_data
+from sage_contact.benchmarks.views import BenchmarkSupportView
+from sage_contact.models import QuarantinedSupportRequest, SupportRequestBase
+from sage_contact.utils.spam import (
+    ACCEPT,
+    DROP,
+    QUARANTINE,
+    NaiveBayes,
+    SpamScorer,
+    timing_token,
+    train_spam_model,
+)
+
+FORM_CLASS = "sage_contact.forms.support.SupportRequestForm"
+
+
+def quarantine(index, **kwargs):
+    data = support_request_data(index)
+    return QuarantinedSupportRequest.objects.create(
+        form_class=FORM_CLASS,
+        subject=data["subject"],
+        email=data["email"],
+        data={
+            name: data[name] for name in ("subject", "full_name", "email", "message")
+        },
+        score=5,
+        reasons="links",
+        **kwargs,
+    )
+
+
+class ReleaseTests(TestCase):
+    def test_release(self):
+        quarantine(0)
+        invalid = quarantine(1)
+        invalid.data = {**invalid.data, "email": "not an email"}
+        invalid.save()
+        released = QuarantinedSupportRequest.objects.order_by("pk").release()
+        self.assertEqual(released, 1)
+        self.assertEqual(
+            list(SupportRequestBase.objects.values_list("email", flat=True)),
+            [support_request_data(0)["email"]],
+        )
+        self.assertEqual(list(QuarantinedSupportRequest.objects.all()), [invalid])
+
+    def test_failed_release_is_not_repeated(self):
+        for index in range(3):
+            quarantine(index)
+        save = SupportRequestBase.save
+        calls = []
+
+        def fail_second(instance, *args, **kwargs):
+            calls.append(instance.email)
+            if len(calls) == 2:
+                raise DatabaseError("lost connection")
+            return save(instance, *args, **kwargs)
+
+        with mock.patch.object(SupportRequestBase, "save", fail_second):
+            with self.assertRaises(DatabaseError):
+                QuarantinedSupportRequest.objects.order_by("pk").release()
+        self.assertEqual(SupportRequestBase.objects.count(), 1)
+        self.assertEqual(QuarantinedSupportRequest.objects.count(), 2)
+
+        self.assertEqual(QuarantinedSupportRequest.objects.order_by("pk").release(), 2)
+        self.assertEqual(
+            sorted(SupportRequestBase.objects.values_list("email", flat=True)),
+            sorted(support_request_data(index)["email"] for index in range(3)),
+        )
+        self.assertFalse(QuarantinedSupportRequest.objects.exists())
+
+    @override_settings(SAGE_CONTACT_SPAM_FILTER=True)
+    def test_quarantine_round_trip(self):
+        data = support_request_data(0)
+        request = RequestFactory().post(
+            "/", {**data, "sage_contact_ts": timing_token()}
+        )
+        request.user = AnonymousUser()
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        response = BenchmarkSupportView.as_view()(request)
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(SupportRequestBase.objects.exists())
+        item = QuarantinedSupportRequest.objects.get()
+        self.assertEqual(item.reasons, "timing_fast")
+        self.assertEqual(item.email, data["email"])
+
+        self.assertEqual(QuarantinedSupportRequest.objects.release(), 1)
+        self.assertFalse(QuarantinedSupportRequest.objects.exists())
+        released = SupportRequestBase.objects.get()
+        self.assertEqual(
+            (released.subject, released.email, released.message),
+            (data["subject"], data["email"], data["message"].strip()),
+        )
+
+
+class TrainSpamCommandTests(TestCase):
+    def train(self, *args):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model.json")
+            out = StringIO()
+            call_command("sage_contact_train_spam", path, *args, stdout=out)
+            return NaiveBayes.load(path), out.getvalue()
+
+    def test_train(self):
+        for index in range(3):
+            quarantine(index, ip_address=None)
+            data = support_request_data(index + 3)
+            SupportRequestBase.objects.create(
+                **{
+                    name: data[name]
+                    for name in ("subject", "full_name", "email", "message")
+                }
+            )
+        model, out = self.train("--limit", "2")
+        self.assertIn("Trained on 2 spam and 2 legitimate texts", out)
+        self.assertTrue(model.counts)
+
+    def test_needs_both_kinds(self):
+        quarantine(0)
+        with self.assertRaisesMessage(CommandError, "needs both"):
+            self.train()
+
+    def test_limit_must_be_positive(self):
+        with self.assertRaisesMessage(CommandError, "--limit"):
+            self.train("--limit", "0")
+
+
+class SpamScorerTests(SimpleTestCase):
+    def submission(self, **data):
+        data = {
+            **support_request_data(0),
+            "sage_contact_ts": timing_token(now=time.time() - 60),
+            **data,
+        }
+        return data, data
+
+    def test_model_scores_clean_submissions(self):
+        scorer = SpamScorer(
+            model=train_spam_model(
+                ["cheap casino bonus win money now"] * 50,
+                [support_request_data(index)["message"] for index in range(50)],
+            )
+        )
+        verdict = scorer.score(*self.submission(message="Win casino money now"))
+        self.assertEqual(verdict.action, QUARANTINE)
+        self.assertEqual(verdict.reasons, ("bayes",))
+        self.assertEqual(scorer.score(*self.submission()).action, ACCEPT)
+
+    def test_links_in_any_case(self):
+        scorer = SpamScorer(max_links=0, blocked_domains=["spam.example"])
+        verdict = scorer.score(*self.submission(message="See Www.spam.example"))
+        self.assertEqual(verdict.action, DROP)
+        self.assertEqual(verdict.reasons, ("links", "blocked_link"))
+
+    def test_honeypot(self):
+        verdict = SpamScorer().score(*self.submission(homepage="https://x.example"))
+        self.assertEqual(verdict, (DROP, 10, ("honeypot",)))
+
+    def test_blocked_email_domain(self):
+        scorer = SpamScorer(blocked_domains=["@Spam.Example."])
+        for email in ("bot@spam.example", "bot@mail.spam.example"):
+            with self.subTest(email=email):
+                verdict = scorer.score(*self.submission(email=email))
+                self.assertEqual(verdict, (DROP, 10, ("blocked_domain",)))
+        verdict = scorer.score(*self.submission(email="user@notspam.example"))
+        self.assertEqual(verdict.action, ACCEPT)
+
+    def test_timing(self):
+        scorer = SpamScorer(timing_required=True)
+        cases = [
+            (timing_token(), (QUARANTINE, 5, ("timing_fast",))),
+            (timing_token(now=time.time() - 60), (ACCEPT, 0, ())),
+            (
+                timing_token(now=time.time() - 86400 - 60),
+                (ACCEPT, 2, ("timing_expired",)),
+            ),
+            (timing_token()[:-1] + "x", (DROP, 10, ("timing_invalid",))),
+            ("not a token", (DROP, 10, ("timing_invalid",))),
+            ("", (QUARANTINE, 5, ("timing_missing",))),
+        ]
+        for token, expected in cases:
+            with self.subTest(token=token):
+                verdict = scorer.score(*self.submission(sage_contact_ts=token))
+                self.assertEqual(verdict, expected)
+        verdict = SpamScorer().score(*self.submission(sage_contact_ts=""))
+        self.assertEqual(verdict, (ACCEPT, 0, ()))
+
+    def test_link_count(self):
+        scorer = SpamScorer(max_links=1)
+        for count, expected in [
+            (1, (ACCEPT, 0, ())),
+            (2, (ACCEPT, 2, ("links",))),
+            (4, (QUARANTINE, 6, ("links",))),
+            (6, (DROP, 10, ("links",))),
+        ]:
+            message = " ".join(f"https://site{n}.example/page" for n in range(count))
+            with self.subTest(count=count):
+                verdict = scorer.score(*self.submission(message=message))
+                self.assertEqual(verdict, expected)
+
+    def test_blocked_link(self):
+        scorer = SpamScorer(blocked_domains=["spam.example"])
+        verdict = scorer.score(
+            *self.submission(subject="Offer at http://shop.spam.example/deal")
+        )
+        self.assertEqual(verdict, (DROP, 10, ("blocked_link",)))
+
+    def test_thresholds(self):
+        message = " ".join(f"https://site{n}.example" for n in range(4))
+        for quarantine_score, drop_score, action in [
+            (5, 10, ACCEPT),
+            (4, 10, QUARANTINE),
+            (2, 4, DROP),
+        ]:
+            scorer = SpamScorer(
+                max_links=2, quarantine_score=quarantine_score, drop_score=drop_score
+            )
+            with self.subTest(quarantine_score=quarantine_score, drop_score=drop_score):
+                verdict = scorer.score(*self.submission(message=message))
+                self.assertEqual(verdict, (action, 4, ("links",)))
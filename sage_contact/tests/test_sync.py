@@ -0,0 +1,188 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from sage_contact.models import Contact, ContactLabel, CustomField, Label
+from sage_contact.tenancy import tenant_scope
+from sage_contact.utils.sync import (
+    SyncTokenError,
+    SyncTokenExpired,
+    changes_since,
+    decode_token,
+    iter_changes,
+    purge_tombstones,
+)
+
+
+@override_settings(SAGE_CONTACT_SYNC=True)
+class SyncTests(TestCase):
+    def setUp(self):
+        self.ann = Contact.objects.create(first_name="Ann", last_name="Lee")
+        self.bob = Contact.objects.create(first_name="Bob", last_name="Ray")
+        self.field = CustomField.objects.create(
+            contact=self.ann, field_name="Team", field_value="Sales"
+        )
+        self.label = ContactLabel.objects.create(
+            contact=self.bob, label=Label.objects.create(name="VIP")
+        )
+
+    def changes(self, page):
+        return [(change.kind, change.op, change.id) for change in page.changes]
+
+    def test_first_sync(self):
+        page = changes_since()
+        self.assertEqual(
+            self.changes(page),
+            [
+                ("contact", "upsert", self.ann.pk),
+                ("contact", "upsert", self.bob.pk),
+                ("custom_field", "upsert", self.field.pk),
+                ("label", "upsert", self.label.pk),
+            ],
+        )
+        self.assertFalse(page.more)
+        self.assertEqual(page.changes[2].contact_id, self.ann.pk)
+        self.assertEqual(page.changes[2].data["field_value"], "Sales")
+        self.assertNotIn("tenant_id", page.changes[0].data)
+        self.assertEqual(changes_since(page.token).changes, [])
+
+    def test_token_is_monotonic(self):
+        token = changes_since().token
+        self.ann.job_title = "Engineer"
+        self.ann.save()
+        page = changes_since(token)
+        self.assertEqual(self.changes(page), [("contact", "upsert", self.ann.pk)])
+        self.assertEqual(page.changes[0].data["job_title"], "Engineer")
+        self.assertGreater(decode_token(page.token), decode_token(token))
+        self.assertGreater(page.changes[0].seq, self.label.sync_seq)
+
+    def test_pages_across_models(self):
+        expected = self.changes(changes_since())
+        seen, token, tokens = [], None, []
+        while True:
+            page = changes_since(token, limit=1)
+            seen += self.changes(page)
+            tokens.append(decode_token(page.token))
+            token = page.token
+            if not page.more:
+                break
+        self.assertEqual(seen, expected)
+        self.assertEqual(tokens, sorted(set(tokens)))
+
+    def test_deletes_leave_tombstones(self):
+        token = changes_since().token
+        field_id, bob_id = self.field.pk, self.bob.pk
+        self.field.delete()
+        self.bob.delete()
+        page = changes_since(token)
+        self.assertEqual(
+            self.changes(page),
+            [
+                ("custom_field", "delete", field_id),
+                ("contact", "delete", bob_id),
+            ],
+        )
+        self.assertIsNone(page.changes[0].data)
+        # A first sync has nothing to delete.
+        self.assertEqual(
+            self.changes(changes_since()), [("contact", "upsert", self.ann.pk)]
+        )
+
+    def test_update_advances_token(self):
+        token = changes_since().token
+        self.assertEqual(Contact.objects.update(job_title="Engineer"), 2)
+        page = changes_since(token)
+        self.assertEqual(
+            self.changes(page),
+            [("contact", "upsert", self.ann.pk), ("contact", "upsert", self.bob.pk)],
+        )
+        self.assertEqual(page.changes[0].seq, page.changes[1].seq)
+        self.assertEqual(changes_since(page.token).changes, [])
+
+    def test_page_does_not_split_a_statement(self):
+        token = changes_since().token
+        Contact.objects.update(job_title="Engineer")
+        first = changes_since(token, limit=1)
+        second = changes_since(first.token, limit=1)
+        self.assertTrue(first.more)
+        self.assertEqual(self.changes(first), [("contact", "upsert", self.ann.pk)])
+        self.assertEqual(self.changes(second), [("contact", "upsert", self.bob.pk)])
+        self.assertFalse(second.more)
+
+    def test_tenants_are_separate(self):
+        with tenant_scope(7):
+            Contact.objects.create(first_name="Eve", last_name="Kim")
+            self.assertEqual(
+                [change.data["first_name"] for change in changes_since().changes],
+                ["Eve"],
+            )
+        self.assertEqual(len(list(iter_changes())), 4)
+
+    def test_tokens(self):
+        with self.assertRaises(SyncTokenError):
+            changes_since("not-a-token")
+        token = changes_since().token
+        self.bob.delete()
+        purge_tombstones(timedelta(seconds=-1))
+        with self.assertRaises(SyncTokenExpired):
+            changes_since(token)
+
+
+@override_settings(SAGE_CONTACT_SYNC=True)
+class ContactSyncViewTests(TestCase):
+    url = reverse("sage_contact_api:contact_sync")
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin"))
+
+    def lines(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in response.streaming_content]
+
+    def test_sync(self):
+        ann = Contact.objects.create(first_name="Ann", last_name="Lee")
+        *changes, end = self.lines(self.client.get(self.url))
+        self.assertEqual(
+            [(change["kind"], change["op"], change["id"]) for change in changes],
+            [("contact", "upsert", ann.pk)],
+        )
+        self.assertFalse(end["more"])
+
+        ann_id = ann.pk
+        ann.delete()
+        *changes, _ = self.lines(self.client.get(self.url, {"since": end["token"]}))
+        self.assertEqual(
+            [(change["op"], change["id"], change["data"]) for change in changes],
+            [("delete", ann_id, None)],
+        )
+
+    def test_paging(self):
+        Contact.objects.bulk_create(
+            Contact(first_name="Ann", last_name=f"Lee {index}") for index in range(3)
+        )
+        Contact.objects.update(job_title="Engineer")
+        *changes, end = self.lines(self.client.get(self.url, {"limit": 2}))
+        self.assertEqual(len(changes), 2)
+        self.assertTrue(end["more"])
+        *changes, end = self.lines(
+            self.client.get(self.url, {"since": end["token"], "limit": 2})
+        )
+        self.assertEqual(len(changes), 1)
+        self.assertFalse(end["more"])
+
+    def test_errors(self):
+        self.assertEqual(self.client.get(self.url, {"since": "x"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"limit": "x"}).status_code, 400)
+        Contact.objects.create(first_name="Ann", last_name="Lee").delete()
+        purge_tombstones(timedelta(seconds=-1))
+        response = self.client.get(self.url, {"since": "0-0-0"})
+        self.assertEqual(response.status_code, 410)
+        with self.settings(SAGE_CONTACT_SYNC=False):
+            self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_permission_required(self):
+        self.client.force_login(User.objects.create_user("staff"))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
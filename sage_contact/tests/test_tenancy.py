@@ -0,0 +1,124 @@
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from sage_contact.models import Contact, ContactChange, CustomField, Label
+from sage_contact.tenancy import TenantMiddleware, current_tenant, tenant_scope
+
+
+def tenant_of_request(request):
+    return request.GET.get("tenant")
+
+
+class TenancyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Contact.objects.create(
+            first_name="Ann", last_name="Lee", email="ann@example.com"
+        )
+        Label.objects.create(name="VIP")
+        with tenant_scope(5):
+            Contact.objects.create(
+                first_name="Bob", last_name="Ray", email="ann@example.com"
+            )
+            Label.objects.create(name="VIP")
+
+    def test_managers_hide_other_tenants(self):
+        for tenant, name in [(None, "Ann"), (5, "Bob"), (6, None)]:
+            with self.subTest(tenant=tenant), tenant_scope(tenant):
+                self.assertEqual(
+                    list(Contact.objects.values_list("first_name", flat=True)),
+                    [name] if name else [],
+                )
+                self.assertEqual(
+                    list(
+                        Contact.objects.by_email("ANN@example.com").values_list(
+                            "first_name", flat=True
+                        )
+                    ),
+                    [name] if name else [],
+                )
+                self.assertEqual(Label.objects.count(), 1 if name else 0)
+                self.assertEqual(
+                    [entry.name for entry in Label.objects.catalog()],
+                    ["VIP"] if name else [],
+                )
+
+    def test_all_tenants(self):
+        self.assertEqual(
+            sorted(
+                Contact.objects.all_tenants().values_list("tenant_id", "first_name")
+            ),
+            [(0, "Ann"), (5, "Bob")],
+        )
+        self.assertEqual(
+            sorted(Label.objects.all_tenants().values_list("tenant_id", flat=True)),
+            [0, 5],
+        )
+
+    def test_label_name_is_unique_per_tenant(self):
+        with tenant_scope(6):
+            Label.objects.create(name="VIP")
+        for tenant in (None, 5, 6):
+            with self.subTest(tenant=tenant), tenant_scope(tenant):
+                with self.assertRaises(IntegrityError), transaction.atomic():
+                    Label.objects.create(name="VIP")
+
+    @override_settings(
+        SAGE_CONTACT_TENANT_RESOLVER="sage_contact.tests.test_tenancy.tenant_of_request"
+    )
+    def test_middleware(self):
+        def view(request):
+            return HttpResponse(
+                f"{current_tenant()}:{Contact.objects.get().first_name}"
+            )
+
+        middleware = TenantMiddleware(view)
+        for query, body in [({}, b"0:Ann"), ({"tenant": "5"}, b"5:Bob")]:
+            with self.subTest(query=query):
+                request = RequestFactory().get("/", query)
+                self.assertEqual(middleware(request).content, body)
+        self.assertEqual(current_tenant(), 0)
+
+
+class ContactChangeTenancyTests(TestCase):
+    def test_changes_belong_to_the_tenant_of_the_row(self):
+        with tenant_scope(5):
+            contact = Contact.objects.create(first_name="Ann", last_name="Lee")
+            CustomField.objects.create(
+                contact=contact, field_name="Team", field_value="Sales"
+            )
+            self.assertEqual(ContactChange.objects.count(), 2)
+            self.assertEqual(
+                ContactChange.objects.reconstruct(contact.pk).first_name, "Ann"
+            )
+        self.assertFalse(ContactChange.objects.exists())
+        self.assertIsNone(ContactChange.objects.reconstruct(contact.pk))
+        self.assertEqual(
+            set(
+                ContactChange.objects.all_tenants().values_list("tenant_id", flat=True)
+            ),
+            {5},
+        )
+
+    def test_bulk_paths_log_the_tenant_of_each_row(self):
+        tenants = {}
+        for tenant in (5, 6):
+            with tenant_scope(tenant):
+                contact = Contact.objects.create(first_name="Ann", last_name="Lee")
+                tenants[contact.pk] = tenant
+        ContactChange.objects.all_tenants().delete()
+        Contact.objects.all_tenants().update(job_title="Engineer")
+        Contact.objects.all_tenants().delete()
+        self.assertEqual(
+            sorted(
+                ContactChange.objects.all_tenants().values_list(
+                    "contact_id", "action", "tenant_id"
+                )
+            ),
+            sorted(
+                (pk, action, tenant)
+                for pk, tenant in tenants.items()
+                for action in (ContactChange.Action.UPDATE, ContactChange.Action.DELETE)
+            ),
+        )
@@ -0,0 +1,76 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from sage_contact.utils.timing import StageHistogram
+
+
+class StageHistogramTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def wait(self, histogram):
+        thread = histogram._flush_thread
+        if thread is not None:
+            thread.join(5)
+
+    def test_flush_runs_in_the_background(self):
+        histogram = StageHistogram("default", flush_interval=0)
+        threads = []
+        flush = histogram.flush
+
+        def record_thread():
+            threads.append(threading.current_thread().name)
+            flush()
+
+        with mock.patch.object(histogram, "flush", record_thread):
+            histogram.observe("db.insert", 0.002)
+            self.wait(histogram)
+        self.assertEqual(threads, ["sage-contact-timing"])
+        self.assertEqual(histogram.shared_snapshot()["db.insert"]["count"], 1)
+
+    def test_flushes_of_several_processes_add_up(self):
+        first = StageHistogram("default", flush_interval=3600)
+        second = StageHistogram("default", flush_interval=3600)
+        for duration in (0.002, 0.002, 0.3):
+            first.observe("db.insert", duration)
+        first.flush()
+        second.observe("db.insert", 0.002)
+        second.observe("geoip.lookup", 0.0001)
+        second.flush()
+        first.observe("db.insert", 0.002)
+        with mock.patch.object(cache, "add", wraps=cache.add) as add:
+            first.flush()
+        # Keys this process created are only incremented.
+        add.assert_not_called()
+
+        stats = first.shared_snapshot()
+        self.assertEqual(sorted(stats), ["db.insert", "geoip.lookup"])
+        self.assertEqual(stats["db.insert"]["count"], 5)
+        self.assertEqual(stats["db.insert"]["buckets"][2], 4)
+        self.assertEqual(stats["db.insert"]["buckets"][9], 1)
+        self.assertAlmostEqual(stats["db.insert"]["mean"], 0.0616)
+        self.assertEqual(stats["geoip.lookup"]["count"], 1)
+
+    def test_flush_after_the_cache_was_cleared(self):
+        histogram = StageHistogram("default", flush_interval=3600)
+        histogram.observe("db.insert", 0.002)
+        histogram.flush()
+        cache.clear()
+        histogram.observe("db.insert", 0.002)
+        histogram.flush()
+        self.assertEqual(histogram.shared_snapshot()["db.insert"]["count"], 1)
+        self.assertEqual(histogram.local_snapshot()["db.insert"]["count"], 2)
+
+    def test_reset(self):
+        histogram = StageHistogram("default", flush_interval=3600)
+        histogram.observe("db.insert", 0.002)
+        histogram.flush()
+        histogram.reset()
+        self.assertEqual(histogram.shared_snapshot(), {})
+        histogram.observe("db.insert", 0.002)
+        histogram.flush()
+        self.assertEqual(histogram.shared_snapshot()["db.insert"]["count"], 1)
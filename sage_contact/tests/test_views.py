@@ -0,0 +1,82 @@
+from unittest import mock
+
+from django import forms
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages import get_messages
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory, TestCase, override_settings
+
+from sage_contact.benchmarks.data import support_request_data
+from sage_contact.benchmarks.views import BenchmarkSupportView
+from sage_contact.forms import FullSupportRequestForm
+from sage_contact.models import SupportRequestBase
+
+
+class ThirdPartySupportForm(forms.ModelForm):
+    class Meta:
+        model = SupportRequestBase
+        fields = ["subject", "full_name", "email", "message"]
+
+
+class ThirdPartySupportView(BenchmarkSupportView):
+    support_form_class = ThirdPartySupportForm
+
+
+class ViewTestCase(TestCase):
+    view_class = BenchmarkSupportView
+
+    def request(self, request):
+        request.user = AnonymousUser()
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        return request, self.view_class.as_view()(request)
+
+    def post(self, **data):
+        return self.request(
+            RequestFactory().post("/", {**support_request_data(), **data})
+        )
+
+
+class SupportRequestViewTests(ViewTestCase):
+
+    def test_spam_filter_is_off_by_default(self):
+        _, response = self.post(homepage="https://spam.example")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(SupportRequestBase.objects.count(), 1)
+
+    @override_settings(SAGE_CONTACT_SPAM_FILTER=True)
+    def test_spam_filter_opt_in(self):
+        _, response = self.post(homepage="https://spam.example")
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(SupportRequestBase.objects.exists())
+
+    @mock.patch.object(FullSupportRequestForm, "save", side_effect=RuntimeError)
+    def test_failed_submission_is_logged(self, save):
+        with self.assertLogs("sage_contact.views.support", "ERROR") as logs:
+            request, response = self.post()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("RuntimeError", logs.output[0])
+        self.assertEqual(
+            [str(message) for message in get_messages(request)],
+            ["There was an error processing your request. Please try again."],
+        )
+
+
+class ThirdPartyFormViewTests(ViewTestCase):
+    view_class = ThirdPartySupportView
+
+    def test_form_without_request_argument(self):
+        _, response = self.request(RequestFactory().get("/"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'name="subject"')
+
+    @override_settings(SAGE_CONTACT_SPAM_FILTER=True)
+    def test_form_without_spam_filter_is_saved(self):
+        request, response = self.post()
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(SupportRequestBase.objects.count(), 1)
+        self.assertEqual(
+            [str(message) for message in get_messages(request)],
+            ["Thank you for contacting us! We will be in touch soon."],
+        )
@@ -0,0 +1,143 @@
+"""
+Incremental and bulk maintenance of the support request rollups.
+
+``SupportRequestDailyRollup`` holds one row per day, request type, contact
+reason, preferred contact method and country. Rows are incremented as
+requests are created (see ``sage_contact.signals.analytics``) and can be
+rebuilt for a date range from the live tables with :func:`rebuild_rollups`.
+Rollups count submissions: archiving or deleting requests leaves them alone.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from sage_contact.models import SupportRequestBase, SupportRequestDailyRollup
+from sage_contact.repository.queryset.analytics import ROLLUP_DIMENSIONS
+from sage_contact.repository.queryset.support import _concrete_support_models
+
+_VALUE_DIMENSIONS = tuple(name for name in ROLLUP_DIMENSIONS if name != "request_type")
+
+
+def rollup_day(created_at: datetime) -> date:
+    """Return the rollup day of a request created at ``created_at``."""
+    return (
+        timezone.localdate(created_at)
+        if timezone.is_aware(created_at)
+        else created_at.date()
+    )
+
+
+def rollup_key(instance: SupportRequestBase) -> Dict[str, object]:
+    """Return the rollup row key of a saved support request."""
+    key = {
+        "day": rollup_day(instance.created_at or timezone.now()),
+        "request_type": instance._meta.label,
+    }
+    for name in _VALUE_DIMENSIONS:
+        key[name] = str(getattr(instance, name, "") or "")
+    return key
+
+
+def record_support_request(
+    instance: SupportRequestBase, using: Optional[str] = None
+) -> None:
+    """Count a newly created support request in its rollup row."""
+    SupportRequestDailyRollup.objects.db_manager(using or instance._state.db).increment(
+        **rollup_key(instance)
+    )
+
+
+def adjust_rollups(deltas: Dict[tuple, int], using: Optional[str] = None) -> None:
+    """
+    Move counts between rollup rows, e.g. after a request's country changed.
+
+    :param deltas: ``{(day, *ROLLUP_DIMENSIONS): delta}``; rows that drop to
+        zero are deleted.
+    :param using: The database alias.
+    """
+    manager = SupportRequestDailyRollup.objects.db_manager(using)
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        key = {"day": key[0], **dict(zip(ROLLUP_DIMENSIONS, key[1:]))}
+        manager.increment(delta, **key)
+        if delta < 0:
+            manager.filter(count__lte=0, **key).delete()
+
+
+def _day_start(day: date) -> datetime:
+    start = datetime.combine(day, time.min)
+    return timezone.make_aware(start) if settings.USE_TZ else start
+
+
+def rebuild_rollups(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    using: str = "default",
+    batch_size: int = 1000,
+) -> int:
+    """
+    Recompute the rollup rows of ``start`` to ``end`` from the live tables.
+
+    Every concrete support request model is aggregated on its own table chain,
+    restricted to the rows whose real type is that model, so no query joins
+    more tables than the model needs. The range is replaced in one
+    transaction.
+
+    :param start: The first day to rebuild, or ``None`` for the earliest.
+    :param end: The last day to rebuild, or ``None`` for the latest.
+    :param using: The database alias.
+    :param batch_size: Rows per ``bulk_create`` statement.
+    :return: The number of rollup rows written.
+    """
+    tzinfo = timezone.get_current_timezone() if settings.USE_TZ else None
+    ctypes = ContentType.objects.db_manager(using)
+    rows = []
+    for model in _concrete_support_models(SupportRequestBase):
+        queryset = (
+            model.objects.db_manager(using)
+            .non_polymorphic()
+            .filter(
+                polymorphic_ctype=ctypes.get_for_model(model, for_concrete_model=False)
+            )
+        )
+        if start is not None:
+            queryset = queryset.filter(created_at__gte=_day_start(start))
+        if end is not None:
+            queryset = queryset.filter(
+                created_at__lt=_day_start(end + timedelta(days=1))
+            )
+        dimensions = [
+            name
+            for name in _VALUE_DIMENSIONS
+            if any(field.name == name for field in model._meta.concrete_fields)
+        ]
+        grouped = (
+            queryset.order_by()
+            .annotate(day=TruncDate("created_at", tzinfo=tzinfo))
+            .values("day", *dimensions)
+            .annotate(count=Count("pk"))
+        )
+        for values in grouped:
+            rows.append(
+                SupportRequestDailyRollup(
+                    request_type=model._meta.label,
+                    **{name: str(values.get(name) or "") for name in _VALUE_DIMENSIONS},
+                    day=values["day"],
+                    count=values["count"],
+                )
+            )
+
+    with transaction.atomic(using=using):
+        SupportRequestDailyRollup.objects.db_manager(using).between(start, end).delete()
+        SupportRequestDailyRollup.objects.db_manager(using).bulk_create(
+            rows, batch_size=batch_size
+        )
+    return len(rows)
@@ -0,0 +1,455 @@
+"""
+Compact in-memory contact directory for prefix typeahead.
+
+Every contact contributes a few search terms (full name, last name, email
+and company), casefolded and UTF-8 encoded. Terms live in a sorted,
+array-backed segment:
+
+* ``blob``: all terms concatenated in sort order;
+* ``offsets``: ``array("Q")`` of term boundaries in ``blob``;
+* ``ids``: ``array("q")`` of contact IDs;
+* ``fields``: ``array("B")`` of the field each term came from.
+
+A prefix query is two binary searches over the segment followed by a
+bounded scan, so it does not depend on the number of contacts. UTF-8 byte
+order equals code point order, and ``0xff`` never occurs in UTF-8, which
+makes ``prefix + b"\\xff"`` the exclusive upper bound of a prefix range.
+
+The segment is loaded from ``Contact`` with a streaming
+``values_list().iterator()`` and never modified in place. Saves and deletes
+go to a small sorted delta list and mark the contact's segment terms as
+stale; once the delta grows past ``SAGE_CONTACT_DIRECTORY_MERGE_THRESHOLD``
+a background thread merges it into a new segment, which is swapped in
+atomically. The index lives in each process, holds the contacts of one
+database and tenant, is built on the first ``Contact.objects.typeahead()``
+call for them and is only maintained once built.
+"""
+
+import heapq
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+from sage_contact.settings.app import app_settings
+from sage_contact.utils.email import normalize_email
+
+#: Fields a term can come from, in ranking order.
+FIELD_NAME, FIELD_LAST_NAME, FIELD_EMAIL, FIELD_COMPANY = range(4)
+
+#: ``Contact`` columns the directory is built from.
+DIRECTORY_COLUMNS = ("pk", "first_name", "last_name", "email_key", "company")
+
+#: ``Contact`` fields whose changes re-index a contact.
+DIRECTORY_FIELDS = frozenset(
+    ("first_name", "last_name", "email", "email_key", "company")
+)
+
+_suspended = ContextVar("sage_contact_directory_suspended", default=False)
+
+Term = Tuple[bytes, int, int]
+
+
+def normalize_term(value: Any) -> str:
+    """Casefold ``value`` and collapse its whitespace."""
+    return " ".join(str(value).casefold().split()) if value else ""
+
+
+def contact_terms(pk, first_name, last_name, email_key, company) -> List[Term]:
+    """Return the ``(term, field, pk)`` search terms of one contact."""
+    terms = []
+    name = normalize_term(f"{first_name or ''} {last_name or ''}")
+    if name:
+        terms.append((name.encode(), FIELD_NAME, pk))
+    last = normalize_term(last_name)
+    if last and last != name:
+        terms.append((last.encode(), FIELD_LAST_NAME, pk))
+    if email_key:
+        terms.append((email_key.encode(), FIELD_EMAIL, pk))
+    company = normalize_term(company)
+    if company:
+        terms.append((company.encode(), FIELD_COMPANY, pk))
+    return terms
+
+
+def instance_terms(instance: Any) -> List[Term]:
+    return contact_terms(
+        instance.pk,
+        instance.first_name,
+        instance.last_name,
+        instance.email_key or normalize_email(instance.email),
+        instance.company,
+    )
+
+
+class Segment:
+    """Immutable, array-backed sorted run of terms."""
+
+    __slots__ = ("blob", "offsets", "ids", "fields")
+
+    def __init__(self, terms: Iterable[Term] = ()) -> None:
+        blob = bytearray()
+        offsets = array("Q", [0])
+        ids = array("q")
+        fields = array("B")
+        for term, field, pk in terms:
+            blob += term
+            offsets.append(len(blob))
+            ids.append(pk)
+            fields.append(field)
+        self.blob = bytes(blob)
+        self.offsets = offsets
+        self.ids = ids
+        self.fields = fields
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def term(self, index: int) -> bytes:
+        return self.blob[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self):
+        for index in range(len(self.ids)):
+            yield self.term(index), self.fields[index], self.ids[index]
+
+    def prefix_range(self, prefix: bytes) -> Tuple[int, int]:
+        """Return the index range of the terms starting with ``prefix``."""
+        indexes = range(len(self.ids))
+        low = bisect_left(indexes, prefix, key=self.term)
+        high = bisect_left(indexes, prefix + b"\xff", lo=low, key=self.term)
+        return low, high
+
+    def nbytes(self) -> int:
+        return (
+            sys.getsizeof(self.blob)
+            + self.offsets.itemsize * len(self.offsets)
+            + self.ids.itemsize * len(self.ids)
+            + self.fields.itemsize * len(self.fields)
+        )
+
+
+class ContactDirectory:
+    """
+    Prefix index over the contacts of one database and tenant.
+
+    :param using: The database alias the contacts are read from.
+    :param tenant: The tenant whose contacts are indexed.
+    :param merge_threshold: Pending changes that trigger a background merge.
+    :param max_scan: Most terms examined per query; bounds the latency of
+        very short prefixes at the cost of exhaustive ranking.
+    """
+
+    def __init__(
+        self,
+        using: str = "default",
+        tenant: int = 0,
+        merge_threshold: int = 50_000,
+        max_scan=2000,
+    ) -> None:
+        self.using = using
+        self.tenant = tenant
+        self.merge_threshold = merge_threshold
+        self.max_scan = max_scan
+        self.built = False
+        self.build_seconds: Optional[float] = None
+        self._segment = Segment()
+        self._delta: List[Term] = []
+        self._delta_terms: Dict[int, List[Term]] = {}
+        self._stale: Set[int] = set()
+        # IDs changed while a build or merge runs.
+        self._touched: Optional[Set[int]] = None
+        self._merging = False
+        self._lock = threading.RLock()
+
+    def build(self, batch_size: int = 10_000) -> "ContactDirectory":
+        """Load every contact with one streamed query and replace the index."""
+        from sage_contact.models import Contact
+
+        start = time.perf_counter()
+        with self._lock:
+            self._touched = set()
+        terms = []
+        rows = (
+            Contact._base_manager.using(self.using)
+            .filter(tenant_id=self.tenant)
+            .order_by()
+            .values_list(*DIRECTORY_COLUMNS)
+            .iterator(chunk_size=batch_size)
+        )
+        for row in rows:
+            terms.extend(contact_terms(*row))
+        terms.sort()
+        segment = Segment(terms)
+        del terms
+        with self._lock:
+            touched, self._touched = self._touched, None
+            self._segment = segment
+            self._delta, self._delta_terms, self._stale = [], {}, set()
+            self.built = True
+        if touched:
+            self.refresh(touched)
+        self.build_seconds = time.perf_counter() - start
+        return self
+
+    def update(self, pk: int, terms: List[Term]) -> None:
+        """Replace the terms of contact ``pk``."""
+        with self._lock:
+            self._discard(pk)
+            for term in terms:
+                insort(self._delta, term)
+            if terms:
+                self._delta_terms[pk] = terms
+        self._maybe_merge()
+
+    def remove(self, pk: int) -> None:
+        """Drop contact ``pk`` from the index."""
+        with self._lock:
+            self._discard(pk)
+        self._maybe_merge()
+
+    def refresh(self, pks: Iterable[int]) -> None:
+        """Re-read contacts ``pks`` and update or remove their terms."""
+        from sage_contact.models import Contact
+
+        pks = list(pks)
+        found = set()
+        for start in range(0, len(pks), 1000):
+            for row in (
+                Contact._base_manager.using(self.using)
+                .filter(tenant_id=self.tenant, pk__in=pks[start : start + 1000])
+                .values_list(*DIRECTORY_COLUMNS)
+            ):
+                found.add(row[0])
+                self.update(row[0], contact_terms(*row))
+        for pk in set(pks) - found:
+            self.remove(pk)
+
+    def _discard(self, pk: int) -> None:
+        for term in self._delta_terms.pop(pk, ()):
+            index = bisect_left(self._delta, term)
+            if index < len(self._delta) and self._delta[index] == term:
+                del self._delta[index]
+        self._stale.add(pk)
+        if self._touched is not None:
+            self._touched.add(pk)
+
+    def search(self, prefix: str, limit: int = 10) -> List[int]:
+        """
+        Return the IDs of the contacts matching ``prefix``, best first.
+
+        Contacts rank by: exact term match, then the matched field (name,
+        last name, email, company), then the shortest matching term.
+        """
+        key = normalize_term(prefix).encode()
+        if not key or limit <= 0:
+            return []
+        best: Dict[int, tuple] = {}
+
+        def consider(term: bytes, field: int, pk: int) -> None:
+            rank = (term != key, field, len(term), term)
+            if pk not in best or rank < best[pk]:
+                best[pk] = rank
+
+        with self._lock:
+            segment, stale = self._segment, self._stale
+            low, high = segment.prefix_range(key)
+            for index in range(low, min(high, low + self.max_scan)):
+                pk = segment.ids[index]
+                if pk not in stale:
+                    consider(segment.term(index), segment.fields[index], pk)
+            low = bisect_left(self._delta, (key,))
+            high = bisect_left(self._delta, (key + b"\xff",), lo=low)
+            for term, field, pk in self._delta[low : min(high, low + self.max_scan)]:
+                consider(term, field, pk)
+        return [pk for pk, _ in sorted(best.items(), key=lambda item: item[1])][:limit]
+
+    def _maybe_merge(self) -> None:
+        if self._merging or len(self._delta) + len(self._stale) < self.merge_threshold:
+            return
+        with self._lock:
+            if self._merging:
+                return
+            self._merging = True
+        threading.Thread(
+            target=self.merge, name="sage-contact-directory-merge", daemon=True
+        ).start()
+
+    def merge(self) -> None:
+        """Fold the pending changes into a new segment and swap it in."""
+        with self._lock:
+            self._merging = True
+            segment = self._segment
+            delta = list(self._delta)
+            stale = set(self._stale)
+            self._touched = set()
+        try:
+            merged = Segment(
+                heapq.merge((term for term in segment if term[2] not in stale), delta)
+            )
+            with self._lock:
+                merged_terms = set(delta)
+                self._delta = [t for t in self._delta if t not in merged_terms]
+                self._delta_terms = {}
+                for term in self._delta:
+                    self._delta_terms.setdefault(term[2], []).append(term)
+                # Contacts changed during the merge have outdated terms in the
+                # new segment; their current terms are in the delta.
+                self._stale = (self._stale - stale) | self._touched
+                self._segment = merged
+        finally:
+            with self._lock:
+                self._touched = None
+                self._merging = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the size and build time of the index."""
+        with self._lock:
+            delta_bytes = sys.getsizeof(self._delta) + sum(
+                sys.getsizeof(term) + sys.getsizeof(term[0]) for term in self._delta
+            )
+            return {
+                "terms": len(self._segment) + len(self._delta),
+                "pending_changes": len(self._delta) + len(self._stale),
+                "segment_bytes": self._segment.nbytes(),
+                "delta_bytes": delta_bytes,
+                "bytes": self._segment.nbytes() + delta_bytes,
+                "build_seconds": self.build_seconds,
+            }
+
+
+_directories: Dict[Tuple[str, int], ContactDirectory] = {}
+_directories_lock = threading.Lock()
+
+
+def get_contact_directory(
+    using: str = "default", tenant: int = 0, build: bool = True
+) -> Optional[ContactDirectory]:
+    """
+    Return the directory of ``using`` and ``tenant``, building it on first use.
+
+    :param build: With ``False``, return ``None`` instead of building.
+    """
+    key = (using, tenant)
+    directory = _directories.get(key)
+    if directory is None or not directory.built:
+        if not build:
+            return None
+        # Concurrent callers wait here until the first build finished.
+        with _directories_lock:
+            directory = _directories.get(key)
+            if directory is None:
+                directory = ContactDirectory(
+                    using,
+                    tenant,
+                    merge_threshold=app_settings.directory_merge_threshold,
+                )
+                # Registered before the build so that changes committed while
+                # it streams the table are recorded and re-read afterwards.
+                _directories[key] = directory
+                try:
+                    directory.build()
+                except BaseException:
+                    del _directories[key]
+                    raise
+    return directory
+
+
+def _loaded(using: str) -> List[ContactDirectory]:
+    return [d for key, d in list(_directories.items()) if key[0] == using]
+
+
+@receiver(setting_changed)
+def reset_contact_directories(setting: str, **kwargs: Any) -> None:
+    if setting == "SAGE_CONTACT_DIRECTORY_MERGE_THRESHOLD":
+        _directories.clear()
+
+
+@contextmanager
+def suspend_directory():
+    """Stop indexing changes in the block, e.g. while the caller indexes them."""
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def directory_tracks(fields: Iterable[str], using: Optional[str] = None) -> bool:
+    """Return whether changing ``fields`` must update a loaded directory."""
+    return (
+        not _suspended.get()
+        and bool(_loaded(using or "default"))
+        and not DIRECTORY_FIELDS.isdisjoint(fields)
+    )
+
+
+def directory_saved(objs: Iterable[Any], using: Optional[str] = None) -> None:
+    """Index saved contacts once the transaction commits, if the directory is loaded."""
+    using = using or "default"
+    if _suspended.get() or not _loaded(using):
+        return
+    # Terms are taken now; the instances may change before the commit.
+    terms = [
+        (obj.tenant_id, obj.pk, instance_terms(obj))
+        for obj in objs
+        if obj.pk is not None
+    ]
+
+    def apply() -> None:
+        for tenant, pk, contact_terms in terms:
+            directory = _directories.get((using, tenant))
+            if directory is not None:
+                directory.update(pk, contact_terms)
+
+    transaction.on_commit(apply, using=using)
+
+
+def directory_changed(pks: Iterable[int], using: Optional[str] = None) -> None:
+    """Re-index contacts changed without instances (e.g. ``update()``)."""
+    from sage_contact.models import Contact
+
+    using = using or "default"
+    if _suspended.get() or not _loaded(using):
+        return
+    pks = list(pks)
+
+    def apply() -> None:
+        found = set()
+        for start in range(0, len(pks), 1000):
+            for tenant, *row in (
+                Contact._base_manager.using(using)
+                .filter(pk__in=pks[start : start + 1000])
+                .values_list("tenant_id", *DIRECTORY_COLUMNS)
+            ):
+                found.add(row[0])
+                directory = _directories.get((using, tenant))
+                if directory is not None:
+                    directory.update(row[0], contact_terms(*row))
+        for directory in _loaded(using):
+            for pk in set(pks) - found:
+                directory.remove(pk)
+
+    transaction.on_commit(apply, using=using)
+
+
+def directory_removed(pks: Iterable[int], using: Optional[str] = None) -> None:
+    """Drop deleted contacts from every directory of ``using`` once committed."""
+    using = using or "default"
+    if _suspended.get() or not _loaded(using):
+        return
+    pks = list(pks)
+
+    def apply() -> None:
+        for directory in _loaded(using):
+            for pk in pks:
+                directory.remove(pk)
+
+    transaction.on_commit(apply, using=using)
@@ -0,0 +1,89 @@
+"""
+Normalized email keys for case-insensitive indexed lookups.
+
+Email addresses are stored as typed. Contacts and support requests also
+store ``email_key``, the lowercased address, which is indexed and used by
+every lookup by email. With ``SAGE_CONTACT_EMAIL_CANONICALIZE`` enabled, the
+key also folds provider-specific aliases (``John.Doe+news@gmail.com`` and
+``johndoe@googlemail.com`` share one key). Changing that setting requires
+running the ``sage_contact_lookup_keys`` command.
+"""
+
+from typing import Any
+
+from django.db import models
+
+from sage_contact.settings.app import app_settings
+
+#: ``domain -> (canonical domain, ignore dots, strip "+tag")``.
+PROVIDER_RULES = {
+    "gmail.com": ("gmail.com", True, True),
+    "googlemail.com": ("gmail.com", True, True),
+    "outlook.com": ("outlook.com", False, True),
+    "hotmail.com": ("hotmail.com", False, True),
+    "live.com": ("live.com", False, True),
+    "icloud.com": ("icloud.com", False, True),
+    "me.com": ("icloud.com", False, True),
+    "mac.com": ("icloud.com", False, True),
+    "fastmail.com": ("fastmail.com", False, True),
+    "protonmail.com": ("proton.me", False, True),
+    "proton.me": ("proton.me", False, True),
+    "pm.me": ("proton.me", False, True),
+}
+
+
+def normalize_email(value: Any, canonicalize: bool = None) -> str:
+    """
+    Return the lookup key of an email address, ``""`` for empty values.
+
+    :param value: The address as typed.
+    :param canonicalize: Apply :data:`PROVIDER_RULES`; defaults to
+        ``SAGE_CONTACT_EMAIL_CANONICALIZE``.
+    """
+    email = str(value or "").strip().lower()
+    if not email:
+        return ""
+    if canonicalize is None:
+        canonicalize = app_settings.email_canonicalize
+    if canonicalize:
+        local, sep, domain = email.rpartition("@")
+        rule = PROVIDER_RULES.get(domain)
+        if sep and local and rule:
+            domain, ignore_dots, strip_tag = rule
+            if strip_tag:
+                local = local.split("+", 1)[0]
+            if ignore_dots:
+                local = local.replace(".", "")
+            email = f"{local}@{domain}"
+    return email[:254]
+
+
+def set_email_key(instance: Any) -> None:
+    """Fill ``email_key`` of ``instance`` from its ``email``."""
+    instance.email_key = normalize_email(instance.email)
+
+
+def refresh_email_keys(model, using: str = "default", batch_size: int = 1000) -> int:
+    """
+    Recompute the email keys of every ``model`` row in batches.
+
+    Only rows whose key changes are written.
+
+    :param model: ``Contact`` or ``SupportRequestBase``.
+    :return: The number of updated rows.
+    """
+    from sage_contact.repository.queryset.bulk import iter_pk_batches
+
+    manager = model._base_manager.db_manager(using)
+    updated = 0
+    for pks in iter_pk_batches(manager.all(), batch_size):
+        changed = []
+        for obj in manager.filter(pk__in=pks).only("pk", "email", "email_key"):
+            key = obj.email_key
+            set_email_key(obj)
+            if key != obj.email_key:
+                changed.append(obj)
+        if changed:
+            models.QuerySet(model, using=using).bulk_update(changed, ["email_key"])
+            updated += len(changed)
+    return updated
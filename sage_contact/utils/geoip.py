@@ -0,0 +1,186 @@
+"""
+GeoIP country lookups of support requests, inline or deferred.
+
+By default the support forms look the country up while handling the
+request. With ``SAGE_CONTACT_GEOIP_DEFERRED = True`` they only store the IP
+address and leave ``geoip_checked_at`` empty; :func:`enrich_locations`, run
+by the ``sage_contact_geoip`` command (from cron or a task queue), then
+fills in the pending rows in batches:
+
+* pending rows are found through a partial index and read in primary key
+  order, a batch at a time;
+* each distinct IP address of a batch is looked up once;
+* the batch is written back with one ``bulk_update``, and the daily rollups
+  move the rows from the empty country to the one found.
+
+Failed lookups, e.g. while the GeoIP database is missing, leave the row
+pending, so it is retried by the next run instead of losing its country.
+Addresses the database does not know are recorded as checked, with no
+country. ``enrich_locations(backfill=True)`` looks every row up again, e.g.
+after the GeoIP database was updated.
+"""
+
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from sage_contact.settings.app import app_settings
+
+logger = logging.getLogger(__name__)
+
+#: Returned by a lookup for addresses the GeoIP database does not know.
+UNKNOWN = ""
+
+_reader = None
+_reader_lock = threading.Lock()
+
+
+def geoip_configured() -> bool:
+    return bool(app_settings.geoip_path)
+
+
+def geoip_deferred() -> bool:
+    return app_settings.geoip_deferred
+
+
+def get_geoip_reader():
+    """Return the process-wide ``GeoIP2`` reader, opening the database once."""
+    global _reader
+    if _reader is None:
+        from django.contrib.gis.geoip2 import GeoIP2
+
+        with _reader_lock:
+            if _reader is None:
+                _reader = GeoIP2()
+    return _reader
+
+
+@receiver(setting_changed)
+def reset_geoip_reader(setting: str, **kwargs: Any) -> None:
+    global _reader
+    if setting in ("SAGE_CONTACT_GEOIP_PATH", "GEOIP_PATH"):
+        _reader = None
+
+
+def lookup_country(ip_address: str) -> str:
+    """
+    Return the country code of ``ip_address``, or :data:`UNKNOWN`.
+
+    :raises Exception: If the lookup itself failed and should be retried.
+    """
+    from geoip2.errors import AddressNotFoundError
+
+    try:
+        return get_geoip_reader().country(ip_address)["country_code"] or UNKNOWN
+    except AddressNotFoundError:
+        return UNKNOWN
+
+
+def lookup_countries(
+    ip_addresses: Iterable[str], lookup: Optional[Callable[[str], str]] = None
+) -> Dict[str, str]:
+    """
+    Look every distinct address up once.
+
+    :param ip_addresses: The addresses; duplicates are looked up once.
+    :param lookup: The lookup function, :func:`lookup_country` by default.
+    :return: ``{address: country code}``, without the failed lookups.
+    """
+    lookup = lookup or lookup_country
+    countries, failed = {}, 0
+    for ip_address in set(ip_addresses):
+        try:
+            countries[ip_address] = lookup(ip_address)
+        except Exception as e:
+            failed += 1
+            error = e
+    if failed:
+        logger.warning(
+            "GeoIP lookup failed for %d addresses, they stay pending: %s",
+            failed,
+            error,
+        )
+    return countries
+
+
+def enrich_locations(
+    using: str = "default",
+    batch_size: int = 1000,
+    backfill: bool = False,
+    since: Optional[datetime] = None,
+    lookup: Optional[Callable[[str], str]] = None,
+) -> int:
+    """
+    Look up the country of support requests with location, in batches.
+
+    :param using: The database alias.
+    :param batch_size: Rows per batch, query and ``bulk_update``.
+    :param backfill: Look every row with an IP address up again, not only
+        the pending ones.
+    :param since: Only rows created from this time on.
+    :param lookup: The lookup function, :func:`lookup_country` by default.
+    :return: The number of rows checked.
+    """
+    from sage_contact.models import SupportRequestWithLocation
+    from sage_contact.utils.analytics import adjust_rollups, rollup_day
+
+    model = SupportRequestWithLocation
+    queryset = (
+        model.objects.db_manager(using)
+        .non_polymorphic()
+        .filter(ip_address__isnull=False)
+    )
+    if not backfill:
+        queryset = queryset.filter(geoip_checked_at__isnull=True)
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    ctypes = ContentType.objects.db_manager(using)
+    checked, last = 0, None
+    while True:
+        batch = queryset if last is None else queryset.filter(pk__gt=last)
+        rows = list(
+            batch.order_by("pk").values_list(
+                "pk",
+                "ip_address",
+                "country",
+                "created_at",
+                "polymorphic_ctype_id",
+                "fullsupportrequest__contact_reason",
+                "fullsupportrequest__preferred_contact_method",
+            )[:batch_size]
+        )
+        if not rows:
+            return checked
+        last = rows[-1][0]
+        countries = lookup_countries((row[1] for row in rows), lookup)
+        now = timezone.now()
+        objs, moves = [], Counter()
+        for pk, ip_address, old, created_at, ctype_id, reason, method in rows:
+            if ip_address not in countries:
+                continue
+            new = countries[ip_address]
+            objs.append(model(pk=pk, country=new, geoip_checked_at=now))
+            if new != (old or UNKNOWN):
+                key = (
+                    rollup_day(created_at),
+                    ctypes.get_for_id(ctype_id).model_class()._meta.label,
+                    reason or "",
+                    method or "",
+                )
+                moves[(*key, old or UNKNOWN)] -= 1
+                moves[(*key, new)] += 1
+        if objs:
+            with transaction.atomic(using=using):
+                model.objects.db_manager(using).non_polymorphic().bulk_update(
+                    objs, ["country", "geoip_checked_at"]
+                )
+                adjust_rollups(moves, using)
+            checked += len(objs)
@@ -0,0 +1,235 @@
+"""
+Field-level change history of contacts, custom fields and contact labels.
+
+Changes are diffed against the values an instance was loaded with (kept by
+``from_db``), so recording an edit costs no extra query: one INSERT into
+``sage_contact_change`` per changed row, and one bulk INSERT per batch for
+bulk operations. Saves that change nothing write nothing. Disable the log
+with ``SAGE_CONTACT_CHANGE_HISTORY = False``.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+
+from sage_contact.settings.app import app_settings
+from sage_contact.tenancy import current_tenant
+
+#: Columns derived from other fields or maintained by the sync sequence;
+#: they are rebuilt on save and therefore not logged.
+DERIVED_CONTACT_FIELDS = frozenset(
+    {
+        "email_key",
+        "phone_e164",
+        "phone_suffix",
+        "birthday_key",
+        "anniversary_key",
+        "sync_seq",
+    }
+)
+
+
+_suspended = ContextVar("sage_contact_history_suspended", default=False)
+
+
+def history_enabled() -> bool:
+    if _suspended.get():
+        return False
+    return app_settings.change_history
+
+
+@contextmanager
+def suspend_history():
+    """Stop logging changes in the block, e.g. while the caller logs them itself."""
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def to_json(value: Any) -> Any:
+    """Return ``value`` in the JSON form stored in the log."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return str(value)
+
+
+def tracked_fields(model) -> List[Any]:
+    """Return the concrete fields of ``model`` whose changes are logged."""
+    fields = model._meta.__dict__.get("_sage_history_fields")
+    if fields is None:
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if not field.primary_key and field.attname not in DERIVED_CONTACT_FIELDS
+        ]
+        model._meta._sage_history_fields = fields
+    return fields
+
+
+def remember_state(instance: Any, values: Optional[Dict[str, Any]] = None) -> None:
+    """Store the values ``instance`` was loaded or saved with."""
+    if values is None:
+        values = {
+            field.attname: getattr(instance, field.attname)
+            for field in tracked_fields(type(instance))
+        }
+    instance._history_state = values
+
+
+def diff(instance: Any, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Return ``{attname: new value}`` of the fields changed since the last load.
+
+    Instances that were not loaded from the database report every field.
+    """
+    state = getattr(instance, "_history_state", None)
+    changes = {}
+    for field in tracked_fields(type(instance)):
+        name = field.attname
+        if fields is not None and name not in fields and field.name not in fields:
+            continue
+        if name in instance.get_deferred_fields():
+            continue
+        value = to_json(getattr(instance, name))
+        if state is None or name not in state or to_json(state[name]) != value:
+            changes[name] = value
+    return changes
+
+
+def _kind(model) -> int:
+    from sage_contact.models import ContactChange, ContactLabel, CustomField
+
+    if model is CustomField:
+        return ContactChange.Kind.CUSTOM_FIELD
+    if model is ContactLabel:
+        return ContactChange.Kind.LABEL
+    return ContactChange.Kind.CONTACT
+
+
+def entry(
+    model,
+    contact_id: int,
+    object_id: int,
+    action: int,
+    changes: Optional[Dict] = None,
+    tenant_id: Optional[int] = None,
+) -> Any:
+    """
+    Build an unsaved ``ContactChange`` of a ``model`` row.
+
+    :param tenant_id: The tenant of the row, defaults to the current tenant.
+    """
+    from sage_contact.models import ContactChange
+
+    return ContactChange(
+        tenant_id=current_tenant() if tenant_id is None else tenant_id,
+        contact_id=contact_id,
+        kind=_kind(model),
+        object_id=object_id,
+        action=action,
+        changes=changes or {},
+    )
+
+
+def change_row(instance: Any, action: int, changes: Optional[Dict] = None) -> Any:
+    """Build the unsaved ``ContactChange`` of ``instance``."""
+    from sage_contact.models import Contact
+
+    contact_id = instance.pk if isinstance(instance, Contact) else instance.contact_id
+    return entry(
+        type(instance), contact_id, instance.pk, action, changes, instance.tenant_id
+    )
+
+
+def record(rows: List[Any], using: Optional[str] = None) -> None:
+    """Append ``rows`` to the log in one statement."""
+    from sage_contact.models import ContactChange
+
+    if len(rows) == 1:
+        # A plain INSERT, without the transaction bulk_create() opens.
+        rows[0].save(using=using, force_insert=True)
+    elif rows:
+        ContactChange.objects.db_manager(using).bulk_create(rows)
+
+
+def mark_saved(instance: Any) -> None:
+    """Make the current values of ``instance`` the base of its next diff."""
+    state = getattr(instance, "_history_state", None) or {}
+    deferred = instance.get_deferred_fields()
+    state.update(
+        (field.attname, getattr(instance, field.attname))
+        for field in tracked_fields(type(instance))
+        if field.attname not in deferred
+    )
+    remember_state(instance, state)
+
+
+def record_save(
+    instance: Any,
+    created: bool,
+    using: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> None:
+    """
+    Log the creation or the changed fields of a saved instance.
+
+    :param fields: The ``update_fields`` of the save, if any.
+    """
+    from sage_contact.models import ContactChange
+
+    changes = diff(instance, None if created or fields is None else set(fields))
+    if created:
+        record([change_row(instance, ContactChange.Action.CREATE, changes)], using)
+    elif changes:
+        record([change_row(instance, ContactChange.Action.UPDATE, changes)], using)
+    mark_saved(instance)
+
+
+def record_delete(instance: Any, using: Optional[str] = None) -> None:
+    """Log the deletion of an instance."""
+    from sage_contact.models import ContactChange
+
+    record([change_row(instance, ContactChange.Action.DELETE)], using)
+
+
+def record_bulk_create(objs: Iterable[Any], using: Optional[str] = None) -> None:
+    """
+    Log the creation of bulk-inserted ``objs`` with one INSERT.
+
+    Objects whose primary key was not returned by the database (e.g. with
+    ``ignore_conflicts``) cannot be attributed and are skipped.
+    """
+    from sage_contact.models import ContactChange
+
+    rows = []
+    for obj in objs:
+        if obj.pk is None:
+            continue
+        rows.append(change_row(obj, ContactChange.Action.CREATE, diff(obj)))
+        mark_saved(obj)
+    record(rows, using)
+
+
+def record_bulk_update(
+    objs: Iterable[Any], fields: Iterable[str], using: Optional[str] = None
+) -> None:
+    """Log the changed ``fields`` of bulk-updated ``objs`` with one INSERT."""
+    from sage_contact.models import ContactChange
+
+    fields = set(fields)
+    rows = []
+    for obj in objs:
+        changes = diff(obj, fields)
+        if changes:
+            rows.append(change_row(obj, ContactChange.Action.UPDATE, changes))
+        mark_saved(obj)
+    record(rows, using)
@@ -0,0 +1,281 @@
+"""
+Cached label catalog and incrementally maintained label counts.
+
+Labels change rarely but are listed on every contact filter, sidebar and
+card. :class:`LabelCatalog` keeps the ``(pk, name, contact_count)`` rows of
+every label of a tenant, ordered by name, in two tiers:
+
+* a per-process copy, trusted for ``SAGE_CONTACT_LABEL_LOCAL_TIMEOUT``
+  seconds without any round trip;
+* a shared copy in the ``SAGE_CONTACT_LABEL_CACHE_ALIAS`` cache, stored under
+  a version number that every ``Label`` or ``ContactLabel`` change bumps.
+
+After the local timeout a process compares its version with the shared one
+and keeps its copy if nothing changed, so a warm catalog costs no database
+query. ``Label.contact_count`` is adjusted with ``F()`` updates as links are
+added and removed and is never recomputed with ``COUNT`` on the read path;
+``refresh_label_counts()`` repairs it after out-of-band changes.
+"""
+
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.dispatch import receiver
+
+from sage_contact.settings.app import app_settings
+from sage_contact.tenancy import DEFAULT_TENANT, current_tenant
+
+
+class LabelEntry(NamedTuple):
+    """A label of the catalog."""
+
+    pk: int
+    name: str
+    contact_count: int
+
+
+class LabelCatalog:
+    """
+    Two-tier cache of every label, invalidated by version bumps.
+
+    :param cache_alias: The shared cache, or ``None`` for the local tier only.
+    :param timeout: Lifetime of shared entries in seconds.
+    :param local_timeout: Seconds a process trusts its copy without checking
+        the shared version; other processes see a change after at most this
+        delay, the changing process at once.
+    """
+
+    def __init__(
+        self,
+        cache_alias: Optional[str] = "default",
+        timeout: Optional[int] = 3600,
+        local_timeout: float = 5,
+    ) -> None:
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.local_timeout = local_timeout
+        self._local: Dict[
+            Tuple[str, int], Tuple[float, Any, Tuple[LabelEntry, ...]]
+        ] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> Any:
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    def _version_key(self, using: str, tenant: int) -> str:
+        return f"sage_contact:labels:{using}:{tenant}:version"
+
+    def _data_key(self, using: str, tenant: int, version: Any) -> str:
+        return f"sage_contact:labels:{using}:{tenant}:{version}"
+
+    def _shared_version(self, using: str, tenant: int) -> int:
+        cache = self.cache
+        key = self._version_key(using, tenant)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, 1, None)
+            version = cache.get(key, 1)
+        return version
+
+    def entries(
+        self, using: str = "default", tenant: int = DEFAULT_TENANT
+    ) -> Tuple[LabelEntry, ...]:
+        """Return every label of ``tenant`` ordered by name."""
+        now = time.monotonic()
+        local = self._local.get((using, tenant))
+        if local is not None and local[0] > now:
+            return local[2]
+
+        version = None
+        entries = None
+        if self.cache_alias:
+            version = self._shared_version(using, tenant)
+            if local is not None and local[1] == version:
+                entries = local[2]
+            else:
+                key = self._data_key(using, tenant, version)
+                entries = self.cache.get(key)
+                if entries is None:
+                    entries = load_labels(using, tenant)
+                    self.cache.set(key, entries, self.timeout)
+        if entries is None:
+            entries = load_labels(using, tenant)
+        with self._lock:
+            self._local[(using, tenant)] = (now + self.local_timeout, version, entries)
+        return entries
+
+    def get(
+        self, pk: Any, using: str = "default", tenant: int = DEFAULT_TENANT
+    ) -> Optional[LabelEntry]:
+        """Return the label ``pk``, or ``None`` if it does not exist."""
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        for entry in self.entries(using, tenant):
+            if entry.pk == pk:
+                return entry
+        return None
+
+    def search(
+        self, name: str, using: str = "default", tenant: int = DEFAULT_TENANT
+    ) -> Tuple[LabelEntry, ...]:
+        """Return the labels whose name contains ``name``, ignoring case."""
+        needle = name.casefold()
+        return tuple(
+            entry
+            for entry in self.entries(using, tenant)
+            if needle in entry.name.casefold()
+        )
+
+    def bump(self, using: str = "default", tenant: int = DEFAULT_TENANT) -> None:
+        """Invalidate the catalog of ``tenant`` in ``using`` in every process."""
+        with self._lock:
+            self._local.pop((using, tenant), None)
+        if self.cache_alias:
+            cache = self.cache
+            key = self._version_key(using, tenant)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, 2, None)
+
+    def clear(self) -> None:
+        """Drop the local copies of this process."""
+        with self._lock:
+            self._local.clear()
+
+
+def load_labels(
+    using: str = "default", tenant: int = DEFAULT_TENANT
+) -> Tuple[LabelEntry, ...]:
+    """Read every label of ``tenant``, ordered by name, from the primary database."""
+    from sage_contact.models import Label
+
+    return tuple(
+        LabelEntry(*row)
+        for row in Label._base_manager.using(using)
+        .filter(tenant_id=tenant)
+        .order_by("name", "pk")
+        .values_list("pk", "name", "contact_count")
+    )
+
+
+_catalog = None
+
+
+def get_label_catalog() -> LabelCatalog:
+    """Return the catalog configured by the ``SAGE_CONTACT_LABEL_*`` settings."""
+    global _catalog
+    if _catalog is None:
+        _catalog = LabelCatalog(
+            cache_alias=app_settings.label_cache_alias,
+            timeout=app_settings.label_cache_timeout,
+            local_timeout=app_settings.label_local_timeout,
+        )
+    return _catalog
+
+
+@receiver(setting_changed)
+def reset_label_catalog(setting: str, **kwargs: Any) -> None:
+    global _catalog
+    if setting in (
+        "SAGE_CONTACT_LABEL_CACHE_ALIAS",
+        "SAGE_CONTACT_LABEL_CACHE_TIMEOUT",
+        "SAGE_CONTACT_LABEL_LOCAL_TIMEOUT",
+    ):
+        _catalog = None
+
+
+def invalidate_label_catalog(
+    using: Optional[str] = None, tenant: Optional[int] = None
+) -> None:
+    """
+    Bump the catalog version once the current transaction commits.
+
+    :param tenant: The tenant of the changed labels, defaults to the current.
+    """
+    using = using or "default"
+    tenant = current_tenant() if tenant is None else tenant
+    transaction.on_commit(lambda: get_label_catalog().bump(using, tenant), using=using)
+
+
+def adjust_label_counts(
+    deltas: Dict[int, int], using: Optional[str] = None, tenant: Optional[int] = None
+) -> None:
+    """
+    Add ``deltas`` (``{label id: change}``) to ``Label.contact_count``.
+
+    Labels sharing the same change are updated in one statement, so a batch
+    touching many labels usually costs one or two UPDATEs.
+
+    :param deltas: Counts of added (positive) or removed (negative) links.
+    :param using: The database alias.
+    :param tenant: The tenant of the labels, defaults to the current tenant.
+    """
+    from sage_contact.models import Label
+
+    by_delta: Dict[int, list] = {}
+    for label_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(label_id)
+    if not by_delta:
+        return
+    labels = Label._base_manager.using(using)
+    for delta, label_ids in by_delta.items():
+        count = F("contact_count") + delta
+        if delta < 0:
+            # Never below zero, even if the count drifted.
+            count = Greatest(count, Value(0))
+        labels.filter(pk__in=label_ids).update(contact_count=count)
+    invalidate_label_catalog(using, tenant)
+
+
+def adjust_tenant_label_counts(
+    deltas: Dict[Tuple[int, int], int], using: Optional[str] = None
+) -> None:
+    """
+    Add ``deltas`` (``{(tenant id, label id): change}``) to the label counts.
+
+    Used by bulk paths whose rows may belong to several tenants.
+    """
+    by_tenant: Dict[int, Dict[int, int]] = {}
+    for (tenant, label_id), delta in deltas.items():
+        by_tenant.setdefault(tenant, {})[label_id] = delta
+    for tenant, tenant_deltas in by_tenant.items():
+        adjust_label_counts(tenant_deltas, using, tenant)
+
+
+def refresh_label_counts(using: str = "default") -> int:
+    """
+    Recompute ``Label.contact_count`` from the link table.
+
+    Needed only after links were changed outside the ORM paths that keep the
+    counts, e.g. raw SQL or fixture loading.
+
+    :return: The number of labels updated.
+    """
+    from sage_contact.models import ContactLabel, Label
+
+    counts = (
+        ContactLabel._base_manager.using(using)
+        .filter(label_id=OuterRef("pk"))
+        .order_by()
+        .values("label_id")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    labels = Label._base_manager.using(using)
+    updated = labels.update(
+        contact_count=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+    )
+    for tenant in labels.order_by().values_list("tenant_id", flat=True).distinct():
+        invalidate_label_catalog(using, tenant)
+    return updated
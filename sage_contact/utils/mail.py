@@ -0,0 +1,331 @@
+"""
+Confirmation emails, sent inline or without blocking the request.
+
+:func:`build_confirmation_email` renders the confirmation of a support
+request. The ``post_save`` receiver sends it inline by default; with
+``SAGE_CONTACT_EMAIL_ASYNC = True`` it hands the message to
+:func:`send_in_background` once the transaction commits, and the request
+returns without waiting for the SMTP server. Async code awaits
+:func:`asend_confirmation_email` or :func:`asend_mail` instead.
+
+:class:`AsyncSMTPEmailBackend` is Django's SMTP backend plus an
+``asend_messages()`` coroutine built on ``aiosmtplib`` (an optional
+dependency)::
+
+    EMAIL_BACKEND = "sage_contact.utils.mail.AsyncSMTPEmailBackend"
+
+Its connections are pooled per event loop and server: at most
+``SAGE_CONTACT_EMAIL_POOL_SIZE`` are open, which also bounds the messages
+sent concurrently, and idle ones are reused for
+``SAGE_CONTACT_EMAIL_POOL_IDLE_TIMEOUT`` seconds. Other backends, e.g. the
+locmem backend of the test runner, are called in a worker thread. To try it
+against a local debugging server, run ``python -m aiosmtpd -n -l
+localhost:1025`` and set ``EMAIL_HOST = "localhost"`` and
+``EMAIL_PORT = 1025``.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from email.utils import make_msgid
+from typing import Any, List, Optional, Sequence, Set, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.smtp import EmailBackend
+from django.core.mail.message import sanitize_address
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+
+from sage_contact.settings.app import app_settings
+from sage_contact.utils.timing import stage
+
+logger = logging.getLogger(__name__)
+
+
+def email_async() -> bool:
+    return app_settings.email_async
+
+
+def build_confirmation_email(instance: Any) -> Optional[EmailMessage]:
+    """
+    Render the confirmation email of a support request.
+
+    :return: The message, or ``None`` if confirmations are disabled or the
+        template is missing.
+    """
+    # Check if the SEND_EMAIL_AFTER_SAGE_CONTACT_SUPPORT_FORM is True
+    if not app_settings.send_confirmation_email:
+        return None
+
+    # Check if the SAGE_CONTACT_SUPPORT_EMAIL_TEMPLATE_PATH is set and exists
+    template_path = app_settings.support_email_template_path
+    if not template_path or not os.path.exists(
+        os.path.join(settings.BASE_DIR, template_path)
+    ):
+        return None
+
+    domain = Site.objects.get_current().domain
+    with stage("email.render"):
+        body = render_to_string(
+            template_path,
+            {
+                "full_name": instance.full_name,
+                "subject": instance.subject,
+                "message": instance.message,
+                "contact_reason": instance.get_contact_reason_display(),
+                "preferred_contact_method": instance.get_preferred_contact_method_display(),
+            },
+        )
+
+    email = EmailMessage(
+        subject=app_settings.email_confirmation_subject,
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[instance.email],
+    )
+    email.content_subtype = "html"
+    email.extra_headers = {
+        "MIME-Version": app_settings.email_extra_headers_mime_version,
+        "Content-Type": app_settings.email_extra_headers_content_type,
+        "Content-Transfer-Encoding": app_settings.email_extra_headers_content_transfer_encoding,
+        "X-Priority": app_settings.email_extra_headers_x_priority,
+        "Message-ID": make_msgid(domain=domain),
+        "X-Auto-Response-Suppress": app_settings.email_extra_headers_x_auto_response_suppress,
+        "X-Spamd-Result": app_settings.email_extra_headers_x_spamd_result,
+    }
+    return email
+
+
+class SMTPConnectionPool:
+    """
+    Reusable connections to one SMTP server, on one event loop.
+
+    :param connect: Coroutine function opening a logged-in connection.
+    :param size: The maximum number of open connections, and so of
+        concurrent sends.
+    :param idle_timeout: Seconds after which an idle connection is closed
+        instead of reused.
+    """
+
+    def __init__(self, connect, size: int, idle_timeout: float) -> None:
+        self._connect = connect
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[Tuple[Any, float]] = []
+        self.idle_timeout = idle_timeout
+
+    def _checkout(self) -> Any:
+        while self._idle:
+            smtp, released = self._idle.pop()
+            if smtp.is_connected and time.monotonic() - released < self.idle_timeout:
+                return smtp
+            smtp.close()
+        return None
+
+    @asynccontextmanager
+    async def connection(self):
+        """Hold a connection for the block; it is closed if the block fails."""
+        async with self._slots:
+            smtp = self._checkout() or await self._connect()
+            try:
+                yield smtp
+            except BaseException:
+                smtp.close()
+                raise
+            self._idle.append((smtp, time.monotonic()))
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        while self._idle:
+            self._idle.pop()[0].close()
+
+
+#: Connection pools by event loop, then by server.
+_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+@receiver(setting_changed)
+def reset_smtp_pools(setting: str, **kwargs: Any) -> None:
+    if setting.startswith("EMAIL_") or setting.startswith("SAGE_CONTACT_EMAIL_POOL"):
+        for loop, pools in list(_pools.items()):
+            if not loop.is_closed():
+                for pool in pools.values():
+                    loop.call_soon_threadsafe(pool.close)
+        _pools.clear()
+
+
+class AsyncSMTPEmailBackend(EmailBackend):
+    """
+    Django's SMTP backend with a non-blocking ``asend_messages()``.
+
+    ``send_messages()`` still sends with ``smtplib``, so the backend can
+    replace the default one; async callers await ``asend_messages()``,
+    which sends through a pool of ``aiosmtplib`` connections.
+    """
+
+    def _pool(self) -> SMTPConnectionPool:
+        loop = asyncio.get_running_loop()
+        key = (self.host, self.port, self.username, self.use_tls, self.use_ssl)
+        pools = _pools.setdefault(loop, {})
+        if key not in pools:
+            pools[key] = SMTPConnectionPool(
+                self._aopen,
+                size=app_settings.email_pool_size,
+                idle_timeout=app_settings.email_pool_idle_timeout,
+            )
+        return pools[key]
+
+    async def _aopen(self) -> Any:
+        try:
+            import aiosmtplib
+        except ImportError:
+            raise ImproperlyConfigured(
+                "AsyncSMTPEmailBackend requires aiosmtplib: pip install aiosmtplib"
+            )
+        smtp = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            username=self.username or None,
+            password=self.password or None,
+            use_tls=bool(self.use_ssl),
+            start_tls=bool(self.use_tls),
+            timeout=self.timeout,
+            client_cert=self.ssl_certfile,
+            client_key=self.ssl_keyfile,
+        )
+        await smtp.connect()
+        return smtp
+
+    async def _asend(self, email_message: EmailMessage) -> bool:
+        import aiosmtplib
+
+        if not email_message.recipients():
+            return False
+        encoding = email_message.encoding or settings.DEFAULT_CHARSET
+        from_email = sanitize_address(email_message.from_email, encoding)
+        recipients = [
+            sanitize_address(address, encoding)
+            for address in email_message.recipients()
+        ]
+        message = email_message.message().as_bytes(linesep="\r\n")
+        async with self._pool().connection() as smtp:
+            try:
+                await smtp.sendmail(from_email, recipients, message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # The server dropped the pooled connection while it was idle.
+                await smtp.connect()
+                await smtp.sendmail(from_email, recipients, message)
+        return True
+
+    async def asend_messages(self, email_messages: Sequence[EmailMessage]) -> int:
+        """
+        Send the messages concurrently, up to the pool size at a time.
+
+        :return: The number of messages sent.
+        """
+        results = await asyncio.gather(
+            *(self._asend(message) for message in email_messages),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not self.fail_silently:
+                raise result
+        return sum(result is True for result in results)
+
+
+async def asend_mail(
+    email_messages: Sequence[EmailMessage], fail_silently: bool = False
+) -> int:
+    """
+    Send the messages without blocking the event loop.
+
+    Backends without ``asend_messages()`` are called in a worker thread.
+
+    :return: The number of messages sent.
+    """
+    connection = get_connection(fail_silently=fail_silently)
+    if hasattr(connection, "asend_messages"):
+        return await connection.asend_messages(email_messages)
+    return await sync_to_async(connection.send_messages, thread_sensitive=False)(
+        email_messages
+    )
+
+
+async def asend_confirmation_email(instance: Any) -> int:
+    """
+    Render and send the confirmation email of a support request.
+
+    :return: The number of messages sent, 0 if confirmations are disabled.
+    """
+    email = await sync_to_async(build_confirmation_email)(instance)
+    if email is None:
+        return 0
+    with stage("email.send"):
+        return await asend_mail([email])
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_pending: Set[concurrent.futures.Future] = set()
+
+
+def _mail_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="sage-contact-mail", daemon=True
+            ).start()
+    return _loop
+
+
+async def _asend_logged(email_messages: List[EmailMessage]) -> int:
+    # Logged before the future completes, so flush() returns after the log.
+    try:
+        return await asend_mail(email_messages)
+    except Exception:
+        logger.exception("Sending email in the background failed.")
+        raise
+
+
+def send_in_background(
+    email_messages: Sequence[EmailMessage],
+) -> concurrent.futures.Future:
+    """
+    Send the messages from the mail event loop thread and return at once.
+
+    The loop is shared by the process, so its connection pool is reused
+    across requests. Failures are logged.
+
+    :return: A future of the number of messages sent.
+    """
+    future = asyncio.run_coroutine_threadsafe(
+        _asend_logged(list(email_messages)), _mail_loop()
+    )
+    _pending.add(future)
+    future.add_done_callback(_pending.discard)
+    return future
+
+
+def flush(timeout: Optional[float] = None) -> bool:
+    """
+    Wait for the messages being sent in the background.
+
+    :return: Whether every message was handled within ``timeout`` seconds.
+    """
+    _, not_done = concurrent.futures.wait(list(_pending), timeout=timeout)
+    return not not_done
+
+
+atexit.register(flush, 10)
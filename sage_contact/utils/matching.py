@@ -0,0 +1,137 @@
+"""
+Batched matching of support requests to contacts.
+
+Unmatched support requests (``contact`` is NULL) are processed in batches of
+primary keys. Every batch costs a fixed number of queries, whatever its
+size: one to read the requests with their phone keys, one per key kind to
+find existing contacts, one ``bulk_create`` for new contacts and one
+``bulk_update`` attaching the requests. Email keys take precedence over
+phone numbers; within a batch, requests from the same sender share the
+contact created for them.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from django.db import transaction
+
+from sage_contact.models import Contact, SupportRequestBase
+from sage_contact.repository.queryset.bulk import iter_pk_batches
+
+
+def _contact_from_request(row: Dict) -> Contact:
+    first_name, _, last_name = (row["full_name"] or "").strip().partition(" ")
+    return Contact(
+        first_name=first_name,
+        last_name=last_name.strip(),
+        email=row["email"] or None,
+        phone_number=row["supportrequestwithphone__phone_number"] or None,
+    )
+
+
+def match_batch(pks: List[int], create: bool = True, using: str = "default") -> int:
+    """
+    Attach the support requests ``pks`` to contacts.
+
+    :param pks: Primary keys of unmatched support requests.
+    :param create: Create a contact for senders without one.
+    :param using: The database alias.
+    :return: The number of matched support requests.
+    """
+    rows = list(
+        SupportRequestBase.objects.db_manager(using)
+        .non_polymorphic()
+        .filter(pk__in=pks, contact__isnull=True)
+        .values(
+            "pk",
+            "full_name",
+            "email",
+            "email_key",
+            "supportrequestwithphone__phone_number",
+            "supportrequestwithphone__phone_e164",
+        )
+    )
+    if not rows:
+        return 0
+    contacts = Contact.objects.db_manager(using)
+    email_keys = {row["email_key"] for row in rows if row["email_key"]}
+    phones = {
+        row["supportrequestwithphone__phone_e164"]
+        for row in rows
+        if row["supportrequestwithphone__phone_e164"]
+    }
+    by_email: Dict[str, int] = {}
+    for pk, key in (
+        contacts.filter(email_key__in=email_keys)
+        .order_by("-pk")
+        .values_list("pk", "email_key")
+    ):
+        by_email[key] = pk  # ordered newest first, so the oldest contact wins
+    by_phone: Dict[str, int] = {}
+    for pk, key in (
+        contacts.filter(phone_e164__in=phones)
+        .order_by("-pk")
+        .values_list("pk", "phone_e164")
+    ):
+        by_phone[key] = pk
+
+    def lookup(row):
+        phone = row["supportrequestwithphone__phone_e164"]
+        return by_email.get(row["email_key"]) or (
+            by_phone.get(phone) if phone else None
+        )
+
+    with transaction.atomic(using=using):
+        if create:
+            pending: Dict[str, Contact] = {}
+            for row in rows:
+                if lookup(row) is None:
+                    key = row["email_key"] or row["supportrequestwithphone__phone_e164"]
+                    if key and key not in pending:
+                        pending[key] = _contact_from_request(row)
+            if pending:
+                created = contacts.bulk_create(pending.values())
+                if any(contact.pk is None for contact in created):
+                    # Backends that do not return primary keys from bulk inserts.
+                    created = contacts.filter(
+                        email_key__in=[c.email_key for c in created if c.email_key]
+                    )
+                for contact in created:
+                    if contact.email_key:
+                        by_email.setdefault(contact.email_key, contact.pk)
+                    if contact.phone_e164:
+                        by_phone.setdefault(contact.phone_e164, contact.pk)
+
+        matched = []
+        for row in rows:
+            contact_id = lookup(row)
+            if contact_id is not None:
+                matched.append(SupportRequestBase(pk=row["pk"], contact_id=contact_id))
+        SupportRequestBase.objects.db_manager(using).bulk_update(matched, ["contact"])
+    return len(matched)
+
+
+def match_support_requests(
+    create: bool = True,
+    batch_size: int = 500,
+    using: str = "default",
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Attach every unmatched support request to a contact, in batches.
+
+    Each batch runs in its own transaction, so the job can be interrupted
+    and resumed at any time.
+
+    :param create: Create a contact for senders without one.
+    :param batch_size: Support requests handled per batch.
+    :param using: The database alias.
+    :param progress: Called with the running total after every batch.
+    :return: The number of matched support requests.
+    """
+    unmatched = SupportRequestBase.objects.db_manager(using).unmatched()
+    total = 0
+    for pks in iter_pk_batches(unmatched, batch_size):
+        total += match_batch(pks, create=create, using=using)
+        if progress is not None:
+            progress(total)
+    return total
@@ -0,0 +1,243 @@
+"""
+Indexed IP address keys, subnet queries and a per-subnet rate limiter.
+
+``SupportRequestWithLocation.ip_key`` holds the address as a 128-bit
+integer written as 32 lowercase hex digits; IPv4 addresses are stored in
+their IPv4-mapped IPv6 form (``::ffff:a.b.c.d``). Fixed-width hex sorts like
+the integer it encodes, so a CIDR network is one contiguous key range served
+by a B-tree index on every database backend, and a subnet is a key prefix
+that can be grouped on with ``Substr``.
+"""
+
+import ipaddress
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from django.core.signals import setting_changed
+from django.db.models import Count, Max, Min
+from django.db.models.functions import Substr
+from django.dispatch import receiver
+from django.utils import timezone
+
+from sage_contact.settings.app import app_settings
+
+#: Key prefix of IPv4-mapped addresses.
+IPV4_MAPPED_PREFIX = "0" * 20 + "ffff"
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def ip_key(value: Any) -> Optional[str]:
+    """Return the index key of an IP address, or ``None`` if it is not one."""
+    if not value:
+        return None
+    try:
+        address = ipaddress.ip_address(str(value).strip())
+    except ValueError:
+        return None
+    if address.version == 4:
+        return IPV4_MAPPED_PREFIX + format(int(address), "08x")
+    if address.ipv4_mapped is not None:
+        return ip_key(address.ipv4_mapped)
+    return format(int(address), "032x")
+
+
+def set_ip_key(instance: Any, field: str = "ip_address") -> None:
+    """Set ``instance.ip_key`` from its IP address field."""
+    instance.ip_key = ip_key(getattr(instance, field))
+
+
+def parse_network(value: Any) -> Network:
+    """
+    Parse a network, e.g. ``"203.0.113.0/24"``; a bare address is a host network.
+
+    Host bits are ignored, so ``"203.0.113.7/24"`` means ``203.0.113.0/24``.
+
+    :raises ValueError: If ``value`` is not a network or address.
+    """
+    if isinstance(value, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+        return value
+    return ipaddress.ip_network(str(value).strip(), strict=False)
+
+
+def network_key_range(network: Any) -> Tuple[str, str]:
+    """Return the first and last index keys of ``network``."""
+    network = parse_network(network)
+    return ip_key(network.network_address), ip_key(network.broadcast_address)
+
+
+def subnet_of(address: Any, prefix: int = 24, v6_prefix: int = 64) -> Network:
+    """Return the ``/prefix`` (IPv4) or ``/v6_prefix`` (IPv6) network of an address."""
+    address = ipaddress.ip_address(str(address).strip())
+    if address.version == 6 and address.ipv4_mapped is not None:
+        address = address.ipv4_mapped
+    length = prefix if address.version == 4 else v6_prefix
+    return ipaddress.ip_network(f"{address}/{length}", strict=False)
+
+
+def _key_network(key: str, length: int) -> Network:
+    value = int(key.ljust(32, "0"), 16)
+    if key.startswith(IPV4_MAPPED_PREFIX):
+        return ipaddress.ip_network(
+            f"{ipaddress.IPv4Address(value & 0xFFFFFFFF)}/{length}", strict=False
+        )
+    return ipaddress.ip_network(
+        f"{ipaddress.IPv6Address(value)}/{length}", strict=False
+    )
+
+
+def subnet_counts(
+    queryset, prefix: int = 24, v6_prefix: int = 64, key: str = "ip_key"
+) -> List[Dict[str, Any]]:
+    """
+    Count the rows of ``queryset`` per subnet, busiest first.
+
+    Rows are grouped in SQL on the hex digits covering the prefix, then
+    merged to the exact prefix length.
+
+    :param queryset: Rows with an IP key.
+    :param prefix: Prefix length of IPv4 subnets.
+    :param v6_prefix: Prefix length of IPv6 subnets.
+    :param key: The lookup of the IP key column.
+    :return: ``{"subnet", "count", "first", "last"}`` dicts; ``first`` and
+        ``last`` are the oldest and newest ``created_at``.
+    """
+    ipv4 = {f"{key}__startswith": IPV4_MAPPED_PREFIX}
+    families = (
+        (queryset.filter(**ipv4), prefix, 96 + prefix),
+        (
+            queryset.filter(**{f"{key}__isnull": False}).exclude(**ipv4),
+            v6_prefix,
+            v6_prefix,
+        ),
+    )
+    merged: Dict[Network, Dict[str, Any]] = {}
+    for rows, length, key_bits in families:
+        grouped = (
+            rows.order_by()
+            .annotate(subnet_key=Substr(key, 1, -(-key_bits // 4)))
+            .values("subnet_key")
+            .annotate(
+                count=Count("pk"), first=Min("created_at"), last=Max("created_at")
+            )
+        )
+        for row in grouped:
+            network = _key_network(row["subnet_key"], length)
+            entry = merged.get(network)
+            if entry is None:
+                merged[network] = {
+                    "subnet": str(network),
+                    "count": row["count"],
+                    "first": row["first"],
+                    "last": row["last"],
+                }
+            else:
+                entry["count"] += row["count"]
+                entry["first"] = min(entry["first"], row["first"])
+                entry["last"] = max(entry["last"], row["last"])
+    return sorted(merged.values(), key=lambda entry: (-entry["count"], entry["subnet"]))
+
+
+class SubnetRateLimiter:
+    """
+    Limit the support requests stored per subnet over a sliding window.
+
+    Each check is one ``COUNT`` over the subnet's key range, served by the
+    IP key index.
+
+    :param limit: Requests allowed per subnet and window.
+    :param window: The window length.
+    :param prefix: Prefix length of IPv4 subnets.
+    :param v6_prefix: Prefix length of IPv6 subnets.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: timedelta = timedelta(hours=1),
+        prefix: int = 24,
+        v6_prefix: int = 64,
+    ) -> None:
+        self.limit = limit
+        self.window = window
+        self.prefix = prefix
+        self.v6_prefix = v6_prefix
+
+    def count(self, address: Any, using: Optional[str] = None) -> int:
+        """Return the requests stored from the subnet of ``address`` in the window."""
+        from sage_contact.models import SupportRequestWithLocation
+
+        subnet = subnet_of(address, self.prefix, self.v6_prefix)
+        return (
+            SupportRequestWithLocation.objects.db_manager(using)
+            .non_polymorphic()
+            .in_network(subnet)
+            .created_since(timezone.now() - self.window)
+            .count()
+        )
+
+    def exceeded(self, address: Any, using: Optional[str] = None) -> bool:
+        """Return whether the subnet of ``address`` used up its requests."""
+        if not address:
+            return False
+        try:
+            return self.count(address, using) >= self.limit
+        except ValueError:
+            return False
+
+
+_limiter: Any = False
+
+
+def get_rate_limiter() -> Optional[SubnetRateLimiter]:
+    """
+    Return the limiter configured by ``SAGE_CONTACT_RATE_LIMIT``, or ``None``.
+
+    The setting is ``None`` (no limit) or a dict with ``limit`` and optional
+    ``window`` (seconds), ``prefix`` and ``v6_prefix``.
+    """
+    global _limiter
+    if _limiter is False:
+        config = app_settings.rate_limit
+        _limiter = None
+        if config:
+            config = dict(config)
+            if "window" in config:
+                config["window"] = timedelta(seconds=config["window"])
+            _limiter = SubnetRateLimiter(**config)
+    return _limiter
+
+
+@receiver(setting_changed)
+def reset_rate_limiter(setting: str, **kwargs: Any) -> None:
+    global _limiter
+    if setting == "SAGE_CONTACT_RATE_LIMIT":
+        _limiter = False
+
+
+def refresh_ip_keys(model, using: str = "default", batch_size: int = 1000) -> int:
+    """
+    Recompute the IP keys of every ``model`` row in batches.
+
+    Used to backfill existing rows. Only rows whose key changes are written.
+
+    :param model: A support request model with an IP address.
+    :return: The number of updated rows.
+    """
+    from django.db import models
+
+    from sage_contact.repository.queryset.bulk import iter_pk_batches
+
+    manager = model._base_manager.db_manager(using)
+    updated = 0
+    for pks in iter_pk_batches(manager.all(), batch_size):
+        changed = []
+        for obj in manager.filter(pk__in=pks).only("pk", "ip_address", "ip_key"):
+            key = obj.ip_key
+            set_ip_key(obj)
+            if key != obj.ip_key:
+                changed.append(obj)
+        if changed:
+            models.QuerySet(model, using=using).bulk_update(changed, ["ip_key"])
+            updated += len(changed)
+    return updated
@@ -0,0 +1,211 @@
+"""
+Normalized phone keys for indexed reverse phone lookups.
+
+Phone numbers are stored by ``PhoneNumberField`` in whatever format
+``PHONENUMBER_DB_FORMAT`` selects, which an inbound caller ID rarely
+matches. Contacts and support requests therefore also store two derived,
+indexed keys:
+
+* ``phone_e164``: the number in E.164 format, empty when it is invalid;
+* ``phone_suffix``: its digits reversed, so that "ends with these digits"
+  becomes an index range scan on a prefix.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from django.db import models
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from phonenumber_field.phonenumber import PhoneNumber, to_python
+
+from sage_contact.settings.app import app_settings
+
+_NON_DIGITS = re.compile(r"\D")
+
+#: Fewest trailing digits accepted for a suffix lookup.
+MIN_SUFFIX_DIGITS = 4
+
+
+def to_e164(value: Any, region: Optional[str] = None) -> str:
+    """
+    Return ``value`` in E.164 format, or ``""`` if it is not a valid number.
+
+    :param value: A ``PhoneNumber`` or a string in any format.
+    :param region: Region used to parse national numbers, defaults to
+        ``PHONENUMBER_DEFAULT_REGION``.
+    """
+    if not value:
+        return ""
+    if not isinstance(value, PhoneNumber):
+        try:
+            value = to_python(str(value), region=region)
+        except Exception:  # phonenumbers raises on garbage input
+            return ""
+    if isinstance(value, PhoneNumber) and value.is_valid():
+        return value.as_e164
+    return ""
+
+
+def digits_suffix_key(digits: str) -> str:
+    """Return the ``phone_suffix`` key of a string of digits."""
+    return _NON_DIGITS.sub("", digits)[::-1]
+
+
+def phone_keys(value: Any, region: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Return the ``(phone_e164, phone_suffix)`` keys of a phone number.
+
+    Numbers that cannot be parsed still get a suffix key from their digits.
+    """
+    e164 = to_e164(value, region)
+    return e164, digits_suffix_key(e164 or str(value or ""))[:32]
+
+
+def set_phone_keys(instance: Any, field: str = "phone_number") -> None:
+    """Fill ``phone_e164`` and ``phone_suffix`` of ``instance`` from ``field``."""
+    instance.phone_e164, instance.phone_suffix = phone_keys(getattr(instance, field))
+
+
+def suffix_range(digits: str) -> Tuple[str, Optional[str]]:
+    """
+    Return the ``(gte, lt)`` bounds of the keys ending with ``digits``.
+
+    The upper bound is the reversed digits incremented as a number, so the
+    range only ever compares digit strings and sorts the same under every
+    database collation. It is ``None`` when the digits are all nines.
+    """
+    key = digits_suffix_key(digits)
+    if len(key) < MIN_SUFFIX_DIGITS:
+        raise ValueError(
+            f"A phone suffix needs at least {MIN_SUFFIX_DIGITS} digits, got {digits!r}."
+        )
+    upper = key.rstrip("9")
+    if not upper:
+        return key, None
+    return key, upper[:-1] + str(int(upper[-1]) + 1)
+
+
+def phone_suffix_filter(field: str, digits: str) -> dict:
+    """Return the filter keyword arguments of a suffix lookup on ``field``."""
+    lower, upper = suffix_range(digits)
+    lookups = {f"{field}__gte": lower}
+    if upper is not None:
+        lookups[f"{field}__lt"] = upper
+    return lookups
+
+
+class PhoneLookupCache:
+    """
+    Small per-process LRU of reverse phone lookups with a time to live.
+
+    Entries are dropped when a contact with the same number is saved or
+    deleted in this process, and the cache is cleared when ``update()`` or
+    ``bulk_update()`` change phone numbers; other processes see the change after at most
+    ``timeout`` seconds.
+    """
+
+    _missing = object()
+
+    def __init__(self, maxsize: int = 1024, timeout: float = 60) -> None:
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or ``PhoneLookupCache._missing``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return self._missing
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return self._missing
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard_value(self, pk: Any) -> None:
+        """Drop every entry whose cached object has primary key ``pk``."""
+        with self._lock:
+            for key in [
+                key
+                for key, (_, value) in self._data.items()
+                if value is not None and value.pk == pk
+            ]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_contact_cache: Optional[PhoneLookupCache] = None
+
+
+def get_contact_phone_cache() -> PhoneLookupCache:
+    """Return the process-wide reverse lookup cache of contacts."""
+    global _contact_cache
+    if _contact_cache is None:
+        _contact_cache = PhoneLookupCache(
+            maxsize=app_settings.phone_cache_size,
+            timeout=app_settings.phone_cache_timeout,
+        )
+    return _contact_cache
+
+
+@receiver(setting_changed)
+def reset_contact_phone_cache(setting: str, **kwargs: Any) -> None:
+    global _contact_cache
+    if setting in ("SAGE_CONTACT_PHONE_CACHE_SIZE", "SAGE_CONTACT_PHONE_CACHE_TIMEOUT"):
+        _contact_cache = None
+
+
+def refresh_phone_keys(model, using: str = "default", batch_size: int = 1000) -> int:
+    """
+    Recompute the phone lookup keys of every ``model`` row in batches.
+
+    Used to backfill existing rows and after changing
+    ``PHONENUMBER_DEFAULT_REGION``. Only rows whose keys change are written.
+
+    :param model: ``Contact`` or a support request model with a phone number.
+    :return: The number of updated rows.
+    """
+    from sage_contact.repository.queryset.bulk import iter_pk_batches
+
+    manager = model._base_manager.db_manager(using)
+    updated = 0
+    for pks in iter_pk_batches(manager.all(), batch_size):
+        changed = []
+        for obj in manager.filter(pk__in=pks).only(
+            "pk", "phone_number", "phone_e164", "phone_suffix"
+        ):
+            keys = (obj.phone_e164, obj.phone_suffix)
+            set_phone_keys(obj)
+            if keys != (obj.phone_e164, obj.phone_suffix):
+                changed.append(obj)
+        if changed:
+            # The base manager's bulk_update is used so the contact queryset
+            # does not recompute the keys a second time.
+            models.QuerySet(model, using=using).bulk_update(
+                changed, ["phone_e164", "phone_suffix"]
+            )
+            updated += len(changed)
+    return updated
@@ -0,0 +1,136 @@
+"""
+Work queues of support requests, with priorities and SLA deadlines.
+
+Queues are opt-in: with ``SAGE_CONTACT_QUEUE = True`` every new support
+request gets a :class:`~sage_contact.models.SupportQueueItem` routed by
+``SAGE_CONTACT_QUEUE_ROUTES``: the queue is the request's contact reason
+(``SAGE_CONTACT_QUEUE_DEFAULT`` for requests without one), and the route
+gives its priority and SLA in seconds::
+
+    SAGE_CONTACT_QUEUE_ROUTES = {
+        "support": {"priority": 30, "sla": 60 * 60 * 4},
+        ...
+    }
+
+``SAGE_CONTACT_QUEUE_ROUTER`` replaces the routing with a callable, or its
+dotted path, taking the support request and returning a :class:`Route`, or
+``None`` to leave the request out of the queues.
+
+Agents and workers take work with ``SupportQueueItem.objects.claim()``:
+the next open items, highest priority and earliest deadline first, are
+selected with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database
+supports it, so concurrent claims pass over each other's rows instead of
+waiting on them. A claim is a lease of ``SAGE_CONTACT_QUEUE_CLAIM_TIMEOUT``
+seconds; items whose lease ran out are reopened by
+``SupportQueueItem.objects.requeue_expired()``, run by the
+``sage_contact_queue`` command.
+"""
+
+from datetime import timedelta
+from typing import Any, NamedTuple, Optional
+
+from django.utils.module_loading import import_string
+
+from sage_contact.repository.queryset.bulk import iter_pk_batches
+from sage_contact.settings.app import app_settings
+
+
+class Route(NamedTuple):
+    """Queue, priority and SLA of a support request."""
+
+    queue: str
+    priority: int
+    sla: timedelta
+
+
+def queue_enabled() -> bool:
+    return app_settings.queue
+
+
+def claim_timeout() -> timedelta:
+    """Return the lease of a claim."""
+    return timedelta(seconds=app_settings.queue_claim_timeout)
+
+
+def route_by_reason(instance: Any) -> Route:
+    """Route a support request by its contact reason."""
+    routes = app_settings.queue_routes
+    queue = getattr(instance, "contact_reason", None)
+    if queue not in routes:
+        queue = app_settings.queue_default
+    route = routes.get(queue, {})
+    return Route(
+        queue=queue,
+        priority=route.get("priority", 0),
+        sla=timedelta(seconds=route.get("sla", 60 * 60 * 24)),
+    )
+
+
+def route_support_request(instance: Any) -> Optional[Route]:
+    """Return the route of a support request from ``SAGE_CONTACT_QUEUE_ROUTER``."""
+    router = app_settings.queue_router
+    if not router:
+        return route_by_reason(instance)
+    if isinstance(router, str):
+        router = import_string(router)
+    return router(instance)
+
+
+def queue_item(instance: Any):
+    """
+    Build the unsaved queue item of a support request.
+
+    :param instance: A saved support request; its SLA runs from ``created_at``.
+    :return: A ``SupportQueueItem``, or ``None`` if the request is not routed.
+    """
+    from sage_contact.models import SupportQueueItem
+
+    route = route_support_request(instance)
+    if route is None:
+        return None
+    return SupportQueueItem(
+        support_request_id=instance.pk,
+        queue=route.queue,
+        priority=route.priority,
+        due_at=instance.created_at + route.sla,
+    )
+
+
+def enqueue(instance: Any, using: Optional[str] = None):
+    """
+    Add a support request to its queue.
+
+    :return: The saved ``SupportQueueItem``, or ``None`` if it is not routed.
+    """
+    item = queue_item(instance)
+    if item is not None:
+        item.save(using=using, force_insert=True)
+    return item
+
+
+def enqueue_missing(queryset, using: str = "default", batch_size: int = 1000) -> int:
+    """
+    Add the support requests of ``queryset`` that have no queue item yet.
+
+    Used to backfill requests stored before the queues were enabled. Their
+    SLA runs from their creation, so old requests arrive overdue.
+
+    :param queryset: Support requests, e.g. ``SupportRequestBase.objects.all()``.
+    :return: The number of queued requests.
+    """
+    from sage_contact.models import SupportQueueItem
+
+    manager = SupportQueueItem.objects.db_manager(using)
+    queryset = queryset.using(using).filter(queue_item__isnull=True)
+    queued = 0
+    for pks in iter_pk_batches(queryset, batch_size):
+        items = [
+            item
+            for item in map(
+                queue_item, queryset.model.objects.using(using).filter(pk__in=pks)
+            )
+            if item is not None
+        ]
+        manager.bulk_create(items, ignore_conflicts=True)
+        queued += len(items)
+    return queued
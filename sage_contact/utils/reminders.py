@@ -0,0 +1,150 @@
+"""
+Birthday and anniversary reminders served by indexed day-of-year keys.
+
+``Contact.birthday_key`` and ``Contact.anniversary_key`` hold the month and
+day of the date as ``month * 100 + day`` (e.g. ``1231``), a key that is the
+same in every year and keeps February 29 distinct. Upcoming dates are then
+one or two index range scans, even when the window wraps around the new
+year. In non-leap years, February 29 dates are due on February 28.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from django.db import models
+from django.db.models import Q
+from django.dispatch import Signal
+
+#: Sent once per batch by :func:`send_reminders` with ``kind`` (``"birthday"``
+#: or ``"anniversary"``) and ``reminders``, a list of ``(contact, date)``
+#: pairs where ``date`` is the upcoming occurrence.
+reminders_due = Signal()
+
+REMINDER_FIELDS = {"birthday": "birthday_key", "anniversary": "anniversary_key"}
+
+
+def day_key(value: Optional[date]) -> Optional[int]:
+    """Return the ``month * 100 + day`` key of ``value``, or ``None``."""
+    if value is None:
+        return None
+    return value.month * 100 + value.day
+
+
+def set_date_keys(instance: Any) -> None:
+    """Fill ``birthday_key`` and ``anniversary_key`` of a contact."""
+    instance.birthday_key = day_key(instance.birthday)
+    instance.anniversary_key = day_key(instance.anniversary)
+
+
+def _is_leap(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def upcoming_filter(field: str, start: date, days: int) -> Q:
+    """
+    Return the filter matching keys due from ``start`` to ``start + days``.
+
+    :param field: The key field, e.g. ``"birthday_key"``.
+    :param start: The first day of the window.
+    :param days: The window length after ``start``; ``0`` means ``start`` only.
+    """
+    if days >= 365:
+        return Q(**{f"{field}__isnull": False})
+    end = start + timedelta(days=days)
+    first, last = day_key(start), day_key(end)
+    if first <= last:
+        condition = Q(**{f"{field}__gte": first, f"{field}__lte": last})
+    else:
+        condition = Q(**{f"{field}__gte": first}) | Q(**{f"{field}__lte": last})
+    # February 29 is celebrated on February 28 in non-leap years; only the
+    # window ending on that day misses it, as 0229 lies between 0228 and 0301.
+    if last == 228 and not _is_leap(end.year):
+        condition |= Q(**{field: 229})
+    return condition
+
+
+def next_occurrence(value: date, start: date) -> date:
+    """Return the first anniversary of ``value`` on or after ``start``."""
+    for year in (start.year, start.year + 1):
+        if value.month == 2 and value.day == 29 and not _is_leap(year):
+            candidate = date(year, 2, 28)
+        else:
+            candidate = value.replace(year=year)
+        if candidate >= start:
+            return candidate
+    return candidate
+
+
+def iter_reminders(
+    queryset, kind: str, start: date, days: int = 0, batch_size: int = 500
+) -> Iterator[List[Tuple[Any, date]]]:
+    """
+    Yield batches of ``(contact, date)`` due from ``start`` to ``start + days``.
+
+    Contacts are read in primary key order with keyset pagination over the
+    indexed key range, so no batch scans the table.
+    """
+    field = REMINDER_FIELDS[kind]
+    queryset = queryset.filter(upcoming_filter(field, start, days)).order_by("pk")
+    last = None
+    while True:
+        batch = queryset if last is None else queryset.filter(pk__gt=last)
+        contacts = list(batch[:batch_size])
+        if not contacts:
+            return
+        yield [
+            (contact, next_occurrence(getattr(contact, kind), start))
+            for contact in contacts
+        ]
+        last = contacts[-1].pk
+
+
+def send_reminders(
+    queryset,
+    kind: str,
+    start: date,
+    days: int = 0,
+    batch_size: int = 500,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Send :data:`reminders_due` for every contact due in the window.
+
+    :return: The number of reminders sent.
+    """
+    total = 0
+    for reminders in iter_reminders(queryset, kind, start, days, batch_size):
+        reminders_due.send(sender=queryset.model, kind=kind, reminders=reminders)
+        total += len(reminders)
+        if progress is not None:
+            progress(total)
+    return total
+
+
+def refresh_date_keys(model, using: str = "default", batch_size: int = 1000) -> int:
+    """
+    Recompute the birthday and anniversary keys of every contact in batches.
+
+    Only rows whose keys change are written.
+
+    :return: The number of updated rows.
+    """
+    from sage_contact.repository.queryset.bulk import iter_pk_batches
+
+    manager = model._base_manager.db_manager(using)
+    updated = 0
+    for pks in iter_pk_batches(manager.all(), batch_size):
+        changed = []
+        for obj in manager.filter(pk__in=pks).only(
+            "pk", "birthday", "anniversary", "birthday_key", "anniversary_key"
+        ):
+            keys = (obj.birthday_key, obj.anniversary_key)
+            set_date_keys(obj)
+            if keys != (obj.birthday_key, obj.anniversary_key):
+                changed.append(obj)
+        if changed:
+            models.QuerySet(model, using=using).bulk_update(
+                changed, ["birthday_key", "anniversary_key"]
+            )
+            updated += len(changed)
+    return updated
@@ -0,0 +1,140 @@
+"""
+Retention and archival of support requests.
+
+Old support requests are moved out of the four live polymorphic tables in
+small batches. Each batch is optionally copied to the ``sage_support_archive``
+table and deleted with one statement per live table, in one transaction.
+Every batch commits on its own, so locks are held only for the duration of a
+single batch. A batch is appended to the gzip JSONL stream once it has
+committed, so a failed or retried batch is never written to it twice.
+"""
+
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from functools import partial
+from typing import IO, Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from sage_contact.models import SupportRequestArchive, SupportRequestBase
+from sage_contact.repository.queryset.support import delete_support_requests
+
+_JSON_TYPES = (str, int, float, bool, type(None), datetime, date, Decimal, UUID)
+
+
+def serialize_support_request(instance: SupportRequestBase) -> Dict[str, Any]:
+    """Return the field values of ``instance`` across its inheritance chain."""
+    data = {}
+    for field in instance._meta.concrete_fields:
+        if field.remote_field and field.remote_field.parent_link:
+            continue
+        value = field.value_from_object(instance)
+        # Phone numbers and countries are stored by their string form.
+        data[field.attname] = value if isinstance(value, _JSON_TYPES) else str(value)
+    return data
+
+
+def write_archive(stream: IO[str], rows: List[SupportRequestArchive]) -> None:
+    """Append ``rows`` to ``stream``, one JSON document per line."""
+    for row in rows:
+        stream.write(
+            json.dumps(
+                {
+                    "id": row.original_id,
+                    "type": row.request_type,
+                    "created_at": row.created_at,
+                    "payload": row.payload,
+                },
+                cls=DjangoJSONEncoder,
+            )
+        )
+        stream.write("\n")
+    stream.flush()
+
+
+def archive_support_requests(
+    cutoff: datetime,
+    batch_size: int = 1000,
+    stream: Optional[IO[str]] = None,
+    to_table: bool = True,
+    using: str = "default",
+    pause: float = 0,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Move support requests created before ``cutoff`` out of the live tables.
+
+    :param cutoff: Requests created before this datetime are archived.
+    :param batch_size: Requests archived and deleted per transaction.
+    :param stream: Optional text stream (e.g. ``gzip.open(path, "at")``)
+        receiving one JSON document per request once its batch has committed.
+    :param to_table: Whether to copy the requests to ``SupportRequestArchive``.
+    :param using: The database alias.
+    :param pause: Seconds to sleep between batches to spread the load.
+    :param progress: Called with the running total after every batch.
+    :return: The number of archived support requests.
+    """
+    if stream is None and not to_table:
+        raise ValueError("Support requests must be archived to a stream or table.")
+
+    total = 0
+    while True:
+        pks = list(
+            SupportRequestBase.objects.using(using)
+            .non_polymorphic()
+            .created_before(cutoff)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            break
+
+        rows = []
+        for instance in SupportRequestBase.objects.using(using).filter(pk__in=pks):
+            rows.append(
+                SupportRequestArchive(
+                    original_id=instance.pk,
+                    request_type=instance._meta.label,
+                    created_at=instance.created_at,
+                    payload=serialize_support_request(instance),
+                )
+            )
+
+        with transaction.atomic(using=using):
+            if to_table:
+                SupportRequestArchive.objects.using(using).bulk_create(rows)
+            total += delete_support_requests(pks, using=using)
+            if stream is not None:
+                # Only rows whose deletion committed reach the stream.
+                transaction.on_commit(partial(write_archive, stream, rows), using)
+
+        if progress is not None:
+            progress(total)
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def purge_archive(
+    cutoff: datetime, batch_size: int = 5000, using: str = "default"
+) -> int:
+    """
+    Delete archived support requests created before ``cutoff`` in batches.
+
+    :return: The number of deleted archive rows.
+    """
+    total = 0
+    manager = SupportRequestArchive.objects.using(using)
+    while True:
+        pks = list(
+            manager.filter(created_at__lt=cutoff)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            return total
+        total += manager.filter(pk__in=pks)._raw_delete(using)
@@ -0,0 +1,320 @@
+"""
+Spam scoring of support form submissions, cheapest checks first.
+
+:class:`SpamScorer` runs after the form validated and before anything is
+written, geolocated or emailed. Every check adds points to the score and the
+scorer stops as soon as the score reaches ``SAGE_CONTACT_SPAM_DROP_SCORE``:
+
+1. the honeypot input, which people never see, must be empty;
+2. the sender's email domain must not be in ``SAGE_CONTACT_SPAM_BLOCKED_DOMAINS``
+   (a set lookup per label of the domain);
+3. the signed timing token must be valid and older than
+   ``SAGE_CONTACT_SPAM_MIN_SUBMIT_SECONDS`` (one HMAC);
+4. subject and message may hold at most ``SAGE_CONTACT_SPAM_MAX_LINKS``
+   links, none of them to a blocked domain;
+5. unless the cheap checks already decided, the naive Bayes model at
+   ``SAGE_CONTACT_SPAM_MODEL_PATH`` scores the text, so plain-text spam that
+   passes every other check is still caught.
+
+Without a model, a clean submission therefore costs a few dictionary and set
+lookups, one HMAC and one regular expression search; the model adds one
+dictionary lookup per distinct word. Submissions scoring at least
+``SAGE_CONTACT_SPAM_QUARANTINE_SCORE`` are quarantined, those reaching the
+drop score are discarded.
+
+The honeypot and timing inputs are added by the ``{% support_form %}``
+template tag, next to the CSRF token, so cached form markup stays shared.
+"""
+
+import json
+import math
+import re
+import time
+from typing import Any, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from django.core import signing
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.html import format_html
+
+from sage_contact.settings.app import app_settings
+
+ACCEPT, QUARANTINE, DROP = "accept", "quarantine", "drop"
+
+#: Points of each excess link, an expired timing token and a certain Bayes
+#: spam verdict.
+LINK_POINTS = 2
+EXPIRED_POINTS = 2
+BAYES_POINTS = 6
+
+_LINK = re.compile(r"(?:https?://|www\.)([^\s/:?#<>\"']*)", re.IGNORECASE)
+_WORD = re.compile(r"[^\W\d_]{2,20}")
+_signer = signing.Signer(salt="sage_contact.spam.timing")
+
+
+class SpamVerdict(NamedTuple):
+    """The outcome of scoring one submission."""
+
+    action: str
+    score: int
+    reasons: Tuple[str, ...]
+
+
+def timing_token(now: Optional[float] = None) -> str:
+    """Return a signed token recording when the form was rendered."""
+    return _signer.sign(str(int(time.time() if now is None else now)))
+
+
+def domain_blocked(domain: str, blocked: frozenset) -> bool:
+    """Return whether ``domain`` or one of its parent domains is blocked."""
+    domain = domain.lower().rstrip(".")
+    while domain:
+        if domain in blocked:
+            return True
+        domain = domain.partition(".")[2]
+    return False
+
+
+def words(text: str, limit: int = 200) -> set:
+    """Return the distinct lowercase words of ``text``, at most ``limit``."""
+    found = set()
+    for match in _WORD.finditer(text.lower()):
+        found.add(match.group())
+        if len(found) >= limit:
+            break
+    return found
+
+
+class NaiveBayes:
+    """
+    Naive Bayes text classifier over the distinct words of a message.
+
+    Training keeps per-word document counts; scoring reads precomputed
+    log-likelihood ratios, so it costs one dictionary lookup per word.
+    """
+
+    __slots__ = ("spam_docs", "ham_docs", "counts", "_weights", "_bias")
+
+    def __init__(self) -> None:
+        self.spam_docs = 0
+        self.ham_docs = 0
+        self.counts: Dict[str, list] = {}
+        self._weights: Optional[Dict[str, float]] = None
+        self._bias = 0.0
+
+    def train(self, texts: Iterable[str], spam: bool) -> "NaiveBayes":
+        """Count the words of ``texts``, labelled as spam or not."""
+        slot = 0 if spam else 1
+        for text in texts:
+            for word in words(text):
+                self.counts.setdefault(word, [0, 0])[slot] += 1
+            if spam:
+                self.spam_docs += 1
+            else:
+                self.ham_docs += 1
+        self._weights = None
+        return self
+
+    def _compile(self) -> Dict[str, float]:
+        spam, ham = self.spam_docs + 2, self.ham_docs + 2
+        self._bias = math.log((self.spam_docs + 1) / (self.ham_docs + 1))
+        self._weights = {
+            word: math.log((s + 1) / spam) - math.log((h + 1) / ham)
+            for word, (s, h) in self.counts.items()
+        }
+        return self._weights
+
+    def probability(self, text: str) -> float:
+        """Return the probability that ``text`` is spam."""
+        weights = self._weights if self._weights is not None else self._compile()
+        logit = self._bias + sum(weights.get(word, 0.0) for word in words(text))
+        logit = max(-30.0, min(30.0, logit))
+        return 1 / (1 + math.exp(-logit))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "spam_docs": self.spam_docs,
+            "ham_docs": self.ham_docs,
+            "counts": self.counts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "NaiveBayes":
+        model = cls()
+        model.spam_docs = data["spam_docs"]
+        model.ham_docs = data["ham_docs"]
+        model.counts = {word: list(pair) for word, pair in data["counts"].items()}
+        return model
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle)
+
+    @classmethod
+    def load(cls, path: str) -> "NaiveBayes":
+        with open(path, encoding="utf-8") as handle:
+            model = cls.from_dict(json.load(handle))
+        model._compile()
+        return model
+
+
+class SpamScorer:
+    """
+    Score submissions with the configured checks.
+
+    :param honeypot_field: Name of the honeypot input.
+    :param timing_field: Name of the timing token input.
+    :param timing_required: Whether a missing timing token is suspicious.
+    :param min_seconds: Minimum seconds between rendering and submitting.
+    :param max_age: Age in seconds after which a timing token expires.
+    :param max_links: Links allowed in the subject and message.
+    :param blocked_domains: Email and link domains that are always spam.
+    :param model: Optional naive Bayes model for submissions the cheap checks
+        did not drop.
+    :param quarantine_score: Score from which submissions are quarantined.
+    :param drop_score: Score from which submissions are discarded.
+    """
+
+    def __init__(
+        self,
+        honeypot_field: str = "homepage",
+        timing_field: str = "sage_contact_ts",
+        timing_required: bool = False,
+        min_seconds: int = 3,
+        max_age: int = 60 * 60 * 24,
+        max_links: int = 2,
+        blocked_domains: Iterable[str] = (),
+        model: Optional[NaiveBayes] = None,
+        quarantine_score: int = 5,
+        drop_score: int = 10,
+    ) -> None:
+        self.honeypot_field = honeypot_field
+        self.timing_field = timing_field
+        self.timing_required = timing_required
+        self.min_seconds = min_seconds
+        self.max_age = max_age
+        self.max_links = max_links
+        self.blocked_domains = frozenset(
+            domain.lower().lstrip("@").rstrip(".") for domain in blocked_domains
+        )
+        self.model = model
+        self.quarantine_score = quarantine_score
+        self.drop_score = drop_score
+
+    def _verdict(self, score: int, reasons: list) -> SpamVerdict:
+        if score >= self.drop_score:
+            action = DROP
+        elif score >= self.quarantine_score:
+            action = QUARANTINE
+        else:
+            action = ACCEPT
+        return SpamVerdict(action, score, tuple(reasons))
+
+    def score(
+        self, cleaned_data: Mapping[str, Any], data: Mapping[str, Any]
+    ) -> SpamVerdict:
+        """
+        Score one validated submission.
+
+        :param cleaned_data: The form's cleaned data.
+        :param data: The submitted data, holding the honeypot and timing inputs.
+        :return: A :class:`SpamVerdict`.
+        """
+        if data.get(self.honeypot_field):
+            return self._verdict(self.drop_score, ["honeypot"])
+        email = cleaned_data.get("email") or ""
+        if self.blocked_domains and domain_blocked(
+            email.rpartition("@")[2], self.blocked_domains
+        ):
+            return self._verdict(self.drop_score, ["blocked_domain"])
+
+        score, reasons = 0, []
+        token = data.get(self.timing_field)
+        if token:
+            try:
+                age = time.time() - int(_signer.unsign(token))
+            except (signing.BadSignature, ValueError):
+                return self._verdict(self.drop_score, ["timing_invalid"])
+            if age < self.min_seconds:
+                score += self.quarantine_score
+                reasons.append("timing_fast")
+            elif age > self.max_age:
+                score += EXPIRED_POINTS
+                reasons.append("timing_expired")
+        elif self.timing_required:
+            score += self.quarantine_score
+            reasons.append("timing_missing")
+
+        text = (
+            f"{cleaned_data.get('subject') or ''}\n{cleaned_data.get('message') or ''}"
+        )
+        lowered = text.lower()
+        if "://" in lowered or "www." in lowered:
+            hosts = _LINK.findall(text)
+            if len(hosts) > self.max_links:
+                score += LINK_POINTS * (len(hosts) - self.max_links)
+                reasons.append("links")
+            if self.blocked_domains and any(
+                domain_blocked(host, self.blocked_domains) for host in hosts
+            ):
+                return self._verdict(
+                    score + self.drop_score, [*reasons, "blocked_link"]
+                )
+
+        if self.model is not None and score < self.drop_score:
+            points = round(self.model.probability(text) * BAYES_POINTS)
+            if points:
+                score += points
+                reasons.append("bayes")
+        return self._verdict(score, reasons)
+
+    def inputs(self):
+        """Return the HTML of the honeypot and timing inputs."""
+        return format_html(
+            '<div style="position:absolute;left:-10000px" aria-hidden="true">'
+            '<input type="text" name="{}" value="" tabindex="-1" autocomplete="off">'
+            "</div>"
+            '<input type="hidden" name="{}" value="{}">',
+            self.honeypot_field,
+            self.timing_field,
+            timing_token(),
+        )
+
+
+def spam_filter_enabled() -> bool:
+    return app_settings.spam_filter
+
+
+_scorer: Optional[SpamScorer] = None
+
+
+def get_spam_scorer() -> SpamScorer:
+    """Return the process-wide scorer configured from the settings."""
+    global _scorer
+    if _scorer is None:
+        model_path = app_settings.spam_model_path
+        _scorer = SpamScorer(
+            honeypot_field=app_settings.spam_honeypot_field,
+            timing_field=app_settings.spam_timing_field,
+            timing_required=app_settings.spam_timing_required,
+            min_seconds=app_settings.spam_min_submit_seconds,
+            max_age=app_settings.spam_max_token_age,
+            max_links=app_settings.spam_max_links,
+            blocked_domains=app_settings.spam_blocked_domains,
+            model=NaiveBayes.load(model_path) if model_path else None,
+            quarantine_score=app_settings.spam_quarantine_score,
+            drop_score=app_settings.spam_drop_score,
+        )
+    return _scorer
+
+
+@receiver(setting_changed)
+def reset_spam_scorer(setting: str, **kwargs: Any) -> None:
+    global _scorer
+    if setting.startswith("SAGE_CONTACT_SPAM_"):
+        _scorer = None
+
+
+def train_spam_model(spam: Iterable[str], ham: Iterable[str]) -> NaiveBayes:
+    """Return a model trained on spam and legitimate texts."""
+    return NaiveBayes().train(spam, spam=True).train(ham, spam=False)
@@ -0,0 +1,434 @@
+"""
+Incremental sync of contacts, custom fields and contact labels.
+
+Sync is opt-in: set ``SAGE_CONTACT_SYNC = True``. The sequence is a single
+row that every synced write locks until it commits, so writers, across all
+tenants, are serialised; leave it off unless clients sync incrementally.
+
+Every write to ``Contact``, ``CustomField`` or ``ContactLabel`` stamps the
+row with a value of one database-wide sequence (``sync_seq``), and every
+deletion leaves a ``SyncTombstone`` with its own sequence value. A client
+keeps the token of the last change it received and asks for everything
+after it, so a sync costs as many rows as changed since, not the size of the
+address book.
+
+Sequence values are taken from the ``sage_sync_sequence`` row inside the
+transaction that writes them. The row stays locked until that transaction
+commits, so values become visible in the order they were handed out: once a
+reader sees value ``n`` committed, every change up to ``n`` is visible too.
+Each page is read up to the sequence value committed when it starts, which
+keeps rows written meanwhile for the next page.
+
+Changes are ordered by ``(sequence, kind, id)``; rows written by one
+statement (``update()``, ``bulk_update()``) share a sequence value, and the
+token points at the last row returned, so pages never split or repeat them.
+"""
+
+import heapq
+import json
+from datetime import timedelta
+from itertools import islice
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from sage_contact.settings.app import app_settings
+from sage_contact.tenancy import current_tenant
+from sage_contact.utils.history import DERIVED_CONTACT_FIELDS, to_json
+
+#: Primary key of the single ``SyncSequence`` row.
+SEQUENCE_PK = 1
+
+#: Position before every change, including rows never stamped (``0``).
+START = (-1, 0, 0)
+
+Cursor = Tuple[int, int, int]
+
+
+class SyncTokenError(ValueError):
+    """Raised for a sync token that cannot be parsed."""
+
+
+class SyncTokenExpired(SyncTokenError):
+    """
+    Raised for a token older than the oldest kept tombstone.
+
+    The client may have missed deletions and must sync from scratch.
+    """
+
+
+class SyncChange(NamedTuple):
+    """One change of a sync page."""
+
+    seq: int
+    kind: str
+    op: str
+    id: int
+    contact_id: int
+    data: Optional[Dict[str, Any]]
+
+
+class SyncPage(NamedTuple):
+    """The changes after a token, with the token to continue from."""
+
+    changes: List[SyncChange]
+    token: str
+    more: bool
+
+
+def sync_enabled() -> bool:
+    return app_settings.sync
+
+
+def page_size(limit: Optional[int] = None) -> int:
+    """Return ``limit`` bounded by ``SAGE_CONTACT_SYNC_PAGE_SIZE``."""
+    maximum = app_settings.sync_page_size
+    return maximum if not limit or limit <= 0 else min(limit, maximum)
+
+
+def sync_models() -> Dict[int, Any]:
+    """Return ``{kind: model}`` of the synced models, in sync order."""
+    from sage_contact.models import Contact, ContactChange, ContactLabel, CustomField
+
+    return {
+        ContactChange.Kind.CONTACT: Contact,
+        ContactChange.Kind.CUSTOM_FIELD: CustomField,
+        ContactChange.Kind.LABEL: ContactLabel,
+    }
+
+
+def kind_of(model: Any) -> int:
+    for kind, synced in sync_models().items():
+        if model is synced:
+            return kind
+    raise ValueError(f"{model!r} is not synced")
+
+
+def kind_name(kind: int) -> str:
+    from sage_contact.models import ContactChange
+
+    return ContactChange.Kind(kind).name.lower()
+
+
+def encode_token(cursor: Cursor) -> str:
+    return "-".join(str(part) for part in cursor)
+
+
+def decode_token(token: Optional[str]) -> Cursor:
+    """Return the position encoded in ``token``; no token means the start."""
+    if not token:
+        return START
+    try:
+        seq, kind, pk = (int(part) for part in token.split("-"))
+    except (AttributeError, ValueError):
+        raise SyncTokenError(f"Invalid sync token {token!r}.") from None
+    if seq < 0 or kind < 0 or pk < 0:
+        raise SyncTokenError(f"Invalid sync token {token!r}.")
+    return seq, kind, pk
+
+
+def allocate_sync_seq(using: Optional[str] = None, count: int = 1) -> int:
+    """
+    Reserve ``count`` consecutive sequence values and return the first.
+
+    Must run in the transaction that writes the values: the sequence row
+    stays locked until it ends. PostgreSQL and SQLite 3.35+ do it in one
+    ``UPDATE ... RETURNING``; other databases add a ``SELECT``.
+    """
+    from sage_contact.models import SyncSequence
+
+    using = using or "default"
+    connection = connections[using]
+    table = connection.ops.quote_name(SyncSequence._meta.db_table)
+    returning = (
+        connection.vendor in ("postgresql", "sqlite")
+        and connection.features.can_return_columns_from_insert
+    )
+    for _ in range(2):
+        if returning:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET value = value + %s WHERE id = %s "
+                    f"RETURNING value",
+                    [count, SEQUENCE_PK],
+                )
+                row = cursor.fetchone()
+        else:
+            sequence = SyncSequence._base_manager.using(using).filter(pk=SEQUENCE_PK)
+            row = None
+            if sequence.update(value=F("value") + count):
+                row = sequence.values_list("value").get()
+        if row is not None:
+            return row[0] - count + 1
+        # First write of the database: create the row, unless another
+        # transaction just did.
+        SyncSequence._base_manager.using(using).bulk_create(
+            [SyncSequence(pk=SEQUENCE_PK)], ignore_conflicts=True
+        )
+    raise RuntimeError("The sync sequence row could not be created.")
+
+
+def sequence_state(using: Optional[str] = None) -> Tuple[int, int]:
+    """Return the last committed sequence value and the tombstone horizon."""
+    from sage_contact.models import SyncSequence
+
+    row = (
+        SyncSequence._base_manager.using(using or "default")
+        .filter(pk=SEQUENCE_PK)
+        .values_list("value", "horizon")
+        .first()
+    )
+    return row or (0, 0)
+
+
+def stamp(objs: List[Any], using: Optional[str] = None) -> None:
+    """Give ``objs`` one new sequence value; the caller writes them."""
+    if objs:
+        seq = allocate_sync_seq(using)
+        for obj in objs:
+            obj.sync_seq = seq
+
+
+def record_tombstones(
+    rows: List[Tuple[Any, int, int, int]], using: Optional[str] = None
+) -> None:
+    """
+    Leave a tombstone for every deleted ``(model, object id, contact id,
+    tenant id)``.
+
+    All tombstones share one sequence value and one INSERT.
+    """
+    from sage_contact.models import SyncTombstone
+
+    if not sync_enabled() or not rows:
+        return
+    using = using or "default"
+    with transaction.atomic(using=using, savepoint=False):
+        seq = allocate_sync_seq(using)
+        tombstones = [
+            SyncTombstone(
+                kind=kind_of(model),
+                object_id=object_id,
+                contact_id=contact_id,
+                tenant_id=tenant_id,
+                sync_seq=seq,
+            )
+            for model, object_id, contact_id, tenant_id in rows
+        ]
+        if len(tombstones) == 1:
+            # A plain INSERT, without the transaction bulk_create() opens.
+            tombstones[0].save(using=using, force_insert=True)
+        else:
+            SyncTombstone._base_manager.using(using).bulk_create(tombstones)
+
+
+def synced_fields(model: Any) -> List[str]:
+    """Return the attnames of ``model`` sent to clients."""
+    fields = model._meta.__dict__.get("_sage_sync_fields")
+    if fields is None:
+        fields = ["sync_seq"] + [
+            field.attname
+            for field in model._meta.concrete_fields
+            # A client only ever syncs the rows of its own tenant.
+            if field.attname not in DERIVED_CONTACT_FIELDS
+            and field.attname != "tenant_id"
+        ]
+        model._meta._sage_sync_fields = fields
+    return fields
+
+
+def after(cursor: Cursor, kind: Optional[int] = None, key: str = "pk") -> Q:
+    """
+    Filter rows ordered after ``cursor`` by ``(sync_seq, kind, key)``.
+
+    :param kind: The kind of every row, or ``None`` if rows have a ``kind``
+        column (tombstones).
+    """
+    seq, last_kind, last_pk = cursor
+    same_seq = Q(sync_seq=seq)
+    if kind is None:
+        same_seq &= Q(kind__gt=last_kind) | Q(kind=last_kind, **{f"{key}__gt": last_pk})
+    elif kind == last_kind:
+        same_seq &= Q(**{f"{key}__gt": last_pk})
+    elif kind < last_kind:
+        same_seq = Q(pk__in=[])
+    return Q(sync_seq__gt=seq) | same_seq
+
+
+def _rows(model, kind: int, cursor: Cursor, high: int, limit: int, using, tenant):
+    fields = synced_fields(model)
+    queryset = (
+        model._base_manager.using(using)
+        .filter(after(cursor, kind), tenant_id=tenant, sync_seq__lte=high)
+        .order_by("sync_seq", "pk")
+        .values_list(*fields)[:limit]
+    )
+    name = kind_name(kind)
+    contact_key = "contact_id" if "contact_id" in fields else "id"
+    for values in queryset.iterator(chunk_size=min(limit, 2000)):
+        data = dict(zip(fields, values))
+        yield (data["sync_seq"], kind, data["id"]), SyncChange(
+            seq=data.pop("sync_seq"),
+            kind=name,
+            op="upsert",
+            id=data["id"],
+            contact_id=data[contact_key],
+            data={key: to_json(value) for key, value in data.items()},
+        )
+
+
+def _tombstones(cursor: Cursor, high: int, limit: int, using: str, tenant: int):
+    from sage_contact.models import SyncTombstone
+
+    queryset = (
+        SyncTombstone._base_manager.using(using)
+        .filter(after(cursor, key="object_id"), tenant_id=tenant, sync_seq__lte=high)
+        .order_by("sync_seq", "kind", "object_id")
+        .values_list("sync_seq", "kind", "object_id", "contact_id")[:limit]
+    )
+    for seq, kind, object_id, contact_id in queryset.iterator(
+        chunk_size=min(limit, 2000)
+    ):
+        yield (seq, kind, object_id), SyncChange(
+            seq=seq,
+            kind=kind_name(kind),
+            op="delete",
+            id=object_id,
+            contact_id=contact_id,
+            data=None,
+        )
+
+
+def iter_changes(
+    token: Optional[str] = None,
+    limit: Optional[int] = None,
+    using: Optional[str] = None,
+    tenant: Optional[int] = None,
+) -> Iterator[Tuple[Cursor, SyncChange]]:
+    """
+    Stream up to ``limit + 1`` changes of ``tenant`` after ``token``, oldest
+    first.
+
+    Each synced table and the tombstones are read with one streamed query
+    (served by their ``(tenant_id, sync_seq, id)`` index) and merged, so
+    memory use does not depend on the page size.
+
+    :param tenant: The tenant, defaults to the current tenant; it is taken
+        when called, not when the changes are streamed.
+
+    :raises SyncTokenError: If ``token`` is malformed.
+    :raises SyncTokenExpired: If tombstones after ``token`` were purged.
+    :return: An iterator of ``(cursor, change)``; one change more than
+        ``limit`` is read to tell whether another page follows.
+    """
+    using = using or "default"
+    tenant = current_tenant() if tenant is None else tenant
+    cursor = decode_token(token)
+    limit = page_size(limit) + 1
+    high, horizon = sequence_state(using)
+    if token and cursor[0] < horizon:
+        raise SyncTokenExpired(f"Sync token {token!r} has expired.")
+    streams = [
+        _rows(model, kind, cursor, high, limit, using, tenant)
+        for kind, model in sync_models().items()
+    ]
+    if token:
+        # A first sync has nothing to delete.
+        streams.append(_tombstones(cursor, high, limit, using, tenant))
+    return islice(heapq.merge(*streams, key=lambda item: item[0]), limit)
+
+
+def changes_since(
+    token: Optional[str] = None,
+    limit: Optional[int] = None,
+    using: Optional[str] = None,
+    tenant: Optional[int] = None,
+) -> SyncPage:
+    """
+    Return one page of changes after ``token``.
+
+    :param token: The token of the previous page, or ``None`` to start.
+    :param limit: The maximum number of changes, bounded by
+        ``SAGE_CONTACT_SYNC_PAGE_SIZE``.
+    :param tenant: The tenant, defaults to the current tenant.
+    :raises SyncTokenError: If ``token`` is malformed.
+    :raises SyncTokenExpired: If the client must sync from scratch.
+    """
+    limit = page_size(limit)
+    cursor = decode_token(token)
+    changes = []
+    more = False
+    for position, change in iter_changes(token, limit, using, tenant):
+        if len(changes) == limit:
+            more = True
+            break
+        changes.append(change)
+        cursor = position
+    return SyncPage(changes, encode_token(cursor), more)
+
+
+def purge_tombstones(older_than: timedelta, using: Optional[str] = None) -> int:
+    """
+    Delete tombstones older than ``older_than`` and move the horizon past them.
+
+    Clients holding a token from before the horizon get
+    :class:`SyncTokenExpired` and must sync from scratch.
+
+    :return: The number of deleted tombstones.
+    """
+    from sage_contact.models import SyncSequence, SyncTombstone
+
+    using = using or "default"
+    tombstones = SyncTombstone._base_manager.using(using).filter(
+        deleted_at__lt=timezone.now() - older_than
+    )
+    with transaction.atomic(using=using):
+        last = tombstones.order_by("-sync_seq").values_list("sync_seq", flat=True)
+        last = last.first()
+        if last is None:
+            return 0
+        tombstones = SyncTombstone._base_manager.using(using).filter(sync_seq__lte=last)
+        deleted = tombstones._raw_delete(using)
+        SyncSequence._base_manager.using(using).filter(
+            pk=SEQUENCE_PK, horizon__lt=last
+        ).update(horizon=last)
+    return deleted
+
+
+def iter_sync_lines(
+    token: Optional[str] = None,
+    limit: Optional[int] = None,
+    using: Optional[str] = None,
+    tenant: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Return one page of changes after ``token`` as newline-delimited JSON.
+
+    Every change is a line of its own, written as it is read; the last line
+    is ``{"token": ..., "more": ...}``. The token is validated before the
+    first line, so errors can still be answered with a status code.
+
+    :raises SyncTokenError: If ``token`` is malformed.
+    :raises SyncTokenExpired: If the client must sync from scratch.
+    """
+    limit = page_size(limit)
+    cursor = decode_token(token)
+    # The lines are written after the request's tenant scope has ended.
+    tenant = current_tenant() if tenant is None else tenant
+    changes = iter_changes(token, limit, using, tenant)
+
+    def lines() -> Iterator[str]:
+        position = cursor
+        more = False
+        for count, (next_position, change) in enumerate(changes):
+            if count == limit:
+                more = True
+                break
+            position = next_position
+            yield json.dumps(change._asdict(), cls=DjangoJSONEncoder) + "\n"
+        yield json.dumps({"token": encode_token(position), "more": more}) + "\n"
+
+    return lines()
@@ -0,0 +1,362 @@
+"""
+Per-stage timing instrumentation for the support request submit path.
+
+Code paths wrap their work in :func:`stage`::
+
+    with stage("geoip.lookup"):
+        ...
+
+When no hook is configured and the histogram is disabled, :func:`stage`
+returns a shared no-op context manager, so the disabled cost is one cached
+attribute check per stage.
+
+Durations are reported in seconds to every callable listed in
+``SAGE_CONTACT_TIMING_HOOKS``. Each hook is called as
+``hook(stage, duration, **tags)``; the built-in :func:`log_hook` and
+:func:`signal_hook` cover logging and Django signals, and a statsd client
+can be plugged in with a one-line wrapper.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import Signal, receiver
+from django.utils.module_loading import import_string
+
+from sage_contact.settings.app import app_settings
+
+logger = logging.getLogger(__name__)
+
+#: Sent after every timed stage with ``stage``, ``duration`` and ``tags``.
+stage_timed = Signal()
+
+#: Upper bounds (seconds) of the histogram buckets; the last one is open.
+BUCKET_BOUNDS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    float("inf"),
+)
+
+_SETTING_NAMES = frozenset(
+    {
+        "SAGE_CONTACT_TIMING_HOOKS",
+        "SAGE_CONTACT_TIMING_HISTOGRAM",
+        "SAGE_CONTACT_TIMING_FLUSH_INTERVAL",
+        "SAGE_CONTACT_TIMING_CACHE",
+    }
+)
+
+
+def log_hook(stage: str, duration: float, **tags: Any) -> None:
+    """Log the duration of a stage in milliseconds."""
+    logger.info("sage_contact stage %s took %.3f ms %s", stage, duration * 1000, tags)
+
+
+def signal_hook(stage: str, duration: float, **tags: Any) -> None:
+    """Re-emit the duration of a stage through the ``stage_timed`` signal."""
+    stage_timed.send(sender=None, stage=stage, duration=duration, tags=tags)
+
+
+class StageHistogram:
+    """
+    Thread-safe, fixed-bucket latency histogram keyed by stage name.
+
+    Samples are aggregated in-process. Deltas are periodically pushed to a
+    shared Django cache with ``cache.incr`` so that the
+    ``sage_contact_timings`` management command can read the totals of all
+    worker processes.
+
+    Periodic flushes run in a background thread, so no request waits on the
+    cache. Each key is created once per process and then only incremented,
+    one round trip per non-empty bucket.
+    """
+
+    registry_key = "sage_contact:timing:stages"
+
+    def __init__(self, cache_alias: str, flush_interval: float) -> None:
+        self.cache_alias = cache_alias
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._stats: Dict[str, List[float]] = {}
+        self._pending: Dict[str, List[float]] = {}
+        self._last_flush = time.monotonic()
+        # Stage names and cache keys this process knows to exist in the cache.
+        self._registered: Set[str] = set()
+        self._created: Set[str] = set()
+        self._flush_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _empty() -> List[float]:
+        # Bucket counts followed by count, total seconds and max seconds.
+        return [0] * len(BUCKET_BOUNDS) + [0, 0.0, 0.0]
+
+    @staticmethod
+    def _add(row: List[float], index: int, duration: float) -> None:
+        row[index] += 1
+        row[-3] += 1
+        row[-2] += duration
+        if duration > row[-1]:
+            row[-1] = duration
+
+    def observe(self, stage: str, duration: float) -> None:
+        """Record one sample and start a background flush when due."""
+        index = bisect_left(BUCKET_BOUNDS, duration)
+        with self._lock:
+            self._add(self._stats.setdefault(stage, self._empty()), index, duration)
+            self._add(self._pending.setdefault(stage, self._empty()), index, duration)
+            due = (
+                time.monotonic() - self._last_flush >= self.flush_interval
+                and self._flush_thread is None
+            )
+            if due:
+                # Not due again until this flush ran.
+                self._last_flush = time.monotonic()
+                self._flush_thread = threading.Thread(
+                    target=self._flush_in_background,
+                    name="sage-contact-timing",
+                    daemon=True,
+                )
+        if due:
+            self._flush_thread.start()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._flush_thread = None
+
+    def flush(self) -> None:
+        """Push the samples collected since the last flush to the shared cache."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        cache = caches[self.cache_alias]
+        try:
+            for name, row in pending.items():
+                for key, value in self._cache_items(name, row):
+                    if value:
+                        self._increment(cache, key, value)
+            if not self._registered.issuperset(pending):
+                known = set(cache.get(self.registry_key) or ())
+                if not known.issuperset(pending):
+                    cache.set(self.registry_key, sorted(known | set(pending)), None)
+                self._registered = known | set(pending)
+        except Exception as e:  # pragma: no cover - depends on the cache backend
+            logger.warning(f"Failed to flush sage_contact timings to cache: {e}")
+
+    def _increment(self, cache: Any, key: str, value: int) -> None:
+        if key in self._created:
+            try:
+                cache.incr(key, value)
+                return
+            except ValueError:
+                # Evicted or cleared: the registry may be gone as well.
+                self._created.discard(key)
+                self._registered = set()
+        # The first write of a key sets it, unless another process just did.
+        if not cache.add(key, value, None):
+            cache.incr(key, value)
+        self._created.add(key)
+
+    @staticmethod
+    def _cache_items(name: str, row: List[float]) -> Iterable[Tuple[str, int]]:
+        prefix = f"sage_contact:timing:{name}"
+        for index in range(len(BUCKET_BOUNDS)):
+            yield f"{prefix}:b{index}", int(row[index])
+        yield f"{prefix}:count", int(row[-3])
+        # Totals are stored in microseconds so they can be incremented.
+        yield f"{prefix}:total_us", int(row[-2] * 1_000_000)
+
+    def local_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the statistics collected by this process."""
+        with self._lock:
+            rows = {name: list(row) for name, row in self._stats.items()}
+        return {
+            name: summarize(row[: len(BUCKET_BOUNDS)], row[-3], row[-2], row[-1])
+            for name, row in rows.items()
+        }
+
+    def shared_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the statistics of every process that flushed to the cache."""
+        cache = caches[self.cache_alias]
+        result = {}
+        for name in cache.get(self.registry_key) or ():
+            prefix = f"sage_contact:timing:{name}"
+            keys = [f"{prefix}:b{index}" for index in range(len(BUCKET_BOUNDS))]
+            values = cache.get_many(keys + [f"{prefix}:count", f"{prefix}:total_us"])
+            buckets = [values.get(key, 0) for key in keys]
+            count = values.get(f"{prefix}:count", 0)
+            total = values.get(f"{prefix}:total_us", 0) / 1_000_000
+            result[name] = summarize(buckets, count, total, None)
+        return result
+
+    def reset(self) -> None:
+        """Drop local samples and the shared totals."""
+        with self._lock:
+            names = set(self._stats)
+            self._stats.clear()
+            self._pending.clear()
+            self._registered = set()
+            self._created = set()
+        cache = caches[self.cache_alias]
+        names.update(cache.get(self.registry_key) or ())
+        keys = [self.registry_key]
+        for name in names:
+            keys.extend(key for key, _ in self._cache_items(name, self._empty()))
+        cache.delete_many(keys)
+
+
+def summarize(
+    buckets: List[float], count: float, total: float, maximum: Optional[float]
+) -> Dict[str, Any]:
+    """
+    Build the summary of one stage from its bucket counts.
+
+    Percentiles are reported as the upper bound of the bucket that contains
+    them, which is accurate to the bucket resolution.
+    """
+
+    def percentile(fraction: float) -> Optional[float]:
+        if not count:
+            return None
+        threshold = count * fraction
+        seen = 0
+        for bound, bucket_count in zip(BUCKET_BOUNDS, buckets):
+            seen += bucket_count
+            if seen >= threshold:
+                return bound
+        return BUCKET_BOUNDS[-1]
+
+    return {
+        "count": int(count),
+        "mean": total / count if count else None,
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": maximum,
+        "buckets": [int(value) for value in buckets],
+    }
+
+
+class _TimingConfig:
+    __slots__ = ("hooks", "histogram", "enabled")
+
+    def __init__(
+        self, hooks: List[Callable[..., None]], histogram: Optional[StageHistogram]
+    ) -> None:
+        self.hooks = hooks
+        self.histogram = histogram
+        self.enabled = bool(hooks) or histogram is not None
+
+
+_config: Optional[_TimingConfig] = None
+
+
+def _load_config() -> _TimingConfig:
+    hooks = []
+    for hook in app_settings.timing_hooks:
+        hooks.append(import_string(hook) if isinstance(hook, str) else hook)
+    histogram = None
+    if app_settings.timing_histogram:
+        histogram = StageHistogram(
+            cache_alias=app_settings.timing_cache,
+            flush_interval=app_settings.timing_flush_interval,
+        )
+    return _TimingConfig(hooks, histogram)
+
+
+def get_config() -> _TimingConfig:
+    """Return the timing configuration, loading it from settings once."""
+    global _config
+    if _config is None:
+        _config = _load_config()
+    return _config
+
+
+def get_histogram() -> Optional[StageHistogram]:
+    """Return the in-process histogram, or ``None`` when it is disabled."""
+    return get_config().histogram
+
+
+@receiver(setting_changed)
+def reset_timing_config(setting: str, **kwargs: Any) -> None:
+    global _config
+    if setting in _SETTING_NAMES:
+        _config = None
+
+
+def record(stage: str, duration: float, **tags: Any) -> None:
+    """Report one stage duration to the histogram and every hook."""
+    config = get_config()
+    if config.histogram is not None:
+        config.histogram.observe(stage, duration)
+    for hook in config.hooks:
+        try:
+            hook(stage, duration, **tags)
+        except Exception as e:
+            logger.warning(f"sage_contact timing hook {hook!r} failed: {e}")
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "tags", "start")
+
+    def __init__(self, name: str, tags: Dict[str, Any]) -> None:
+        self.name = name
+        self.tags = tags
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> bool:
+        duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.tags["failed"] = True
+        record(self.name, duration, **self.tags)
+        return False
+
+
+def stage(name: str, **tags: Any) -> Any:
+    """
+    Return a context manager that times the wrapped block as ``name``.
+
+    :param name: Dotted stage name, e.g. ``"form.post_clean"``.
+    :param tags: Extra keyword arguments passed through to the hooks.
+    :return: A context manager; a shared no-op one when timing is disabled.
+    """
+    if not get_config().enabled:
+        return _NULL_STAGE
+    return _Stage(name, tags)
@@ -0,0 +1,10 @@
+def package_version() -> str:
+    """Return the installed version of django-sage-contact, or ``"unknown"``."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # pragma: no cover - Python < 3.8
+        return "unknown"
+    try:
+        return version("django-sage-contact")
+    except PackageNotFoundError:
+        return "unknown"
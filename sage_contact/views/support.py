@@ -1,3 +1,5 @@
+import logging
+
 from django.contrib import messages
 from django.core.exceptions import ImproperlyConfigured
 from django.shortcuts import redirect, render
@@ -5,6 +7,13 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.views.generic.base import ContextMixin
 
+from sage_contact.routers import pin_response, request_scope
+from sage_contact.utils.network import get_rate_limiter
+from sage_contact.utils.spam import ACCEPT, QUARANTINE
+from sage_contact.utils.timing import stage
+
+logger = logging.getLogger(__name__)
+
 
 class SupportRequestViewMixin(ContextMixin):
     """
@@ -20,6 +29,7 @@ class SupportRequestViewMixin(ContextMixin):
     support_form_success_message = _(
         "Thank you for contacting us! We will be in touch soon."
     )
+    support_form_fragment_cache = False
     template_name = None
 
     def __init__(self, *args, **kwargs):
@@ -66,26 +76,124 @@ class SupportRequestViewMixin(ContextMixin):
         """Returns the template name to use for rendering the view."""
         return self.template_name
 
+    def get_support_form_kwargs(self):
+        """
+        Returns the keyword arguments for instantiating the support form.
+
+        The request is only passed to forms whose class sets
+        ``accepts_request = True``, as the package's support forms do; other
+        forms are built with the data alone.
+        """
+        if getattr(self.get_support_form_class(), "accepts_request", False):
+            return {"request": self.request}
+        return {}
+
+    def get_support_form(self, data=None):
+        """Returns an instance of the support form bound to ``data``, if given."""
+        form = self.get_support_form_class()(data, **self.get_support_form_kwargs())
+        if data is None and self.use_support_form_fragment_cache():
+            form.use_render_cache = True
+        return form
+
+    def use_support_form_fragment_cache(self):
+        """
+        Returns whether the unbound form markup may be served from the cache.
+
+        Only anonymous visitors get the cached fragment, so per-user markup is
+        never shared. Render the form with ``{% support_form %}`` to add the
+        CSRF token.
+        """
+        if not self.support_form_fragment_cache:
+            return False
+        user = getattr(self.request, "user", None)
+        return user is None or not user.is_authenticated
+
     def get_context_data(self, **kwargs):
-        """Adds the form to the context."""
-        context = super().get_context_data(**kwargs)
-        context[self.support_form_context_name] = self.get_support_form_class()()
-        return context
+        """Adds the form to the context, unless a form is passed in ``kwargs``."""
+        if self.support_form_context_name not in kwargs:
+            kwargs[self.support_form_context_name] = self.get_support_form()
+        return super().get_context_data(**kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Handles the request with its reads routed for read-your-writes.
+
+        A client that submitted the form within the last
+        ``SAGE_CONTACT_READ_YOUR_WRITES_SECONDS`` reads from the primary.
+        """
+        with request_scope(request):
+            return super().dispatch(request, *args, **kwargs)
+
+    def handle_spam(self, form, verdict):
+        """
+        Handles a submission rejected by the spam filter.
+
+        Quarantined submissions are stored for review; dropped ones are only
+        logged. Nothing is inserted into the support request tables, located
+        or emailed.
+        """
+        if verdict.action == QUARANTINE:
+            form.quarantine(verdict)
+        logger.info(
+            "Support form submission %s (score %d: %s).",
+            "quarantined" if verdict.action == QUARANTINE else "dropped",
+            verdict.score,
+            ", ".join(verdict.reasons),
+        )
+
+    def rate_limit_exceeded(self):
+        """
+        Returns whether the client's subnet sent too many requests recently.
+
+        The limit is set by ``SAGE_CONTACT_RATE_LIMIT``; by default there is none.
+        """
+        limiter = get_rate_limiter()
+        return limiter is not None and limiter.exceeded(
+            self.request.META.get("REMOTE_ADDR")
+        )
 
     def post(self, request, *args, **kwargs):
         """Handles POST requests, validates and processes the form."""
-        contact_form = self.get_support_form_class()(request.POST)
-        if contact_form.is_valid():
+        with stage("view.post", view=self.__class__.__name__):
+            return self._process_support_form(request, *args, **kwargs)
+
+    def _process_support_form(self, request, *args, **kwargs):
+        contact_form = self.get_support_form(request.POST)
+        if self.rate_limit_exceeded():
+            messages.error(
+                request,
+                _(
+                    "Too many requests were sent from your network. Please try again later."
+                ),
+            )
+            kwargs[self.support_form_context_name] = contact_form
+            context = self.get_context_data(**kwargs)
+            return render(request, self.get_template_name(), context, status=429)
+        with stage("form.validate", form=contact_form.__class__.__name__):
+            is_valid = contact_form.is_valid()
+        if is_valid:
             try:
-                contact_form.save()
+                # Forms without SpamFilterMixin are not scored.
+                get_spam_verdict = getattr(contact_form, "get_spam_verdict", None)
+                verdict = get_spam_verdict() if get_spam_verdict else None
+                if verdict is None or verdict.action == ACCEPT:
+                    with stage("form.save", form=contact_form.__class__.__name__):
+                        contact_form.save()
+                else:
+                    self.handle_spam(contact_form, verdict)
+                # Spam gets the same answer, so senders cannot tune against it.
                 messages.success(request, self.get_support_form_success_message())
-                return redirect(self.get_success_url())
-            except Exception as e:
+                return pin_response(redirect(self.get_success_url()))
+            except Exception:
+                logger.exception(
+                    "Failed to process the %s submission.",
+                    contact_form.__class__.__name__,
+                )
                 messages.error(
                     request,
                     _("There was an error processing your request. Please try again."),
                 )
-                # Log the exception, e.g., logging.error(e)
+        kwargs[self.support_form_context_name] = contact_form
         context = self.get_context_data(**kwargs)
-        context[self.support_form_context_name] = contact_form
-        return render(request, self.get_template_name(), context)
+        with stage("view.render", view=self.__class__.__name__):
+            return render(request, self.get_template_name(), context)